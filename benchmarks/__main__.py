@@ -0,0 +1,69 @@
+"""
+Run the benchmarks and write their results as JSON
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks compare baseline.json results.json
+"""
+import argparse
+import json
+import sys
+
+from . import bench_consume, bench_publish
+from .runner import compare, get_metadata
+
+SUITES = {"publish": bench_publish, "consume": bench_consume}
+
+
+def run(args: argparse.Namespace) -> int:
+    if args.iterations < 1:
+        raise ValueError("iterations must be a positive integer.")
+    results = []
+    for name in args.suite or SUITES:
+        print(f"Running {name} benchmarks", file=sys.stderr)
+        results.extend(SUITES[name].run(args.iterations, args.latency))
+    output = json.dumps({"metadata": get_metadata(), "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(output)
+    else:
+        print(output)
+    return 0
+
+
+def compare_runs(args: argparse.Namespace) -> int:
+    with open(args.baseline) as baseline_file, open(args.current) as current_file:
+        comparison = compare(json.load(baseline_file), json.load(current_file), args.threshold)
+    print(json.dumps(comparison, indent=2))
+    return 1 if any(entry["regression"] for entry in comparison) else 0
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--suite", action="append", choices=list(SUITES))
+    run_parser.add_argument("--iterations", type=int, default=10000)
+    run_parser.add_argument(
+        "--latency", type=float, default=0, help="Seconds every stubbed AWS call sleeps for"
+    )
+    run_parser.add_argument("--output", help="File the JSON results are written to")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare two runs, exits with 1 when a benchmark regressed"
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+    compare_parser.set_defaults(func=compare_runs)
+    return parser
+
+
+def main(argv: list[str] = None) -> int:
+    args = get_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+from .runner import measure, measure_async
+from .stubs import StubSQSAdapter, get_sqs_messages
+
+CONCURRENCY = (1, 10, 1000)
+MESSAGES_PER_RECEIVE = 10
+
+
+def run(iterations: int, latency: float = 0) -> list[dict]:
+    """
+    Benchmark the consume hot path
+
+    Args:
+        iterations (int): Number of operations of every benchmark
+        latency (float, optional): Seconds every stubbed client call sleeps for. Defaults to 0.
+
+    Returns:
+        list[dict]: One result per benchmark
+    """
+    return [*bench_parse_message(iterations), *bench_fetch_messages(iterations, latency)]
+
+
+def bench_parse_message(iterations: int) -> list[dict]:
+    messages = get_sqs_messages(1)
+    adapter = StubSQSAdapter(messages)
+    return [
+        measure(
+            "sqs_adapter._parse_message",
+            lambda: adapter._parse_message("queue", messages[0]),
+            iterations,
+        ),
+        measure(
+            "sqs_adapter._parse_message+message_data",
+            lambda: adapter._parse_message("queue", messages[0])["message_data"],
+            iterations,
+        ),
+    ]
+
+
+def bench_fetch_messages(iterations: int, latency: float = 0) -> list[dict]:
+    adapter = StubSQSAdapter(get_sqs_messages(MESSAGES_PER_RECEIVE), latency=latency)
+    params = {"messages": MESSAGES_PER_RECEIVE, "latency": latency}
+    results = []
+    for concurrency in CONCURRENCY:
+        results.append(
+            measure(
+                "sqs_adapter.fetch_messages",
+                lambda: list(adapter.fetch_messages("benchmark_queue", MESSAGES_PER_RECEIVE)),
+                iterations,
+                concurrency=concurrency,
+                params=params,
+            )
+        )
+        results.append(
+            measure_async(
+                "sqs_adapter.async_fetch_messages",
+                lambda: adapter.async_fetch_messages("benchmark_queue", MESSAGES_PER_RECEIVE),
+                iterations,
+                concurrency=concurrency,
+                params=params,
+            )
+        )
+    return results
@@ -0,0 +1,100 @@
+from clever_events_library.events import EventPublisher
+from clever_events_library.message_codec import get_codec
+
+from .runner import measure, measure_async
+from .stubs import StubSNSAdapter, get_message, get_message_attributes
+
+CODECS = ("json", "orjson", "msgpack", "json+zlib", "orjson+zstd")
+ASYNC_CONCURRENCY = (1, 10)
+ATTRIBUTE_COUNTS = (1, 10)
+MESSAGE_SIZES = (1024, 65536)
+
+
+def run(iterations: int, latency: float = 0) -> list[dict]:
+    """
+    Benchmark the publish hot path
+
+    Args:
+        iterations (int): Number of operations of every benchmark
+        latency (float, optional): Seconds every stubbed client call sleeps for. Defaults to 0.
+
+    Returns:
+        list[dict]: One result per benchmark
+    """
+    return [
+        *bench_publish(iterations, latency),
+        *bench_prepare_message_attributes(iterations),
+        *bench_serialization(iterations),
+    ]
+
+
+def bench_publish(iterations: int, latency: float = 0) -> list[dict]:
+    publisher = EventPublisher(event_adapter=StubSNSAdapter(latency=latency))
+    message_data = {"message": get_message(), "message_attributes": get_message_attributes()}
+    params = {"latency": latency}
+
+    results = [
+        measure(
+            "publisher.sync_publish",
+            lambda: publisher.sync_publish("benchmark_topic", message_data),
+            iterations,
+            params=params,
+        )
+    ]
+    for concurrency in ASYNC_CONCURRENCY:
+        results.append(
+            measure_async(
+                "publisher.async_publish",
+                lambda: publisher.async_publish("benchmark_topic", message_data),
+                iterations,
+                concurrency=concurrency,
+                params=params,
+            )
+        )
+    return results
+
+
+def bench_prepare_message_attributes(iterations: int) -> list[dict]:
+    adapter = StubSNSAdapter()
+    results = []
+    for count in ATTRIBUTE_COUNTS:
+        attributes = get_message_attributes(count)
+        results.append(
+            measure(
+                "sns_adapter._prepare_message_attributes",
+                lambda: adapter._prepare_message_attributes(attributes),
+                iterations,
+                params={"attributes": count},
+            )
+        )
+    return results
+
+
+def bench_serialization(iterations: int) -> list[dict]:
+    results = []
+    for codec_name in CODECS:
+        try:
+            codec = get_codec(codec_name)
+        except ImportError:
+            continue
+        adapter = StubSNSAdapter(codec=codec)
+        for size in MESSAGE_SIZES:
+            message = get_message(size)
+            body = codec.encode(message)
+            message_data = {"message": message, "message_attributes": get_message_attributes()}
+            params = {"codec": codec.name, "size": size}
+            results.extend(
+                [
+                    measure(
+                        "codec.encode", lambda: codec.encode(message), iterations, params=params
+                    ),
+                    measure("codec.decode", lambda: codec.decode(body), iterations, params=params),
+                    measure(
+                        "sns_adapter.prepare",
+                        lambda: adapter.prepare("benchmark_topic", message_data),
+                        iterations,
+                        params=params,
+                    ),
+                ]
+            )
+    return results
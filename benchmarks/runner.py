@@ -0,0 +1,209 @@
+import asyncio
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from clever_events_library import __version__
+
+
+def measure(
+    name: str,
+    func: Callable[[], object],
+    iterations: int,
+    concurrency: int = 1,
+    warmup: int = 100,
+    params: dict = {},
+) -> dict:
+    """
+    Measure the throughput and latency of a synchronous callable
+
+    Args:
+        name (str): The name of the benchmark
+        func (Callable): Called once per operation, without arguments
+        iterations (int): Total number of operations, split between the callers
+        concurrency (int, optional): Number of threads calling func at the same time. Defaults to 1.
+        warmup (int, optional): Operations run before measuring. Defaults to 100.
+        params (dict, optional): Parameters of the benchmark, added to the result. Defaults to {}.
+
+    Returns:
+        dict: The benchmark result, see get_result
+    """
+    for _ in range(warmup):
+        func()
+
+    def run(count: int) -> list[int]:
+        latencies = []
+        for _ in range(count):
+            start = time.perf_counter_ns()
+            func()
+            latencies.append(time.perf_counter_ns() - start)
+        return latencies
+
+    start = time.perf_counter_ns()
+    if concurrency == 1:
+        latencies = run(iterations)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = [
+                latency
+                for caller_latencies in executor.map(run, _split(iterations, concurrency))
+                for latency in caller_latencies
+            ]
+    elapsed = time.perf_counter_ns() - start
+    return get_result(name, latencies, elapsed, concurrency, params)
+
+
+def measure_async(
+    name: str,
+    func: Callable[[], Awaitable],
+    iterations: int,
+    concurrency: int = 1,
+    warmup: int = 100,
+    params: dict = {},
+) -> dict:
+    """
+    Measure the throughput and latency of a coroutine function
+
+    Args:
+        name (str): The name of the benchmark
+        func (Callable): Called and awaited once per operation, without arguments
+        iterations (int): Total number of operations, split between the callers
+        concurrency (int, optional): Number of tasks awaiting func at the same time. Defaults to 1.
+        warmup (int, optional): Operations run before measuring. Defaults to 100.
+        params (dict, optional): Parameters of the benchmark, added to the result. Defaults to {}.
+
+    Returns:
+        dict: The benchmark result, see get_result
+    """
+
+    async def run(count: int) -> list[int]:
+        latencies = []
+        for _ in range(count):
+            start = time.perf_counter_ns()
+            await func()
+            latencies.append(time.perf_counter_ns() - start)
+        return latencies
+
+    async def main() -> tuple:
+        for _ in range(warmup):
+            await func()
+        start = time.perf_counter_ns()
+        callers_latencies = await asyncio.gather(
+            *(run(count) for count in _split(iterations, concurrency))
+        )
+        elapsed = time.perf_counter_ns() - start
+        return [latency for latencies in callers_latencies for latency in latencies], elapsed
+
+    latencies, elapsed = asyncio.run(main())
+    return get_result(name, latencies, elapsed, concurrency, params)
+
+
+def get_result(
+    name: str, latencies: list[int], elapsed: int, concurrency: int, params: dict
+) -> dict:
+    """
+    Summarize the latencies of a benchmark
+
+    Args:
+        name (str): The name of the benchmark
+        latencies (list[int]): Nanoseconds taken by every operation
+        elapsed (int): Nanoseconds taken by all operations
+        concurrency (int): Number of concurrent callers
+        params (dict): Parameters of the benchmark
+
+    Returns:
+        dict: A dict containing the following keys:
+            - name: The name of the benchmark
+            - params: The parameters of the benchmark
+            - iterations: Number of operations measured
+            - concurrency: Number of concurrent callers
+            - ops_per_sec: Operations per second, across every caller
+            - latency_us: p50, p99, mean and max latency in microseconds
+    """
+    latencies = sorted(latencies)
+    return {
+        "name": name,
+        "params": params,
+        "iterations": len(latencies),
+        "concurrency": concurrency,
+        "ops_per_sec": round(len(latencies) / (elapsed / 1e9), 2) if elapsed else None,
+        "latency_us": {
+            "p50": _percentile(latencies, 50),
+            "p99": _percentile(latencies, 99),
+            "mean": round(statistics.fmean(latencies) / 1e3, 3),
+            "max": round(latencies[-1] / 1e3, 3),
+        },
+    }
+
+
+def get_metadata() -> dict:
+    """
+    Describe the environment benchmarks ran in, so results of different releases can be compared
+
+    Returns:
+        dict: The library version, python version, platform and time of the run
+    """
+    return {
+        "library_version": __version__,
+        "python_version": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "argv": sys.argv[1:],
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.1) -> list[dict]:
+    """
+    Compare two benchmark runs
+
+    Args:
+        baseline (dict): The output of a previous run
+        current (dict): The output of the run to be checked
+        threshold (float, optional): Relative ops_per_sec drop above which a benchmark is
+            considered a regression. Defaults to 0.1.
+
+    Returns:
+        list[dict]: One entry per benchmark present in both runs, with the baseline and current
+            ops_per_sec and p99 latency, their ratio and whether it is a regression
+    """
+    baseline_results = {_get_key(result): result for result in baseline["results"]}
+    comparison = []
+    for result in current["results"]:
+        previous = baseline_results.get(_get_key(result))
+        if previous is None or not previous["ops_per_sec"] or not result["ops_per_sec"]:
+            continue
+        ratio = result["ops_per_sec"] / previous["ops_per_sec"]
+        comparison.append(
+            {
+                "name": result["name"],
+                "params": result["params"],
+                "concurrency": result["concurrency"],
+                "baseline_ops_per_sec": previous["ops_per_sec"],
+                "current_ops_per_sec": result["ops_per_sec"],
+                "baseline_p99_us": previous["latency_us"]["p99"],
+                "current_p99_us": result["latency_us"]["p99"],
+                "ratio": round(ratio, 3),
+                "regression": ratio < 1 - threshold,
+            }
+        )
+    return comparison
+
+
+def _get_key(result: dict) -> tuple:
+    return result["name"], result["concurrency"], tuple(sorted(result["params"].items()))
+
+
+def _percentile(latencies: list[int], percentile: int) -> float:
+    index = min(int(len(latencies) * percentile / 100), len(latencies) - 1)
+    return round(latencies[index] / 1e3, 3)
+
+
+def _split(iterations: int, callers: int) -> list[int]:
+    share, remainder = divmod(iterations, callers)
+    return [share + (1 if caller < remainder else 0) for caller in range(callers)]
@@ -0,0 +1,206 @@
+import asyncio
+import json
+import time
+import uuid
+
+from clever_events_library.events.adapters import SNSAdapter
+from clever_events_library.queues.adapters import SQSAdapter
+
+CLIENT_CONFIG = {
+    "aws_region": "us-east-1",
+    "aws_key": "benchmark",
+    "aws_secret": "benchmark",
+    "aws_account_id": "123456789012",
+}
+
+
+class StubSNSClient:
+    def __init__(self, latency: float = 0) -> None:
+        """
+        Initialize StubSNSClient, standing in for the botocore SNS client
+
+        Args:
+            latency (float, optional): Seconds every call sleeps for, to simulate the network.
+                Defaults to 0.
+
+        Returns:
+            None
+        """
+        self.latency = latency
+
+    def publish(self, **params) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        return {"MessageId": str(uuid.uuid4())}
+
+    def publish_batch(self, PublishBatchRequestEntries: list, **params) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        return {
+            "Successful": [
+                {"Id": entry["Id"], "MessageId": str(uuid.uuid4())}
+                for entry in PublishBatchRequestEntries
+            ]
+        }
+
+
+class AsyncStubSNSClient(StubSNSClient):
+    async def publish(self, **params) -> dict:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return {"MessageId": str(uuid.uuid4())}
+
+    async def publish_batch(self, PublishBatchRequestEntries: list, **params) -> dict:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return {
+            "Successful": [
+                {"Id": entry["Id"], "MessageId": str(uuid.uuid4())}
+                for entry in PublishBatchRequestEntries
+            ]
+        }
+
+
+class StubSQSClient:
+    def __init__(self, messages: list[dict], latency: float = 0) -> None:
+        """
+        Initialize StubSQSClient, standing in for the botocore SQS client
+
+        Every receive_message call returns the same messages, so only the parsing done by the
+        adapter is measured.
+
+        Args:
+            messages (list[dict]): The raw SQS messages returned by receive_message
+            latency (float, optional): Seconds every call sleeps for, to simulate the network.
+                Defaults to 0.
+
+        Returns:
+            None
+        """
+        self.latency = latency
+        self._response = {"Messages": messages}
+
+    def receive_message(self, MaxNumberOfMessages: int = 1, **params) -> dict:
+        if self.latency:
+            time.sleep(self.latency)
+        return {"Messages": self._response["Messages"][:MaxNumberOfMessages]}
+
+
+class AsyncStubSQSClient(StubSQSClient):
+    async def receive_message(self, MaxNumberOfMessages: int = 1, **params) -> dict:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return {"Messages": self._response["Messages"][:MaxNumberOfMessages]}
+
+
+class StubAsyncClientContext:
+    def __init__(self, client) -> None:
+        self.client = client
+
+    async def __aenter__(self):
+        return self.client
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> bool:
+        return False
+
+
+class StubSNSAdapter(SNSAdapter):
+    def __init__(self, latency: float = 0, **kwargs) -> None:
+        """
+        Initialize StubSNSAdapter, a SNSAdapter whose clients never reach AWS
+
+        Args:
+            latency (float, optional): Seconds every client call sleeps for. Defaults to 0.
+            kwargs: Passed to SNSAdapter, e.g. codec
+
+        Returns:
+            None
+        """
+        super().__init__(client_config=CLIENT_CONFIG, **kwargs)
+        self._sns_client = StubSNSClient(latency)
+        self._latency = latency
+
+    def _get_async_client_context(self):
+        return StubAsyncClientContext(AsyncStubSNSClient(self._latency))
+
+
+class StubSQSAdapter(SQSAdapter):
+    def __init__(self, messages: list[dict], latency: float = 0, **kwargs) -> None:
+        """
+        Initialize StubSQSAdapter, a SQSAdapter whose clients never reach AWS
+
+        Args:
+            messages (list[dict]): The raw SQS messages returned by every receive
+            latency (float, optional): Seconds every client call sleeps for. Defaults to 0.
+            kwargs: Passed to SQSAdapter
+
+        Returns:
+            None
+        """
+        super().__init__(client_config=CLIENT_CONFIG, **kwargs)
+        self._sqs_client = StubSQSClient(messages, latency)
+        self._messages = messages
+        self._latency = latency
+
+    def _get_async_client_context(self):
+        return StubAsyncClientContext(AsyncStubSQSClient(self._messages, self._latency))
+
+
+def get_message(size: int = 1024) -> dict:
+    """
+    Build a message of roughly size bytes once serialized to JSON
+
+    Args:
+        size (int, optional): Approximate size in bytes. Defaults to 1024.
+
+    Returns:
+        dict: The message
+    """
+    return {
+        "event_id": str(uuid.uuid4()),
+        "user_id": 123456,
+        "active": True,
+        "score": 98.5,
+        "tags": ["benchmark", "clever", "events"],
+        "payload": "x" * max(size - 150, 0),
+    }
+
+
+def get_message_attributes(count: int = 5) -> dict:
+    """
+    Build count message attributes of mixed types
+
+    Args:
+        count (int, optional): Number of attributes. Defaults to 5.
+
+    Returns:
+        dict: The message attributes, as passed in message_data
+    """
+    values = ("value", 42, 3.14, True, "another value")
+    return {f"attribute_{index}": values[index % len(values)] for index in range(count)}
+
+
+def get_sqs_messages(count: int = 10, size: int = 1024) -> list[dict]:
+    """
+    Build raw SQS messages, as returned by ReceiveMessage
+
+    Args:
+        count (int, optional): Number of messages. Defaults to 10.
+        size (int, optional): Approximate body size in bytes. Defaults to 1024.
+
+    Returns:
+        list[dict]: The raw messages
+    """
+    return [
+        {
+            "MessageId": str(uuid.uuid4()),
+            "ReceiptHandle": str(uuid.uuid4()),
+            "Body": json.dumps(get_message(size)),
+            "Attributes": {"ApproximateReceiveCount": "1", "SentTimestamp": "1700000000000"},
+            "MessageAttributes": {
+                name: {"DataType": "String", "StringValue": str(value)}
+                for name, value in get_message_attributes().items()
+            },
+        }
+        for _ in range(count)
+    ]
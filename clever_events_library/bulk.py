@@ -0,0 +1,437 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import TextIO
+
+from .claim_check import CLAIM_CHECK_ATTRIBUTE
+from .events.event_publisher import EventPublisher
+from .message_attributes import decode_attributes
+from .message_codec import CODEC_ATTRIBUTE
+from .queues.queue_manager import QueueManager
+
+logger = logging.getLogger(__name__)
+
+RECEIVE_BATCH_SIZE = 10
+# Attributes set by the adapters themselves, they are set again when records are re-published
+INTERNAL_ATTRIBUTES = (CLAIM_CHECK_ATTRIBUTE, CODEC_ATTRIBUTE)
+CHECKPOINT_INTERVAL = 1.0
+
+
+def to_record(message: dict) -> dict:
+    """
+    Convert a fetched message into a record, the JSON serializable form used by the bulk tools
+
+    Args:
+        message (dict): A message fetched with QueueManager.fetch_messages
+
+    Returns:
+        dict: A dict with message_id, message_data, message_attributes as native values and,
+            for FIFO messages, message_group_id
+    """
+    message_attributes = message["message_attributes"] or {}
+    if any(
+        isinstance(value, dict) and "DataType" in value for value in message_attributes.values()
+    ):
+        message_attributes = decode_attributes(message_attributes)
+    record = {
+        "message_id": message["message_id"],
+        "message_data": message["message_data"],
+        "message_attributes": {
+            name: value
+            for name, value in message_attributes.items()
+            if name not in INTERNAL_ATTRIBUTES
+        },
+    }
+    message_group_id = getattr(message, "message_group_id", None)
+    if message_group_id is not None:
+        record["message_group_id"] = message_group_id
+    return record
+
+
+def drain_queue(
+    queue_manager: QueueManager,
+    event_publisher: EventPublisher,
+    queue_name: str,
+    event_name: str,
+    workers: int = 8,
+    message_filter: Callable[[dict], bool] = None,
+    transform: Callable[[dict], dict] = None,
+    max_messages: int = None,
+    additional_params: dict = {},
+) -> dict:
+    """
+    Re-publish the messages of a queue to a topic, deleting them once published
+
+    Every worker thread fetches batches of messages, converts them into records (see to_record),
+    filters and transforms them and re-publishes them with EventPublisher.sync_publish_batch,
+    until the queue is empty or max_messages were received. The queue is its own checkpoint:
+    a message is deleted only once published, so a drain that stops can be run again.
+
+    Messages that are filtered out or fail to be published are left in the queue, and are not
+    received again by the drain while their visibility timeout lasts.
+
+    Args:
+        queue_manager (QueueManager): The QueueManager messages are fetched with
+        event_publisher (EventPublisher): The EventPublisher records are published with
+        queue_name (str): The name of the queue
+        event_name (str): The name of the topic
+        workers (int, optional): Number of threads fetching and publishing. Defaults to 8.
+        message_filter (Callable, optional): Called with every record, records for which it
+            returns False are skipped. Defaults to None.
+        transform (Callable, optional): Called with every record, returns the record to publish,
+            or None to skip it. Defaults to None.
+        max_messages (int, optional): Highest number of messages to receive. Defaults to None,
+            until the queue is empty.
+        additional_params (dict, optional): Sent with every batch, see sync_publish_batch.
+
+    Raises:
+        ValueError: If workers or max_messages is not valid
+        Exception: Any error raised while fetching or deleting messages
+
+    Returns:
+        dict: The number of messages received, published, skipped and failed
+    """
+    stats = _Stats("received", "published", "skipped", "failed")
+
+    def handle_batch(messages: list) -> None:
+        selected = _select_records(
+            [to_record(message) for message in messages], message_filter, transform
+        )
+        successes = _publish_records(
+            event_publisher, event_name, [record for _, record in selected], additional_params
+        )
+        published = [
+            messages[index]["message_receipt_handle"]
+            for (index, _), success in zip(selected, successes)
+            if success
+        ]
+        if published:
+            queue_manager.delete_messages(queue_name, published)
+        stats.add(
+            received=len(messages),
+            published=len(published),
+            skipped=len(messages) - len(selected),
+            failed=len(selected) - len(published),
+        )
+
+    _consume_queue(queue_manager, queue_name, workers, max_messages, handle_batch)
+    return stats.get()
+
+
+def export_queue(
+    queue_manager: QueueManager,
+    queue_name: str,
+    output: TextIO,
+    workers: int = 8,
+    message_filter: Callable[[dict], bool] = None,
+    transform: Callable[[dict], dict] = None,
+    max_messages: int = None,
+    delete: bool = False,
+) -> dict:
+    """
+    Write the messages of a queue to a newline-delimited JSON file, one record per line
+
+    Every worker thread fetches batches of messages, converts them into records (see to_record),
+    filters and transforms them and appends them to output, until the queue is empty or
+    max_messages were received. Records are written in the order they are received, which is
+    not the order of the queue. The file can be published with replay_file.
+
+    Without delete, exported messages stay in the queue and become visible again once their
+    visibility timeout expires, so set it longer than the export.
+
+    Args:
+        queue_manager (QueueManager): The QueueManager messages are fetched with
+        queue_name (str): The name of the queue
+        output (TextIO): The file records are written to
+        workers (int, optional): Number of threads fetching messages. Defaults to 8.
+        message_filter (Callable, optional): Called with every record, records for which it
+            returns False are skipped. Defaults to None.
+        transform (Callable, optional): Called with every record, returns the record to write,
+            or None to skip it. Defaults to None.
+        max_messages (int, optional): Highest number of messages to receive. Defaults to None,
+            until the queue is empty.
+        delete (bool, optional): Delete written messages from the queue, once flushed to output.
+            Defaults to False.
+
+    Raises:
+        ValueError: If workers or max_messages is not valid
+        Exception: Any error raised while fetching or deleting messages or writing output
+
+    Returns:
+        dict: The number of messages received, written and skipped
+    """
+    stats = _Stats("received", "written", "skipped")
+    lock = threading.Lock()
+
+    def handle_batch(messages: list) -> None:
+        selected = _select_records(
+            [to_record(message) for message in messages], message_filter, transform
+        )
+        if selected:
+            lines = "".join(_dump_record(record) for _, record in selected)
+            with lock:
+                output.write(lines)
+                output.flush()
+            if delete:
+                queue_manager.delete_messages(
+                    queue_name,
+                    [messages[index]["message_receipt_handle"] for index, _ in selected],
+                )
+        stats.add(
+            received=len(messages), written=len(selected), skipped=len(messages) - len(selected)
+        )
+
+    _consume_queue(queue_manager, queue_name, workers, max_messages, handle_batch)
+    return stats.get()
+
+
+def replay_file(
+    event_publisher: EventPublisher,
+    path: str,
+    event_name: str,
+    workers: int = 8,
+    message_filter: Callable[[dict], bool] = None,
+    transform: Callable[[dict], dict] = None,
+    batch_size: int = RECEIVE_BATCH_SIZE,
+    checkpoint: str = None,
+    failed_output: TextIO = None,
+    additional_params: dict = {},
+) -> dict:
+    """
+    Publish the records of a newline-delimited JSON file to a topic
+
+    Records, e.g. written by export_queue, go through the same filter, transform and
+    sync_publish_batch path as drain_queue. Batches are published by workers threads.
+
+    With a checkpoint, the byte offset up to which every batch was handled is saved to the
+    checkpoint file at most every second and when the replay ends, and a replay with the same
+    checkpoint resumes from it. Records published after the last saved offset are published
+    again on resume.
+
+    Args:
+        event_publisher (EventPublisher): The EventPublisher records are published with
+        path (str): The path of the file
+        event_name (str): The name of the topic
+        workers (int, optional): Number of threads publishing. Defaults to 8.
+        message_filter (Callable, optional): Called with every record, records for which it
+            returns False are skipped. Defaults to None.
+        transform (Callable, optional): Called with every record, returns the record to publish,
+            or None to skip it. Defaults to None.
+        batch_size (int, optional): Number of records per sync_publish_batch call. Defaults to 10.
+        checkpoint (str, optional): The path of the checkpoint file. Defaults to None.
+        failed_output (TextIO, optional): The file records that fail to be published are written
+            to, so they can be replayed. Defaults to None, they are logged.
+        additional_params (dict, optional): Sent with every batch, see sync_publish_batch.
+
+    Raises:
+        ValueError: If workers or batch_size is not valid, or checkpoint belongs to another file
+        Exception: Any error raised while reading path or writing the checkpoint
+
+    Returns:
+        dict: The number of records read, published, skipped and failed
+    """
+    if workers < 1:
+        raise ValueError("workers must be a positive integer.")
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer.")
+    stats = _Stats("read", "published", "skipped", "failed")
+    lock = threading.Lock()
+
+    def handle_batch(records: list[dict]) -> None:
+        selected = _select_records(records, message_filter, transform)
+        successes = _publish_records(
+            event_publisher, event_name, [record for _, record in selected], additional_params
+        )
+        failed = [record for (_, record), success in zip(selected, successes) if not success]
+        for record in failed:
+            logger.error("Failed to publish record %s", record.get("message_id"))
+        if failed and failed_output is not None:
+            lines = "".join(_dump_record(record) for record in failed)
+            with lock:
+                failed_output.write(lines)
+                failed_output.flush()
+        stats.add(
+            read=len(records),
+            published=len(selected) - len(failed),
+            skipped=len(records) - len(selected),
+            failed=len(failed),
+        )
+
+    offset = _read_checkpoint(checkpoint, path)
+    saved_offset, saved_at = offset, time.monotonic()
+    with open(path, "rb") as input_file, ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="Replay"
+    ) as executor:
+        input_file.seek(offset)
+        # Batches in file order, so the checkpoint only moves past batches that are all handled
+        pending = deque()
+        for records, end_offset in _read_batches(input_file, offset, batch_size):
+            pending.append((executor.submit(handle_batch, records), end_offset))
+            if len(pending) >= workers * 2:
+                # Waiting on the oldest batch bounds the batches read ahead, even when later
+                # batches complete first
+                wait([pending[0][0]])
+            while pending and pending[0][0].done():
+                future, offset = pending.popleft()
+                future.result()
+            if checkpoint is not None and offset != saved_offset:
+                if time.monotonic() - saved_at >= CHECKPOINT_INTERVAL:
+                    _write_checkpoint(checkpoint, path, offset)
+                    saved_offset, saved_at = offset, time.monotonic()
+        while pending:
+            future, offset = pending.popleft()
+            future.result()
+    if checkpoint is not None and offset != saved_offset:
+        _write_checkpoint(checkpoint, path, offset)
+    return stats.get()
+
+
+class _Stats:
+    def __init__(self, *names: str) -> None:
+        self._counts = dict.fromkeys(names, 0)
+        self._lock = threading.Lock()
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            for name, count in counts.items():
+                self._counts[name] += count
+
+    def get(self) -> dict:
+        with self._lock:
+            return dict(self._counts)
+
+
+def _consume_queue(
+    queue_manager: QueueManager,
+    queue_name: str,
+    workers: int,
+    max_messages: int,
+    handle_batch: Callable[[list], None],
+) -> None:
+    if workers < 1:
+        raise ValueError("workers must be a positive integer.")
+    if max_messages is not None and max_messages < 0:
+        raise ValueError("max_messages must be a non-negative integer.")
+    lock = threading.Lock()
+    stop_event = threading.Event()
+    remaining = [max_messages]
+
+    def reserve(count: int) -> int:
+        with lock:
+            if remaining[0] is None:
+                return count
+            count = min(count, remaining[0])
+            remaining[0] -= count
+            return count
+
+    def release(count: int) -> None:
+        with lock:
+            if remaining[0] is not None:
+                remaining[0] += count
+
+    def work() -> None:
+        try:
+            while not stop_event.is_set():
+                count = reserve(RECEIVE_BATCH_SIZE)
+                if not count:
+                    return
+                messages = list(queue_manager.fetch_messages(queue_name, count))
+                if len(messages) < count:
+                    release(count - len(messages))
+                # With long polling, an empty receive means the queue is drained
+                if not messages:
+                    return
+                handle_batch(messages)
+        except Exception:
+            stop_event.set()
+            raise
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Bulk") as executor:
+        futures = [executor.submit(work) for _ in range(workers)]
+    for future in futures:
+        future.result()
+
+
+def _select_records(
+    records: list[dict], message_filter: Callable[[dict], bool], transform: Callable[[dict], dict]
+) -> list[tuple[int, dict]]:
+    selected = []
+    for index, record in enumerate(records):
+        if message_filter is not None and not message_filter(record):
+            continue
+        if transform is not None:
+            record = transform(record)
+            if record is None:
+                continue
+        selected.append((index, record))
+    return selected
+
+
+def _publish_records(
+    event_publisher: EventPublisher, event_name: str, records: list[dict], additional_params: dict
+) -> list[bool]:
+    if not records:
+        return []
+    messages_data = []
+    for record in records:
+        message_data = {
+            "message": record["message_data"],
+            "message_attributes": record.get("message_attributes") or {},
+        }
+        if "message_group_id" in record:
+            message_data["message_group_id"] = record["message_group_id"]
+        messages_data.append(message_data)
+    try:
+        results = event_publisher.sync_publish_batch(event_name, messages_data, additional_params)
+    except Exception:
+        logger.exception("Failed to publish %s records to %s", len(records), event_name)
+        return [False] * len(records)
+    for result in results:
+        if not result["success"]:
+            logger.error(
+                "Failed to publish record to %s: %s %s",
+                event_name,
+                result["error_code"],
+                result["error_message"],
+            )
+    return [result["success"] for result in results]
+
+
+def _dump_record(record: dict) -> str:
+    return json.dumps(record, default=str) + "\n"
+
+
+def _read_batches(input_file, offset: int, batch_size: int):
+    records = []
+    for line in input_file:
+        offset += len(line)
+        if line.strip():
+            records.append(json.loads(line))
+        if len(records) == batch_size:
+            yield records, offset
+            records = []
+    if records:
+        yield records, offset
+
+
+def _read_checkpoint(checkpoint: str, path: str) -> int:
+    if checkpoint is None or not os.path.exists(checkpoint):
+        return 0
+    with open(checkpoint) as checkpoint_file:
+        state = json.load(checkpoint_file)
+    if state["path"] != os.path.abspath(path):
+        raise ValueError(f"checkpoint {checkpoint} belongs to {state['path']}.")
+    return state["offset"]
+
+
+def _write_checkpoint(checkpoint: str, path: str, offset: int) -> None:
+    # Written to a temporary file first, so a crash never leaves a truncated checkpoint
+    temporary = f"{checkpoint}.tmp"
+    with open(temporary, "w") as checkpoint_file:
+        json.dump({"path": os.path.abspath(path), "offset": offset}, checkpoint_file)
+    os.replace(temporary, checkpoint)
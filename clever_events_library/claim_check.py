@@ -0,0 +1,154 @@
+import os
+import threading
+import uuid
+from abc import ABC, abstractmethod
+
+import boto3
+
+from .mixins import AwsHelperMixin
+
+CLAIM_CHECK_ATTRIBUTE = "clever_events_claim_check"
+
+
+class BlobStore(ABC):
+    @abstractmethod
+    def put(self, data: bytes) -> str:
+        """
+        Store a payload
+
+        Args:
+            data (bytes): The payload to be stored
+
+        Returns:
+            str: The location of the stored payload, to be used with get
+        """
+        pass
+
+    @abstractmethod
+    def get(self, location: str) -> bytes:
+        """
+        Read a stored payload
+
+        Args:
+            location (str): The location returned by put
+
+        Raises:
+            ValueError: If location is outside of the store
+
+        Returns:
+            bytes: The stored payload
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, location: str) -> None:
+        """
+        Delete a stored payload
+
+        Args:
+            location (str): The location returned by put
+
+        Raises:
+            ValueError: If location is outside of the store
+
+        Returns:
+            None
+        """
+        pass
+
+
+class S3BlobStore(AwsHelperMixin, BlobStore):
+    def __init__(self, bucket: str, prefix: str = "", client_config: dict = {}) -> None:
+        """
+        Initialize S3BlobStore with bucket
+
+        Only objects of bucket under prefix are read or deleted, so a message can't make a
+        consumer read other objects its credentials give access to.
+
+        Args:
+            bucket (str): The name of the S3 bucket payloads are stored in
+            prefix (str, optional): A prefix added to every object key. Defaults to "".
+            client_config (dict): AWS configuration, see SNSAdapter. If not provided, values will
+                be fetched from environment variables. Defaults to {}.
+
+        Returns:
+            None
+        """
+        self.bucket = bucket
+        self.prefix = prefix
+        self.aws_client_params = self._get_aws_client_params(client_config)
+        self._s3_client = None
+        self._s3_client_lock = threading.Lock()
+
+    @property
+    def s3_client(self) -> boto3.client:
+        if not self._s3_client:
+            # boto3 clients are thread safe, but creating them from the default session is not
+            with self._s3_client_lock:
+                if not self._s3_client:
+                    self._s3_client = boto3.client(
+                        "s3",
+                        region_name=self.aws_client_params["aws_region"],
+                        aws_access_key_id=self.aws_client_params["aws_key"],
+                        aws_secret_access_key=self.aws_client_params["aws_secret"],
+                    )
+        return self._s3_client
+
+    def put(self, data: bytes) -> str:
+        key = f"{self.prefix}{uuid.uuid4()}"
+        self.s3_client.put_object(Bucket=self.bucket, Key=key, Body=data)
+        return f"s3://{self.bucket}/{key}"
+
+    def get(self, location: str) -> bytes:
+        bucket, key = self._parse_location(location)
+        return self.s3_client.get_object(Bucket=bucket, Key=key)["Body"].read()
+
+    def delete(self, location: str) -> None:
+        bucket, key = self._parse_location(location)
+        self.s3_client.delete_object(Bucket=bucket, Key=key)
+
+    def _parse_location(self, location: str) -> tuple:
+        if not location.startswith("s3://"):
+            raise ValueError(f"{location} is not an S3 location")
+        bucket, _, key = location[len("s3://") :].partition("/")
+        if bucket != self.bucket or not key.startswith(self.prefix) or key == self.prefix:
+            raise ValueError(f"{location} is not a location of s3://{self.bucket}/{self.prefix}")
+        return bucket, key
+
+
+class LocalFileBlobStore(BlobStore):
+    def __init__(self, directory: str) -> None:
+        """
+        Initialize LocalFileBlobStore with directory
+
+        Stores payloads as files, meant for tests and local development. Only files of
+        directory are read or deleted.
+
+        Args:
+            directory (str): The directory payloads are stored in. It is created if missing.
+
+        Returns:
+            None
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def put(self, data: bytes) -> str:
+        location = os.path.join(self.directory, str(uuid.uuid4()))
+        with open(location, "wb") as blob:
+            blob.write(data)
+        return location
+
+    def get(self, location: str) -> bytes:
+        with open(self._check_location(location), "rb") as blob:
+            return blob.read()
+
+    def delete(self, location: str) -> None:
+        os.remove(self._check_location(location))
+
+    def _check_location(self, location: str) -> str:
+        # Resolved first, so neither ".." nor symbolic links lead out of directory
+        path = os.path.realpath(location)
+        if os.path.dirname(path) != os.path.realpath(self.directory):
+            raise ValueError(f"{location} is not a location of {self.directory}")
+        return path
@@ -0,0 +1,188 @@
+"""
+Move or replay messages in bulk, for incident recovery and backfills
+
+    clever-events drain my_queue my_topic --workers 16
+    clever-events export my_queue messages.ndjson --delete
+    clever-events replay messages.ndjson my_topic --checkpoint replay.checkpoint
+
+AWS credentials are read from the environment, like SNSAdapter and SQSAdapter. Use --sqlite to
+work with the queues and topics of a local SQLite broker instead.
+"""
+import argparse
+import importlib
+import json
+import logging
+import sys
+from collections.abc import Callable
+
+from .bulk import drain_queue, export_queue, replay_file
+from .events import EventPublisher
+from .events.adapters import SNSAdapter, SQLiteEventAdapter
+from .queues import QueueManager
+from .queues.adapters import SQLiteQueueAdapter, SQSAdapter
+
+
+def drain(args: argparse.Namespace) -> int:
+    stats = drain_queue(
+        _get_queue_manager(args),
+        _get_event_publisher(args),
+        args.queue,
+        args.topic,
+        workers=args.workers,
+        message_filter=_load_callable(args.filter),
+        transform=_load_callable(args.transform),
+        max_messages=args.max_messages,
+    )
+    print(json.dumps(stats))
+    return 1 if stats["failed"] else 0
+
+
+def export(args: argparse.Namespace) -> int:
+    queue_manager = _get_queue_manager(args)
+    options = {
+        "workers": args.workers,
+        "message_filter": _load_callable(args.filter),
+        "transform": _load_callable(args.transform),
+        "max_messages": args.max_messages,
+        "delete": args.delete,
+    }
+    if args.output == "-":
+        stats = export_queue(queue_manager, args.queue, sys.stdout, **options)
+    else:
+        with open(args.output, "a") as output:
+            stats = export_queue(queue_manager, args.queue, output, **options)
+    print(json.dumps(stats), file=sys.stderr if args.output == "-" else sys.stdout)
+    return 0
+
+
+def replay(args: argparse.Namespace) -> int:
+    options = {
+        "workers": args.workers,
+        "message_filter": _load_callable(args.filter),
+        "transform": _load_callable(args.transform),
+        "batch_size": args.batch_size,
+        "checkpoint": args.checkpoint,
+    }
+    event_publisher = _get_event_publisher(args)
+    if args.failed_output is None:
+        stats = replay_file(event_publisher, args.input, args.topic, **options)
+    else:
+        with open(args.failed_output, "a") as failed_output:
+            stats = replay_file(
+                event_publisher, args.input, args.topic, failed_output=failed_output, **options
+            )
+    print(json.dumps(stats))
+    return 1 if stats["failed"] else 0
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="clever-events",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--sqlite", metavar="PATH", help="Use the SQLite broker at PATH instead of SNS and SQS"
+    )
+    parser.add_argument("--log-level", default="INFO")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    records_parser = argparse.ArgumentParser(add_help=False)
+    records_parser.add_argument("--workers", type=int, default=8)
+    records_parser.add_argument(
+        "--filter",
+        metavar="MODULE:FUNCTION",
+        help="Called with every record, records for which it returns False are skipped",
+    )
+    records_parser.add_argument(
+        "--transform",
+        metavar="MODULE:FUNCTION",
+        help="Called with every record, returns the record to use, or None to skip it",
+    )
+
+    queue_parser = argparse.ArgumentParser(add_help=False, parents=[records_parser])
+    queue_parser.add_argument("--max-messages", type=int, help="Stop after receiving this many")
+    queue_parser.add_argument(
+        "--visibility-timeout",
+        type=int,
+        default=300,
+        help="Seconds received messages are hidden, longer than the whole run for exports",
+    )
+    queue_parser.add_argument(
+        "--wait-time",
+        type=int,
+        default=2,
+        help="Long polling seconds, the run ends on the first empty receive of every worker",
+    )
+
+    drain_parser = subparsers.add_parser(
+        "drain",
+        parents=[queue_parser],
+        help="Re-publish the messages of a queue to a topic, deleting them once published",
+    )
+    drain_parser.add_argument("queue")
+    drain_parser.add_argument("topic")
+    drain_parser.set_defaults(func=drain)
+
+    export_parser = subparsers.add_parser(
+        "export",
+        parents=[queue_parser],
+        help="Append the messages of a queue to a newline-delimited JSON file",
+    )
+    export_parser.add_argument("queue")
+    export_parser.add_argument("output", help="The file records are appended to, - for stdout")
+    export_parser.add_argument(
+        "--delete", action="store_true", help="Delete messages from the queue once written"
+    )
+    export_parser.set_defaults(func=export)
+
+    replay_parser = subparsers.add_parser(
+        "replay",
+        parents=[records_parser],
+        help="Publish the records of a newline-delimited JSON file to a topic",
+    )
+    replay_parser.add_argument("input")
+    replay_parser.add_argument("topic")
+    replay_parser.add_argument("--batch-size", type=int, default=10)
+    replay_parser.add_argument(
+        "--checkpoint", metavar="PATH", help="Save progress to PATH and resume from it"
+    )
+    replay_parser.add_argument(
+        "--failed-output", metavar="PATH", help="Append records that fail to be published to PATH"
+    )
+    replay_parser.set_defaults(func=replay)
+    return parser
+
+
+def main(argv: list[str] = None) -> int:
+    args = get_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level, format="%(asctime)s %(levelname)s %(message)s")
+    return args.func(args)
+
+
+def _load_callable(path: str) -> Callable:
+    if path is None:
+        return None
+    module_name, _, name = path.partition(":")
+    if not name:
+        raise ValueError(f"{path} must be formatted as module:function.")
+    return getattr(importlib.import_module(module_name), name)
+
+
+def _get_queue_manager(args: argparse.Namespace) -> QueueManager:
+    if args.sqlite is not None:
+        return QueueManager(SQLiteQueueAdapter(args.sqlite, args.visibility_timeout))
+    queue_adapter = SQSAdapter()
+    queue_adapter.set_visibility_timeout(args.visibility_timeout)
+    queue_adapter.set_await_time(args.wait_time)
+    return QueueManager(queue_adapter)
+
+
+def _get_event_publisher(args: argparse.Namespace) -> EventPublisher:
+    if args.sqlite is not None:
+        return EventPublisher(SQLiteEventAdapter(args.sqlite))
+    return EventPublisher(SNSAdapter())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1 +1,4 @@
+from .buffered_event_publisher import BufferedEventPublisher
 from .event_publisher import EventPublisher
+from .fifo_partitioner import FifoPartitioner
+from .outbox_publisher import OutboxPublisher
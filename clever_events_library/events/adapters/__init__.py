@@ -1,2 +1,5 @@
 from .event_base_adapter import EventBaseAdapter
+from .local_adapter import (DispatcherEventAdapter, InMemoryEventAdapter, LocalEventAdapter,
+                            SQLiteEventAdapter)
+from .prepared_message import PreparedMessage
 from .sns_adapter import SNSAdapter
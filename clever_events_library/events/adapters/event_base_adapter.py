@@ -1,5 +1,8 @@
+import json
 from abc import ABC, abstractmethod
 
+from .prepared_message import PreparedMessage
+
 
 class EventBaseAdapter(ABC):
 
@@ -36,3 +39,175 @@ class EventBaseAdapter(ABC):
             None
         """
         pass
+
+    @abstractmethod
+    def sync_publish_batch(
+        self, event_name: str, messages_data: list[dict], additional_params: dict = {}
+    ) -> list[dict]:
+        """
+        Synchronously publish a batch of events to the event stack
+
+        Args:
+            event_name (str): The name of the SNS topic
+            messages_data (list[dict]): A list of dicts containing the message attributes.
+            additional_params (dict): A dict containing additional parameters to be sent for every entry. It is optional.
+
+        Returns:
+            list[dict]: One result per entry of messages_data, in the same order, with the following keys:
+                - index: Position of the entry in messages_data
+                - success: Whether the entry was published
+                - message_id: The id assigned by the events stack, None on failure
+                - error_code: The error code, None on success
+                - error_message: The error message, None on success
+                - sender_fault: Whether the failure was caused by the request itself
+        """
+        pass
+
+    @abstractmethod
+    async def async_publish_batch(
+        self, event_name: str, messages_data: list[dict], additional_params: dict = {}
+    ) -> list[dict]:
+        """
+        Asynchronously publish a batch of events to the event stack
+
+        Args:
+            event_name (str): The name of the SNS topic
+            messages_data (list[dict]): A list of dicts containing the message attributes.
+            additional_params (dict): A dict containing additional parameters to be sent for every entry. It is optional.
+
+        Returns:
+            list[dict]: One result per entry of messages_data, in the same order. See sync_publish_batch.
+        """
+        pass
+
+    def prepare(
+        self, event_name: str, message_data: dict, additional_params: dict = {}
+    ) -> PreparedMessage:
+        """
+        Prepare a message to be published with publish_prepared or publish_prepared_batch
+
+        Adapters that encode their requests override it, so the message is encoded once however
+        many times it is published. By default the prepared message holds message_data and
+        additional_params, published with sync_publish and sync_publish_batch.
+
+        Args:
+            event_name (str): The name of the SNS topic
+            message_data (dict): A dict containing the message attributes.
+            additional_params (dict): A dict containing additional parameters to be sent in the events stack call. It is optional.
+
+        Raises:
+            ValueError: If message is not present in message_data
+
+        Returns:
+            PreparedMessage: The prepared message
+        """
+        if "message" not in message_data:
+            raise ValueError("message is required in message_data")
+        return PreparedMessage(
+            event_name,
+            event_name,
+            {"message_data": message_data, "additional_params": additional_params},
+            self.get_payload_size(message_data),
+        )
+
+    def publish_prepared(self, prepared_message: PreparedMessage) -> None:
+        """
+        Synchronously publish a prepared message
+
+        Args:
+            prepared_message (PreparedMessage): A message prepared with prepare
+
+        Returns:
+            None
+        """
+        self.sync_publish(
+            prepared_message.event_name,
+            prepared_message.params["message_data"],
+            prepared_message.params["additional_params"],
+        )
+
+    async def async_publish_prepared(self, prepared_message: PreparedMessage) -> None:
+        """
+        Asynchronously publish a prepared message
+
+        Args:
+            prepared_message (PreparedMessage): A message prepared with prepare
+
+        Returns:
+            None
+        """
+        await self.async_publish(
+            prepared_message.event_name,
+            prepared_message.params["message_data"],
+            prepared_message.params["additional_params"],
+        )
+
+    def publish_prepared_batch(self, prepared_messages: list[PreparedMessage]) -> list[dict]:
+        """
+        Synchronously publish a batch of prepared messages of the same topic
+
+        Args:
+            prepared_messages (list[PreparedMessage]): Messages prepared with prepare
+
+        Raises:
+            ValueError: If the messages belong to different topics or were prepared with
+                different additional_params
+
+        Returns:
+            list[dict]: One result per prepared message, in the same order. See sync_publish_batch.
+        """
+        if not prepared_messages:
+            return []
+        event_name, messages_data, additional_params = self._unpack_batch(prepared_messages)
+        return self.sync_publish_batch(event_name, messages_data, additional_params)
+
+    async def async_publish_prepared_batch(
+        self, prepared_messages: list[PreparedMessage]
+    ) -> list[dict]:
+        """
+        Asynchronously publish a batch of prepared messages of the same topic
+
+        Args:
+            prepared_messages (list[PreparedMessage]): Messages prepared with prepare
+
+        Raises:
+            ValueError: If the messages belong to different topics or were prepared with
+                different additional_params
+
+        Returns:
+            list[dict]: One result per prepared message, in the same order. See sync_publish_batch.
+        """
+        if not prepared_messages:
+            return []
+        event_name, messages_data, additional_params = self._unpack_batch(prepared_messages)
+        return await self.async_publish_batch(event_name, messages_data, additional_params)
+
+    def get_payload_size(self, message_data: dict) -> int:
+        """
+        Get the size of a message once encoded, reported to instrumentation
+
+        Args:
+            message_data (dict): A dict containing the message attributes.
+
+        Returns:
+            int: The size in bytes of the message encoded as JSON
+        """
+        return len(json.dumps(message_data.get("message"), default=str).encode("utf-8"))
+
+    def _check_batch_destination(self, prepared_messages: list[PreparedMessage]) -> None:
+        if len({prepared.destination for prepared in prepared_messages}) > 1:
+            raise ValueError("prepared messages of a batch must belong to the same topic.")
+
+    def _unpack_batch(self, prepared_messages: list[PreparedMessage]) -> tuple:
+        self._check_batch_destination(prepared_messages)
+        additional_params = prepared_messages[0].params["additional_params"]
+        if any(
+            prepared.params["additional_params"] != additional_params
+            for prepared in prepared_messages
+        ):
+            raise ValueError("prepared messages of a batch must share their additional_params.")
+        return (
+            prepared_messages[0].event_name,
+            [prepared.params["message_data"] for prepared in prepared_messages],
+            additional_params,
+        )
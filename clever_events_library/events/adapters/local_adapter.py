@@ -0,0 +1,474 @@
+import uuid
+from typing import TYPE_CHECKING
+
+from ...local_broker import InMemoryBroker, LocalBroker, SQLiteBroker
+from ...queues.queue_message import QueueMessage
+from .event_base_adapter import EventBaseAdapter
+from .prepared_message import PreparedMessage
+
+if TYPE_CHECKING:
+    from ...queues.dispatcher import Dispatcher
+
+
+class LocalEventAdapter(EventBaseAdapter):
+    def __init__(self, broker: LocalBroker) -> None:
+        """
+        Initialize LocalEventAdapter with broker
+
+        Publishes events to a LocalBroker instead of SNS, so pipelines can be run and load tested
+        without AWS. Events are delivered to the queues subscribed to the topic with
+        broker.subscribe(event_name, queue_name).
+
+        Args:
+            broker (LocalBroker): The broker events are published to
+
+        Returns:
+            None
+        """
+        self.broker = broker
+
+    def sync_publish(
+        self, event_name: str, message_data: dict, additional_params: dict = {}
+    ) -> None:
+        """
+        Synchronously publish a message to the broker topic
+
+        Args:
+            event_name (str): The name of the topic
+            message_data (dict): A dict containing the message and message attributes. See SNSAdapter.
+            additional_params (dict): A dict containing additional parameters. Only MessageGroupId is used. It is optional.
+
+        Raises:
+            ValueError: If message is not present in message_data
+
+        Returns:
+            None
+        """
+        self.publish_prepared(self.prepare(event_name, message_data, additional_params))
+
+    async def async_publish(
+        self, event_name: str, message_data: dict, additional_params: dict = {}
+    ) -> None:
+        """
+        Asynchronously publish a message to the broker topic
+
+        Args:
+            event_name (str): The name of the topic
+            message_data (dict): A dict containing the message and message attributes. See SNSAdapter.
+            additional_params (dict): A dict containing additional parameters. Only MessageGroupId is used. It is optional.
+
+        Raises:
+            ValueError: If message is not present in message_data
+
+        Returns:
+            None
+        """
+        self.sync_publish(event_name, message_data, additional_params)
+
+    def sync_publish_batch(
+        self, event_name: str, messages_data: list[dict], additional_params: dict = {}
+    ) -> list[dict]:
+        """
+        Synchronously publish a batch of messages to the broker topic
+
+        Args:
+            event_name (str): The name of the topic
+            messages_data (list[dict]): A list of dicts with the same format as sync_publish message_data.
+            additional_params (dict): A dict containing additional parameters. Only MessageGroupId is used. It is optional.
+
+        Raises:
+            ValueError: If message is not present in any of the messages_data entries
+
+        Returns:
+            list[dict]: One result per entry of messages_data, in the same order
+        """
+        return self.publish_prepared_batch(
+            [
+                self.prepare(event_name, message_data, additional_params)
+                for message_data in messages_data
+            ]
+        )
+
+    async def async_publish_batch(
+        self, event_name: str, messages_data: list[dict], additional_params: dict = {}
+    ) -> list[dict]:
+        """
+        Asynchronously publish a batch of messages to the broker topic
+
+        Args:
+            event_name (str): The name of the topic
+            messages_data (list[dict]): A list of dicts with the same format as async_publish message_data.
+            additional_params (dict): A dict containing additional parameters. Only MessageGroupId is used. It is optional.
+
+        Raises:
+            ValueError: If message is not present in any of the messages_data entries
+
+        Returns:
+            list[dict]: One result per entry of messages_data, in the same order
+        """
+        return self.sync_publish_batch(event_name, messages_data, additional_params)
+
+    def prepare(
+        self, event_name: str, message_data: dict, additional_params: dict = {}
+    ) -> PreparedMessage:
+        """
+        Prepare a message to be published, with its attributes encoded as SNSAdapter does
+
+        Args:
+            event_name (str): The name of the topic
+            message_data (dict): A dict containing the message and message attributes. See SNSAdapter.
+            additional_params (dict): A dict containing additional parameters. Only MessageGroupId is used. It is optional.
+
+        Raises:
+            ValueError: If message is not present in message_data
+
+        Returns:
+            PreparedMessage: The prepared message
+        """
+        if "message" not in message_data:
+            raise ValueError("message is required in message_data")
+        message_attributes = {
+            key: {"DataType": "String", "StringValue": str(value)}
+            for key, value in message_data.get("message_attributes", {}).items()
+        }
+        params = {
+            "message": message_data["message"],
+            "message_attributes": message_attributes,
+            "message_group_id": message_data.get(
+                "message_group_id", additional_params.get("MessageGroupId")
+            ),
+        }
+        return PreparedMessage(event_name, event_name, params, self.get_payload_size(message_data))
+
+    def publish_prepared(self, prepared_message: PreparedMessage) -> None:
+        """
+        Publish a prepared message to the broker topic
+
+        Args:
+            prepared_message (PreparedMessage): A message prepared with prepare
+
+        Returns:
+            None
+        """
+        self.broker.publish(prepared_message.event_name, [self._get_message(prepared_message)])
+
+    async def async_publish_prepared(self, prepared_message: PreparedMessage) -> None:
+        """
+        Publish a prepared message to the broker topic
+
+        Args:
+            prepared_message (PreparedMessage): A message prepared with prepare
+
+        Returns:
+            None
+        """
+        self.publish_prepared(prepared_message)
+
+    def publish_prepared_batch(self, prepared_messages: list[PreparedMessage]) -> list[dict]:
+        """
+        Publish a batch of prepared messages to the broker topic
+
+        Args:
+            prepared_messages (list[PreparedMessage]): Messages of the same topic prepared with
+                prepare
+
+        Raises:
+            ValueError: If the messages belong to different topics
+
+        Returns:
+            list[dict]: One result per prepared message, in the same order
+        """
+        if not prepared_messages:
+            return []
+        self._check_batch_destination(prepared_messages)
+        message_ids = self.broker.publish(
+            prepared_messages[0].event_name,
+            [self._get_message(prepared) for prepared in prepared_messages],
+        )
+        return [
+            {
+                "index": index,
+                "success": True,
+                "message_id": message_id,
+                "error_code": None,
+                "error_message": None,
+                "sender_fault": False,
+            }
+            for index, message_id in enumerate(message_ids)
+        ]
+
+    async def async_publish_prepared_batch(
+        self, prepared_messages: list[PreparedMessage]
+    ) -> list[dict]:
+        """
+        Publish a batch of prepared messages to the broker topic
+
+        Args:
+            prepared_messages (list[PreparedMessage]): Messages of the same topic prepared with
+                prepare
+
+        Raises:
+            ValueError: If the messages belong to different topics
+
+        Returns:
+            list[dict]: One result per prepared message, in the same order
+        """
+        return self.publish_prepared_batch(prepared_messages)
+
+    def _get_message(self, prepared_message: PreparedMessage) -> tuple:
+        params = prepared_message.params
+        return params["message"], params["message_attributes"], params["message_group_id"]
+
+
+class InMemoryEventAdapter(LocalEventAdapter):
+    def __init__(self, broker: InMemoryBroker = None) -> None:
+        """
+        Initialize InMemoryEventAdapter with broker
+
+        Args:
+            broker (InMemoryBroker, optional): The broker events are published to. Share it with
+                InMemoryQueueAdapter to consume the events. A new one is created by default.
+
+        Returns:
+            None
+        """
+        super().__init__(broker or InMemoryBroker())
+
+
+class SQLiteEventAdapter(LocalEventAdapter):
+    def __init__(self, path: str) -> None:
+        """
+        Initialize SQLiteEventAdapter with path
+
+        Args:
+            path (str): The path of the SQLite database events are stored in. Use the same path in
+                SQLiteQueueAdapter to consume the events.
+
+        Returns:
+            None
+        """
+        super().__init__(SQLiteBroker(path))
+
+
+class DispatcherEventAdapter(EventBaseAdapter):
+    def __init__(self, dispatcher: "Dispatcher") -> None:
+        """
+        Initialize DispatcherEventAdapter with dispatcher
+
+        Short-circuits publishing in tests: published events are dispatched right away to the
+        handlers of dispatcher, in the calling thread, instead of going through a topic and a
+        queue. The event name is set in the dispatcher event_name_attribute message attribute,
+        and message attributes are sent as strings, as SNSAdapter does by default.
+
+        Args:
+            dispatcher (Dispatcher): The dispatcher events are dispatched to
+
+        Returns:
+            None
+        """
+        self.dispatcher = dispatcher
+
+    def sync_publish(
+        self, event_name: str, message_data: dict, additional_params: dict = {}
+    ) -> None:
+        """
+        Dispatch a message to the dispatcher handlers
+
+        Args:
+            event_name (str): The name of the topic
+            message_data (dict): A dict containing the message and message attributes. See SNSAdapter.
+            additional_params (dict): A dict containing additional parameters. Not used. It is optional.
+
+        Raises:
+            ValueError: If message is not present in message_data
+            Exception: The first error raised by the handlers
+
+        Returns:
+            None
+        """
+        self.publish_prepared(self.prepare(event_name, message_data, additional_params))
+
+    async def async_publish(
+        self, event_name: str, message_data: dict, additional_params: dict = {}
+    ) -> None:
+        """
+        Dispatch a message to the dispatcher handlers
+
+        Args:
+            event_name (str): The name of the topic
+            message_data (dict): A dict containing the message and message attributes. See SNSAdapter.
+            additional_params (dict): A dict containing additional parameters. Not used. It is optional.
+
+        Raises:
+            ValueError: If message is not present in message_data
+            Exception: The first error raised by the handlers
+
+        Returns:
+            None
+        """
+        self.sync_publish(event_name, message_data, additional_params)
+
+    def sync_publish_batch(
+        self, event_name: str, messages_data: list[dict], additional_params: dict = {}
+    ) -> list[dict]:
+        """
+        Dispatch a batch of messages to the dispatcher handlers
+
+        Args:
+            event_name (str): The name of the topic
+            messages_data (list[dict]): A list of dicts with the same format as sync_publish message_data.
+            additional_params (dict): A dict containing additional parameters. Not used. It is optional.
+
+        Raises:
+            ValueError: If message is not present in any of the messages_data entries
+
+        Returns:
+            list[dict]: One result per entry of messages_data, in the same order. Entries whose
+                handlers raised are failed, with the error class name as error_code.
+        """
+        return self.publish_prepared_batch(
+            [
+                self.prepare(event_name, message_data, additional_params)
+                for message_data in messages_data
+            ]
+        )
+
+    async def async_publish_batch(
+        self, event_name: str, messages_data: list[dict], additional_params: dict = {}
+    ) -> list[dict]:
+        """
+        Dispatch a batch of messages to the dispatcher handlers
+
+        Args:
+            event_name (str): The name of the topic
+            messages_data (list[dict]): A list of dicts with the same format as sync_publish message_data.
+            additional_params (dict): A dict containing additional parameters. Not used. It is optional.
+
+        Raises:
+            ValueError: If message is not present in any of the messages_data entries
+
+        Returns:
+            list[dict]: One result per entry of messages_data, in the same order
+        """
+        return self.sync_publish_batch(event_name, messages_data, additional_params)
+
+    def prepare(
+        self, event_name: str, message_data: dict, additional_params: dict = {}
+    ) -> PreparedMessage:
+        """
+        Prepare a message to be dispatched, with its attributes encoded as SNSAdapter does
+
+        Args:
+            event_name (str): The name of the topic
+            message_data (dict): A dict containing the message and message attributes. See SNSAdapter.
+            additional_params (dict): A dict containing additional parameters. Not used. It is optional.
+
+        Raises:
+            ValueError: If message is not present in message_data
+
+        Returns:
+            PreparedMessage: The prepared message
+        """
+        if "message" not in message_data:
+            raise ValueError("message is required in message_data")
+        message_attributes = {
+            key: {"DataType": "String", "StringValue": str(value)}
+            for key, value in message_data.get("message_attributes", {}).items()
+        }
+        message_attributes.setdefault(
+            self.dispatcher.event_name_attribute, {"DataType": "String", "StringValue": event_name}
+        )
+        params = {
+            "message": message_data["message"],
+            "message_attributes": message_attributes,
+            "message_group_id": message_data.get("message_group_id"),
+        }
+        return PreparedMessage(event_name, event_name, params, self.get_payload_size(message_data))
+
+    def publish_prepared(self, prepared_message: PreparedMessage) -> None:
+        """
+        Dispatch a prepared message to the dispatcher handlers
+
+        Args:
+            prepared_message (PreparedMessage): A message prepared with prepare
+
+        Raises:
+            Exception: The first error raised by the handlers
+
+        Returns:
+            None
+        """
+        self.dispatcher.dispatch(self._get_message(prepared_message))
+
+    async def async_publish_prepared(self, prepared_message: PreparedMessage) -> None:
+        """
+        Dispatch a prepared message to the dispatcher handlers
+
+        Args:
+            prepared_message (PreparedMessage): A message prepared with prepare
+
+        Raises:
+            Exception: The first error raised by the handlers
+
+        Returns:
+            None
+        """
+        self.publish_prepared(prepared_message)
+
+    def publish_prepared_batch(self, prepared_messages: list[PreparedMessage]) -> list[dict]:
+        """
+        Dispatch a batch of prepared messages to the dispatcher handlers
+
+        Args:
+            prepared_messages (list[PreparedMessage]): Messages of the same topic prepared with
+                prepare
+
+        Raises:
+            ValueError: If the messages belong to different topics
+
+        Returns:
+            list[dict]: One result per prepared message, in the same order. Entries whose
+                handlers raised are failed, with the error class name as error_code.
+        """
+        self._check_batch_destination(prepared_messages)
+        messages = [self._get_message(prepared) for prepared in prepared_messages]
+        return [
+            {
+                "index": result["index"],
+                "success": result["success"],
+                "message_id": messages[result["index"]]["message_id"],
+                "error_code": None if result["success"] else type(result["error"]).__name__,
+                "error_message": None if result["success"] else str(result["error"]),
+                "sender_fault": False,
+            }
+            for result in self.dispatcher.dispatch_batch(messages)
+        ]
+
+    async def async_publish_prepared_batch(
+        self, prepared_messages: list[PreparedMessage]
+    ) -> list[dict]:
+        """
+        Dispatch a batch of prepared messages to the dispatcher handlers
+
+        Args:
+            prepared_messages (list[PreparedMessage]): Messages of the same topic prepared with
+                prepare
+
+        Raises:
+            ValueError: If the messages belong to different topics
+
+        Returns:
+            list[dict]: One result per prepared message, in the same order
+        """
+        return self.publish_prepared_batch(prepared_messages)
+
+    def _get_message(self, prepared_message: PreparedMessage) -> QueueMessage:
+        params = prepared_message.params
+        # A new message per dispatch, as a message published twice is delivered twice
+        return QueueMessage(
+            str(uuid.uuid4()),
+            None,
+            params["message"],
+            params["message_attributes"],
+            message_group_id=params["message_group_id"],
+        )
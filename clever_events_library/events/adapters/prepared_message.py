@@ -0,0 +1,40 @@
+class PreparedMessage:
+    """
+    A message turned into the request of an events stack call, ready to be sent
+
+    Built by the prepare method of event adapters, which validates message_data, resolves the
+    destination and encodes the message once: SNSAdapter encodes the body and attributes,
+    applies FIFO partitioning and claim check and measures the encoded size. Prepared messages
+    hold no connection state, so the same one can be published from sync or async code, alone
+    or in batches, and retried, without being encoded again.
+
+    Keep and reuse the prepared message of an event that is published repeatedly with the same
+    content, e.g. with EventPublisher.prepare and a cache_key. On FIFO topics its
+    MessageDeduplicationId is reused too, so SNS drops repeats sent within the deduplication
+    interval.
+    """
+
+    __slots__ = ("event_name", "destination", "params", "size")
+
+    def __init__(self, event_name: str, destination: str, params: dict, size: int) -> None:
+        """
+        Initialize PreparedMessage
+
+        Args:
+            event_name (str): The name of the topic
+            destination (str): The resource the message is sent to, e.g. the ARN of the SNS
+                topic. Messages published in the same batch must share it.
+            params (dict): The request of the adapter, e.g. the parameters of the SNS Publish
+                call, Message and MessageAttributes included, without the topic
+            size (int): The size in bytes of the encoded message, reported to instrumentation
+
+        Returns:
+            None
+        """
+        self.event_name = event_name
+        self.destination = destination
+        self.params = params
+        self.size = size
+
+    def __repr__(self) -> str:
+        return f"PreparedMessage(event_name={self.event_name!r}, size={self.size!r})"
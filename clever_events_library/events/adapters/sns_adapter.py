@@ -1,14 +1,45 @@
+import asyncio
 import json
+import threading
+import time
+from collections.abc import Awaitable, Callable, Generator, Iterator
 
 import boto3
 from aioboto3.session import Session
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 
-from ...mixins import AwsHelperMixin
+from ...claim_check import CLAIM_CHECK_ATTRIBUTE, BlobStore
+from ...message_attributes import AttributeEncoder
+from ...message_codec import CODEC_ATTRIBUTE, DEFAULT_CODEC, MessageCodec, get_codec
+from ...mixins import AsyncClientMixin, AwsHelperMixin
+from ...rate_limiter import RateLimiter
+from ...retry import RetryPolicy
+from ..fifo_partitioner import FifoPartitioner
 from . import EventBaseAdapter
+from .prepared_message import PreparedMessage
 
+SNS_PUBLISH_BATCH_MAX_ENTRIES = 10
+SNS_MAX_PAYLOAD_SIZE = 262144
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_TIMEOUT = 15
 
-class SNSAdapter(AwsHelperMixin, EventBaseAdapter):
-    def __init__(self, client_config: dict = {}) -> None:
+
+class SNSAdapter(AwsHelperMixin, AsyncClientMixin, EventBaseAdapter):
+    def __init__(
+        self,
+        client_config: dict = {},
+        max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        codec: MessageCodec | str = DEFAULT_CODEC,
+        claim_check_store: BlobStore = None,
+        claim_check_threshold: int = SNS_MAX_PAYLOAD_SIZE,
+        retry_policy: RetryPolicy = None,
+        rate_limiter: RateLimiter = None,
+        typed_attributes: bool = False,
+        attribute_schemas: dict[str, dict] = {},
+        fifo_partitioners: dict[str, FifoPartitioner] = {},
+    ) -> None:
         """
         Initialize SNSAdapter with client_config
 
@@ -21,24 +52,125 @@ class SNSAdapter(AwsHelperMixin, EventBaseAdapter):
                 - aws_secret: AWS secret key
             If not provided, values will be fetched from environment variables.
             Defaults to {}.
+            max_pool_connections (int, optional): Highest number of connections kept by the sync
+                and async client pools, i.e. of concurrent publishes. Defaults to 10.
+            keepalive_timeout (float, optional): Seconds an idle async connection is kept open for
+                reuse. Defaults to 15.
+            codec (MessageCodec | str, optional): The codec used to encode messages, e.g. orjson,
+                msgpack or json+zlib. The codec name is sent in the clever_events_codec message
+                attribute so consumers decode messages automatically. Defaults to json.
+            claim_check_store (BlobStore, optional): When provided, messages bigger than
+                claim_check_threshold are written to this store and a pointer to them is published
+                instead, in the clever_events_claim_check message attribute. Defaults to None.
+            claim_check_threshold (int, optional): Size in bytes of the message and its attributes
+                above which messages are offloaded to claim_check_store. Defaults to 262144.
+            retry_policy (RetryPolicy, optional): When provided, throttled and transiently failed
+                publishes (and failed batch entries) are retried with exponential backoff and
+                jitter instead of botocore retries. Defaults to None, botocore default retries.
+            rate_limiter (RateLimiter, optional): When provided, publishes wait for one token per
+                message of the topic bucket, retries included. Defaults to None.
+            typed_attributes (bool, optional): Send message attributes with typed data types
+                (Number, Binary, String.Array, String.Boolean) instead of stringifying every value
+                as String, see AttributeEncoder. Defaults to False.
+            attribute_schemas (dict[str, dict], optional): Maps topic names to the data type of
+                their attributes, e.g. {"user_created": {"user_id": "Number"}}. The encoder of
+                every schema is built once and reused by every publish to the topic, which
+                always sends typed attributes. Defaults to {}.
+            fifo_partitioners (dict[str, FifoPartitioner], optional): Maps FIFO topic names to the
+                FifoPartitioner deriving the MessageGroupId and MessageDeduplicationId of their
+                messages. Defaults to {}.
+
+        The sync client is created on first sync call and can be shared by many threads. The async
+        client is created on first async call and shared by every async call made from the same
+        event loop. Close it with `await adapter.aclose()` or use the adapter as an async
+        context manager (`async with SNSAdapter(...) as adapter:`).
 
         Returns:
             None
         """
         self.aws_client_params = self._get_aws_client_params(client_config)
         self._sns_client = None
+        self._sns_client_lock = threading.Lock()
+        self._init_async_client(max_pool_connections, keepalive_timeout)
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self._attribute_encoder = AttributeEncoder() if typed_attributes else None
+        self._attribute_encoders = {
+            event_name: AttributeEncoder(schema)
+            for event_name, schema in attribute_schemas.items()
+        }
+        self._fifo_partitioners = dict(fifo_partitioners)
+        self.codec = get_codec(codec)
+        self.claim_check_store = claim_check_store
+        self.claim_check_threshold = claim_check_threshold
 
     @property
     def sns_client(self) -> boto3.client:
         if not self._sns_client:
-            self._sns_client = boto3.client(
-                "sns",
-                region_name=self.aws_client_params["aws_region"],
-                aws_access_key_id=self.aws_client_params["aws_key"],
-                aws_secret_access_key=self.aws_client_params["aws_secret"],
-            )
+            # boto3 clients are thread safe, but creating them from the default session is not
+            with self._sns_client_lock:
+                if not self._sns_client:
+                    self._sns_client = boto3.client(
+                        "sns",
+                        region_name=self.aws_client_params["aws_region"],
+                        aws_access_key_id=self.aws_client_params["aws_key"],
+                        aws_secret_access_key=self.aws_client_params["aws_secret"],
+                        config=self._get_client_config(),
+                    )
         return self._sns_client
 
+    def _get_client_config(self) -> Config:
+        if self.retry_policy is None:
+            return Config(max_pool_connections=self._max_pool_connections)
+        # Retries are made by retry_policy, botocore ones would multiply them
+        return Config(
+            max_pool_connections=self._max_pool_connections,
+            retries={"mode": "standard", "total_max_attempts": 1},
+        )
+
+    def _get_async_client_context(self):
+        config = self._get_async_client_config()
+        if self.retry_policy is not None:
+            config = config.merge(Config(retries={"mode": "standard", "total_max_attempts": 1}))
+        return Session().client(
+            "sns",
+            region_name=self.aws_client_params["aws_region"],
+            aws_access_key_id=self.aws_client_params["aws_key"],
+            aws_secret_access_key=self.aws_client_params["aws_secret"],
+            config=config,
+        )
+
+    def prepare(
+        self, event_name: str, message_data: dict, additional_params: dict = {}
+    ) -> PreparedMessage:
+        """
+        Prepare a message to be published, see PreparedMessage
+
+        Every publish method prepares its messages with this method and sends them with the sync
+        or async client. Call it directly to publish the same message many times, or to
+        prepare messages ahead of time, with publish_prepared and publish_prepared_batch.
+
+        Args:
+            event_name (str): The name of the SNS topic
+            message_data (dict): A dict with the same format as sync_publish message_data.
+            additional_params (dict): A dict containing additional parameters. It is optional.
+
+        Raises:
+            ValueError: If message is not present in message_data
+
+        Returns:
+            PreparedMessage: The prepared message
+        """
+        params = self._prepare_message_params(message_data, event_name)
+        if additional_params:
+            params.update(additional_params)
+        return PreparedMessage(
+            event_name,
+            self._get_topic_arn(service="sns", topic_name=event_name),
+            params,
+            self._get_entry_size(params),
+        )
+
     def sync_publish(
         self, event_name: str, message_data: dict, additional_params: dict = {}
     ) -> None:
@@ -51,6 +183,8 @@ class SNSAdapter(AwsHelperMixin, EventBaseAdapter):
                 keys:
                 - message: The message to be published
                 - message_attributes: A dict containing the message attributes. It is optional.
+                - message_group_id: The MessageGroupId of FIFO topics. It is optional.
+                - message_deduplication_id: The MessageDeduplicationId of FIFO topics. It is optional.
             additional_params: A dict containing additional parameters. It is optional.
 
         Raises:
@@ -59,16 +193,7 @@ class SNSAdapter(AwsHelperMixin, EventBaseAdapter):
         Returns:
             None
         """
-        if "message" not in message_data:
-            raise ValueError("message is required in message_data")
-        message_attributes = message_data.get("message_attributes", {})
-        self.sns_client.publish(
-            TargetArn=self._get_topic_arn(service="sns", topic_name=event_name),
-            Message=json.dumps({"default": json.dumps(message_data["message"])}),
-            MessageStructure="json",
-            MessageAttributes=self._prepare_message_attributes(message_attributes),
-            **additional_params
-        )
+        self.publish_prepared(self.prepare(event_name, message_data, additional_params))
 
     async def async_publish(
         self, event_name: str, message_data: dict, additional_params: dict = {}
@@ -82,6 +207,8 @@ class SNSAdapter(AwsHelperMixin, EventBaseAdapter):
                 keys:
                 - message: The message to be published
                 - message_attributes: A dict containing the message attributes. It is optional.
+                - message_group_id: The MessageGroupId of FIFO topics. It is optional.
+                - message_deduplication_id: The MessageDeduplicationId of FIFO topics. It is optional.
             additional_params (dict): A dict containing additional parameters. It is optional.
 
         Raises:
@@ -90,26 +217,369 @@ class SNSAdapter(AwsHelperMixin, EventBaseAdapter):
         Returns:
             None
         """
+        await self.async_publish_prepared(
+            self.prepare(event_name, message_data, additional_params)
+        )
+
+    def sync_publish_batch(
+        self, event_name: str, messages_data: list[dict], additional_params: dict = {}
+    ) -> list[dict]:
+        """
+        Synchronously publish a batch of messages to the SNS topic using PublishBatch
+
+        Messages are sent in chunks of up to 10 entries, keeping every request under the
+        256 KB SNS payload limit.
+
+        Args:
+            event_name (str): The name of the SNS topic
+            messages_data (list[dict]): A list of dicts with the same format as sync_publish message_data.
+            additional_params (dict): A dict containing additional parameters added to every entry. It is optional.
+
+        Raises:
+            ValueError: If message is not present in any of the messages_data entries
+
+        Returns:
+            list[dict]: One result per entry of messages_data, in the same order
+        """
+        return self.publish_prepared_batch(
+            [
+                self.prepare(event_name, message_data, additional_params)
+                for message_data in messages_data
+            ]
+        )
+
+    async def async_publish_batch(
+        self, event_name: str, messages_data: list[dict], additional_params: dict = {}
+    ) -> list[dict]:
+        """
+        Asynchronously publish a batch of messages to the SNS topic using PublishBatch
+
+        Messages are sent in chunks of up to 10 entries, keeping every request under the
+        256 KB SNS payload limit.
+
+        Args:
+            event_name (str): The name of the SNS topic
+            messages_data (list[dict]): A list of dicts with the same format as async_publish message_data.
+            additional_params (dict): A dict containing additional parameters added to every entry. It is optional.
+
+        Raises:
+            ValueError: If message is not present in any of the messages_data entries
+
+        Returns:
+            list[dict]: One result per entry of messages_data, in the same order
+        """
+        return await self.async_publish_prepared_batch(
+            [
+                self.prepare(event_name, message_data, additional_params)
+                for message_data in messages_data
+            ]
+        )
+
+    def publish_prepared(self, prepared_message: PreparedMessage) -> None:
+        """
+        Synchronously publish a prepared message
+
+        Args:
+            prepared_message (PreparedMessage): A message prepared with prepare
+
+        Returns:
+            None
+        """
+        self._call(
+            "publish",
+            prepared_message.event_name,
+            1,
+            lambda: self.sns_client.publish(
+                TargetArn=prepared_message.destination, **prepared_message.params
+            ),
+        )
+
+    async def async_publish_prepared(self, prepared_message: PreparedMessage) -> None:
+        """
+        Asynchronously publish a prepared message
+
+        Args:
+            prepared_message (PreparedMessage): A message prepared with prepare
+
+        Returns:
+            None
+        """
+        client = await self._get_async_client()
+        await self._async_call(
+            "publish",
+            prepared_message.event_name,
+            1,
+            lambda: client.publish(
+                TargetArn=prepared_message.destination, **prepared_message.params
+            ),
+        )
+
+    def publish_prepared_batch(self, prepared_messages: list[PreparedMessage]) -> list[dict]:
+        """
+        Synchronously publish prepared messages of a topic using PublishBatch
+
+        Args:
+            prepared_messages (list[PreparedMessage]): Messages of the same topic prepared with
+                prepare
+
+        Raises:
+            ValueError: If the messages belong to different topics
+
+        Returns:
+            list[dict]: One result per prepared message, in the same order, see sync_publish_batch
+        """
+        results = {}
+        plan = self._plan_batch(prepared_messages, results)
+        request = next(plan, None)
+        while request is not None:
+            event_name, topic_arn, chunk, delay = request
+            if delay:
+                time.sleep(delay)
+            try:
+                response = self._call(
+                    "publish_batch",
+                    event_name,
+                    len(chunk),
+                    lambda: self.sns_client.publish_batch(
+                        TopicArn=topic_arn, PublishBatchRequestEntries=chunk
+                    ),
+                )
+            except (BotoCoreError, ClientError) as error:
+                response = error
+            request = self._advance_plan(plan, response)
+        return [results[index] for index in range(len(prepared_messages))]
+
+    async def async_publish_prepared_batch(
+        self, prepared_messages: list[PreparedMessage]
+    ) -> list[dict]:
+        """
+        Asynchronously publish prepared messages of a topic using PublishBatch
+
+        Args:
+            prepared_messages (list[PreparedMessage]): Messages of the same topic prepared with
+                prepare
+
+        Raises:
+            ValueError: If the messages belong to different topics
+
+        Returns:
+            list[dict]: One result per prepared message, in the same order, see sync_publish_batch
+        """
+        results = {}
+        plan = self._plan_batch(prepared_messages, results)
+        request = next(plan, None)
+        if request is not None:
+            client = await self._get_async_client()
+        while request is not None:
+            event_name, topic_arn, chunk, delay = request
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                response = await self._async_call(
+                    "publish_batch",
+                    event_name,
+                    len(chunk),
+                    lambda: client.publish_batch(
+                        TopicArn=topic_arn, PublishBatchRequestEntries=chunk
+                    ),
+                )
+            except (BotoCoreError, ClientError) as error:
+                response = error
+            request = self._advance_plan(plan, response)
+        return [results[index] for index in range(len(prepared_messages))]
+
+    def _plan_batch(self, prepared_messages: list[PreparedMessage], results: dict) -> Generator:
+        # Chunking, oversized entries and retries of failed entries are decided here, once for
+        # both clients: every PublishBatch request is yielded with the delay to wait before
+        # sending it, and its response, or the error it raised, is sent back
+        self._check_batch_destination(prepared_messages)
+        entries = []
+        for index, prepared in enumerate(prepared_messages):
+            if prepared.size > SNS_MAX_PAYLOAD_SIZE:
+                results[index] = self._get_entry_result(
+                    str(index),
+                    error_code="PayloadTooLarge",
+                    error_message=f"Entry exceeds the {SNS_MAX_PAYLOAD_SIZE} bytes limit",
+                    sender_fault=True,
+                )
+            else:
+                entries.append(({"Id": str(index), **prepared.params}, prepared.size))
+        if not entries:
+            return
+        event_name, topic_arn = prepared_messages[0].event_name, prepared_messages[0].destination
+        for chunk in self._chunk_batch_entries(entries):
+            attempt, delay = 0, 0
+            while chunk:
+                response = yield event_name, topic_arn, chunk, delay
+                if isinstance(response, Exception):
+                    results.update(self._get_failed_chunk_results(chunk, response))
+                    break
+                results.update(self._get_batch_response_results(response))
+                attempt += 1
+                chunk = self._get_retryable_entries(event_name, chunk, response, attempt)
+                if chunk:
+                    delay = self.retry_policy.get_delay(attempt)
+
+    def _advance_plan(self, plan: Generator, response) -> tuple:
+        try:
+            return plan.send(response)
+        except StopIteration:
+            return None
+
+    def _call(self, operation: str, event_name: str, tokens: int, func: Callable[[], object]):
+        def attempt():
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(event_name, tokens)
+            return func()
+
+        if self.retry_policy is None:
+            return attempt()
+        return self.retry_policy.call(operation, event_name, attempt)
+
+    async def _async_call(
+        self, operation: str, event_name: str, tokens: int, func: Callable[[], Awaitable]
+    ):
+        async def attempt():
+            if self.rate_limiter is not None:
+                await self.rate_limiter.async_acquire(event_name, tokens)
+            return await func()
+
+        if self.retry_policy is None:
+            return await attempt()
+        return await self.retry_policy.async_call(operation, event_name, attempt)
+
+    def _get_retryable_entries(
+        self, event_name: str, chunk: list, response: dict, attempt: int
+    ) -> list:
+        if self.retry_policy is None or attempt >= self.retry_policy.max_attempts:
+            return []
+        failed_ids = {
+            failed["Id"]
+            for failed in response.get("Failed", [])
+            if self.retry_policy.is_retryable_code(failed.get("Code"))
+        }
+        if failed_ids:
+            self.retry_policy.record_retry("publish_batch", event_name, attempt)
+        return [entry for entry in chunk if entry["Id"] in failed_ids]
+
+    def get_payload_size(self, message_data: dict) -> int:
+        """
+        Get the size of a message once encoded with the adapter codec, reported to instrumentation
+
+        Args:
+            message_data (dict): A dict with the same format as sync_publish message_data.
+
+        Returns:
+            int: The size in bytes of the encoded message
+        """
+        return len(self.codec.encode(message_data.get("message")).encode("utf-8"))
+
+    def _prepare_message_params(self, message_data: dict, event_name: str = None) -> dict:
         if "message" not in message_data:
             raise ValueError("message is required in message_data")
-        message_attributes = message_data.get("message_attributes", {})
+        message_params = {}
+        partitioner = self._fifo_partitioners.get(event_name)
+        if partitioner is not None:
+            message_data = partitioner.partition(message_data)
+        if "message_group_id" in message_data:
+            message_params["MessageGroupId"] = message_data["message_group_id"]
+        if "message_deduplication_id" in message_data:
+            message_params["MessageDeduplicationId"] = message_data["message_deduplication_id"]
+        message_attributes = self._prepare_message_attributes(
+            message_data.get("message_attributes", {}), event_name
+        )
+        body = self.codec.encode(message_data["message"])
+        if self.codec.name != DEFAULT_CODEC:
+            message_attributes[CODEC_ATTRIBUTE] = {
+                "DataType": "String",
+                "StringValue": self.codec.name,
+            }
+        if self.claim_check_store is not None:
+            body = self._apply_claim_check(body, message_attributes)
+        # Sent as is rather than wrapped in a MessageStructure json envelope, which delivers the
+        # same message but encodes the body twice and inflates its size with escapes
+        return {"Message": body, "MessageAttributes": message_attributes, **message_params}
 
-        session = Session()
-        async with session.client(
-            "sns",
-            region_name=self.aws_client_params["aws_region"],
-            aws_access_key_id=self.aws_client_params["aws_key"],
-            aws_secret_access_key=self.aws_client_params["aws_secret"],
-        ) as client:
-            await client.publish(
-                TargetArn=self._get_topic_arn(service="sns", topic_name=event_name),
-                Message=json.dumps({"default": json.dumps(message_data["message"])}),
-                MessageStructure="json",
-                MessageAttributes=self._prepare_message_attributes(message_attributes),
-                **additional_params
+    def _apply_claim_check(self, body: str, message_attributes: dict) -> str:
+        size = self._get_entry_size({"Message": body, "MessageAttributes": message_attributes})
+        if size <= self.claim_check_threshold:
+            return body
+        location = self.claim_check_store.put(body.encode("utf-8"))
+        message_attributes[CLAIM_CHECK_ATTRIBUTE] = {"DataType": "String", "StringValue": location}
+        return json.dumps({CLAIM_CHECK_ATTRIBUTE: location})
+
+    def _get_entry_size(self, entry: dict) -> int:
+        size = len(entry["Message"].encode("utf-8"))
+        for name, attribute in entry["MessageAttributes"].items():
+            size += len(name.encode("utf-8")) + len(attribute["DataType"].encode("utf-8"))
+            if "BinaryValue" in attribute:
+                size += len(attribute["BinaryValue"])
+            else:
+                size += len(attribute["StringValue"].encode("utf-8"))
+        return size
+
+    def _chunk_batch_entries(self, entries: list[tuple[dict, int]]) -> Iterator[list]:
+        chunk, chunk_size = [], 0
+        for entry, entry_size in entries:
+            if chunk and (
+                len(chunk) == SNS_PUBLISH_BATCH_MAX_ENTRIES
+                or chunk_size + entry_size > SNS_MAX_PAYLOAD_SIZE
+            ):
+                yield chunk
+                chunk, chunk_size = [], 0
+            chunk.append(entry)
+            chunk_size += entry_size
+        if chunk:
+            yield chunk
+
+    def _get_batch_response_results(self, response: dict) -> dict:
+        results = {}
+        for successful in response.get("Successful", []):
+            results[int(successful["Id"])] = self._get_entry_result(
+                successful["Id"], success=True, message_id=successful.get("MessageId")
+            )
+        for failed in response.get("Failed", []):
+            results[int(failed["Id"])] = self._get_entry_result(
+                failed["Id"],
+                error_code=failed.get("Code", "UnknownError"),
+                error_message=failed.get("Message"),
+                sender_fault=failed.get("SenderFault", False),
             )
+        return results
+
+    def _get_failed_chunk_results(self, chunk: list, error: Exception) -> dict:
+        error_code = type(error).__name__
+        if isinstance(error, ClientError):
+            error_code = error.response.get("Error", {}).get("Code", error_code)
+        return {
+            int(entry["Id"]): self._get_entry_result(
+                entry["Id"], error_code=error_code, error_message=str(error)
+            )
+            for entry in chunk
+        }
+
+    def _get_entry_result(
+        self,
+        entry_id: str,
+        success: bool = False,
+        message_id: str = None,
+        error_code: str = None,
+        error_message: str = None,
+        sender_fault: bool = False,
+    ) -> dict:
+        return {
+            "index": int(entry_id),
+            "success": success,
+            "message_id": message_id,
+            "error_code": error_code,
+            "error_message": error_message,
+            "sender_fault": sender_fault,
+        }
 
-    def _prepare_message_attributes(self, attributes: dict) -> dict:
+    def _prepare_message_attributes(self, attributes: dict, event_name: str = None) -> dict:
+        encoder = self._attribute_encoders.get(event_name, self._attribute_encoder)
+        if encoder is not None:
+            return encoder.encode(attributes)
         message_attributes = {}
         for key, value in attributes.items():
             value_key = "StringValue"
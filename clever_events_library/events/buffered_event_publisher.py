@@ -0,0 +1,261 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+from .adapters import EventBaseAdapter
+
+logger = logging.getLogger(__name__)
+
+BACKPRESSURE_BLOCK = "block"
+BACKPRESSURE_DROP_OLDEST = "drop_oldest"
+BACKPRESSURE_RAISE = "raise"
+BACKPRESSURE_STRATEGIES = (BACKPRESSURE_BLOCK, BACKPRESSURE_DROP_OLDEST, BACKPRESSURE_RAISE)
+
+
+class BufferedEventPublisher:
+    def __init__(
+        self,
+        event_adapter: EventBaseAdapter,
+        max_queue_size: int = 10000,
+        batch_size: int = 10,
+        flush_interval: float = 0.5,
+        backpressure: str = BACKPRESSURE_BLOCK,
+        on_failure: Callable[[dict, dict], None] = None,
+    ) -> None:
+        """
+        Initialize BufferedEventPublisher with event_adapter
+
+        Events are accepted into a bounded in-memory queue and published in batches from a
+        background thread, either when batch_size events are queued or when the oldest queued
+        event has waited flush_interval seconds.
+
+        Args:
+            event_adapter (EventBaseAdapter): An instance of EventBaseAdapter
+            max_queue_size (int, optional): Highest number of events held in memory. Defaults to 10000.
+            batch_size (int, optional): Number of queued events that triggers a flush. Defaults to 10.
+            flush_interval (float, optional): Seconds an event can wait before being flushed. Defaults to 0.5.
+            backpressure (str, optional): What to do when the queue is full:
+                - block: wait until there is room in the queue
+                - drop_oldest: discard the oldest queued event
+                - raise: raise queue.Full
+                Defaults to block.
+            on_failure (Callable, optional): Called with the event dict (event_name, message_data,
+                additional_params) and the failed entry result for every event that could not be
+                published. Failures are logged when not provided.
+
+        Raises:
+            ValueError: If any of the arguments is not valid
+
+        Returns:
+            None
+        """
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be a positive integer.")
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be a positive number.")
+        if backpressure not in BACKPRESSURE_STRATEGIES:
+            raise ValueError(f"backpressure must be one of {', '.join(BACKPRESSURE_STRATEGIES)}.")
+
+        self.event_adapter = event_adapter
+        self._max_queue_size = max_queue_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._backpressure = backpressure
+        self._on_failure = on_failure
+
+        self._buffer = deque()
+        self._condition = threading.Condition()
+        self._enqueued_count = 0
+        self._processed_count = 0
+        self._flush_requested = False
+        self._closed = False
+        self._worker = threading.Thread(
+            target=self._run, name="BufferedEventPublisher", daemon=True
+        )
+        self._worker.start()
+
+    def sync_publish(
+        self,
+        event_name: str,
+        message_data: dict,
+        additional_params: dict = {},
+        timeout: float = None,
+    ) -> None:
+        """
+        Queue an event to be published by the background thread
+
+        Args:
+            event_name (str): The name of the SNS topic
+            message_data (dict): A dict containing the message attributes.
+            additional_params (dict): A dict containing additional parameters to be sent in the events stack call. It is optional.
+            timeout (float, optional): Seconds to wait for room in the queue when backpressure is
+                block. Waits forever by default.
+
+        Raises:
+            ValueError: If message is not present in message_data
+            RuntimeError: If the publisher is closed
+            queue.Full: If the queue is full and backpressure is raise, or timeout expired
+
+        Returns:
+            None
+        """
+        # Validated here, as a malformed event would fail the whole batch it is published in
+        if "message" not in message_data:
+            raise ValueError("message is required in message_data")
+        event = {
+            "event_name": event_name,
+            "message_data": message_data,
+            "additional_params": additional_params,
+            "queued_at": time.monotonic(),
+        }
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("BufferedEventPublisher is closed")
+            if len(self._buffer) >= self._max_queue_size:
+                self._apply_backpressure(timeout)
+            self._buffer.append(event)
+            self._enqueued_count += 1
+            self._condition.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Block until every event queued before this call has been published
+
+        Args:
+            timeout (float, optional): Highest number of seconds to wait. Waits forever by default.
+
+        Returns:
+            bool: True if every event was processed, False if timeout expired first
+        """
+        with self._condition:
+            target = self._enqueued_count
+            self._flush_requested = True
+            self._condition.notify_all()
+            self._condition.wait_for(
+                lambda: self._processed_count >= target or not self._worker.is_alive(),
+                timeout=timeout,
+            )
+            return self._processed_count >= target
+
+    def close(self, timeout: float = None) -> None:
+        """
+        Stop accepting events, publish the queued ones and stop the background thread
+
+        Args:
+            timeout (float, optional): Highest number of seconds to wait. Waits forever by default.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _apply_backpressure(self, timeout: float) -> None:
+        if self._backpressure == BACKPRESSURE_RAISE:
+            raise queue.Full("BufferedEventPublisher queue is full")
+        if self._backpressure == BACKPRESSURE_DROP_OLDEST:
+            dropped = self._buffer.popleft()
+            self._processed_count += 1
+            logger.warning("Dropped queued event for %s, queue is full", dropped["event_name"])
+            return
+        if not self._condition.wait_for(
+            lambda: len(self._buffer) < self._max_queue_size or self._closed, timeout=timeout
+        ):
+            raise queue.Full("BufferedEventPublisher queue is full")
+        if self._closed:
+            raise RuntimeError("BufferedEventPublisher is closed")
+
+    def _is_flush_due(self) -> bool:
+        if not self._buffer:
+            return False
+        if self._closed or self._flush_requested or len(self._buffer) >= self._batch_size:
+            return True
+        return time.monotonic() - self._buffer[0]["queued_at"] >= self._flush_interval
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._is_flush_due():
+                    if self._closed:
+                        return
+                    self._flush_requested = False
+                    timeout = None
+                    if self._buffer:
+                        timeout = self._buffer[0]["queued_at"] + self._flush_interval
+                        timeout -= time.monotonic()
+                    self._condition.wait(timeout)
+                events = [
+                    self._buffer.popleft() for _ in range(min(self._batch_size, len(self._buffer)))
+                ]
+                self._condition.notify_all()
+
+            self._publish_events(events)
+
+            with self._condition:
+                self._processed_count += len(events)
+                self._condition.notify_all()
+
+    def _publish_events(self, events: list) -> None:
+        groups = []
+        for event in events:
+            for group in groups:
+                if (
+                    group[0]["event_name"] == event["event_name"]
+                    and group[0]["additional_params"] == event["additional_params"]
+                ):
+                    group.append(event)
+                    break
+            else:
+                groups.append([event])
+
+        for group in groups:
+            try:
+                results = self.event_adapter.sync_publish_batch(
+                    group[0]["event_name"],
+                    [event["message_data"] for event in group],
+                    group[0]["additional_params"],
+                )
+            except Exception as error:
+                logger.exception("Failed to publish %s events", group[0]["event_name"])
+                results = [
+                    {
+                        "index": index,
+                        "success": False,
+                        "message_id": None,
+                        "error_code": type(error).__name__,
+                        "error_message": str(error),
+                        "sender_fault": False,
+                    }
+                    for index in range(len(group))
+                ]
+            for event, result in zip(group, results):
+                if not result["success"]:
+                    self._report_failure(event, result)
+
+    def _report_failure(self, event: dict, result: dict) -> None:
+        event = {key: value for key, value in event.items() if key != "queued_at"}
+        if self._on_failure is None:
+            logger.error(
+                "Failed to publish event for %s: %s %s",
+                event["event_name"],
+                result["error_code"],
+                result["error_message"],
+            )
+            return
+        try:
+            self._on_failure(event, result)
+        except Exception:
+            logger.exception("on_failure callback raised for %s", event["event_name"])
@@ -1,18 +1,45 @@
-from .adapters import EventBaseAdapter
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
 
+from ..instrumentation import Instrumentation
+from ..mixins import InstrumentationMixin
+from .adapters import EventBaseAdapter, PreparedMessage
 
-class EventPublisher:
-    def __init__(self, event_adapter: EventBaseAdapter) -> None:
+DEFAULT_PREPARED_CACHE_SIZE = 1024
+
+
+class EventPublisher(InstrumentationMixin):
+    def __init__(
+        self,
+        event_adapter: EventBaseAdapter,
+        instrumentation: Instrumentation = None,
+        prepared_cache_size: int = DEFAULT_PREPARED_CACHE_SIZE,
+    ) -> None:
         """
         Initialize EventPublisher with event_adapter
 
         Args:
             event_adapter (EventBaseAdapter): An instance of EventBaseAdapter
+            instrumentation (Instrumentation, optional): Hooks called around every publish with
+                its latency, payload bytes and batch size, e.g. SentryInstrumentation. Defaults to
+                None, no instrumentation.
+            prepared_cache_size (int, optional): Highest number of messages prepared with a
+                cache_key kept, least recently used first out. Defaults to 1024.
+
+        Raises:
+            ValueError: If prepared_cache_size is not positive
 
         Returns:
             None
         """
+        if prepared_cache_size < 1:
+            raise ValueError("prepared_cache_size must be a positive integer.")
         self.event_adapter = event_adapter
+        self._init_instrumentation(instrumentation)
+        self._prepared_cache_size = prepared_cache_size
+        self._prepared_cache = OrderedDict()
+        self._prepared_cache_lock = threading.Lock()
 
     def sync_publish(
         self, event_name: str, message_data: dict, additional_params: dict = {}
@@ -25,7 +52,18 @@ class EventPublisher:
             message_data (dict): A dict containing the message attributes.
             additional_params (dict): A dict containing additional parameters to be sent in the events stack call. It is optional.
         """
-        self.event_adapter.sync_publish(event_name, message_data, additional_params)
+        if self.instrumentation is None:
+            self.event_adapter.sync_publish(event_name, message_data, additional_params)
+            return
+        metrics = {"batch_size": 1}
+
+        def publish() -> None:
+            prepared_messages = self._prepare_all(
+                event_name, [message_data], additional_params, metrics
+            )
+            self.event_adapter.publish_prepared(prepared_messages[0])
+
+        self._instrument("publish", event_name, metrics, publish)
 
     async def async_publish(
         self, event_name: str, message_data: dict, additional_params: dict = {}
@@ -38,4 +76,220 @@ class EventPublisher:
             message_data (dict): A dict containing the message attributes.
             additional_params (dict): A dict containing additional parameters to be sent in the events stack call. It is optional.
         """
-        await self.event_adapter.async_publish(event_name, message_data, additional_params)
+        if self.instrumentation is None:
+            await self.event_adapter.async_publish(event_name, message_data, additional_params)
+            return
+        metrics = {"batch_size": 1}
+
+        async def publish() -> None:
+            prepared_messages = self._prepare_all(
+                event_name, [message_data], additional_params, metrics
+            )
+            await self.event_adapter.async_publish_prepared(prepared_messages[0])
+
+        await self._async_instrument("publish", event_name, metrics, publish)
+
+    def sync_publish_batch(
+        self, event_name: str, messages_data: list[dict], additional_params: dict = {}
+    ) -> list[dict]:
+        """
+        Synchronously publish a batch of events to the event stack
+
+        Args:
+            event_name (str): The name of the SNS topic
+            messages_data (list[dict]): A list of dicts containing the message attributes.
+            additional_params (dict): A dict containing additional parameters to be sent for every entry. It is optional.
+
+        Returns:
+            list[dict]: One success / failure result per entry, in the same order as messages_data
+        """
+        if self.instrumentation is None:
+            return self.event_adapter.sync_publish_batch(
+                event_name, messages_data, additional_params
+            )
+        metrics = {"batch_size": len(messages_data)}
+        return self._instrument(
+            "publish_batch",
+            event_name,
+            metrics,
+            lambda: self.event_adapter.publish_prepared_batch(
+                self._prepare_all(event_name, messages_data, additional_params, metrics)
+            ),
+            self._get_batch_results_metrics,
+        )
+
+    async def async_publish_batch(
+        self, event_name: str, messages_data: list[dict], additional_params: dict = {}
+    ) -> list[dict]:
+        """
+        Asynchronously publish a batch of events to the event stack
+
+        Args:
+            event_name (str): The name of the SNS topic
+            messages_data (list[dict]): A list of dicts containing the message attributes.
+            additional_params (dict): A dict containing additional parameters to be sent for every entry. It is optional.
+
+        Returns:
+            list[dict]: One success / failure result per entry, in the same order as messages_data
+        """
+        if self.instrumentation is None:
+            return await self.event_adapter.async_publish_batch(
+                event_name, messages_data, additional_params
+            )
+        metrics = {"batch_size": len(messages_data)}
+        return await self._async_instrument(
+            "publish_batch",
+            event_name,
+            metrics,
+            lambda: self.event_adapter.async_publish_prepared_batch(
+                self._prepare_all(event_name, messages_data, additional_params, metrics)
+            ),
+            self._get_batch_results_metrics,
+        )
+
+    def prepare(
+        self,
+        event_name: str,
+        message_data: dict,
+        additional_params: dict = {},
+        cache_key: Hashable = None,
+    ) -> PreparedMessage:
+        """
+        Prepare an event once, to publish it many times with the publish_prepared methods
+
+        The adapter validates and encodes the event, see EventBaseAdapter.prepare. Events prepared
+        with a cache_key are kept, so preparing the same event template again, e.g. a heartbeat
+        or a cache invalidation, returns the cached prepared message without encoding it. The
+        cache_key must identify the content of the event: message_data and additional_params
+        are ignored once the key is cached.
+
+        Args:
+            event_name (str): The name of the SNS topic
+            message_data (dict): A dict containing the message attributes.
+            additional_params (dict): A dict containing additional parameters to be sent in the events stack call. It is optional.
+            cache_key (Hashable, optional): The key the prepared event is cached with, per
+                event_name. Defaults to None, not cached.
+
+        Raises:
+            ValueError: If message is not present in message_data
+
+        Returns:
+            PreparedMessage: The prepared event
+        """
+        if cache_key is None:
+            return self.event_adapter.prepare(event_name, message_data, additional_params)
+        key = (event_name, cache_key)
+        with self._prepared_cache_lock:
+            prepared_message = self._prepared_cache.get(key)
+            if prepared_message is not None:
+                self._prepared_cache.move_to_end(key)
+                return prepared_message
+        prepared_message = self.event_adapter.prepare(event_name, message_data, additional_params)
+        with self._prepared_cache_lock:
+            self._prepared_cache[key] = prepared_message
+            if len(self._prepared_cache) > self._prepared_cache_size:
+                self._prepared_cache.popitem(last=False)
+        return prepared_message
+
+    def publish_prepared(self, prepared_message: PreparedMessage) -> None:
+        """
+        Synchronously publish a prepared event to the event stack
+
+        Args:
+            prepared_message (PreparedMessage): An event prepared with prepare
+        """
+        if self.instrumentation is None:
+            self.event_adapter.publish_prepared(prepared_message)
+            return
+        self._instrument(
+            "publish",
+            prepared_message.event_name,
+            {"batch_size": 1, "payload_bytes": prepared_message.size},
+            lambda: self.event_adapter.publish_prepared(prepared_message),
+        )
+
+    async def async_publish_prepared(self, prepared_message: PreparedMessage) -> None:
+        """
+        Asynchronously publish a prepared event to the event stack
+
+        Args:
+            prepared_message (PreparedMessage): An event prepared with prepare
+        """
+        if self.instrumentation is None:
+            await self.event_adapter.async_publish_prepared(prepared_message)
+            return
+        await self._async_instrument(
+            "publish",
+            prepared_message.event_name,
+            {"batch_size": 1, "payload_bytes": prepared_message.size},
+            lambda: self.event_adapter.async_publish_prepared(prepared_message),
+        )
+
+    def publish_prepared_batch(self, prepared_messages: list[PreparedMessage]) -> list[dict]:
+        """
+        Synchronously publish a batch of prepared events of the same topic to the event stack
+
+        Args:
+            prepared_messages (list[PreparedMessage]): Events prepared with prepare
+
+        Raises:
+            ValueError: If the events belong to different topics
+
+        Returns:
+            list[dict]: One success / failure result per event, in the same order
+        """
+        if self.instrumentation is None or not prepared_messages:
+            return self.event_adapter.publish_prepared_batch(prepared_messages)
+        return self._instrument(
+            "publish_batch",
+            prepared_messages[0].event_name,
+            self._get_prepared_metrics(prepared_messages),
+            lambda: self.event_adapter.publish_prepared_batch(prepared_messages),
+            self._get_batch_results_metrics,
+        )
+
+    async def async_publish_prepared_batch(
+        self, prepared_messages: list[PreparedMessage]
+    ) -> list[dict]:
+        """
+        Asynchronously publish a batch of prepared events of the same topic to the event stack
+
+        Args:
+            prepared_messages (list[PreparedMessage]): Events prepared with prepare
+
+        Raises:
+            ValueError: If the events belong to different topics
+
+        Returns:
+            list[dict]: One success / failure result per event, in the same order
+        """
+        if self.instrumentation is None or not prepared_messages:
+            return await self.event_adapter.async_publish_prepared_batch(prepared_messages)
+        return await self._async_instrument(
+            "publish_batch",
+            prepared_messages[0].event_name,
+            self._get_prepared_metrics(prepared_messages),
+            lambda: self.event_adapter.async_publish_prepared_batch(prepared_messages),
+            self._get_batch_results_metrics,
+        )
+
+    def _prepare_all(
+        self, event_name: str, messages_data: list[dict], additional_params: dict, metrics: dict
+    ) -> list[PreparedMessage]:
+        # Prepared within the instrumented call, so validation errors are reported, and the
+        # payload size is the one measured while encoding
+        prepared_messages = [
+            self.event_adapter.prepare(event_name, message_data, additional_params)
+            for message_data in messages_data
+        ]
+        metrics.update(self._get_prepared_metrics(prepared_messages))
+        return prepared_messages
+
+    def _get_prepared_metrics(self, prepared_messages: list[PreparedMessage]) -> dict:
+        return {
+            "batch_size": len(prepared_messages),
+            "payload_bytes": sum(prepared.size for prepared in prepared_messages),
+        }
+
+    def _get_batch_results_metrics(self, results: list[dict]) -> dict:
+        return {"failed": sum(1 for result in results if not result["success"])}
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import zlib
+from collections.abc import Callable
+
+
+class FifoPartitioner:
+    def __init__(
+        self,
+        group_key: Callable[[dict], object],
+        deduplication_key: Callable[[dict], object] = None,
+        partitions: int = None,
+    ) -> None:
+        """
+        Initialize FifoPartitioner with group_key
+
+        Derives the message group and deduplication ids of FIFO messages from their content.
+        Messages with the same group id are delivered in order, and messages of different groups
+        can be consumed in parallel, so the group key should be the entity whose events must stay
+        ordered, e.g. the user id.
+
+        Args:
+            group_key (Callable): Called with the message_data of every message, returns the key
+                of its group
+            deduplication_key (Callable, optional): Called with the message_data of every message,
+                returns its deduplication id. Defaults to a SHA-256 hash of the message, like
+                content-based deduplication.
+            partitions (int, optional): When provided, group keys are hashed into this number of
+                groups (0 to partitions - 1), bounding the number of groups. Defaults to None, one
+                group per key.
+
+        Raises:
+            ValueError: If partitions is not a positive integer
+
+        Returns:
+            None
+        """
+        if partitions is not None and partitions < 1:
+            raise ValueError("partitions must be a positive integer.")
+        self.group_key = group_key
+        self.deduplication_key = deduplication_key
+        self.partitions = partitions
+
+    def get_group_id(self, message_data: dict) -> str:
+        """
+        Get the message group id of a message
+
+        Args:
+            message_data (dict): A dict with the same format as SNSAdapter.sync_publish message_data
+
+        Returns:
+            str: The message group id
+        """
+        key = str(self.group_key(message_data))
+        if self.partitions is None:
+            return key
+        # crc32 is stable across processes, unlike hash()
+        return str(zlib.crc32(key.encode("utf-8")) % self.partitions)
+
+    def get_deduplication_id(self, message_data: dict) -> str:
+        """
+        Get the message deduplication id of a message
+
+        Args:
+            message_data (dict): A dict with the same format as SNSAdapter.sync_publish message_data
+
+        Returns:
+            str: The message deduplication id
+        """
+        if self.deduplication_key is not None:
+            return str(self.deduplication_key(message_data))
+        body = json.dumps(message_data["message"], sort_keys=True, default=str)
+        return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+    def partition(self, message_data: dict) -> dict:
+        """
+        Add the message group and deduplication ids to a message
+
+        Ids already present in message_data are kept.
+
+        Args:
+            message_data (dict): A dict with the same format as SNSAdapter.sync_publish message_data
+
+        Returns:
+            dict: A copy of message_data with message_group_id and message_deduplication_id
+        """
+        message_data = dict(message_data)
+        if "message_group_id" not in message_data:
+            message_data["message_group_id"] = self.get_group_id(message_data)
+        if "message_deduplication_id" not in message_data:
+            message_data["message_deduplication_id"] = self.get_deduplication_id(message_data)
+        return message_data
@@ -0,0 +1,462 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from contextlib import contextmanager
+
+from ..retry import RETRYABLE_ERROR_CODES
+from .adapters import EventBaseAdapter, PreparedMessage
+
+logger = logging.getLogger(__name__)
+
+DEDUP_ID_ATTRIBUTE = "clever_events_dedup_id"
+# Highest number of prepared events kept for retries
+PREPARED_CACHE_SIZE = 1024
+
+
+class OutboxPublisher:
+    def __init__(
+        self,
+        event_adapter: EventBaseAdapter,
+        path: str,
+        batch_size: int = 10,
+        retry_delay: float = 1.0,
+        max_retry_delay: float = 60.0,
+        on_failure: Callable[[dict, dict], None] = None,
+    ) -> None:
+        """
+        Initialize OutboxPublisher with event_adapter and path
+
+        Events are appended to a durable SQLite spool and published in batches by a background
+        relay thread, so publishing costs a local disk write and an outage of the events stack
+        turns into backlog instead of lost events. Events stay in the spool until they are
+        published, including across restarts: the relay of the next OutboxPublisher using the
+        same path publishes them. Keep a single OutboxPublisher per spool file.
+
+        Delivery is at least once: an event can be published again if the process stops between
+        publishing it and removing it from the spool. Every event gets a dedup id, sent in the
+        clever_events_dedup_id message attribute and, for FIFO messages (with a MessageGroupId),
+        as MessageDeduplicationId, so consumers can discard duplicates.
+
+        Events are prepared (encoded) by the adapter once, and their prepared messages reused by
+        retries. FIFO events keep their order: while an event waits for a retry, the later events
+        of its topic and message group are held back. Failed events are retried with exponential backoff, from retry_delay up to
+        max_retry_delay seconds. Events rejected because of the request itself (sender_fault,
+        e.g. PayloadTooLarge) are removed from the spool and reported to on_failure, unless their
+        error code is retryable: SNS reports throttling (Throttled, KMSThrottling) as a sender
+        fault too. Retryable codes are those of the adapter retry_policy, if any.
+
+        Args:
+            event_adapter (EventBaseAdapter): An instance of EventBaseAdapter
+            path (str): The path of the spool database file
+            batch_size (int, optional): Highest number of events published per batch. Defaults to 10.
+            retry_delay (float, optional): Seconds before the first retry of a failed event.
+                Defaults to 1.
+            max_retry_delay (float, optional): Highest number of seconds between retries.
+                Defaults to 60.
+            on_failure (Callable, optional): Called with the event dict (event_name, message_data,
+                additional_params, dedup_id) and the failed entry result for every event that is
+                rejected. Failures are logged when not provided.
+
+        Raises:
+            ValueError: If any of the arguments is not valid
+
+        Returns:
+            None
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+        if retry_delay <= 0 or max_retry_delay < retry_delay:
+            raise ValueError("delays must satisfy 0 < retry_delay <= max_retry_delay.")
+
+        self.event_adapter = event_adapter
+        self.path = path
+        self._batch_size = batch_size
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._on_failure = on_failure
+        self._prepared = OrderedDict()
+        retry_policy = getattr(event_adapter, "retry_policy", None)
+        self._retryable_error_codes = (
+            RETRYABLE_ERROR_CODES if retry_policy is None else retry_policy.retryable_error_codes
+        )
+
+        self._condition = threading.Condition()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                event_name TEXT NOT NULL,
+                message_data TEXT NOT NULL,
+                additional_params TEXT NOT NULL,
+                dedup_id TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                message_group_id TEXT
+            );
+            """
+        )
+        columns = [row[1] for row in self._connection.execute("PRAGMA table_info(outbox)")]
+        if "message_group_id" not in columns:
+            self._connection.execute("ALTER TABLE outbox ADD COLUMN message_group_id TEXT")
+        self._connection.executescript(
+            """
+            CREATE INDEX IF NOT EXISTS outbox_available_at ON outbox (available_at, id);
+            CREATE INDEX IF NOT EXISTS outbox_message_group
+                ON outbox (event_name, message_group_id, id);
+            """
+        )
+        # Events left by a previous publisher are relayed right away, not after their backoff
+        self._connection.execute(
+            "UPDATE outbox SET available_at = ? WHERE available_at > ?", (time.time(),) * 2
+        )
+
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="OutboxPublisher", daemon=True)
+        self._worker.start()
+
+    def sync_publish(
+        self, event_name: str, message_data: dict, additional_params: dict = {}
+    ) -> str:
+        """
+        Append an event to the spool to be published by the relay
+
+        Args:
+            event_name (str): The name of the SNS topic
+            message_data (dict): A dict containing the message attributes. It must be JSON
+                serializable.
+            additional_params (dict): A dict containing additional parameters to be sent in the events stack call. It is optional.
+
+        Raises:
+            ValueError: If message is not present in message_data
+            RuntimeError: If the publisher is closed
+
+        Returns:
+            str: The dedup id of the event
+        """
+        return self.sync_publish_batch(event_name, [message_data], additional_params)[0]
+
+    async def async_publish(
+        self, event_name: str, message_data: dict, additional_params: dict = {}
+    ) -> str:
+        """
+        Append an event to the spool from a worker thread, without blocking the event loop
+
+        Args:
+            event_name (str): The name of the SNS topic
+            message_data (dict): A dict containing the message attributes. It must be JSON
+                serializable.
+            additional_params (dict): A dict containing additional parameters to be sent in the events stack call. It is optional.
+
+        Raises:
+            ValueError: If message is not present in message_data
+            RuntimeError: If the publisher is closed
+
+        Returns:
+            str: The dedup id of the event
+        """
+        return await asyncio.to_thread(
+            self.sync_publish, event_name, message_data, additional_params
+        )
+
+    def sync_publish_batch(
+        self, event_name: str, messages_data: list[dict], additional_params: dict = {}
+    ) -> list[str]:
+        """
+        Append a batch of events to the spool in a single transaction
+
+        Args:
+            event_name (str): The name of the SNS topic
+            messages_data (list[dict]): A list of dicts containing the message attributes. They
+                must be JSON serializable.
+            additional_params (dict): A dict containing additional parameters to be sent for every entry. It is optional.
+
+        Raises:
+            ValueError: If message is not present in any of the messages_data
+            RuntimeError: If the publisher is closed
+
+        Returns:
+            list[str]: The dedup id of every event, in the same order as messages_data
+        """
+        # Validated here, as a malformed event would make the relay fail its whole batch
+        if any("message" not in message_data for message_data in messages_data):
+            raise ValueError("message is required in message_data")
+        now = time.time()
+        encoded_params = json.dumps(additional_params)
+        dedup_ids = [uuid.uuid4().hex for _ in messages_data]
+        rows = [
+            (
+                event_name,
+                json.dumps(message_data),
+                encoded_params,
+                dedup_id,
+                now,
+                additional_params.get("MessageGroupId", message_data.get("message_group_id")),
+            )
+            for message_data, dedup_id in zip(messages_data, dedup_ids)
+        ]
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("OutboxPublisher is closed")
+            with self._transaction():
+                self._connection.executemany(
+                    "INSERT INTO outbox (event_name, message_data, additional_params, dedup_id, "
+                    "available_at, message_group_id) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            self._condition.notify_all()
+        return dedup_ids
+
+    def get_backlog(self) -> int:
+        """
+        Get the number of events waiting in the spool, retries included
+
+        Returns:
+            int: The number of events not published yet
+        """
+        with self._condition:
+            return self._connection.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Block until every event appended before this call has left the spool
+
+        Events that keep failing stay in the spool, so use a timeout while the events stack may
+        be unavailable.
+
+        Args:
+            timeout (float, optional): Highest number of seconds to wait. Waits forever by default.
+
+        Returns:
+            bool: True if every event left the spool, False if timeout expired first
+        """
+        with self._condition:
+            target = self._connection.execute("SELECT MAX(id) FROM outbox").fetchone()[0]
+            if target is None:
+                return True
+            self._condition.wait_for(
+                lambda: self._is_flushed(target) or not self._worker.is_alive(), timeout=timeout
+            )
+            return self._is_flushed(target)
+
+    def close(self, timeout: float = None) -> None:
+        """
+        Stop accepting events and stop the relay once its current batch is published
+
+        Events left in the spool are published by the next OutboxPublisher using the same path.
+        Call flush first to wait for them.
+
+        Args:
+            timeout (float, optional): Highest number of seconds to wait. Waits forever by default.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join(timeout)
+        if not self._worker.is_alive():
+            with self._condition:
+                self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @contextmanager
+    def _transaction(self):
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._connection
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    def _is_flushed(self, target: int) -> bool:
+        return (
+            self._connection.execute(
+                "SELECT 1 FROM outbox WHERE id <= ? LIMIT 1", (target,)
+            ).fetchone()
+            is None
+        )
+
+    def _run(self) -> None:
+        while True:
+            try:
+                rows = self._wait_for_events()
+                if rows is None:
+                    return
+                self._relay([self._get_event(row) for row in rows])
+            except Exception:
+                # The relay must outlive unexpected errors, or the spool silently stops draining
+                logger.exception("Outbox relay failed, retrying in %s seconds", self._retry_delay)
+                with self._condition:
+                    if self._closed:
+                        return
+                    self._condition.wait(self._retry_delay)
+
+    def _wait_for_events(self) -> list[tuple] | None:
+        with self._condition:
+            while True:
+                if self._closed:
+                    return None
+                now = time.time()
+                # Events of a FIFO message group wait behind an earlier event awaiting a retry
+                rows = self._connection.execute(
+                    "SELECT id, event_name, message_data, additional_params, dedup_id, "
+                    "attempts FROM outbox AS event WHERE available_at <= ? AND ("
+                    "message_group_id IS NULL OR NOT EXISTS (SELECT 1 FROM outbox AS pending "
+                    "WHERE pending.event_name = event.event_name "
+                    "AND pending.message_group_id = event.message_group_id "
+                    "AND pending.id < event.id AND pending.available_at > ?)"
+                    ") ORDER BY id LIMIT ?",
+                    (now, now, self._batch_size),
+                ).fetchall()
+                if rows:
+                    return rows
+                # Held back events become available with the event they wait behind
+                next_available_at = self._connection.execute(
+                    "SELECT MIN(available_at) FROM outbox WHERE available_at > ?", (now,)
+                ).fetchone()[0]
+                timeout = None
+                if next_available_at is not None:
+                    timeout = max(0, next_available_at - time.time())
+                self._condition.wait(timeout)
+
+    def _get_event(self, row: tuple) -> dict:
+        row_id, event_name, message_data, additional_params, dedup_id, attempts = row
+        return {
+            "id": row_id,
+            "event_name": event_name,
+            "message_data": json.loads(message_data),
+            "additional_params": json.loads(additional_params),
+            "dedup_id": dedup_id,
+            "attempts": attempts,
+        }
+
+    def _relay(self, events: list[dict]) -> None:
+        groups = {}
+        for event in events:
+            key = (event["event_name"], json.dumps(event["additional_params"], sort_keys=True))
+            groups.setdefault(key, []).append(event)
+
+        published, retried, rejected = [], [], []
+        for group in groups.values():
+            for event, result in zip(group, self._publish_group(group)):
+                if result["success"]:
+                    published.append(event)
+                elif (
+                    result["sender_fault"]
+                    and result["error_code"] not in self._retryable_error_codes
+                ):
+                    rejected.append((event, result))
+                else:
+                    retried.append(event)
+
+        for event in published + [event for event, _ in rejected]:
+            self._prepared.pop(event["id"], None)
+
+        now = time.time()
+        with self._condition, self._transaction():
+            self._connection.executemany(
+                "DELETE FROM outbox WHERE id = ?",
+                [(event["id"],) for event in published + [event for event, _ in rejected]],
+            )
+            self._connection.executemany(
+                "UPDATE outbox SET attempts = attempts + 1, available_at = ? WHERE id = ?",
+                [
+                    (now + self._get_retry_delay(event["attempts"]), event["id"])
+                    for event in retried
+                ],
+            )
+            self._condition.notify_all()
+        for event, result in rejected:
+            self._report_failure(event, result)
+
+    def _publish_group(self, group: list[dict]) -> list[dict]:
+        results, prepared_messages, indexes = [None] * len(group), [], []
+        for index, event in enumerate(group):
+            try:
+                prepared_messages.append(self._get_prepared_message(event))
+            except Exception as error:
+                # The event itself is invalid, it would fail on every retry
+                results[index] = self._get_failed_result(index, error, sender_fault=True)
+            else:
+                indexes.append(index)
+        if not prepared_messages:
+            return results
+        try:
+            batch_results = self.event_adapter.publish_prepared_batch(prepared_messages)
+        except Exception as error:
+            logger.exception("Failed to relay %s events", group[0]["event_name"])
+            batch_results = [
+                self._get_failed_result(index, error, sender_fault=False) for index in indexes
+            ]
+        for index, result in zip(indexes, batch_results):
+            results[index] = {**result, "index": index}
+        return results
+
+    def _get_prepared_message(self, event: dict) -> PreparedMessage:
+        prepared_message = self._prepared.get(event["id"])
+        if prepared_message is not None:
+            return prepared_message
+        message_data = event["message_data"]
+        message_data["message_attributes"] = {
+            **message_data.get("message_attributes", {}),
+            DEDUP_ID_ATTRIBUTE: event["dedup_id"],
+        }
+        if "MessageGroupId" in event["additional_params"] or "message_group_id" in message_data:
+            message_data.setdefault("message_deduplication_id", event["dedup_id"])
+        prepared_message = self.event_adapter.prepare(
+            event["event_name"], message_data, event["additional_params"]
+        )
+        self._prepared[event["id"]] = prepared_message
+        if len(self._prepared) > PREPARED_CACHE_SIZE:
+            self._prepared.popitem(last=False)
+        return prepared_message
+
+    def _get_failed_result(self, index: int, error: Exception, sender_fault: bool) -> dict:
+        return {
+            "index": index,
+            "success": False,
+            "message_id": None,
+            "error_code": type(error).__name__,
+            "error_message": str(error),
+            "sender_fault": sender_fault,
+        }
+
+    def _get_retry_delay(self, attempts: int) -> float:
+        # Bounded before exponentiation, so long outages don't overflow the float multiply
+        exponent = min(attempts, int(self._max_retry_delay / self._retry_delay).bit_length())
+        return min(self._max_retry_delay, self._retry_delay * 2**exponent)
+
+    def _report_failure(self, event: dict, result: dict) -> None:
+        event = {
+            key: value
+            for key, value in event.items()
+            if key in ("event_name", "message_data", "additional_params", "dedup_id")
+        }
+        if self._on_failure is None:
+            logger.error(
+                "Failed to publish event for %s: %s %s",
+                event["event_name"],
+                result["error_code"],
+                result["error_message"],
+            )
+            return
+        try:
+            self._on_failure(event, result)
+        except Exception:
+            logger.exception("on_failure callback raised for %s", event["event_name"])
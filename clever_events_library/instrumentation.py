@@ -0,0 +1,503 @@
+import socket
+import threading
+
+import sentry_sdk
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover
+    prometheus_client = None
+
+try:
+    from opentelemetry import context as otel_context
+    from opentelemetry import metrics as otel_metrics
+    from opentelemetry import trace as otel_trace
+except ImportError:  # pragma: no cover
+    otel_context = otel_metrics = otel_trace = None
+
+RECEIVE_OPERATIONS = ("fetch_messages",)
+PUBLISH_OPERATIONS = ("publish", "publish_batch")
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+
+class Instrumentation:
+    """
+    Hooks called around every call EventPublisher and QueueManager make to their adapter
+
+    Every hook is a no-op, subclasses override the ones they need. The metrics dict passed to
+    end_call may contain the following keys:
+        - batch_size: Number of messages published or deleted by the call
+        - payload_bytes: Size of the published messages once encoded
+        - max_number_of_messages: Highest number of messages requested by a receive
+        - messages: Number of messages received
+        - failed: Number of batch entries that failed
+        - retries: Number of retries reported by the AWS response
+    """
+
+    def start_call(self, operation: str, destination: str):
+        """
+        Called before an adapter call
+
+        Args:
+            operation (str): publish, publish_batch, fetch_messages, delete_message or delete_messages
+            destination (str): The name of the topic or queue
+
+        Returns:
+            Any value, passed back to end_call as context
+        """
+        return None
+
+    def end_call(
+        self,
+        context,
+        operation: str,
+        destination: str,
+        duration: float,
+        metrics: dict,
+        error: Exception = None,
+    ) -> None:
+        """
+        Called after an adapter call, whether it succeeded or raised
+
+        Args:
+            context: The value returned by start_call
+            operation (str): The operation, see start_call
+            destination (str): The name of the topic or queue
+            duration (float): Seconds spent in the call
+            metrics (dict): The metrics of the call, see the class docstring
+            error (Exception, optional): The error raised by the call. Defaults to None.
+
+        Returns:
+            None
+        """
+        pass
+
+    def record_retry(
+        self, operation: str, destination: str, attempt: int, error: Exception = None
+    ) -> None:
+        """
+        Called when a call is retried
+
+        Args:
+            operation (str): The operation, see start_call
+            destination (str): The name of the topic or queue
+            attempt (int): The number of the attempt about to be made, starting at 1 for the first retry
+            error (Exception, optional): The error that caused the retry. Defaults to None.
+
+        Returns:
+            None
+        """
+        pass
+
+    def record_in_flight(self, operation: str, destination: str, count: int) -> None:
+        """
+        Called when the number of calls or messages in flight changes
+
+        Args:
+            operation (str): The operation, see start_call, or process_message for messages
+                being handled by a QueueWorker
+            destination (str): The name of the topic or queue
+            count (int): The number of calls or messages in flight
+
+        Returns:
+            None
+        """
+        pass
+
+
+class CompositeInstrumentation(Instrumentation):
+    def __init__(self, instrumentations: list[Instrumentation]) -> None:
+        """
+        Initialize CompositeInstrumentation with instrumentations
+
+        Forwards every hook to each of the instrumentations, e.g. to record Sentry spans and
+        Prometheus metrics at the same time.
+
+        Args:
+            instrumentations (list[Instrumentation]): The instrumentations hooks are forwarded to
+
+        Returns:
+            None
+        """
+        self.instrumentations = list(instrumentations)
+
+    def start_call(self, operation: str, destination: str) -> list:
+        return [
+            instrumentation.start_call(operation, destination)
+            for instrumentation in self.instrumentations
+        ]
+
+    def end_call(
+        self,
+        context: list,
+        operation: str,
+        destination: str,
+        duration: float,
+        metrics: dict,
+        error: Exception = None,
+    ) -> None:
+        # Ended in reverse order, so nested spans are closed before their parents
+        for instrumentation, instrumentation_context in reversed(
+            list(zip(self.instrumentations, context))
+        ):
+            instrumentation.end_call(
+                instrumentation_context, operation, destination, duration, metrics, error
+            )
+
+    def record_retry(
+        self, operation: str, destination: str, attempt: int, error: Exception = None
+    ) -> None:
+        for instrumentation in self.instrumentations:
+            instrumentation.record_retry(operation, destination, attempt, error)
+
+    def record_in_flight(self, operation: str, destination: str, count: int) -> None:
+        for instrumentation in self.instrumentations:
+            instrumentation.record_in_flight(operation, destination, count)
+
+
+class SentryInstrumentation(Instrumentation):
+    """
+    Records a Sentry performance span for every call, as a child of the current span or transaction
+
+    Spans follow Sentry queue monitoring conventions: publish calls use the queue.publish op,
+    receives the queue.receive op, and the topic or queue is recorded as
+    messaging.destination.name.
+    """
+
+    SPAN_OPS = {
+        "publish": "queue.publish",
+        "publish_batch": "queue.publish",
+        "fetch_messages": "queue.receive",
+    }
+
+    def start_call(self, operation: str, destination: str):
+        span = sentry_sdk.start_span(
+            op=self.SPAN_OPS.get(operation, f"queue.{operation}"),
+            name=f"{operation} {destination}",
+        )
+        span.__enter__()
+        span.set_data("messaging.destination.name", destination)
+        return span
+
+    def end_call(
+        self,
+        context,
+        operation: str,
+        destination: str,
+        duration: float,
+        metrics: dict,
+        error: Exception = None,
+    ) -> None:
+        if "payload_bytes" in metrics:
+            context.set_data("messaging.message.body.size", metrics["payload_bytes"])
+        if "retries" in metrics:
+            context.set_data("messaging.message.retry.count", metrics["retries"])
+        for key in ("batch_size", "messages", "failed"):
+            if key in metrics:
+                context.set_data(f"clever_events.{key}", metrics[key])
+        if error is None:
+            context.__exit__(None, None, None)
+        else:
+            context.__exit__(type(error), error, error.__traceback__)
+
+
+class StatsDInstrumentation(Instrumentation):
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 8125,
+        prefix: str = "clever_events",
+        use_tags: bool = True,
+    ) -> None:
+        """
+        Initialize StatsDInstrumentation with host and port
+
+        Metrics are sent over UDP, every call in a single packet, using the following names:
+            - <prefix>.<operation>.duration: timer, in milliseconds
+            - <prefix>.<operation>.calls: counter, tagged with status ok or error
+            - <prefix>.<operation>.payload_bytes / batch_size / messages: histograms
+            - <prefix>.<operation>.empty_receives / failed / retries: counters
+            - <prefix>.<operation>.in_flight: gauge
+
+        Args:
+            host (str, optional): The StatsD server host. Defaults to localhost.
+            port (int, optional): The StatsD server port. Defaults to 8125.
+            prefix (str, optional): Prefix of every metric name. Defaults to clever_events.
+            use_tags (bool, optional): Send destination and status as DogStatsD tags. When False
+                they are added to the metric name instead, for servers without tags support.
+                Defaults to True.
+
+        Returns:
+            None
+        """
+        self.address = (host, port)
+        self.prefix = prefix
+        self.use_tags = use_tags
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+
+    def end_call(
+        self,
+        context,
+        operation: str,
+        destination: str,
+        duration: float,
+        metrics: dict,
+        error: Exception = None,
+    ) -> None:
+        status = STATUS_OK if error is None else STATUS_ERROR
+        lines = [
+            self._format(operation, destination, "duration", f"{duration * 1000:.3f}|ms"),
+            self._format(operation, destination, "calls", "1|c", status),
+        ]
+        for key in ("payload_bytes", "batch_size", "messages"):
+            if key in metrics:
+                lines.append(self._format(operation, destination, key, f"{metrics[key]}|h"))
+        for key in ("failed", "retries"):
+            if metrics.get(key):
+                lines.append(self._format(operation, destination, key, f"{metrics[key]}|c"))
+        if operation in RECEIVE_OPERATIONS and error is None and not metrics.get("messages"):
+            lines.append(self._format(operation, destination, "empty_receives", "1|c"))
+        self._send(lines)
+
+    def record_retry(
+        self, operation: str, destination: str, attempt: int, error: Exception = None
+    ) -> None:
+        self._send([self._format(operation, destination, "retries", "1|c")])
+
+    def record_in_flight(self, operation: str, destination: str, count: int) -> None:
+        self._send([self._format(operation, destination, "in_flight", f"{count}|g")])
+
+    def close(self) -> None:
+        """
+        Close the UDP socket
+
+        Returns:
+            None
+        """
+        self._socket.close()
+
+    def _format(
+        self, operation: str, destination: str, metric: str, value: str, status: str = None
+    ) -> str:
+        if not self.use_tags:
+            name = f"{self.prefix}.{destination}.{operation}.{metric}"
+            if status is not None:
+                name = f"{name}.{status}"
+            return f"{name}:{value}"
+        tags = f"destination:{destination}"
+        if status is not None:
+            tags = f"{tags},status:{status}"
+        return f"{self.prefix}.{operation}.{metric}:{value}|#{tags}"
+
+    def _send(self, lines: list[str]) -> None:
+        try:
+            self._socket.sendto("\n".join(lines).encode("utf-8"), self.address)
+        except OSError:
+            # Metrics are best effort, a full buffer or unreachable server must not break calls
+            pass
+
+
+class PrometheusInstrumentation(Instrumentation):
+    def __init__(self, registry=None, namespace: str = "clever_events") -> None:
+        """
+        Initialize PrometheusInstrumentation with registry
+
+        Metrics are labeled with operation and destination:
+            - <namespace>_call_duration_seconds: histogram, also labeled with status
+            - <namespace>_payload_bytes / batch_size / received_messages: histograms
+            - <namespace>_empty_receives_total / failed_entries_total / retries_total: counters
+            - <namespace>_in_flight: gauge
+
+        Args:
+            registry (prometheus_client.CollectorRegistry, optional): The registry metrics are
+                registered in. Only one instance can use a given registry. Defaults to the
+                prometheus_client default registry.
+            namespace (str, optional): Prefix of every metric name. Defaults to clever_events.
+
+        Raises:
+            ImportError: If prometheus_client is not installed
+
+        Returns:
+            None
+        """
+        if prometheus_client is None:
+            raise ImportError("prometheus_client is required to use PrometheusInstrumentation")
+        if registry is None:
+            registry = prometheus_client.REGISTRY
+        labels = ("operation", "destination")
+        options = {"namespace": namespace, "registry": registry}
+
+        self._duration = prometheus_client.Histogram(
+            "call_duration_seconds",
+            "Seconds spent in adapter calls",
+            (*labels, "status"),
+            **options,
+        )
+        self._payload_bytes = prometheus_client.Histogram(
+            "payload_bytes",
+            "Size of published messages once encoded",
+            labels,
+            buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576),
+            **options,
+        )
+        self._batch_size = prometheus_client.Histogram(
+            "batch_size",
+            "Number of messages published or deleted by each call",
+            labels,
+            buckets=(1, 2, 5, 10, 20, 50, 100),
+            **options,
+        )
+        self._messages = prometheus_client.Histogram(
+            "received_messages",
+            "Number of messages received by each receive call",
+            labels,
+            buckets=(0, 1, 2, 5, 10),
+            **options,
+        )
+        self._empty_receives = prometheus_client.Counter(
+            "empty_receives", "Receive calls that returned no messages", labels, **options
+        )
+        self._failed = prometheus_client.Counter(
+            "failed_entries", "Batch entries that failed", labels, **options
+        )
+        self._retries = prometheus_client.Counter("retries", "Retried calls", labels, **options)
+        self._in_flight = prometheus_client.Gauge(
+            "in_flight", "Calls or messages in flight", labels, **options
+        )
+
+    def end_call(
+        self,
+        context,
+        operation: str,
+        destination: str,
+        duration: float,
+        metrics: dict,
+        error: Exception = None,
+    ) -> None:
+        status = STATUS_OK if error is None else STATUS_ERROR
+        self._duration.labels(operation, destination, status).observe(duration)
+        if "payload_bytes" in metrics:
+            self._payload_bytes.labels(operation, destination).observe(metrics["payload_bytes"])
+        if "batch_size" in metrics:
+            self._batch_size.labels(operation, destination).observe(metrics["batch_size"])
+        if "messages" in metrics:
+            self._messages.labels(operation, destination).observe(metrics["messages"])
+        if metrics.get("failed"):
+            self._failed.labels(operation, destination).inc(metrics["failed"])
+        if metrics.get("retries"):
+            self._retries.labels(operation, destination).inc(metrics["retries"])
+        if operation in RECEIVE_OPERATIONS and error is None and not metrics.get("messages"):
+            self._empty_receives.labels(operation, destination).inc()
+
+    def record_retry(
+        self, operation: str, destination: str, attempt: int, error: Exception = None
+    ) -> None:
+        self._retries.labels(operation, destination).inc()
+
+    def record_in_flight(self, operation: str, destination: str, count: int) -> None:
+        self._in_flight.labels(operation, destination).set(count)
+
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    def __init__(self, tracer_provider=None, meter_provider=None) -> None:
+        """
+        Initialize OpenTelemetryInstrumentation
+
+        Every call is recorded as a span, made current while the call runs so spans of
+        instrumented HTTP clients are nested in it, and as metrics following the messaging
+        semantic conventions where they exist:
+            - clever_events.call.duration: histogram, in seconds
+            - clever_events.payload.size / batch.size / received.messages: histograms
+            - clever_events.receive.empty / entries.failed / retries: counters
+            - clever_events.in_flight: up down counter
+
+        Args:
+            tracer_provider (TracerProvider, optional): Defaults to the global tracer provider.
+            meter_provider (MeterProvider, optional): Defaults to the global meter provider.
+
+        Raises:
+            ImportError: If opentelemetry-api is not installed
+
+        Returns:
+            None
+        """
+        if otel_trace is None:
+            raise ImportError("opentelemetry-api is required to use OpenTelemetryInstrumentation")
+        self._tracer = otel_trace.get_tracer(__name__, tracer_provider=tracer_provider)
+        meter = otel_metrics.get_meter(__name__, meter_provider=meter_provider)
+        self._duration = meter.create_histogram("clever_events.call.duration", unit="s")
+        self._payload_bytes = meter.create_histogram("clever_events.payload.size", unit="By")
+        self._batch_size = meter.create_histogram("clever_events.batch.size")
+        self._messages = meter.create_histogram("clever_events.received.messages")
+        self._empty_receives = meter.create_counter("clever_events.receive.empty")
+        self._failed = meter.create_counter("clever_events.entries.failed")
+        self._retries = meter.create_counter("clever_events.retries")
+        self._in_flight = meter.create_up_down_counter("clever_events.in_flight")
+        self._in_flight_counts = {}
+        self._lock = threading.Lock()
+
+    def start_call(self, operation: str, destination: str) -> tuple:
+        kind = otel_trace.SpanKind.CLIENT
+        if operation in PUBLISH_OPERATIONS:
+            kind = otel_trace.SpanKind.PRODUCER
+        elif operation in RECEIVE_OPERATIONS:
+            kind = otel_trace.SpanKind.CONSUMER
+        span = self._tracer.start_span(
+            f"{operation} {destination}",
+            kind=kind,
+            attributes={
+                "messaging.operation": operation,
+                "messaging.destination.name": destination,
+            },
+        )
+        token = otel_context.attach(otel_trace.set_span_in_context(span))
+        return span, token
+
+    def end_call(
+        self,
+        context: tuple,
+        operation: str,
+        destination: str,
+        duration: float,
+        metrics: dict,
+        error: Exception = None,
+    ) -> None:
+        span, token = context
+        attributes = {"operation": operation, "destination": destination}
+        if "payload_bytes" in metrics:
+            span.set_attribute("messaging.message.body.size", metrics["payload_bytes"])
+            self._payload_bytes.record(metrics["payload_bytes"], attributes)
+        if "batch_size" in metrics:
+            span.set_attribute("messaging.batch.message_count", metrics["batch_size"])
+            self._batch_size.record(metrics["batch_size"], attributes)
+        if "messages" in metrics:
+            span.set_attribute("messaging.batch.message_count", metrics["messages"])
+            self._messages.record(metrics["messages"], attributes)
+        if metrics.get("failed"):
+            self._failed.add(metrics["failed"], attributes)
+        if metrics.get("retries"):
+            self._retries.add(metrics["retries"], attributes)
+        if operation in RECEIVE_OPERATIONS and error is None and not metrics.get("messages"):
+            self._empty_receives.add(1, attributes)
+        status = STATUS_OK
+        if error is not None:
+            status = STATUS_ERROR
+            span.record_exception(error)
+            span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, str(error)))
+        self._duration.record(duration, {**attributes, "status": status})
+        span.end()
+        otel_context.detach(token)
+
+    def record_retry(
+        self, operation: str, destination: str, attempt: int, error: Exception = None
+    ) -> None:
+        self._retries.add(1, {"operation": operation, "destination": destination})
+
+    def record_in_flight(self, operation: str, destination: str, count: int) -> None:
+        # The up down counter takes deltas, so the last count of every label set is kept
+        with self._lock:
+            previous = self._in_flight_counts.get((operation, destination), 0)
+            self._in_flight_counts[(operation, destination)] = count
+        self._in_flight.add(count - previous, {"operation": operation, "destination": destination})
@@ -0,0 +1,430 @@
+import heapq
+import itertools
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+class LocalBroker(ABC):
+    """
+    Routes messages published to topics into the queues subscribed to them, like SNS to SQS
+    fan-out, with visibility timeouts and receipt handles, without AWS.
+
+    Received messages are dicts with the following keys: message_id, receipt_handle, body,
+    attributes, group_id, receive_count.
+    """
+
+    @abstractmethod
+    def subscribe(self, topic_name: str, queue_name: str) -> None:
+        """
+        Deliver every message published to topic_name to queue_name
+
+        Args:
+            topic_name (str): The name of the topic
+            queue_name (str): The name of the queue
+
+        Returns:
+            None
+        """
+        pass
+
+    @abstractmethod
+    def publish(self, topic_name: str, messages: list[tuple]) -> list[str]:
+        """
+        Publish messages to every queue subscribed to the topic
+
+        Args:
+            topic_name (str): The name of the topic
+            messages (list[tuple]): (body, attributes, group_id) tuples
+
+        Returns:
+            list[str]: The id assigned to every message, in the same order
+        """
+        pass
+
+    @abstractmethod
+    def send(self, queue_name: str, messages: list[tuple]) -> list[str]:
+        """
+        Send messages straight to a queue
+
+        Args:
+            queue_name (str): The name of the queue
+            messages (list[tuple]): (body, attributes, group_id) tuples
+
+        Returns:
+            list[str]: The id assigned to every message, in the same order
+        """
+        pass
+
+    @abstractmethod
+    def receive(
+        self, queue_name: str, max_number_of_messages: int, visibility_timeout: float
+    ) -> list[dict]:
+        """
+        Receive visible messages, hiding them for visibility_timeout seconds
+
+        Args:
+            queue_name (str): The name of the queue
+            max_number_of_messages (int): Highest number of messages to receive
+            visibility_timeout (float): Seconds received messages are hidden from other consumers
+
+        Returns:
+            list[dict]: The received messages
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, queue_name: str, receipt_handles: list[str]) -> list[bool]:
+        """
+        Delete received messages
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handles (list[str]): The receipt handles of the messages
+
+        Returns:
+            list[bool]: Whether every receipt handle was valid, in the same order
+        """
+        pass
+
+    @abstractmethod
+    def change_visibility(
+        self, queue_name: str, receipt_handles: list[str], visibility_timeout: float
+    ) -> list[bool]:
+        """
+        Hide received messages for visibility_timeout seconds, counted from now
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handles (list[str]): The receipt handles of the messages
+            visibility_timeout (float): Seconds messages are hidden from other consumers
+
+        Returns:
+            list[bool]: Whether every receipt handle was valid, in the same order
+        """
+        pass
+
+    @abstractmethod
+    def count_messages(self, queue_name: str) -> dict:
+        """
+        Count the messages of a queue
+
+        Args:
+            queue_name (str): The name of the queue
+
+        Returns:
+            dict: A dict with the number of visible and in_flight messages
+        """
+        pass
+
+
+class _InMemoryQueue:
+    __slots__ = ("ready", "in_flight", "deadlines")
+
+    def __init__(self) -> None:
+        self.ready = deque()
+        self.in_flight = {}
+        self.deadlines = []
+
+
+class InMemoryBroker(LocalBroker):
+    def __init__(self) -> None:
+        """
+        Initialize InMemoryBroker
+
+        Messages are kept in memory and are not serialized, so consumers receive the same objects
+        that were published. Safe to use from many threads.
+
+        Returns:
+            None
+        """
+        self._subscriptions = {}
+        self._queues = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._prefix = uuid.uuid4().hex[:8]
+
+    def subscribe(self, topic_name: str, queue_name: str) -> None:
+        with self._lock:
+            queues = self._subscriptions.setdefault(topic_name, [])
+            if queue_name not in queues:
+                queues.append(queue_name)
+            self._queues.setdefault(queue_name, _InMemoryQueue())
+
+    def publish(self, topic_name: str, messages: list[tuple]) -> list[str]:
+        with self._lock:
+            queues = [
+                self._queues[queue_name] for queue_name in self._subscriptions.get(topic_name, [])
+            ]
+            return self._enqueue(queues, messages)
+
+    def send(self, queue_name: str, messages: list[tuple]) -> list[str]:
+        with self._lock:
+            return self._enqueue([self._get_queue(queue_name)], messages)
+
+    def receive(
+        self, queue_name: str, max_number_of_messages: int, visibility_timeout: float
+    ) -> list[dict]:
+        now = time.monotonic()
+        received = []
+        with self._lock:
+            queue = self._get_queue(queue_name)
+            self._requeue_expired(queue, now)
+            deadline = now + visibility_timeout
+            while queue.ready and len(received) < max_number_of_messages:
+                record = queue.ready.popleft()
+                receipt_handle = f"{record['message_id']}:{next(self._ids)}"
+                record["receive_count"] += 1
+                record["deadline"] = deadline
+                queue.in_flight[receipt_handle] = record
+                heapq.heappush(queue.deadlines, (deadline, receipt_handle))
+                received.append(
+                    {
+                        "message_id": record["message_id"],
+                        "receipt_handle": receipt_handle,
+                        "body": record["body"],
+                        "attributes": record["attributes"],
+                        "group_id": record["group_id"],
+                        "receive_count": record["receive_count"],
+                    }
+                )
+        return received
+
+    def delete(self, queue_name: str, receipt_handles: list[str]) -> list[bool]:
+        with self._lock:
+            queue = self._get_queue(queue_name)
+            return [
+                queue.in_flight.pop(receipt_handle, None) is not None
+                for receipt_handle in receipt_handles
+            ]
+
+    def change_visibility(
+        self, queue_name: str, receipt_handles: list[str], visibility_timeout: float
+    ) -> list[bool]:
+        deadline = time.monotonic() + visibility_timeout
+        results = []
+        with self._lock:
+            queue = self._get_queue(queue_name)
+            for receipt_handle in receipt_handles:
+                record = queue.in_flight.get(receipt_handle)
+                if record is not None:
+                    record["deadline"] = deadline
+                    heapq.heappush(queue.deadlines, (deadline, receipt_handle))
+                results.append(record is not None)
+        return results
+
+    def count_messages(self, queue_name: str) -> dict:
+        with self._lock:
+            queue = self._get_queue(queue_name)
+            self._requeue_expired(queue, time.monotonic())
+            return {"visible": len(queue.ready), "in_flight": len(queue.in_flight)}
+
+    def _get_queue(self, queue_name: str) -> _InMemoryQueue:
+        queue = self._queues.get(queue_name)
+        if queue is None:
+            queue = self._queues[queue_name] = _InMemoryQueue()
+        return queue
+
+    def _enqueue(self, queues: list, messages: list[tuple]) -> list[str]:
+        message_ids = []
+        for body, attributes, group_id in messages:
+            message_id = f"{self._prefix}-{next(self._ids)}"
+            message_ids.append(message_id)
+            for queue in queues:
+                queue.ready.append(
+                    {
+                        "message_id": message_id,
+                        "body": body,
+                        "attributes": attributes,
+                        "group_id": group_id,
+                        "receive_count": 0,
+                        "deadline": None,
+                    }
+                )
+        return message_ids
+
+    def _requeue_expired(self, queue: _InMemoryQueue, now: float) -> None:
+        expired = []
+        while queue.deadlines and queue.deadlines[0][0] <= now:
+            deadline, receipt_handle = heapq.heappop(queue.deadlines)
+            record = queue.in_flight.get(receipt_handle)
+            # Deleted messages and outdated deadlines of extended messages are skipped
+            if record is not None and record["deadline"] == deadline:
+                del queue.in_flight[receipt_handle]
+                expired.append(record)
+        queue.ready.extendleft(reversed(expired))
+
+
+class SQLiteBroker(LocalBroker):
+    def __init__(self, path: str) -> None:
+        """
+        Initialize SQLiteBroker with path
+
+        Messages are stored in a SQLite database, so they survive restarts and can be shared by
+        many processes using the same file. Bodies and attributes are stored as JSON.
+
+        Args:
+            path (str): The path of the database file, or :memory:
+
+        Returns:
+            None
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS subscriptions (
+                topic_name TEXT NOT NULL,
+                queue_name TEXT NOT NULL,
+                PRIMARY KEY (topic_name, queue_name)
+            );
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                queue_name TEXT NOT NULL,
+                message_id TEXT NOT NULL,
+                body TEXT NOT NULL,
+                attributes TEXT NOT NULL,
+                group_id TEXT,
+                receive_count INTEGER NOT NULL DEFAULT 0,
+                visible_at REAL NOT NULL,
+                receipt_handle TEXT
+            );
+            CREATE INDEX IF NOT EXISTS messages_visible_at
+                ON messages (queue_name, visible_at, id);
+            CREATE UNIQUE INDEX IF NOT EXISTS messages_receipt_handle
+                ON messages (receipt_handle);
+            """
+        )
+
+    def subscribe(self, topic_name: str, queue_name: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO subscriptions (topic_name, queue_name) VALUES (?, ?)",
+                (topic_name, queue_name),
+            )
+
+    def publish(self, topic_name: str, messages: list[tuple]) -> list[str]:
+        with self._lock:
+            queue_names = [
+                row[0]
+                for row in self._connection.execute(
+                    "SELECT queue_name FROM subscriptions WHERE topic_name = ?", (topic_name,)
+                )
+            ]
+            return self._enqueue(queue_names, messages)
+
+    def send(self, queue_name: str, messages: list[tuple]) -> list[str]:
+        with self._lock:
+            return self._enqueue([queue_name], messages)
+
+    def receive(
+        self, queue_name: str, max_number_of_messages: int, visibility_timeout: float
+    ) -> list[dict]:
+        now = time.time()
+        received = []
+        with self._lock, self._transaction():
+            rows = self._connection.execute(
+                "SELECT id, message_id, body, attributes, group_id, receive_count FROM messages "
+                "WHERE queue_name = ? AND visible_at <= ? ORDER BY id LIMIT ?",
+                (queue_name, now, max_number_of_messages),
+            ).fetchall()
+            for row_id, message_id, body, attributes, group_id, receive_count in rows:
+                receipt_handle = f"{message_id}:{uuid.uuid4().hex}"
+                self._connection.execute(
+                    "UPDATE messages SET receipt_handle = ?, visible_at = ?, "
+                    "receive_count = receive_count + 1 WHERE id = ?",
+                    (receipt_handle, now + visibility_timeout, row_id),
+                )
+                received.append(
+                    {
+                        "message_id": message_id,
+                        "receipt_handle": receipt_handle,
+                        "body": json.loads(body),
+                        "attributes": json.loads(attributes),
+                        "group_id": group_id,
+                        "receive_count": receive_count + 1,
+                    }
+                )
+        return received
+
+    def delete(self, queue_name: str, receipt_handles: list[str]) -> list[bool]:
+        with self._lock, self._transaction():
+            return [
+                self._connection.execute(
+                    "DELETE FROM messages WHERE queue_name = ? AND receipt_handle = ?",
+                    (queue_name, receipt_handle),
+                ).rowcount
+                > 0
+                for receipt_handle in receipt_handles
+            ]
+
+    def change_visibility(
+        self, queue_name: str, receipt_handles: list[str], visibility_timeout: float
+    ) -> list[bool]:
+        visible_at = time.time() + visibility_timeout
+        with self._lock, self._transaction():
+            return [
+                self._connection.execute(
+                    "UPDATE messages SET visible_at = ? WHERE queue_name = ? AND receipt_handle = ?",
+                    (visible_at, queue_name, receipt_handle),
+                ).rowcount
+                > 0
+                for receipt_handle in receipt_handles
+            ]
+
+    def count_messages(self, queue_name: str) -> dict:
+        with self._lock:
+            visible, total = self._connection.execute(
+                "SELECT COALESCE(SUM(visible_at <= ?), 0), COUNT(*) FROM messages "
+                "WHERE queue_name = ?",
+                (time.time(), queue_name),
+            ).fetchone()
+        return {"visible": visible, "in_flight": total - visible}
+
+    def close(self) -> None:
+        """
+        Close the database connection
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._connection.close()
+
+    def _transaction(self):
+        return _Transaction(self._connection)
+
+    def _enqueue(self, queue_names: list[str], messages: list[tuple]) -> list[str]:
+        now = time.time()
+        message_ids = [str(uuid.uuid4()) for _ in messages]
+        rows = [
+            (queue_name, message_id, json.dumps(body), json.dumps(attributes), group_id, now)
+            for message_id, (body, attributes, group_id) in zip(message_ids, messages)
+            for queue_name in queue_names
+        ]
+        with self._transaction():
+            self._connection.executemany(
+                "INSERT INTO messages (queue_name, message_id, body, attributes, group_id, "
+                "visible_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return message_ids
+
+
+class _Transaction:
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self._connection = connection
+
+    def __enter__(self):
+        self._connection.execute("BEGIN IMMEDIATE")
+        return self._connection
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
@@ -0,0 +1,150 @@
+import json
+from collections.abc import Callable
+from decimal import Decimal
+
+STRING = "String"
+NUMBER = "Number"
+BINARY = "Binary"
+STRING_ARRAY = "String.Array"
+# A custom String type: SNS and SQS accept any "String." suffix and treat the value as a
+# String, so filter policies match "true" and "false" while decode_attributes returns a bool
+BOOLEAN = "String.Boolean"
+DATA_TYPES = (STRING, NUMBER, BINARY, STRING_ARRAY, BOOLEAN)
+
+
+def _encode_string(value) -> dict:
+    return {"DataType": STRING, "StringValue": str(value)}
+
+
+def _encode_number(value) -> dict:
+    return {"DataType": NUMBER, "StringValue": str(value)}
+
+
+def _encode_binary(value) -> dict:
+    return {"DataType": BINARY, "BinaryValue": bytes(value)}
+
+
+def _encode_string_array(value) -> dict:
+    return {"DataType": STRING_ARRAY, "StringValue": json.dumps(list(value), default=str)}
+
+
+def _encode_boolean(value) -> dict:
+    return {"DataType": BOOLEAN, "StringValue": "true" if value else "false"}
+
+
+ENCODERS = {
+    STRING: _encode_string,
+    NUMBER: _encode_number,
+    BINARY: _encode_binary,
+    STRING_ARRAY: _encode_string_array,
+    BOOLEAN: _encode_boolean,
+}
+
+# Exact type lookups are cheaper than isinstance chains, subclasses fall back to _infer_encoder
+TYPE_ENCODERS = {
+    str: _encode_string,
+    bool: _encode_boolean,
+    int: _encode_number,
+    float: _encode_number,
+    Decimal: _encode_number,
+    bytes: _encode_binary,
+    bytearray: _encode_binary,
+    list: _encode_string_array,
+    tuple: _encode_string_array,
+}
+
+
+def _infer_encoder(value) -> Callable[[object], dict]:
+    for value_type, encoder in TYPE_ENCODERS.items():
+        if isinstance(value, value_type):
+            return encoder
+    return _encode_string
+
+
+def _decode_number(value: str) -> int | float:
+    try:
+        return int(value)
+    except ValueError:
+        return float(value)
+
+
+DECODERS = {
+    STRING: lambda attribute: attribute["StringValue"],
+    NUMBER: lambda attribute: _decode_number(attribute["StringValue"]),
+    BINARY: lambda attribute: attribute["BinaryValue"],
+    STRING_ARRAY: lambda attribute: json.loads(attribute["StringValue"]),
+    BOOLEAN: lambda attribute: attribute["StringValue"] == "true",
+}
+
+
+class AttributeEncoder:
+    def __init__(self, schema: dict[str, str] = {}) -> None:
+        """
+        Initialize AttributeEncoder with schema
+
+        Encodes message attributes into SNS / SQS typed attributes: str as String, int, float
+        and Decimal as Number (usable by numeric filter policies), bytes as Binary, lists and
+        tuples as String.Array and bool as String.Boolean. Other values are sent as String.
+        String.Boolean is not an SNS data type but a custom String type, valued "true" or
+        "false": filter policies and consumers without decode_attributes see a String.
+
+        The encoder of every attribute in schema is resolved once, so encoding skips type
+        checks. Keep one AttributeEncoder per event schema and reuse it across publishes.
+
+        Args:
+            schema (dict[str, str], optional): Maps attribute names to their data type, one of
+                String, Number, Binary, String.Array or String.Boolean. Attributes missing from
+                the schema have their type inferred from their value. Defaults to {}.
+
+        Raises:
+            ValueError: If a data type of schema is not supported
+
+        Returns:
+            None
+        """
+        for name, data_type in schema.items():
+            if data_type not in ENCODERS:
+                raise ValueError(f"{name} data type must be one of {', '.join(DATA_TYPES)}.")
+        self.schema = dict(schema)
+        self._encoders = {name: ENCODERS[data_type] for name, data_type in schema.items()}
+
+    def encode(self, attributes: dict) -> dict:
+        """
+        Encode message attributes
+
+        Args:
+            attributes (dict): Maps attribute names to their native values
+
+        Returns:
+            dict: The MessageAttributes parameter of SNS / SQS calls
+        """
+        encoders = self._encoders
+        message_attributes = {}
+        for name, value in attributes.items():
+            encoder = encoders.get(name) or TYPE_ENCODERS.get(type(value))
+            if encoder is None:
+                encoder = _infer_encoder(value)
+            message_attributes[name] = encoder(value)
+        return message_attributes
+
+
+def decode_attributes(message_attributes: dict) -> dict:
+    """
+    Decode SNS / SQS typed message attributes into native values
+
+    Custom types (e.g. Number.float) are decoded as their base type.
+
+    Args:
+        message_attributes (dict): The MessageAttributes of a received message
+
+    Returns:
+        dict: Maps attribute names to their native values
+    """
+    attributes = {}
+    for name, attribute in message_attributes.items():
+        data_type = attribute["DataType"]
+        decoder = DECODERS.get(data_type)
+        if decoder is None:
+            decoder = DECODERS.get(data_type.partition(".")[0], DECODERS[STRING])
+        attributes[name] = decoder(attribute)
+    return attributes
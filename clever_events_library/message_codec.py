@@ -0,0 +1,144 @@
+import base64
+import json
+import zlib
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+CODEC_ATTRIBUTE = "clever_events_codec"
+DEFAULT_CODEC = "json"
+
+
+class MessageCodec:
+    def __init__(self, serializer: str = "json", compression: str = None) -> None:
+        """
+        Initialize MessageCodec with serializer and compression
+
+        The codec turns a message into the text body sent to the events / queues stack and back.
+        Binary outputs (msgpack or compressed payloads) are base64 encoded, since SNS / SQS only
+        accept text bodies.
+
+        Args:
+            serializer (str, optional): json, orjson or msgpack. Defaults to json.
+            compression (str, optional): zlib or zstd. Defaults to None, no compression.
+
+        Raises:
+            ValueError: If serializer or compression is not supported
+            ImportError: If the library needed by serializer or compression is not installed
+
+        Returns:
+            None
+        """
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"serializer must be one of {', '.join(SERIALIZERS)}.")
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"compression must be one of {', '.join(COMPRESSIONS)}.")
+        if serializer == "orjson" and orjson is None:
+            raise ImportError("orjson is required to use the orjson serializer")
+        if serializer == "msgpack" and msgpack is None:
+            raise ImportError("msgpack is required to use the msgpack serializer")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstandard is required to use the zstd compression")
+
+        self.serializer = serializer
+        self.compression = compression
+        self.name = serializer if compression is None else f"{serializer}+{compression}"
+        self._dumps, self._loads, self._binary = SERIALIZERS[serializer]
+        self._compress, self._decompress = COMPRESSIONS.get(compression, (None, None))
+
+    def encode(self, message) -> str:
+        """
+        Encode a message into a text body
+
+        Args:
+            message: The message to be encoded
+
+        Returns:
+            str: The encoded body
+        """
+        body = self._dumps(message)
+        if self._compress is None and not self._binary:
+            return body if isinstance(body, str) else body.decode("utf-8")
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if self._compress is not None:
+            body = self._compress(body)
+        return base64.b64encode(body).decode("ascii")
+
+    def decode(self, body: str):
+        """
+        Decode a text body into a message
+
+        Args:
+            body (str): The encoded body
+
+        Returns:
+            The decoded message
+        """
+        if self._compress is None and not self._binary:
+            return self._loads(body)
+        body = base64.b64decode(body)
+        if self._decompress is not None:
+            body = self._decompress(body)
+        return self._loads(body)
+
+
+def _zstd_compress(body: bytes) -> bytes:
+    return zstandard.ZstdCompressor().compress(body)
+
+
+def _zstd_decompress(body: bytes) -> bytes:
+    return zstandard.ZstdDecompressor().decompress(body)
+
+
+SERIALIZERS = {
+    "json": (json.dumps, json.loads, False),
+    "orjson": (lambda message: orjson.dumps(message), lambda body: orjson.loads(body), False),
+    "msgpack": (
+        lambda message: msgpack.packb(message),
+        lambda body: msgpack.unpackb(body),
+        True,
+    ),
+}
+
+COMPRESSIONS = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "zstd": (_zstd_compress, _zstd_decompress),
+}
+
+_codecs = {}
+
+
+def get_codec(codec) -> MessageCodec:
+    """
+    Get a MessageCodec from its name, e.g. json, orjson+zlib or msgpack+zstd
+
+    Codecs are cached, so looking them up on every message is cheap.
+
+    Args:
+        codec (MessageCodec | str): A codec or a codec name
+
+    Raises:
+        ValueError: If the codec name is not supported
+
+    Returns:
+        MessageCodec: The codec
+    """
+    if isinstance(codec, MessageCodec):
+        return codec
+    if codec not in _codecs:
+        serializer, _, compression = codec.partition("+")
+        _codecs[codec] = MessageCodec(serializer, compression or None)
+    return _codecs[codec]
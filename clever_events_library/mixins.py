@@ -1,8 +1,29 @@
+import asyncio
+import logging
 import os
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack
 
+from aiobotocore.config import AioConfig
 from dotenv import load_dotenv
 
-load_dotenv()
+from .instrumentation import Instrumentation
+from .resource_resolver import ResourceResolver
+
+logger = logging.getLogger(__name__)
+
+AWS_CONFIG_KEYS = ("aws_region", "aws_key", "aws_secret", "aws_account_id")
+
+_dotenv_loaded = False
+
+
+def _load_dotenv_once() -> None:
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        load_dotenv()
+        _dotenv_loaded = True
 
 
 class AwsHelperMixin:
@@ -25,6 +46,9 @@ class AwsHelperMixin:
                 - aws_secret: AWS secret key
                 - aws_account_id: AWS
         """
+        # .env is only read when a value is missing, so importing the library costs nothing
+        if not all(config_data.get(key) for key in AWS_CONFIG_KEYS):
+            _load_dotenv_once()
 
         aws_region = config_data.get("aws_region", os.environ.get("AWS_REGION"))
         aws_key = config_data.get("aws_key", os.environ.get("AWS_ACCESS_KEY_ID"))
@@ -47,5 +71,185 @@ class AwsHelperMixin:
             "aws_account_id": aws_account_id,
         }
 
+    @property
+    def resource_resolver(self) -> ResourceResolver:
+        resolver = getattr(self, "_resource_resolver", None)
+        if resolver is None:
+            resolver = ResourceResolver(
+                self.aws_client_params["aws_region"], self.aws_client_params["aws_account_id"]
+            )
+            self._resource_resolver = resolver
+        return resolver
+
     def _get_topic_arn(self, service: str, topic_name: str) -> str:
-        return f"arn:aws:{service}:{self.aws_client_params['aws_region']}:{self.aws_client_params['aws_account_id']}:{topic_name}"
+        return self.resource_resolver.get_topic_arn(service, topic_name)
+
+
+class AsyncClientMixin:
+    """
+    Keeps a long-lived aioboto3 client so concurrent async calls share one warm connection pool.
+
+    Classes using this mixin must implement _get_async_client_context, returning the aioboto3
+    client context manager to be entered. The client is created lazily on first use and closed
+    with `await adapter.aclose()` or by using the adapter as an async context manager.
+    """
+
+    def _init_async_client(self, max_pool_connections: int, keepalive_timeout: float) -> None:
+        """
+        Initialize the async client state
+
+        Args:
+            max_pool_connections (int): Highest number of connections kept in the pool.
+            keepalive_timeout (float): Seconds an idle connection is kept open for reuse.
+
+        Raises:
+            ValueError: If max_pool_connections is not positive or keepalive_timeout is negative.
+
+        Returns:
+            None
+        """
+        if max_pool_connections < 1:
+            raise ValueError("max_pool_connections must be a positive integer.")
+        if keepalive_timeout < 0:
+            raise ValueError("keepalive_timeout must be a non-negative number.")
+        self._max_pool_connections = max_pool_connections
+        self._keepalive_timeout = keepalive_timeout
+        self._async_client = None
+        self._async_client_loop = None
+        self._async_client_lock = None
+        self._async_exit_stack = None
+
+    def _get_async_client_config(self) -> AioConfig:
+        return AioConfig(
+            max_pool_connections=self._max_pool_connections,
+            connector_args={"keepalive_timeout": self._keepalive_timeout},
+        )
+
+    def _get_async_client_context(self):
+        raise NotImplementedError
+
+    async def _get_async_client(self):
+        loop = asyncio.get_running_loop()
+        if self._async_client is not None and self._async_client_loop is loop:
+            return self._async_client
+
+        # Clients are bound to the event loop they were created in, so a new loop gets a new one
+        if self._async_client_lock is None or self._async_client_lock[0] is not loop:
+            self._async_client_lock = (loop, asyncio.Lock())
+        async with self._async_client_lock[1]:
+            if self._async_client is None or self._async_client_loop is not loop:
+                exit_stack = AsyncExitStack()
+                client = await exit_stack.enter_async_context(self._get_async_client_context())
+                self._async_client = client
+                self._async_client_loop = loop
+                self._async_exit_stack = exit_stack
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """
+        Close the async client and release its pooled connections
+
+        Returns:
+            None
+        """
+        exit_stack = self._async_exit_stack
+        self._async_client = None
+        self._async_client_loop = None
+        self._async_exit_stack = None
+        if exit_stack is not None:
+            await exit_stack.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+
+class InstrumentationMixin:
+    """
+    Wraps adapter calls with the hooks of an Instrumentation.
+
+    Classes using this mixin call _init_instrumentation and check `self.instrumentation is None`
+    before wrapping, so the uninstrumented path costs a single attribute lookup. Errors raised by
+    the hooks are logged and never break the wrapped call.
+    """
+
+    def _init_instrumentation(self, instrumentation: Instrumentation = None) -> None:
+        self.instrumentation = instrumentation
+        self._in_flight_calls = {}
+        self._in_flight_lock = threading.Lock()
+
+    def _instrument(
+        self,
+        operation: str,
+        destination: str,
+        metrics: dict,
+        call: Callable[[], object],
+        result_metrics: Callable[[object], dict] = None,
+    ):
+        context = self._start_call(operation, destination)
+        start = time.perf_counter()
+        try:
+            result = call()
+        except Exception as error:
+            self._end_call(context, operation, destination, start, metrics, error)
+            raise
+        if result_metrics is not None:
+            metrics.update(result_metrics(result))
+        self._end_call(context, operation, destination, start, metrics)
+        return result
+
+    async def _async_instrument(
+        self,
+        operation: str,
+        destination: str,
+        metrics: dict,
+        call: Callable[[], Awaitable],
+        result_metrics: Callable[[object], dict] = None,
+    ):
+        context = self._start_call(operation, destination)
+        start = time.perf_counter()
+        try:
+            result = await call()
+        except Exception as error:
+            self._end_call(context, operation, destination, start, metrics, error)
+            raise
+        if result_metrics is not None:
+            metrics.update(result_metrics(result))
+        self._end_call(context, operation, destination, start, metrics)
+        return result
+
+    def _start_call(self, operation: str, destination: str):
+        count = self._update_in_flight_calls(operation, destination, 1)
+        try:
+            self.instrumentation.record_in_flight(operation, destination, count)
+            return self.instrumentation.start_call(operation, destination)
+        except Exception:
+            logger.exception("Instrumentation failed to start %s call", operation)
+            return None
+
+    def _end_call(
+        self,
+        context,
+        operation: str,
+        destination: str,
+        start: float,
+        metrics: dict,
+        error: Exception = None,
+    ) -> None:
+        duration = time.perf_counter() - start
+        count = self._update_in_flight_calls(operation, destination, -1)
+        try:
+            self.instrumentation.end_call(
+                context, operation, destination, duration, metrics, error
+            )
+            self.instrumentation.record_in_flight(operation, destination, count)
+        except Exception:
+            logger.exception("Instrumentation failed to end %s call", operation)
+
+    def _update_in_flight_calls(self, operation: str, destination: str, delta: int) -> int:
+        with self._in_flight_lock:
+            count = self._in_flight_calls.get((operation, destination), 0) + delta
+            self._in_flight_calls[(operation, destination)] = count
+            return count
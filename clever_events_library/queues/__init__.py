@@ -1 +1,11 @@
+from .ack_accumulator import AckAccumulator
+from .dead_letter_policy import DeadLetterPolicy
+from .dedup_cache import InMemoryDedupCache, RedisDedupCache, SQLiteDedupCache
+from .dispatcher import Dispatcher
+from .fifo_queue_worker import FifoQueueWorker
+from .lease_manager import LeaseManager
+from .multi_queue_consumer import MultiQueueConsumer
 from .queue_manager import QueueManager
+from .queue_message import QueueMessage
+from .queue_worker import QueueWorker
+from .receive_strategy import AdaptiveReceiveStrategy
@@ -0,0 +1,190 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from .adapters import QueueBaseAdapter
+
+logger = logging.getLogger(__name__)
+
+
+class AckAccumulator:
+    def __init__(
+        self,
+        queue_adapter: QueueBaseAdapter,
+        batch_size: int = 10,
+        flush_interval: float = 1.0,
+        on_failure: Callable[[str, dict], None] = None,
+    ) -> None:
+        """
+        Initialize AckAccumulator with queue_adapter
+
+        Receipt handles added from a consumer loop are deleted in batches from a background
+        thread, when batch_size handles of the same queue are pending or when the oldest pending
+        handle has waited flush_interval seconds. Adding a handle never waits for the stack, so it
+        can be used from both sync and async consumer loops.
+
+        Args:
+            queue_adapter (QueueBaseAdapter): An instance of QueueBaseAdapter
+            batch_size (int, optional): Number of pending handles of a queue that triggers a flush. Defaults to 10.
+            flush_interval (float, optional): Seconds a handle can wait before being flushed. Defaults to 1.0.
+            on_failure (Callable, optional): Called with the queue name and the failed entry result
+                for every message that could not be deleted. Failures are logged when not provided.
+
+        Raises:
+            ValueError: If batch_size or flush_interval is not positive
+
+        Returns:
+            None
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be a positive number.")
+
+        self.queue_adapter = queue_adapter
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._on_failure = on_failure
+
+        self._pending = {}
+        self._condition = threading.Condition()
+        self._added_count = 0
+        self._processed_count = 0
+        self._flush_requested = False
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="AckAccumulator", daemon=True)
+        self._worker.start()
+
+    def add(self, queue_name: str, receipt_handle: str) -> None:
+        """
+        Add the receipt handle of a processed message to be deleted
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handle (str): The id of the message we want to delete
+
+        Raises:
+            RuntimeError: If the accumulator is closed
+
+        Returns:
+            None
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("AckAccumulator is closed")
+            self._pending.setdefault(queue_name, []).append((receipt_handle, time.monotonic()))
+            self._added_count += 1
+            self._condition.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Block until every receipt handle added before this call has been deleted
+
+        Args:
+            timeout (float, optional): Highest number of seconds to wait. Waits forever by default.
+
+        Returns:
+            bool: True if every handle was processed, False if timeout expired first
+        """
+        with self._condition:
+            target = self._added_count
+            self._flush_requested = True
+            self._condition.notify_all()
+            self._condition.wait_for(
+                lambda: self._processed_count >= target or not self._worker.is_alive(),
+                timeout=timeout,
+            )
+            return self._processed_count >= target
+
+    def close(self, timeout: float = None) -> None:
+        """
+        Stop accepting receipt handles, delete the pending ones and stop the background thread
+
+        Args:
+            timeout (float, optional): Highest number of seconds to wait. Waits forever by default.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _get_due_queue(self) -> str:
+        now = time.monotonic()
+        force = self._closed or self._flush_requested
+        for queue_name, handles in self._pending.items():
+            if force or len(handles) >= self._batch_size:
+                return queue_name
+            if now - handles[0][1] >= self._flush_interval:
+                return queue_name
+        return None
+
+    def _get_wait_timeout(self) -> float:
+        if not self._pending:
+            return None
+        oldest = min(handles[0][1] for handles in self._pending.values())
+        return oldest + self._flush_interval - time.monotonic()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                queue_name = self._get_due_queue()
+                while queue_name is None:
+                    if self._closed:
+                        return
+                    self._flush_requested = False
+                    self._condition.wait(self._get_wait_timeout())
+                    queue_name = self._get_due_queue()
+                handles = self._pending[queue_name][: self._batch_size]
+                del self._pending[queue_name][: self._batch_size]
+                if not self._pending[queue_name]:
+                    del self._pending[queue_name]
+
+            self._delete_handles(queue_name, [receipt_handle for receipt_handle, _ in handles])
+
+            with self._condition:
+                self._processed_count += len(handles)
+                self._condition.notify_all()
+
+    def _delete_handles(self, queue_name: str, receipt_handles: list[str]) -> None:
+        try:
+            results = self.queue_adapter.delete_messages(queue_name, receipt_handles)
+        except Exception as error:
+            logger.exception("Failed to delete messages from %s", queue_name)
+            results = [
+                {
+                    "index": index,
+                    "receipt_handle": receipt_handle,
+                    "success": False,
+                    "error_code": type(error).__name__,
+                    "error_message": str(error),
+                    "sender_fault": False,
+                }
+                for index, receipt_handle in enumerate(receipt_handles)
+            ]
+        for result in results:
+            if not result["success"]:
+                self._report_failure(queue_name, result)
+
+    def _report_failure(self, queue_name: str, result: dict) -> None:
+        if self._on_failure is None:
+            logger.error(
+                "Failed to delete message from %s: %s %s",
+                queue_name,
+                result["error_code"],
+                result["error_message"],
+            )
+            return
+        try:
+            self._on_failure(queue_name, result)
+        except Exception:
+            logger.exception("on_failure callback raised for %s", queue_name)
@@ -1,2 +1,3 @@
+from .local_adapter import InMemoryQueueAdapter, LocalQueueAdapter, SQLiteQueueAdapter
 from .queue_base_adapter import QueueBaseAdapter
 from .sqs_adapter import SQSAdapter
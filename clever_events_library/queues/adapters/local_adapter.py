@@ -0,0 +1,252 @@
+from collections.abc import Iterator
+
+from ...local_broker import InMemoryBroker, LocalBroker, SQLiteBroker
+from ..queue_message import QueueMessage
+from .queue_base_adapter import QueueBaseAdapter
+
+
+class LocalQueueAdapter(QueueBaseAdapter):
+    def __init__(self, broker: LocalBroker, visibility_timeout: float = 30) -> None:
+        """
+        Initialize LocalQueueAdapter with broker
+
+        Fetches messages from a LocalBroker instead of SQS, so pipelines can be run and load tested
+        without AWS.
+
+        Args:
+            broker (LocalBroker): The broker messages are fetched from
+            visibility_timeout (float, optional): Seconds fetched messages are hidden from other
+                consumers. Defaults to 30, the SQS queue default.
+
+        Returns:
+            None
+        """
+        self.broker = broker
+        self.set_visibility_timeout(visibility_timeout)
+
+    def set_visibility_timeout(self, visibility_timeout: float) -> None:
+        """
+        Set the time messages are hidden from other consumers after being received by current one
+
+        Args:
+            visibility_timeout (float): The amount of seconds messages are hidden from other consumers
+
+        Raises:
+            ValueError: If visibility_timeout is negative.
+
+        Returns:
+            None
+        """
+        if visibility_timeout < 0:
+            raise ValueError("visibility_timeout must be a non-negative integer.")
+        self._visibility_timeout = visibility_timeout
+
+    def fetch_messages(self, queue_name: str, max_number_of_messages: int = 1) -> Iterator[dict]:
+        """
+        Fetch messages from the queue
+
+        Args:
+            queue_name (str): The name of the queue
+            max_number_of_messages (int, optional): Highest number of messages we want to fetch. Defaults to 1.
+
+        Yields:
+            Iterator[dict]: A generator that yields messages from the queue
+        """
+        for message in self.broker.receive(
+            queue_name, max_number_of_messages, self._visibility_timeout
+        ):
+            yield self._parse_message(queue_name, message)
+
+    async def async_fetch_messages(
+        self, queue_name: str, max_number_of_messages: int = 1
+    ) -> list[dict]:
+        """
+        Asynchronously fetch messages from the queue
+
+        Args:
+            queue_name (str): The name of the queue
+            max_number_of_messages (int, optional): Highest number of messages we want to fetch. Defaults to 1.
+
+        Returns:
+            list[dict]: The messages fetched from the queue
+        """
+        return list(self.fetch_messages(queue_name, max_number_of_messages))
+
+    def delete_message(self, queue_name: str, message_id: str) -> dict:
+        """
+        Delete a message from the queue
+
+        Args:
+            queue_name (str): The name of the queue
+            message_id (str): The receipt handle of the message we want to delete
+
+        Raises:
+            ValueError: If the receipt handle is not valid
+
+        Returns:
+            dict: A dict containing the response of the deletion
+        """
+        if not self.broker.delete(queue_name, [message_id])[0]:
+            raise ValueError(f"Receipt handle {message_id} is not valid")
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+
+    async def async_delete_message(self, queue_name: str, message_id: str) -> dict:
+        """
+        Asynchronously delete a message from the queue
+
+        Args:
+            queue_name (str): The name of the queue
+            message_id (str): The receipt handle of the message we want to delete
+
+        Raises:
+            ValueError: If the receipt handle is not valid
+
+        Returns:
+            dict: A dict containing the response of the deletion
+        """
+        return self.delete_message(queue_name, message_id)
+
+    def delete_messages(self, queue_name: str, receipt_handles: list[str]) -> list[dict]:
+        """
+        Delete a batch of messages from the queue
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handles (list[str]): The ids of the messages we want to delete
+
+        Returns:
+            list[dict]: One result per receipt handle, in the same order
+        """
+        return self._get_results(receipt_handles, self.broker.delete(queue_name, receipt_handles))
+
+    async def async_delete_messages(
+        self, queue_name: str, receipt_handles: list[str]
+    ) -> list[dict]:
+        """
+        Asynchronously delete a batch of messages from the queue
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handles (list[str]): The ids of the messages we want to delete
+
+        Returns:
+            list[dict]: One result per receipt handle, in the same order
+        """
+        return self.delete_messages(queue_name, receipt_handles)
+
+    def change_messages_visibility(
+        self, queue_name: str, receipt_handles: list[str], visibility_timeout: int
+    ) -> list[dict]:
+        """
+        Change the visibility timeout of a batch of in-flight messages
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handles (list[str]): The ids of the messages we want to change
+            visibility_timeout (int): The amount of seconds, counted from now, messages are hidden from other consumers
+
+        Raises:
+            ValueError: If visibility_timeout is negative.
+
+        Returns:
+            list[dict]: One result per receipt handle, in the same order
+        """
+        if visibility_timeout < 0:
+            raise ValueError("visibility_timeout must be a non-negative integer.")
+        return self._get_results(
+            receipt_handles,
+            self.broker.change_visibility(queue_name, receipt_handles, visibility_timeout),
+        )
+
+    def send_messages(self, queue_name: str, messages: list[QueueMessage]) -> list[dict]:
+        """
+        Send fetched messages to another queue, with their body, attributes and message group
+
+        Args:
+            queue_name (str): The name of the queue the messages are sent to
+            messages (list[QueueMessage]): Messages fetched with fetch_messages
+
+        Returns:
+            list[dict]: One result per message, in the same order, see send_messages
+        """
+        self.broker.send(
+            queue_name,
+            [
+                (message.body, message.message_attributes, message.message_group_id)
+                for message in messages
+            ],
+        )
+        return self._get_results(
+            [message.message_receipt_handle for message in messages], [True] * len(messages)
+        )
+
+    def get_queue_depth(self, queue_name: str) -> int:
+        """
+        Get the number of visible messages of the queue
+
+        Args:
+            queue_name (str): The name of the queue
+
+        Returns:
+            int: The number of visible messages
+        """
+        return self.broker.count_messages(queue_name)["visible"]
+
+    def _parse_message(self, queue_name: str, message: dict) -> QueueMessage:
+        return QueueMessage(
+            message["message_id"],
+            message["receipt_handle"],
+            message["body"],
+            message["attributes"],
+            adapter=self,
+            queue_name=queue_name,
+            message_group_id=message["group_id"],
+            receive_count=message["receive_count"],
+        )
+
+    def _get_results(self, receipt_handles: list[str], outcomes: list[bool]) -> list[dict]:
+        return [
+            {
+                "index": index,
+                "receipt_handle": receipt_handle,
+                "success": success,
+                "error_code": None if success else "ReceiptHandleIsInvalid",
+                "error_message": None if success else "The receipt handle is not valid",
+                "sender_fault": not success,
+            }
+            for index, (receipt_handle, success) in enumerate(zip(receipt_handles, outcomes))
+        ]
+
+
+class InMemoryQueueAdapter(LocalQueueAdapter):
+    def __init__(self, broker: InMemoryBroker = None, visibility_timeout: float = 30) -> None:
+        """
+        Initialize InMemoryQueueAdapter with broker
+
+        Args:
+            broker (InMemoryBroker, optional): The broker messages are fetched from. Share it with
+                InMemoryEventAdapter to consume its events. A new one is created by default.
+            visibility_timeout (float, optional): Seconds fetched messages are hidden from other
+                consumers. Defaults to 30.
+
+        Returns:
+            None
+        """
+        super().__init__(broker or InMemoryBroker(), visibility_timeout)
+
+
+class SQLiteQueueAdapter(LocalQueueAdapter):
+    def __init__(self, path: str, visibility_timeout: float = 30) -> None:
+        """
+        Initialize SQLiteQueueAdapter with path
+
+        Args:
+            path (str): The path of the SQLite database messages are stored in. Use the same path
+                in SQLiteEventAdapter to publish events to it.
+            visibility_timeout (float, optional): Seconds fetched messages are hidden from other
+                consumers. Defaults to 30.
+
+        Returns:
+            None
+        """
+        super().__init__(SQLiteBroker(path), visibility_timeout)
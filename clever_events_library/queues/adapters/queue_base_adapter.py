@@ -1,5 +1,9 @@
 from abc import ABC, abstractmethod
 from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..queue_message import QueueMessage
 
 
 class QueueBaseAdapter(ABC):
@@ -31,3 +35,196 @@ class QueueBaseAdapter(ABC):
             dict: A dict containing the response we got from the stack when performing deletion
         """
         pass
+
+    @abstractmethod
+    async def async_fetch_messages(
+        self, queue_name: str, max_number_of_messages: int = 1
+    ) -> list[dict]:
+        """
+        Asynchronously fetch messages from the queue
+
+        Args:
+            queue_name (str): The name of the queue
+            max_number_of_messages (int, optional): Highest number of messages we want to fetch. Defaults to 1.
+
+        Returns:
+            list[dict]: The messages fetched from the queue
+        """
+        pass
+
+    @abstractmethod
+    async def async_delete_message(self, queue_name: str, message_id: str) -> dict:
+        """
+        Asynchronously delete a message from the queue
+
+        Args:
+            queue_name (str): The name of the queue
+            message_id (str): The id of the message we want to delete
+
+        Returns:
+            dict: A dict containing the response we got from the stack when performing deletion
+        """
+        pass
+
+    def delete_messages(self, queue_name: str, receipt_handles: list[str]) -> list[dict]:
+        """
+        Delete a batch of messages from the queue
+
+        Falls back to one delete_message call per receipt handle. Adapters with a batch delete
+        call should override it.
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handles (list[str]): The ids of the messages we want to delete
+
+        Returns:
+            list[dict]: One result per receipt handle, in the same order, with the following keys:
+                - index: Position of the receipt handle in receipt_handles
+                - receipt_handle: The id of the message
+                - success: Whether the message was deleted
+                - error_code: The error code, None on success
+                - error_message: The error message, None on success
+                - sender_fault: Whether the failure was caused by the request itself
+        """
+        results = []
+        for index, receipt_handle in enumerate(receipt_handles):
+            try:
+                self.delete_message(queue_name, receipt_handle)
+            except Exception as error:
+                results.append(self._get_failed_result(index, receipt_handle, error))
+            else:
+                results.append(self._get_successful_result(index, receipt_handle))
+        return results
+
+    async def async_delete_messages(
+        self, queue_name: str, receipt_handles: list[str]
+    ) -> list[dict]:
+        """
+        Asynchronously delete a batch of messages from the queue
+
+        Falls back to one async_delete_message call per receipt handle. Adapters with a batch
+        delete call should override it.
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handles (list[str]): The ids of the messages we want to delete
+
+        Returns:
+            list[dict]: One result per receipt handle, in the same order. See delete_messages.
+        """
+        results = []
+        for index, receipt_handle in enumerate(receipt_handles):
+            try:
+                await self.async_delete_message(queue_name, receipt_handle)
+            except Exception as error:
+                results.append(self._get_failed_result(index, receipt_handle, error))
+            else:
+                results.append(self._get_successful_result(index, receipt_handle))
+        return results
+
+    def change_messages_visibility(
+        self, queue_name: str, receipt_handles: list[str], visibility_timeout: int
+    ) -> list[dict]:
+        """
+        Change the visibility timeout of a batch of in-flight messages
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handles (list[str]): The ids of the messages we want to change
+            visibility_timeout (int): The amount of seconds, counted from now, messages are hidden from other consumers
+
+        Raises:
+            NotImplementedError: If the adapter can't change the visibility of messages
+
+        Returns:
+            list[dict]: One result per receipt handle, in the same order. See delete_messages.
+        """
+        raise NotImplementedError(f"{type(self).__name__} doesn't change message visibility")
+
+    def get_queue_depth(self, queue_name: str) -> int:
+        """
+        Get the approximate number of visible messages of the queue
+
+        Args:
+            queue_name (str): The name of the queue
+
+        Raises:
+            NotImplementedError: If the adapter can't report the queue depth
+
+        Returns:
+            int: The approximate number of visible messages
+        """
+        raise NotImplementedError(f"{type(self).__name__} doesn't report queue depth")
+
+    async def async_get_queue_depth(self, queue_name: str) -> int:
+        """
+        Asynchronously get the approximate number of visible messages of the queue
+
+        Args:
+            queue_name (str): The name of the queue
+
+        Raises:
+            NotImplementedError: If the adapter can't report the queue depth
+
+        Returns:
+            int: The approximate number of visible messages
+        """
+        return self.get_queue_depth(queue_name)
+
+    def send_messages(self, queue_name: str, messages: list["QueueMessage"]) -> list[dict]:
+        """
+        Send fetched messages to another queue, with their body and attributes unchanged
+
+        Used to move messages to and from dead-letter queues. The messages of FIFO queues keep
+        their message group.
+
+        Args:
+            queue_name (str): The name of the queue the messages are sent to
+            messages (list[QueueMessage]): Messages fetched with fetch_messages
+
+        Raises:
+            NotImplementedError: If the adapter can't send messages
+
+        Returns:
+            list[dict]: One result per message, in the same order, see delete_messages. The
+                receipt_handle of every result is the one of the message sent.
+        """
+        raise NotImplementedError(f"{type(self).__name__} doesn't send messages")
+
+    async def async_send_messages(
+        self, queue_name: str, messages: list["QueueMessage"]
+    ) -> list[dict]:
+        """
+        Asynchronously send fetched messages to another queue, see send_messages
+
+        Args:
+            queue_name (str): The name of the queue the messages are sent to
+            messages (list[QueueMessage]): Messages fetched with async_fetch_messages
+
+        Raises:
+            NotImplementedError: If the adapter can't send messages
+
+        Returns:
+            list[dict]: One result per message, in the same order, see send_messages
+        """
+        return self.send_messages(queue_name, messages)
+
+    def _get_successful_result(self, index: int, receipt_handle: str) -> dict:
+        return {
+            "index": index,
+            "receipt_handle": receipt_handle,
+            "success": True,
+            "error_code": None,
+            "error_message": None,
+            "sender_fault": False,
+        }
+
+    def _get_failed_result(self, index: int, receipt_handle: str, error: Exception) -> dict:
+        return {
+            "index": index,
+            "receipt_handle": receipt_handle,
+            "success": False,
+            "error_code": type(error).__name__,
+            "error_message": str(error),
+            "sender_fault": False,
+        }
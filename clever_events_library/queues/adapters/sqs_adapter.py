@@ -1,14 +1,37 @@
 import json
+import threading
 from collections.abc import Iterator
+from functools import partial
 
 import boto3
+from aioboto3.session import Session
+from botocore.exceptions import BotoCoreError, ClientError
 
-from ...mixins import AwsHelperMixin
+from ...claim_check import CLAIM_CHECK_ATTRIBUTE, BlobStore
+from ...message_attributes import decode_attributes
+from ...message_codec import CODEC_ATTRIBUTE, get_codec
+from ...mixins import AsyncClientMixin, AwsHelperMixin
+from ..queue_message import QueueMessage
+from ..receive_strategy import AdaptiveReceiveStrategy
 from . import QueueBaseAdapter
 
+SQS_BATCH_MAX_ENTRIES = 10
+SQS_MAX_PAYLOAD_SIZE = 262144
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_TIMEOUT = 15
 
-class SQSAdapter(AwsHelperMixin, QueueBaseAdapter):
-    def __init__(self, client_config: dict = {}) -> None:
+
+class SQSAdapter(AwsHelperMixin, AsyncClientMixin, QueueBaseAdapter):
+    def __init__(
+        self,
+        client_config: dict = {},
+        max_pool_connections: int = DEFAULT_MAX_POOL_CONNECTIONS,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        claim_check_store: BlobStore = None,
+        resolve_queue_urls: bool = False,
+        receive_strategy: AdaptiveReceiveStrategy = None,
+        decode_attributes: bool = False,
+    ) -> None:
         """
         Initialize SQSAdapter with client_config
 
@@ -21,14 +44,48 @@ class SQSAdapter(AwsHelperMixin, QueueBaseAdapter):
                 - aws_secret: AWS secret key
             If not provided, values will be fetched from environment variables.
             Defaults to {}.
+            max_pool_connections (int, optional): Highest number of connections kept by the async
+                client pool. Defaults to 10.
+            keepalive_timeout (float, optional): Seconds an idle async connection is kept open for
+                reuse. Defaults to 15.
+            claim_check_store (BlobStore, optional): The store messages offloaded by SNSAdapter
+                claim check are read from. Their message_data is read from the store on first
+                access. Defaults to None.
+            resolve_queue_urls (bool, optional): Resolve queue URLs with GetQueueUrl the first time
+                each queue is used instead of building them from the region and account id. Queues
+                of other accounts can then be used as "<account_id>/<queue_name>". Defaults to False.
+            receive_strategy (AdaptiveReceiveStrategy, optional): When provided, the wait time and
+                number of messages of every receive are chosen by the strategy, overriding
+                set_await_time: idle queues are long polled, for less than half the visibility
+                timeout when one is set, and queues with backlog are fetched without waiting.
+                Defaults to None.
+            decode_attributes (bool, optional): Return message_attributes as native values
+                instead of their raw {"DataType": ..., "StringValue": ...} form: Number as int or
+                float, Binary as bytes, String.Array as list and String.Boolean as bool.
+                Defaults to False.
+
+        Queue URLs are cached per queue name. Full queue URLs can also be used as queue names.
+
+        The sync client is created on first sync call and can be shared by many threads, e.g.
+        by QueueWorker, AckAccumulator and LeaseManager.
+
+        The async client is created on first async call and shared by every async call made from
+        the same event loop. Close it with `await adapter.aclose()` or use the adapter as an async
+        context manager (`async with SQSAdapter(...) as adapter:`).
 
         Returns:
             None
         """
         self.aws_client_params = self._get_aws_client_params(client_config)
         self._sqs_client = None
+        self._sqs_client_lock = threading.Lock()
         self._await_time = 0
         self._visibility_timeout = 0
+        self._init_async_client(max_pool_connections, keepalive_timeout)
+        self.claim_check_store = claim_check_store
+        self._resolve_queue_urls = resolve_queue_urls
+        self.receive_strategy = receive_strategy
+        self.decode_attributes = decode_attributes
 
     def set_await_time(self, await_time: int) -> None:
         """
@@ -63,46 +120,97 @@ class SQSAdapter(AwsHelperMixin, QueueBaseAdapter):
     @property
     def sqs_client(self) -> boto3.client:
         if not self._sqs_client:
-            self._sqs_client = boto3.client(
-                "sqs",
-                region_name=self.aws_client_params["aws_region"],
-                aws_access_key_id=self.aws_client_params["aws_key"],
-                aws_secret_access_key=self.aws_client_params["aws_secret"],
-            )
+            # boto3 clients are thread safe, but creating them from the default session is not
+            with self._sqs_client_lock:
+                if not self._sqs_client:
+                    self._sqs_client = boto3.client(
+                        "sqs",
+                        region_name=self.aws_client_params["aws_region"],
+                        aws_access_key_id=self.aws_client_params["aws_key"],
+                        aws_secret_access_key=self.aws_client_params["aws_secret"],
+                    )
         return self._sqs_client
 
-    def fetch_messages(self, queue_name: str, max_number_of_messages: int = 1) -> Iterator[dict]:
+    def fetch_messages(
+        self, queue_name: str, max_number_of_messages: int = 1
+    ) -> Iterator[QueueMessage]:
         """
         Fetch messages from the queue
 
+        Messages are QueueMessage objects, whose body is decoded on first access of
+        message_data. Messages published with a codec other than json are decoded using the
+        codec named in their clever_events_codec message attribute. The message_data of claim
+        check messages is read from claim_check_store when first accessed.
+
         Args:
             queue_name (str): The name of the queue
             max_number_of_messages (int, optional): Highest number of messages we want to fetch. Defaults to 1.
 
         Yields:
-            Iterator[dict]: A generator that yields messages from the queue
+            Iterator[QueueMessage]: A generator that yields messages from the queue
+        """
+        params = self._get_receive_message_params(queue_name, max_number_of_messages)
+        response = self.sqs_client.receive_message(**params)
+        messages = response.get("Messages", [])
+        self._record_receive(queue_name, params, messages)
+
+        for msg in messages:
+            yield self._parse_message(queue_name, msg)
+
+    async def async_fetch_messages(
+        self, queue_name: str, max_number_of_messages: int = 1
+    ) -> list[QueueMessage]:
+        """
+        Asynchronously fetch messages from the queue using the shared async client
+
+        Args:
+            queue_name (str): The name of the queue
+            max_number_of_messages (int, optional): Highest number of messages we want to fetch. Defaults to 1.
+
+        Returns:
+            list[QueueMessage]: The messages fetched from the queue
+        """
+        params = self._get_receive_message_params(
+            queue_name, max_number_of_messages, await self._async_get_queue_url(queue_name)
+        )
+        client = await self._get_async_client()
+        response = await client.receive_message(**params)
+        messages = response.get("Messages", [])
+        self._record_receive(queue_name, params, messages)
+        return [self._parse_message(queue_name, msg) for msg in messages]
+
+    def get_queue_depth(self, queue_name: str) -> int:
         """
-        response = self.sqs_client.receive_message(
+        Get the approximate number of visible messages of the queue
+
+        Args:
+            queue_name (str): The name of the queue
+
+        Returns:
+            int: The ApproximateNumberOfMessages attribute of the queue
+        """
+        response = self.sqs_client.get_queue_attributes(
             QueueUrl=self._get_queue_url(queue_name=queue_name),
-            AttributeNames=["All"],
-            MaxNumberOfMessages=max_number_of_messages,
-            MessageAttributeNames=["All"],
-            VisibilityTimeout=self._visibility_timeout,
-            WaitTimeSeconds=self._await_time,
+            AttributeNames=["ApproximateNumberOfMessages"],
         )
+        return int(response["Attributes"]["ApproximateNumberOfMessages"])
+
+    async def async_get_queue_depth(self, queue_name: str) -> int:
+        """
+        Asynchronously get the approximate number of visible messages of the queue
+
+        Args:
+            queue_name (str): The name of the queue
 
-        if "Messages" in response:
-            for msg in response["Messages"]:
-                message_id = msg["MessageId"]
-                message_receipt_handle = msg["ReceiptHandle"]
-                message_body = json.loads(msg["Body"])
-                message_attributes = msg["MessageAttributes"] if "MessageAttributes" in msg else {}
-                yield {
-                    "message_id": message_id,
-                    "message_receipt_handle": message_receipt_handle,
-                    "message_data": message_body,
-                    "message_attributes": message_attributes,
-                }
+        Returns:
+            int: The ApproximateNumberOfMessages attribute of the queue
+        """
+        client = await self._get_async_client()
+        response = await client.get_queue_attributes(
+            QueueUrl=await self._async_get_queue_url(queue_name),
+            AttributeNames=["ApproximateNumberOfMessages"],
+        )
+        return int(response["Attributes"]["ApproximateNumberOfMessages"])
 
     def delete_message(self, queue_name: str, message_id: str) -> dict:
         """
@@ -119,9 +227,380 @@ class SQSAdapter(AwsHelperMixin, QueueBaseAdapter):
             QueueUrl=self._get_queue_url(queue_name=queue_name), ReceiptHandle=message_id
         )
 
-    def _get_queue_url(self, queue_name: str) -> str:
-        return "https://sqs.{}.amazonaws.com/{}/{}".format(
-            self.aws_client_params["aws_region"],
-            self.aws_client_params["aws_account_id"],
+    async def async_delete_message(self, queue_name: str, message_id: str) -> dict:
+        """
+        Asynchronously delete a message from the queue using the shared async client
+
+        Args:
+            queue_name (str): The name of the queue
+            message_id (str): The id of the message we want to delete
+
+        Returns:
+            dict: A dict containing the response we got from the stack when performing deletion
+        """
+        client = await self._get_async_client()
+        return await client.delete_message(
+            QueueUrl=await self._async_get_queue_url(queue_name), ReceiptHandle=message_id
+        )
+
+    def delete_messages(self, queue_name: str, receipt_handles: list[str]) -> list[dict]:
+        """
+        Delete a batch of messages from the queue using DeleteMessageBatch
+
+        Receipt handles are sent in chunks of up to 10 entries.
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handles (list[str]): The ids of the messages we want to delete
+
+        Returns:
+            list[dict]: One result per receipt handle, in the same order
+        """
+        queue_url = self._get_queue_url(queue_name=queue_name)
+        results = {}
+        for chunk in self._chunk_batch_entries(receipt_handles):
+            try:
+                response = self.sqs_client.delete_message_batch(QueueUrl=queue_url, Entries=chunk)
+            except (BotoCoreError, ClientError) as error:
+                results.update(self._get_failed_chunk_results(chunk, error))
+            else:
+                results.update(self._get_batch_response_results(chunk, response))
+        return [results[index] for index in range(len(receipt_handles))]
+
+    async def async_delete_messages(
+        self, queue_name: str, receipt_handles: list[str]
+    ) -> list[dict]:
+        """
+        Asynchronously delete a batch of messages from the queue using DeleteMessageBatch
+
+        Receipt handles are sent in chunks of up to 10 entries.
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handles (list[str]): The ids of the messages we want to delete
+
+        Returns:
+            list[dict]: One result per receipt handle, in the same order
+        """
+        queue_url = await self._async_get_queue_url(queue_name)
+        results = {}
+        client = await self._get_async_client()
+        for chunk in self._chunk_batch_entries(receipt_handles):
+            try:
+                response = await client.delete_message_batch(QueueUrl=queue_url, Entries=chunk)
+            except (BotoCoreError, ClientError) as error:
+                results.update(self._get_failed_chunk_results(chunk, error))
+            else:
+                results.update(self._get_batch_response_results(chunk, response))
+        return [results[index] for index in range(len(receipt_handles))]
+
+    def change_messages_visibility(
+        self, queue_name: str, receipt_handles: list[str], visibility_timeout: int
+    ) -> list[dict]:
+        """
+        Change the visibility timeout of a batch of in-flight messages using ChangeMessageVisibilityBatch
+
+        Receipt handles are sent in chunks of up to 10 entries.
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handles (list[str]): The ids of the messages we want to change
+            visibility_timeout (int): The amount of seconds, counted from now, messages are hidden from other consumers
+
+        Raises:
+            ValueError: If visibility_timeout is negative.
+
+        Returns:
+            list[dict]: One result per receipt handle, in the same order
+        """
+        if visibility_timeout < 0:
+            raise ValueError("visibility_timeout must be a non-negative integer.")
+        queue_url = self._get_queue_url(queue_name=queue_name)
+        results = {}
+        for chunk in self._chunk_batch_entries(receipt_handles):
+            entries = [{**entry, "VisibilityTimeout": visibility_timeout} for entry in chunk]
+            try:
+                response = self.sqs_client.change_message_visibility_batch(
+                    QueueUrl=queue_url, Entries=entries
+                )
+            except (BotoCoreError, ClientError) as error:
+                results.update(self._get_failed_chunk_results(chunk, error))
+            else:
+                results.update(self._get_batch_response_results(chunk, response))
+        return [results[index] for index in range(len(receipt_handles))]
+
+    def send_messages(self, queue_name: str, messages: list[QueueMessage]) -> list[dict]:
+        """
+        Send fetched messages to another queue using SendMessageBatch
+
+        The body and message attributes of every message are sent unchanged, so codec and claim
+        check messages keep working. For claim check messages the body sent is message.body,
+        the location of the stored payload, not the payload itself. Messages with a message
+        group are sent with it and with their message id as MessageDeduplicationId, so
+        queue_name must be a FIFO queue. Messages are sent in chunks of up to 10 entries and
+        256 KiB.
+
+        Args:
+            queue_name (str): The name of the queue the messages are sent to
+            messages (list[QueueMessage]): Messages fetched with fetch_messages
+
+        Returns:
+            list[dict]: One result per message, in the same order, see delete_messages. The
+                receipt_handle of every result is the one of the message sent.
+        """
+        queue_url = self._get_queue_url(queue_name=queue_name)
+        results = {}
+        for chunk in self._chunk_send_entries(messages):
+            try:
+                response = self.sqs_client.send_message_batch(
+                    QueueUrl=queue_url, Entries=[entry for entry, _ in chunk]
+                )
+            except (BotoCoreError, ClientError) as error:
+                results.update(
+                    self._get_failed_chunk_results(self._get_chunk_handles(chunk), error)
+                )
+            else:
+                results.update(
+                    self._get_batch_response_results(self._get_chunk_handles(chunk), response)
+                )
+        return [results[index] for index in range(len(messages))]
+
+    async def async_send_messages(
+        self, queue_name: str, messages: list[QueueMessage]
+    ) -> list[dict]:
+        """
+        Asynchronously send fetched messages to another queue using SendMessageBatch
+
+        Args:
+            queue_name (str): The name of the queue the messages are sent to
+            messages (list[QueueMessage]): Messages fetched with async_fetch_messages
+
+        Returns:
+            list[dict]: One result per message, in the same order, see send_messages
+        """
+        queue_url = await self._async_get_queue_url(queue_name)
+        results = {}
+        client = await self._get_async_client()
+        for chunk in self._chunk_send_entries(messages):
+            try:
+                response = await client.send_message_batch(
+                    QueueUrl=queue_url, Entries=[entry for entry, _ in chunk]
+                )
+            except (BotoCoreError, ClientError) as error:
+                results.update(
+                    self._get_failed_chunk_results(self._get_chunk_handles(chunk), error)
+                )
+            else:
+                results.update(
+                    self._get_batch_response_results(self._get_chunk_handles(chunk), response)
+                )
+        return [results[index] for index in range(len(messages))]
+
+    def _chunk_send_entries(self, messages: list[QueueMessage]) -> Iterator[list]:
+        chunk, chunk_size = [], 0
+        for index, message in enumerate(messages):
+            entry = {"Id": str(index), "MessageBody": message.body}
+            # Forwarded as received: re-encoding decoded values would lose their exact form
+            if message.raw_message_attributes:
+                entry["MessageAttributes"] = message.raw_message_attributes
+            if message.message_group_id is not None:
+                entry["MessageGroupId"] = message.message_group_id
+                entry["MessageDeduplicationId"] = message.message_id
+            entry_size = self._get_send_entry_size(entry)
+            if chunk and (
+                len(chunk) == SQS_BATCH_MAX_ENTRIES
+                or chunk_size + entry_size > SQS_MAX_PAYLOAD_SIZE
+            ):
+                yield chunk
+                chunk, chunk_size = [], 0
+            chunk.append((entry, message.message_receipt_handle))
+            chunk_size += entry_size
+        if chunk:
+            yield chunk
+
+    def _get_chunk_handles(self, chunk: list) -> list:
+        return [
+            {"Id": entry["Id"], "ReceiptHandle": receipt_handle} for entry, receipt_handle in chunk
+        ]
+
+    def _get_send_entry_size(self, entry: dict) -> int:
+        size = len(entry["MessageBody"].encode("utf-8"))
+        for name, attribute in entry.get("MessageAttributes", {}).items():
+            size += len(name.encode("utf-8")) + len(attribute["DataType"].encode("utf-8"))
+            if "BinaryValue" in attribute:
+                size += len(attribute["BinaryValue"])
+            else:
+                size += len(attribute["StringValue"].encode("utf-8"))
+        return size
+
+    def _chunk_batch_entries(self, receipt_handles: list[str]) -> Iterator[list]:
+        entries = [
+            {"Id": str(index), "ReceiptHandle": receipt_handle}
+            for index, receipt_handle in enumerate(receipt_handles)
+        ]
+        for start in range(0, len(entries), SQS_BATCH_MAX_ENTRIES):
+            yield entries[start : start + SQS_BATCH_MAX_ENTRIES]
+
+    def _get_batch_response_results(self, chunk: list, response: dict) -> dict:
+        receipt_handles = {entry["Id"]: entry["ReceiptHandle"] for entry in chunk}
+        results = {}
+        for successful in response.get("Successful", []):
+            results[int(successful["Id"])] = self._get_entry_result(
+                successful["Id"], receipt_handles[successful["Id"]], success=True
+            )
+        for failed in response.get("Failed", []):
+            results[int(failed["Id"])] = self._get_entry_result(
+                failed["Id"],
+                receipt_handles[failed["Id"]],
+                error_code=failed.get("Code", "UnknownError"),
+                error_message=failed.get("Message"),
+                sender_fault=failed.get("SenderFault", False),
+            )
+        return results
+
+    def _get_failed_chunk_results(self, chunk: list, error: Exception) -> dict:
+        error_code = type(error).__name__
+        if isinstance(error, ClientError):
+            error_code = error.response.get("Error", {}).get("Code", error_code)
+        return {
+            int(entry["Id"]): self._get_entry_result(
+                entry["Id"],
+                entry["ReceiptHandle"],
+                error_code=error_code,
+                error_message=str(error),
+            )
+            for entry in chunk
+        }
+
+    def _get_entry_result(
+        self,
+        entry_id: str,
+        receipt_handle: str,
+        success: bool = False,
+        error_code: str = None,
+        error_message: str = None,
+        sender_fault: bool = False,
+    ) -> dict:
+        return {
+            "index": int(entry_id),
+            "receipt_handle": receipt_handle,
+            "success": success,
+            "error_code": error_code,
+            "error_message": error_message,
+            "sender_fault": sender_fault,
+        }
+
+    def _get_async_client_context(self):
+        return Session().client(
+            "sqs",
+            region_name=self.aws_client_params["aws_region"],
+            aws_access_key_id=self.aws_client_params["aws_key"],
+            aws_secret_access_key=self.aws_client_params["aws_secret"],
+            config=self._get_async_client_config(),
+        )
+
+    def _get_receive_message_params(
+        self, queue_name: str, max_number_of_messages: int, queue_url: str = None
+    ) -> dict:
+        params = {
+            "QueueUrl": queue_url or self._get_queue_url(queue_name=queue_name),
+            "AttributeNames": ["All"],
+            "MaxNumberOfMessages": max_number_of_messages,
+            "MessageAttributeNames": ["All"],
+            "VisibilityTimeout": self._visibility_timeout,
+            "WaitTimeSeconds": self._await_time,
+        }
+        if self.receive_strategy is not None:
+            params.update(
+                self.receive_strategy.get_receive_params(
+                    queue_name, max_number_of_messages, self._get_max_wait_time()
+                )
+            )
+        return params
+
+    def _get_max_wait_time(self) -> int | None:
+        # Long polls end well before received messages become visible again, so consumers
+        # waiting in a receive still delete the messages they completed in time
+        if self._visibility_timeout:
+            return self._visibility_timeout // 2
+        return None
+
+    def _record_receive(self, queue_name: str, params: dict, messages: list) -> None:
+        if self.receive_strategy is not None:
+            self.receive_strategy.record_receive(
+                queue_name, params["MaxNumberOfMessages"], len(messages)
+            )
+
+    def _parse_message(self, queue_name: str, msg: dict) -> QueueMessage:
+        message_attributes = msg.get("MessageAttributes", {})
+        if CLAIM_CHECK_ATTRIBUTE in message_attributes:
+            body = message_attributes[CLAIM_CHECK_ATTRIBUTE]["StringValue"]
+            decoder = partial(self._read_claim_check, message_attributes)
+        elif CODEC_ATTRIBUTE in message_attributes:
+            body = msg["Body"]
+            # Looked up on first access, so an unknown codec fails that message, not the batch
+            decoder = partial(self._decode_body, message_attributes=message_attributes)
+        else:
+            body = msg["Body"]
+            decoder = json.loads
+        attributes = msg.get("Attributes", {})
+        receive_count = attributes.get("ApproximateReceiveCount")
+        return QueueMessage(
+            msg["MessageId"],
+            msg["ReceiptHandle"],
+            body,
+            self._get_message_attributes(message_attributes),
+            decoder,
+            self,
             queue_name,
+            attributes.get("MessageGroupId"),
+            None if receive_count is None else int(receive_count),
+            message_attributes,
         )
+
+    def _read_claim_check(self, message_attributes: dict, location: str):
+        return self._decode_body(
+            self._get_claim_check_store().get(location).decode("utf-8"), message_attributes
+        )
+
+    def _get_message_attributes(self, message_attributes: dict) -> dict:
+        if self.decode_attributes:
+            return decode_attributes(message_attributes)
+        return message_attributes
+
+    def _decode_body(self, body: str, message_attributes: dict):
+        if CODEC_ATTRIBUTE in message_attributes:
+            return get_codec(message_attributes[CODEC_ATTRIBUTE]["StringValue"]).decode(body)
+        return json.loads(body)
+
+    def _get_claim_check_store(self) -> BlobStore:
+        if self.claim_check_store is None:
+            raise ValueError("claim_check_store is required to read claim check messages")
+        return self.claim_check_store
+
+    def _get_queue_url(self, queue_name: str) -> str:
+        if self._resolve_queue_urls:
+            return self.resource_resolver.get_queue_url(queue_name, self._resolve_queue_url)
+        return self.resource_resolver.get_queue_url(queue_name)
+
+    def _resolve_queue_url(self, queue_name: str) -> str:
+        account_id, _, name = queue_name.rpartition("/")
+        params = {"QueueName": name}
+        if account_id:
+            params["QueueOwnerAWSAccountId"] = account_id
+        return self.sqs_client.get_queue_url(**params)["QueueUrl"]
+
+    async def _async_get_queue_url(self, queue_name: str) -> str:
+        if self._resolve_queue_urls:
+            return await self.resource_resolver.async_get_queue_url(
+                queue_name, self._async_resolve_queue_url
+            )
+        return self.resource_resolver.get_queue_url(queue_name)
+
+    async def _async_resolve_queue_url(self, queue_name: str) -> str:
+        account_id, _, name = queue_name.rpartition("/")
+        params = {"QueueName": name}
+        if account_id:
+            params["QueueOwnerAWSAccountId"] = account_id
+        client = await self._get_async_client()
+        return (await client.get_queue_url(**params))["QueueUrl"]
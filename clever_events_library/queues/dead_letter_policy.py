@@ -0,0 +1,116 @@
+from collections.abc import Callable
+
+FIFO_SUFFIX = ".fifo"
+# Highest visibility timeout accepted by SQS, 12 hours
+MAX_VISIBILITY_TIMEOUT = 43200
+
+
+class DeadLetterPolicy:
+    def __init__(
+        self,
+        dead_letter_queue: str | Callable[[str], str] = None,
+        max_receive_count: int = 5,
+        backoff: int = 2,
+        max_backoff: int = 900,
+    ) -> None:
+        """
+        Initialize DeadLetterPolicy
+
+        Describes when the messages of a queue are poison and where they are quarantined. A
+        message is poison once it was received max_receive_count times without being processed:
+        it is moved to the dead-letter queue instead of being passed to a handler again. Failed
+        messages that are not poison yet are hidden for an exponential backoff, backoff * 2 **
+        (receive_count - 1) seconds up to max_backoff, instead of being redelivered as soon as
+        their visibility timeout expires.
+
+        Detection relies on the receive count reported by the adapter (ApproximateReceiveCount
+        for SQS), messages without it are never considered poison. Keep max_receive_count below
+        the maxReceiveCount of the queue redrive policy, if any, so messages are quarantined by
+        the consumer first.
+
+        Args:
+            dead_letter_queue (str | Callable, optional): The name of the dead-letter queue, or a
+                function called with the name of the source queue that returns it. Defaults to
+                None, the source queue name with a _dlq suffix (orders.fifo -> orders_dlq.fifo).
+            max_receive_count (int, optional): Number of receives after which a message that
+                is not processed is poison. Defaults to 5.
+            backoff (int, optional): Seconds failed messages are hidden after their first
+                receive, doubled on every receive. Defaults to 2.
+            max_backoff (int, optional): Highest number of seconds failed messages are hidden.
+                Defaults to 900.
+
+        Raises:
+            ValueError: If any of the arguments is not valid
+
+        Returns:
+            None
+        """
+        if max_receive_count < 1:
+            raise ValueError("max_receive_count must be a positive integer.")
+        if backoff < 0 or max_backoff < backoff:
+            raise ValueError("backoffs must satisfy 0 <= backoff <= max_backoff.")
+        if max_backoff > MAX_VISIBILITY_TIMEOUT:
+            raise ValueError(f"max_backoff must not exceed {MAX_VISIBILITY_TIMEOUT} seconds.")
+        self.dead_letter_queue = dead_letter_queue
+        self.max_receive_count = max_receive_count
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def get_dead_letter_queue(self, queue_name: str) -> str:
+        """
+        Get the dead-letter queue of a queue
+
+        Args:
+            queue_name (str): The name of the source queue
+
+        Returns:
+            str: The name of its dead-letter queue
+        """
+        if callable(self.dead_letter_queue):
+            return self.dead_letter_queue(queue_name)
+        if self.dead_letter_queue is not None:
+            return self.dead_letter_queue
+        if queue_name.endswith(FIFO_SUFFIX):
+            return f"{queue_name[:-len(FIFO_SUFFIX)]}_dlq{FIFO_SUFFIX}"
+        return f"{queue_name}_dlq"
+
+    def is_poison(self, message: dict) -> bool:
+        """
+        Check whether a fetched message was received too many times to be handled again
+
+        Args:
+            message (dict): A fetched message
+
+        Returns:
+            bool: True if the message was received more than max_receive_count times
+        """
+        receive_count = getattr(message, "receive_count", None)
+        return receive_count is not None and receive_count > self.max_receive_count
+
+    def is_exhausted(self, message: dict) -> bool:
+        """
+        Check whether a failed message used its last receive
+
+        Args:
+            message (dict): A message whose handler failed
+
+        Returns:
+            bool: True if the message was received max_receive_count times or more
+        """
+        receive_count = getattr(message, "receive_count", None)
+        return receive_count is not None and receive_count >= self.max_receive_count
+
+    def get_backoff(self, message: dict) -> int:
+        """
+        Get the seconds a failed message is hidden before its next receive
+
+        Args:
+            message (dict): A message whose handler failed
+
+        Returns:
+            int: The visibility timeout of the message
+        """
+        receive_count = getattr(message, "receive_count", None) or 1
+        # Bounded before exponentiation, so huge receive counts don't build huge integers
+        exponent = min(receive_count - 1, MAX_VISIBILITY_TIMEOUT.bit_length())
+        return min(self.max_backoff, self.backoff * 2**exponent)
@@ -0,0 +1,212 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+class DedupCache(ABC):
+    """
+    Remembers the keys of processed messages for ttl seconds
+    """
+
+    @abstractmethod
+    def contains(self, key: str) -> bool:
+        """
+        Check whether a key was added and has not expired
+
+        Args:
+            key (str): The key of a message
+
+        Returns:
+            bool: True if the message was already processed
+        """
+        pass
+
+    @abstractmethod
+    def add(self, key: str) -> None:
+        """
+        Remember a key for ttl seconds
+
+        Args:
+            key (str): The key of a processed message
+
+        Returns:
+            None
+        """
+        pass
+
+    def add_many(self, keys: list[str]) -> None:
+        """
+        Remember many keys for ttl seconds
+
+        Args:
+            keys (list[str]): The keys of processed messages
+
+        Returns:
+            None
+        """
+        for key in keys:
+            self.add(key)
+
+
+class InMemoryDedupCache(DedupCache):
+    def __init__(self, max_size: int = 100000, ttl: float = 3600) -> None:
+        """
+        Initialize InMemoryDedupCache
+
+        Keys are kept in process memory, in least recently added order, as 8 byte digests rather
+        than strings, so a full cache of 100000 keys takes a few MB. Once max_size keys are held,
+        adding a key evicts the oldest one.
+
+        Args:
+            max_size (int, optional): Highest number of keys held. Defaults to 100000.
+            ttl (float, optional): Seconds a key is remembered. Defaults to 3600.
+
+        Raises:
+            ValueError: If max_size or ttl is not positive
+
+        Returns:
+            None
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer.")
+        if ttl <= 0:
+            raise ValueError("ttl must be a positive number.")
+        self.max_size = max_size
+        self.ttl = ttl
+        self._expirations = OrderedDict()
+        self._lock = threading.Lock()
+
+    def contains(self, key: str) -> bool:
+        digest = self._get_digest(key)
+        with self._lock:
+            expires_at = self._expirations.get(digest)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._expirations[digest]
+                return False
+            return True
+
+    def add(self, key: str) -> None:
+        self.add_many([key])
+
+    def add_many(self, keys: list[str]) -> None:
+        digests = [self._get_digest(key) for key in keys]
+        with self._lock:
+            now = time.monotonic()
+            expires_at = now + self.ttl
+            for digest in digests:
+                self._expirations[digest] = expires_at
+                self._expirations.move_to_end(digest)
+            # Keys are ordered by expiration, so expired ones are at the front
+            while self._expirations and (
+                len(self._expirations) > self.max_size
+                or next(iter(self._expirations.values())) <= now
+            ):
+                self._expirations.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._expirations)
+
+    def _get_digest(self, key: str) -> bytes:
+        return hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+
+
+class SQLiteDedupCache(DedupCache):
+    def __init__(self, path: str, ttl: float = 3600) -> None:
+        """
+        Initialize SQLiteDedupCache with path
+
+        Keys are stored in a SQLite database, so they survive restarts and are shared by every
+        consumer process using the same file. Expired keys are purged every ttl / 10 seconds.
+
+        Args:
+            path (str): The path of the database file, or :memory:
+            ttl (float, optional): Seconds a key is remembered. Defaults to 3600.
+
+        Raises:
+            ValueError: If ttl is not positive
+
+        Returns:
+            None
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be a positive number.")
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._purge_at = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS dedup_keys (key TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+        )
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return (
+                self._connection.execute(
+                    "SELECT 1 FROM dedup_keys WHERE key = ? AND expires_at > ?", (key, time.time())
+                ).fetchone()
+                is not None
+            )
+
+    def add(self, key: str) -> None:
+        self.add_many([key])
+
+    def add_many(self, keys: list[str]) -> None:
+        now = time.time()
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO dedup_keys (key, expires_at) VALUES (?, ?)",
+                [(key, now + self.ttl) for key in keys],
+            )
+            if now >= self._purge_at:
+                self._connection.execute("DELETE FROM dedup_keys WHERE expires_at <= ?", (now,))
+                self._purge_at = now + self.ttl / 10
+
+    def close(self) -> None:
+        """
+        Close the database connection
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._connection.close()
+
+
+class RedisDedupCache(DedupCache):
+    def __init__(self, client, ttl: float = 3600, prefix: str = "clever_events:dedup:") -> None:
+        """
+        Initialize RedisDedupCache with client
+
+        Keys are stored in Redis with an expiration, so they are shared by every consumer using
+        the same server. Any client compatible with redis-py (set with px, exists) can be used.
+
+        Args:
+            client: A redis.Redis client, or a compatible one
+            ttl (float, optional): Seconds a key is remembered. Defaults to 3600.
+            prefix (str, optional): Prepended to every key. Defaults to clever_events:dedup:.
+
+        Raises:
+            ValueError: If ttl is not positive
+
+        Returns:
+            None
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be a positive number.")
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def contains(self, key: str) -> bool:
+        return bool(self.client.exists(self.prefix + key))
+
+    def add(self, key: str) -> None:
+        self.client.set(self.prefix + key, 1, px=int(self.ttl * 1000))
@@ -0,0 +1,331 @@
+import logging
+import operator
+from collections.abc import Callable
+
+from ..message_attributes import decode_attributes
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_OPERATORS = {
+    "=": operator.eq,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _compile_condition(condition) -> Callable[[object], bool]:
+    if isinstance(condition, bool) or condition is None:
+        return lambda value: value == condition
+    if isinstance(condition, str):
+        return lambda value: value == condition
+    if isinstance(condition, (int, float)):
+        return lambda value: _to_number(value) == condition
+    if not isinstance(condition, dict) or len(condition) != 1:
+        raise ValueError(f"Unsupported filter policy condition: {condition!r}")
+    ((name, argument),) = condition.items()
+    if name == "prefix":
+        return lambda value: isinstance(value, str) and value.startswith(argument)
+    if name == "suffix":
+        return lambda value: isinstance(value, str) and value.endswith(argument)
+    if name == "equals-ignore-case":
+        argument = argument.casefold()
+        return lambda value: isinstance(value, str) and value.casefold() == argument
+    if name == "anything-but":
+        if isinstance(argument, dict):
+            match = _compile_condition(argument)
+            return lambda value: not match(value)
+        excluded = set(argument) if isinstance(argument, list) else {argument}
+        return lambda value: value not in excluded and _to_number(value) not in excluded
+    if name == "numeric":
+        comparisons = [
+            (NUMERIC_OPERATORS[argument[index]], argument[index + 1])
+            for index in range(0, len(argument), 2)
+        ]
+        return lambda value: (number := _to_number(value)) is not None and all(
+            compare(number, bound) for compare, bound in comparisons
+        )
+    raise ValueError(f"Unsupported filter policy operator: {name}")
+
+
+def _to_number(value) -> int | float | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def compile_filter_policy(filter_policy: dict) -> tuple[dict, Callable[[dict], bool]]:
+    """
+    Compile an SNS-style filter policy over message attributes
+
+    Every key of the policy must match (AND) and any of its conditions can match (OR). Supported
+    conditions are exact strings and numbers, prefix, suffix, equals-ignore-case, anything-but,
+    numeric ranges and exists. Attributes holding lists match when any of their items matches.
+
+    Args:
+        filter_policy (dict): Maps attribute names to a list of conditions
+
+    Raises:
+        ValueError: If a condition is not supported
+
+    Returns:
+        tuple[dict, Callable]: The exact string values of the attributes matched only by exact
+            strings, used to index the policy, and a predicate called with the attributes of a
+            message
+    """
+    exact_values = {}
+    matchers = []
+    for name, conditions in filter_policy.items():
+        if not isinstance(conditions, list):
+            conditions = [conditions]
+        if conditions and all(isinstance(condition, str) for condition in conditions):
+            exact_values[name] = set(conditions)
+        exists = None
+        value_conditions = []
+        for condition in conditions:
+            if isinstance(condition, dict) and set(condition) == {"exists"}:
+                exists = condition["exists"]
+            else:
+                value_conditions.append(_compile_condition(condition))
+        matchers.append((name, exists, value_conditions))
+
+    def matches(attributes: dict) -> bool:
+        for name, exists, value_conditions in matchers:
+            if name not in attributes:
+                if exists is False:
+                    continue
+                return False
+            if exists is True:
+                continue
+            value = attributes[name]
+            values = value if isinstance(value, list) else (value,)
+            if not any(match(item) for match in value_conditions for item in values):
+                return False
+        return True
+
+    return exact_values, matches
+
+
+class Dispatcher:
+    def __init__(
+        self,
+        event_name_attribute: str = "event_name",
+        default_handler: Callable[[dict], None] = None,
+    ) -> None:
+        """
+        Initialize Dispatcher
+
+        Routes messages to the handlers registered for them, so consumers of queues receiving
+        many event types don't chain conditions over message_attributes. A message is passed to
+        every matching handler, in registration order.
+
+        Routes are compiled into an index on their exact-match attributes (e.g. the event name)
+        the first time a message is dispatched after a registration, so finding the candidate
+        routes of a message is a dict lookup per indexed attribute, whatever the number of
+        routes. Only the candidates have their remaining conditions evaluated.
+
+        Args:
+            event_name_attribute (str, optional): The message attribute holding the event name.
+                Defaults to event_name.
+            default_handler (Callable, optional): Called with the messages matching no route.
+                Defaults to None, such messages are ignored.
+
+        Returns:
+            None
+        """
+        self.event_name_attribute = event_name_attribute
+        self.default_handler = default_handler
+        self._routes = []
+        self._index = None
+        self._unindexed_routes = None
+
+    def register(
+        self,
+        handler: Callable,
+        event_name: str | list[str] = None,
+        filter_policy: dict = {},
+        predicate: Callable[[dict], bool] = None,
+        batch: bool = False,
+    ) -> None:
+        """
+        Register a handler
+
+        Args:
+            handler (Callable): Called with every matching message, or with the list of matching
+                messages of every dispatched batch when batch is True
+            event_name (str | list[str], optional): The event names the handler is registered
+                for. Defaults to None, any event.
+            filter_policy (dict, optional): An SNS-style filter policy over the message
+                attributes, e.g. {"country": ["ES", "PT"], "price": [{"numeric": [">", 100]}]}.
+                Defaults to {}.
+            predicate (Callable, optional): Called with the message, the handler only receives
+                it when it returns True. Defaults to None.
+            batch (bool, optional): Call the handler once per dispatched batch. Defaults to False.
+
+        Raises:
+            ValueError: If the filter policy is not valid
+
+        Returns:
+            None
+        """
+        if event_name is not None:
+            filter_policy = {**filter_policy, self.event_name_attribute: event_name}
+        exact_values, matches = compile_filter_policy(filter_policy)
+        self._routes.append(
+            {
+                "handler": handler,
+                "exact_values": exact_values,
+                "matches": matches,
+                "predicate": predicate,
+                "batch": batch,
+                "order": len(self._routes),
+            }
+        )
+        self._index = None
+
+    def on(
+        self,
+        event_name: str | list[str] = None,
+        filter_policy: dict = {},
+        predicate: Callable[[dict], bool] = None,
+        batch: bool = False,
+    ) -> Callable:
+        """
+        Register the decorated function as a handler, see register
+
+        Returns:
+            Callable: The decorator
+        """
+
+        def decorator(handler: Callable) -> Callable:
+            self.register(handler, event_name, filter_policy, predicate, batch)
+            return handler
+
+        return decorator
+
+    def dispatch(self, message: dict) -> int:
+        """
+        Dispatch a message to its handlers
+
+        Dispatcher.dispatch can be used as the handler of run_consumer.
+
+        Args:
+            message (dict): A message, e.g. fetched with QueueManager.fetch_messages
+
+        Raises:
+            Exception: The first error raised by the handlers, once every handler was called
+
+        Returns:
+            int: The number of handlers the message was passed to
+        """
+        result = self.dispatch_batch([message])[0]
+        if result["error"] is not None:
+            raise result["error"]
+        return result["handlers"]
+
+    def dispatch_batch(self, messages: list[dict]) -> list[dict]:
+        """
+        Dispatch a batch of messages to their handlers
+
+        Every message is routed first, then handlers are called: batch handlers once with all
+        their messages and the other handlers once per message. Errors raised by handlers are
+        logged and reported in the results, so a failing handler doesn't stop the others.
+
+        Args:
+            messages (list[dict]): The messages, e.g. fetched with QueueManager.fetch_messages
+
+        Returns:
+            list[dict]: One result per message, in the same order, with keys:
+                - index: The position of the message in messages
+                - success: True if every handler of the message returned without raising
+                - handlers: The number of handlers the message was passed to
+                - error: The first error raised by its handlers, or None
+        """
+        if self._index is None:
+            self._compile()
+        results = [
+            {"index": index, "success": True, "handlers": 0, "error": None}
+            for index in range(len(messages))
+        ]
+        batches = {}
+        for index, message in enumerate(messages):
+            routes = self._route(message)
+            if not routes and self.default_handler is not None:
+                self._call(self.default_handler, message, [results[index]])
+                continue
+            for route in routes:
+                if route["batch"]:
+                    batches.setdefault(route["order"], (route, []))[1].append(index)
+                else:
+                    self._call(route["handler"], message, [results[index]])
+        for route, indexes in batches.values():
+            self._call(
+                route["handler"],
+                [messages[index] for index in indexes],
+                [results[index] for index in indexes],
+            )
+        return results
+
+    def __call__(self, message: dict) -> int:
+        return self.dispatch(message)
+
+    def _compile(self) -> None:
+        index, unindexed_routes = {}, []
+        for route in self._routes:
+            if not route["exact_values"]:
+                unindexed_routes.append(route)
+                continue
+            # Index on a single attribute, preferring the event name, so every candidate is found
+            # by exactly one lookup
+            name = min(route["exact_values"], key=lambda name: name != self.event_name_attribute)
+            for value in route["exact_values"][name]:
+                index.setdefault(name, {}).setdefault(value, []).append(route)
+        self._index, self._unindexed_routes = index, unindexed_routes
+
+    def _route(self, message: dict) -> list[dict]:
+        attributes = self._get_attributes(message)
+        candidates = list(self._unindexed_routes)
+        for name, routes_by_value in self._index.items():
+            value = attributes.get(name)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, str):
+                        candidates.extend(routes_by_value.get(item, ()))
+            elif isinstance(value, str):
+                candidates.extend(routes_by_value.get(value, ()))
+        routes, seen = [], set()
+        for route in sorted(candidates, key=operator.itemgetter("order")):
+            if route["order"] in seen:
+                continue
+            seen.add(route["order"])
+            if route["matches"](attributes) and (
+                route["predicate"] is None or route["predicate"](message)
+            ):
+                routes.append(route)
+        return routes
+
+    def _get_attributes(self, message: dict) -> dict:
+        attributes = message.get("message_attributes") or {}
+        for value in attributes.values():
+            # Raw SQS attributes, {"DataType": ..., "StringValue": ...}, are decoded first
+            if isinstance(value, dict) and "DataType" in value:
+                return decode_attributes(attributes)
+        return attributes
+
+    def _call(self, handler: Callable, argument, results: list[dict]) -> None:
+        for result in results:
+            result["handlers"] += 1
+        try:
+            handler(argument)
+        except Exception as error:
+            logger.exception("Handler %r failed", handler)
+            for result in results:
+                if result["error"] is None:
+                    result["success"] = False
+                    result["error"] = error
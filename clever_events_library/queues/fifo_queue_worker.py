@@ -0,0 +1,117 @@
+import logging
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+
+from .queue_worker import QueueWorker
+
+logger = logging.getLogger(__name__)
+
+
+class FifoQueueWorker(QueueWorker):
+    """
+    A QueueWorker that keeps the messages of every message group in order
+
+    Messages of different groups are processed in parallel by the workers, and the messages of
+    each group one at a time, in the order they were received. When the handler of a message
+    raises, the messages of its group fetched after it are not processed and are redelivered
+    after it, once their visibility timeout expires. Messages without a group (e.g. from
+    standard queues) are processed in parallel, as QueueWorker does.
+
+    Takes the same arguments as QueueWorker. prefetch bounds the messages fetched and not
+    processed yet, including those waiting for an earlier message of their group.
+    """
+
+    def run(self) -> None:
+        """
+        Process messages until stop is called
+
+        Messages fetched when stop is called are processed and acknowledged before returning.
+
+        Returns:
+            None
+        """
+        with self._create_executor() as executor:
+            groups = {}
+            in_flight = {}
+            buffered = 0
+            while not self._stop_event.is_set():
+                fetched = 0
+                if buffered < self._prefetch:
+                    for message in self._fetch_messages(self._prefetch - buffered):
+                        if self._lease_manager is not None:
+                            self._lease_manager.track(
+                                self.queue_name, message["message_receipt_handle"]
+                            )
+                        group = self._get_group(message)
+                        if group in groups:
+                            groups[group].append(message)
+                        else:
+                            groups[group] = deque()
+                            in_flight[executor.submit(self.handler, message)] = (group, message)
+                        fetched += 1
+                    if fetched:
+                        buffered += fetched
+                        self._record_in_flight(buffered)
+                if not in_flight:
+                    if not fetched:
+                        self._stop_event.wait(self._idle_interval)
+                    continue
+                timeout = None
+                if buffered < self._prefetch:
+                    timeout = 0 if fetched else self._idle_interval
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                if done:
+                    buffered -= self._complete_groups(executor, done, in_flight, groups)
+                    self._record_in_flight(buffered)
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                self._complete_groups(executor, done, in_flight, groups)
+            self._record_in_flight(0)
+
+    def _get_group(self, message: dict) -> str:
+        group = getattr(message, "message_group_id", None)
+        if group is None:
+            return message["message_id"]
+        return group
+
+    def _complete_groups(
+        self, executor: Executor, done: set, in_flight: dict, groups: dict
+    ) -> int:
+        completed = 0
+        processed, failed = [], []
+        for future in done:
+            group, message = in_flight.pop(future)
+            pending = groups[group]
+            completed += 1
+            self._release(message)
+            error = future.exception()
+            if error is None:
+                processed.append(message)
+            else:
+                logger.error(
+                    "Handler failed for message %s from %s, skipping %s messages of its group",
+                    message["message_id"],
+                    self.queue_name,
+                    len(pending),
+                    exc_info=error,
+                )
+                failed.append(message)
+                for skipped in pending:
+                    self._release(skipped)
+                completed += len(pending)
+                pending.clear()
+            if pending:
+                message = pending.popleft()
+                in_flight[executor.submit(self.handler, message)] = (group, message)
+            else:
+                del groups[group]
+        if processed:
+            self._delete_messages(processed)
+        if failed:
+            self._fail_messages(failed)
+        return completed
+
+    def _release(self, message: dict) -> None:
+        if self._lease_manager is not None:
+            self._lease_manager.release(self.queue_name, message["message_receipt_handle"])
@@ -0,0 +1,182 @@
+import logging
+import threading
+import time
+
+from .adapters import QueueBaseAdapter
+
+logger = logging.getLogger(__name__)
+
+SQS_MAX_VISIBILITY_TIMEOUT = 43200
+
+
+class LeaseManager:
+    def __init__(
+        self,
+        queue_adapter: QueueBaseAdapter,
+        visibility_timeout: int = 30,
+        extend_interval: float = None,
+        max_lease_time: float = SQS_MAX_VISIBILITY_TIMEOUT,
+    ) -> None:
+        """
+        Initialize LeaseManager with queue_adapter
+
+        Tracked messages have their visibility timeout extended in batches from a background
+        thread every extend_interval seconds, until they are released. This allows short base
+        visibility timeouts, so messages of crashed consumers are redelivered quickly, while long
+        running handlers keep their messages hidden.
+
+        Args:
+            queue_adapter (QueueBaseAdapter): An instance of QueueBaseAdapter
+            visibility_timeout (int, optional): Seconds, counted from each extension, messages are
+                hidden from other consumers. Defaults to 30.
+            extend_interval (float, optional): Seconds between extensions of a message. Defaults to
+                half of visibility_timeout.
+            max_lease_time (float, optional): Seconds after which a message is no longer extended.
+                Defaults to 43200, the SQS limit.
+
+        Raises:
+            ValueError: If any of the arguments is not valid
+
+        Returns:
+            None
+        """
+        if visibility_timeout < 1:
+            raise ValueError("visibility_timeout must be a positive integer.")
+        if extend_interval is None:
+            extend_interval = visibility_timeout / 2
+        if not 0 < extend_interval < visibility_timeout:
+            raise ValueError("extend_interval must be positive and lower than visibility_timeout.")
+        if max_lease_time <= 0:
+            raise ValueError("max_lease_time must be a positive number.")
+
+        self.queue_adapter = queue_adapter
+        self._visibility_timeout = visibility_timeout
+        self._extend_interval = extend_interval
+        self._max_lease_time = max_lease_time
+
+        self._leases = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="LeaseManager", daemon=True)
+        self._worker.start()
+
+    def track(self, queue_name: str, receipt_handle: str) -> None:
+        """
+        Start extending the visibility timeout of a received message
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handle (str): The receipt handle of the message
+
+        Raises:
+            RuntimeError: If the lease manager is closed
+
+        Returns:
+            None
+        """
+        now = time.monotonic()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("LeaseManager is closed")
+            self._leases[(queue_name, receipt_handle)] = {
+                "received_at": now,
+                "extend_at": now + self._extend_interval,
+            }
+            self._condition.notify_all()
+
+    def release(self, queue_name: str, receipt_handle: str) -> None:
+        """
+        Stop extending the visibility timeout of a message, once deleted or failed
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handle (str): The receipt handle of the message
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self._leases.pop((queue_name, receipt_handle), None)
+
+    def is_tracked(self, queue_name: str, receipt_handle: str) -> bool:
+        """
+        Check whether a message visibility timeout is being extended
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handle (str): The receipt handle of the message
+
+        Returns:
+            bool: True if the message is tracked
+        """
+        with self._condition:
+            return (queue_name, receipt_handle) in self._leases
+
+    def close(self, timeout: float = None) -> None:
+        """
+        Stop extending every tracked message and stop the background thread
+
+        Args:
+            timeout (float, optional): Highest number of seconds to wait. Waits forever by default.
+
+        Returns:
+            None
+        """
+        with self._condition:
+            self._closed = True
+            self._leases.clear()
+            self._condition.notify_all()
+        self._worker.join(timeout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _get_due_leases(self, now: float) -> dict:
+        due = {}
+        for (queue_name, receipt_handle), lease in list(self._leases.items()):
+            if now - lease["received_at"] >= self._max_lease_time:
+                logger.warning("Lease of message from %s reached max_lease_time", queue_name)
+                del self._leases[(queue_name, receipt_handle)]
+            elif lease["extend_at"] <= now:
+                lease["extend_at"] = now + self._extend_interval
+                due.setdefault(queue_name, []).append(receipt_handle)
+        return due
+
+    def _get_wait_timeout(self, now: float) -> float:
+        if not self._leases:
+            return None
+        return max(min(lease["extend_at"] for lease in self._leases.values()) - now, 0)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                due = self._get_due_leases(time.monotonic())
+                while not due:
+                    if self._closed:
+                        return
+                    self._condition.wait(self._get_wait_timeout(time.monotonic()))
+                    due = self._get_due_leases(time.monotonic())
+
+            for queue_name, receipt_handles in due.items():
+                self._extend_leases(queue_name, receipt_handles)
+
+    def _extend_leases(self, queue_name: str, receipt_handles: list[str]) -> None:
+        try:
+            results = self.queue_adapter.change_messages_visibility(
+                queue_name, receipt_handles, self._visibility_timeout
+            )
+        except Exception:
+            logger.exception("Failed to extend visibility timeout of messages from %s", queue_name)
+            return
+        for result in results:
+            if not result["success"]:
+                logger.warning(
+                    "Failed to extend visibility timeout of message from %s: %s %s",
+                    queue_name,
+                    result["error_code"],
+                    result["error_message"],
+                )
+                self.release(queue_name, result["receipt_handle"])
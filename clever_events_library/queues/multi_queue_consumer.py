@@ -0,0 +1,148 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .queue_manager import QueueManager
+
+DEFAULT_QUEUE_OPTIONS = {"weight": 1, "priority": 0, "concurrency": 1, "buffer_size": None}
+
+
+class MultiQueueConsumer:
+    def __init__(
+        self,
+        queue_manager: "QueueManager",
+        queues: dict[str, dict] | list[str],
+        max_number_of_messages: int = 10,
+        idle_interval: float = 0,
+    ) -> None:
+        """
+        Initialize MultiQueueConsumer with queue_manager and queues
+
+        Every queue is polled by its own pollers, so a busy queue doesn't delay the others and
+        idle queues are long polled in the background. Fetched messages are merged into a single
+        stream: among the queues with messages waiting, the ones with the highest priority are
+        served first and the others share the stream in proportion to their weight, using smooth
+        weighted round robin. All pollers use the queue_manager adapter, so they share its pooled
+        async client; keep the total concurrency within its max_pool_connections.
+
+        Args:
+            queue_manager (QueueManager): An instance of QueueManager
+            queues (dict[str, dict] | list[str]): The queue names, or a dict mapping every queue
+                name to its options, all of them optional:
+                - weight: Share of the stream relative to queues of the same priority. Defaults to 1.
+                - priority: Queues with a higher priority are served first. Defaults to 0.
+                - concurrency: Number of concurrent receives of the queue. Defaults to 1.
+                - buffer_size: Highest number of fetched messages of the queue waiting to be
+                  consumed. Defaults to concurrency * max_number_of_messages.
+            max_number_of_messages (int, optional): Highest number of messages fetched by each
+                receive. Defaults to 10.
+            idle_interval (float, optional): Seconds a poller waits after an empty receive. Use
+                with adapters that don't long poll. Defaults to 0.
+
+        Raises:
+            ValueError: If any of the queues or options is not valid
+
+        Returns:
+            None
+        """
+        if not queues:
+            raise ValueError("queues must contain at least one queue.")
+        if isinstance(queues, (list, tuple)):
+            queues = {queue_name: {} for queue_name in queues}
+        if idle_interval < 0:
+            raise ValueError("idle_interval must be a non-negative number.")
+
+        self.queue_manager = queue_manager
+        self.max_number_of_messages = max_number_of_messages
+        self.idle_interval = idle_interval
+        self.queues = {}
+        for queue_name, options in queues.items():
+            unknown_options = set(options) - set(DEFAULT_QUEUE_OPTIONS)
+            if unknown_options:
+                raise ValueError(f"Unknown options for {queue_name}: {', '.join(unknown_options)}")
+            options = {**DEFAULT_QUEUE_OPTIONS, **options}
+            if options["buffer_size"] is None:
+                options["buffer_size"] = options["concurrency"] * max_number_of_messages
+            if options["weight"] <= 0:
+                raise ValueError(f"weight of {queue_name} must be a positive number.")
+            if options["concurrency"] < 1:
+                raise ValueError(f"concurrency of {queue_name} must be a positive integer.")
+            if options["buffer_size"] < 1:
+                raise ValueError(f"buffer_size of {queue_name} must be a positive integer.")
+            self.queues[queue_name] = options
+        self._current_weights = dict.fromkeys(self.queues, 0)
+
+    async def consume(self) -> AsyncIterator[tuple[str, dict]]:
+        """
+        Continuously consume messages from every queue
+
+        Raises:
+            Exception: Any error raised by the adapter while fetching messages
+
+        Yields:
+            AsyncIterator[tuple[str, dict]]: The name of the queue and the message
+        """
+        buffers = {queue_name: deque() for queue_name in self.queues}
+        errors = []
+        changed = asyncio.Condition()
+
+        async def poll(queue_name: str) -> None:
+            buffer, buffer_size = buffers[queue_name], self.queues[queue_name]["buffer_size"]
+            try:
+                while True:
+                    async with changed:
+                        await changed.wait_for(lambda: len(buffer) < buffer_size)
+                    messages = await self.queue_manager.async_fetch_messages(
+                        queue_name, self.max_number_of_messages
+                    )
+                    if not messages:
+                        await asyncio.sleep(self.idle_interval)
+                        continue
+                    async with changed:
+                        buffer.extend(messages)
+                        changed.notify_all()
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                async with changed:
+                    errors.append(error)
+                    changed.notify_all()
+
+        pollers = [
+            asyncio.create_task(poll(queue_name))
+            for queue_name, options in self.queues.items()
+            for _ in range(options["concurrency"])
+        ]
+        try:
+            while True:
+                async with changed:
+                    await changed.wait_for(lambda: errors or any(buffers.values()))
+                    if errors:
+                        raise errors[0]
+                    queue_name = self._select_queue(
+                        [queue_name for queue_name, buffer in buffers.items() if buffer]
+                    )
+                    message = buffers[queue_name].popleft()
+                    changed.notify_all()
+                yield queue_name, message
+        finally:
+            for poller in pollers:
+                poller.cancel()
+            await asyncio.gather(*pollers, return_exceptions=True)
+
+    def _select_queue(self, ready_queues: list[str]) -> str:
+        priority = max(self.queues[queue_name]["priority"] for queue_name in ready_queues)
+        candidates = [
+            queue_name
+            for queue_name in ready_queues
+            if self.queues[queue_name]["priority"] == priority
+        ]
+        total_weight = 0
+        for queue_name in candidates:
+            self._current_weights[queue_name] += self.queues[queue_name]["weight"]
+            total_weight += self.queues[queue_name]["weight"]
+        selected = max(candidates, key=self._current_weights.__getitem__)
+        self._current_weights[selected] -= total_weight
+        return selected
@@ -1,20 +1,58 @@
-from collections.abc import Iterator
+import asyncio
+import logging
+import threading
+from collections.abc import AsyncIterator, Callable, Iterator
 
+from ..instrumentation import Instrumentation
+from ..mixins import InstrumentationMixin
+from ..rate_limiter import TokenBucket
 from .adapters import QueueBaseAdapter
+from .dead_letter_policy import DeadLetterPolicy
+from .dedup_cache import DedupCache
+from .fifo_queue_worker import FifoQueueWorker
+from .queue_worker import EXECUTOR_THREAD, QueueWorker
+from .receive_strategy import get_pollers_for_backlog
 
+logger = logging.getLogger(__name__)
 
-class QueueManager:
-    def __init__(self, queue_adapter: QueueBaseAdapter) -> None:
+
+class QueueManager(InstrumentationMixin):
+    def __init__(
+        self,
+        queue_adapter: QueueBaseAdapter,
+        instrumentation: Instrumentation = None,
+        dedup_cache: DedupCache = None,
+        dedup_key: str | Callable[[dict], str] = None,
+        dead_letter_policy: DeadLetterPolicy = None,
+    ) -> None:
         """
         Initialize QueueManager with queue_adapter
 
         Args:
             queue_adapter (QueueBaseAdapter): An instance of QueueBaseAdapter
+            instrumentation (Instrumentation, optional): Hooks called around every receive and
+                delete with its latency, number of messages and failures, e.g.
+                SentryInstrumentation. Defaults to None, no instrumentation.
+            dedup_cache (DedupCache, optional): When provided, fetched messages that were already
+                processed are deleted and dropped instead of being returned. Messages are
+                remembered as processed by mark_processed, which run_consumer calls for every
+                message handled without errors. Defaults to None.
+            dedup_key (str | Callable, optional): The key messages are deduplicated on: the name
+                of a message_data key, or a function called with the message. Messages without a
+                key are never dropped. Defaults to None, the message_id.
+            dead_letter_policy (DeadLetterPolicy, optional): When provided, fetched poison
+                messages are moved to their dead-letter queue instead of being returned, and
+                mark_failed hides failed messages for an exponential backoff. run_consumer calls
+                mark_failed for every message whose handler raises. Defaults to None.
 
         Returns:
             None
         """
         self.queue_adapter = queue_adapter
+        self.dedup_cache = dedup_cache
+        self.dedup_key = dedup_key
+        self.dead_letter_policy = dead_letter_policy
+        self._init_instrumentation(instrumentation)
 
     def fetch_messages(self, queue_name: str, max_number_of_messages: int = 1) -> Iterator[dict]:
         """
@@ -27,7 +65,31 @@ class QueueManager:
         Yields:
             Iterator[dict]: A generator that yields messages from the queue
         """
-        return self.queue_adapter.fetch_messages(queue_name, max_number_of_messages)
+        if self.instrumentation is None:
+            messages = self.queue_adapter.fetch_messages(queue_name, max_number_of_messages)
+            if self.dedup_cache is None and self.dead_letter_policy is None:
+                return messages
+        else:
+            # Adapters may return generators, which are consumed here so the receive is measured
+            messages = self._instrument(
+                "fetch_messages",
+                queue_name,
+                {"max_number_of_messages": max_number_of_messages},
+                lambda: list(
+                    self.queue_adapter.fetch_messages(queue_name, max_number_of_messages)
+                ),
+                self._get_fetch_metrics,
+            )
+        if self.dead_letter_policy is not None:
+            messages, poison = self._split_poison(messages)
+            if poison:
+                self._quarantine(queue_name, poison)
+        if self.dedup_cache is None:
+            return iter(messages)
+        messages, duplicates = self._split_duplicates(queue_name, messages)
+        if duplicates:
+            self._delete_duplicates(queue_name, duplicates)
+        return iter(messages)
 
     def delete_message(self, queue_name: str, message_id: str) -> dict:
         """
@@ -40,4 +102,536 @@ class QueueManager:
         Returns:
             dict: A dict containing the response we got from the stack when performing deletion
         """
-        return self.queue_adapter.delete_message(queue_name, message_id)
+        if self.instrumentation is None:
+            return self.queue_adapter.delete_message(queue_name, message_id)
+        return self._instrument(
+            "delete_message",
+            queue_name,
+            {"batch_size": 1},
+            lambda: self.queue_adapter.delete_message(queue_name, message_id),
+            self._get_response_metrics,
+        )
+
+    def delete_messages(self, queue_name: str, receipt_handles: list[str]) -> list[dict]:
+        """
+        Delete a batch of messages from the queue
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handles (list[str]): The ids of the messages we want to delete
+
+        Returns:
+            list[dict]: One success / failure result per receipt handle, in the same order
+        """
+        if self.instrumentation is None:
+            return self.queue_adapter.delete_messages(queue_name, receipt_handles)
+        return self._instrument(
+            "delete_messages",
+            queue_name,
+            {"batch_size": len(receipt_handles)},
+            lambda: self.queue_adapter.delete_messages(queue_name, receipt_handles),
+            self._get_batch_results_metrics,
+        )
+
+    async def async_fetch_messages(
+        self, queue_name: str, max_number_of_messages: int = 1
+    ) -> list[dict]:
+        """
+        Asynchronously fetch messages from the queue
+
+        Args:
+            queue_name (str): The name of the queue
+            max_number_of_messages (int, optional): Highest number of messages we want to fetch. Defaults to 1.
+
+        Returns:
+            list[dict]: The messages fetched from the queue
+        """
+        if self.instrumentation is None:
+            messages = await self.queue_adapter.async_fetch_messages(
+                queue_name, max_number_of_messages
+            )
+        else:
+            messages = await self._async_instrument(
+                "fetch_messages",
+                queue_name,
+                {"max_number_of_messages": max_number_of_messages},
+                lambda: self.queue_adapter.async_fetch_messages(
+                    queue_name, max_number_of_messages
+                ),
+                self._get_fetch_metrics,
+            )
+        if self.dead_letter_policy is not None:
+            messages, poison = self._split_poison(messages)
+            if poison:
+                await self._async_quarantine(queue_name, poison)
+        if self.dedup_cache is None:
+            return messages
+        messages, duplicates = self._split_duplicates(queue_name, messages)
+        if duplicates:
+            await self._async_delete_duplicates(queue_name, duplicates)
+        return messages
+
+    async def async_delete_message(self, queue_name: str, message_id: str) -> dict:
+        """
+        Asynchronously delete a message from the queue
+
+        Args:
+            queue_name (str): The name of the queue
+            message_id (str): The id of the message we want to delete
+
+        Returns:
+            dict: A dict containing the response we got from the stack when performing deletion
+        """
+        if self.instrumentation is None:
+            return await self.queue_adapter.async_delete_message(queue_name, message_id)
+        return await self._async_instrument(
+            "delete_message",
+            queue_name,
+            {"batch_size": 1},
+            lambda: self.queue_adapter.async_delete_message(queue_name, message_id),
+            self._get_response_metrics,
+        )
+
+    async def async_delete_messages(
+        self, queue_name: str, receipt_handles: list[str]
+    ) -> list[dict]:
+        """
+        Asynchronously delete a batch of messages from the queue
+
+        Args:
+            queue_name (str): The name of the queue
+            receipt_handles (list[str]): The ids of the messages we want to delete
+
+        Returns:
+            list[dict]: One success / failure result per receipt handle, in the same order
+        """
+        if self.instrumentation is None:
+            return await self.queue_adapter.async_delete_messages(queue_name, receipt_handles)
+        return await self._async_instrument(
+            "delete_messages",
+            queue_name,
+            {"batch_size": len(receipt_handles)},
+            lambda: self.queue_adapter.async_delete_messages(queue_name, receipt_handles),
+            self._get_batch_results_metrics,
+        )
+
+    async def consume(
+        self,
+        queue_name: str,
+        concurrency: int = 1,
+        max_number_of_messages: int = 10,
+        buffer_size: int = None,
+        max_concurrency: int = None,
+        scale_interval: float = 10.0,
+    ) -> AsyncIterator[dict]:
+        """
+        Continuously consume messages from the queue using concurrent pollers
+
+        `concurrency` pollers keep fetching messages in the background and feed a bounded
+        internal buffer, so the time spent handling a message overlaps with the next receives.
+        Pollers stop when the buffer is full until messages are consumed. Enable long polling in
+        the adapter (e.g. SQSAdapter.set_await_time(20) or an AdaptiveReceiveStrategy) to avoid
+        busy polling of empty queues.
+
+        When max_concurrency is provided, the queue depth is read every scale_interval seconds
+        and one poller is run per max_number_of_messages visible messages, between concurrency
+        and max_concurrency pollers.
+
+        Args:
+            queue_name (str): The name of the queue
+            concurrency (int, optional): Number of concurrent pollers. Defaults to 1.
+            max_number_of_messages (int, optional): Highest number of messages fetched by each poll. Defaults to 10.
+            buffer_size (int, optional): Highest number of fetched messages waiting to be consumed.
+                Defaults to max_concurrency (or concurrency) * max_number_of_messages.
+            max_concurrency (int, optional): Highest number of concurrent pollers when scaling
+                with the queue depth. Defaults to None, no scaling.
+            scale_interval (float, optional): Seconds between queue depth reads. Defaults to 10.
+
+        With a dedup_cache, call mark_processed once messages are handled.
+
+        Raises:
+            ValueError: If concurrency, max_concurrency, buffer_size or scale_interval is not valid
+            Exception: Any error raised by the adapter while fetching messages
+
+        Yields:
+            AsyncIterator[dict]: An async generator that yields messages from the queue
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be a positive integer.")
+        if max_concurrency is not None and max_concurrency < concurrency:
+            raise ValueError("max_concurrency must be greater than or equal to concurrency.")
+        if scale_interval <= 0:
+            raise ValueError("scale_interval must be a positive number.")
+        if buffer_size is None:
+            buffer_size = (max_concurrency or concurrency) * max_number_of_messages
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be a positive integer.")
+
+        buffer = asyncio.Queue(maxsize=buffer_size)
+        pollers, stopped_pollers = [], []
+
+        async def poll(stop: asyncio.Event) -> None:
+            try:
+                while not stop.is_set():
+                    messages = await self.async_fetch_messages(queue_name, max_number_of_messages)
+                    for message in messages:
+                        await buffer.put(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                await buffer.put(error)
+
+        def scale_pollers(target: int) -> None:
+            while len(pollers) < target:
+                stop = asyncio.Event()
+                pollers.append((asyncio.create_task(poll(stop)), stop))
+            while len(pollers) > target:
+                # Stopped pollers finish their current receive, so no fetched message is dropped
+                task, stop = pollers.pop()
+                stop.set()
+                stopped_pollers.append(task)
+
+        async def scale() -> None:
+            while True:
+                await asyncio.sleep(scale_interval)
+                try:
+                    queue_depth = await self.async_get_queue_depth(queue_name)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("Failed to get the depth of %s", queue_name)
+                    continue
+                scale_pollers(
+                    get_pollers_for_backlog(
+                        queue_depth, concurrency, max_concurrency, max_number_of_messages
+                    )
+                )
+                stopped_pollers[:] = [task for task in stopped_pollers if not task.done()]
+
+        scale_pollers(concurrency)
+        scaler = asyncio.create_task(scale()) if max_concurrency is not None else None
+        try:
+            while True:
+                message = await buffer.get()
+                if isinstance(message, Exception):
+                    raise message
+                yield message
+        finally:
+            tasks = [task for task, _ in pollers] + stopped_pollers
+            if scaler is not None:
+                tasks.append(scaler)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_queue_depth(self, queue_name: str) -> int:
+        """
+        Get the approximate number of visible messages of the queue
+
+        Args:
+            queue_name (str): The name of the queue
+
+        Returns:
+            int: The approximate number of visible messages
+        """
+        return self.queue_adapter.get_queue_depth(queue_name)
+
+    async def async_get_queue_depth(self, queue_name: str) -> int:
+        """
+        Asynchronously get the approximate number of visible messages of the queue
+
+        Args:
+            queue_name (str): The name of the queue
+
+        Returns:
+            int: The approximate number of visible messages
+        """
+        return await self.queue_adapter.async_get_queue_depth(queue_name)
+
+    def run_consumer(
+        self,
+        queue_name: str,
+        handler: Callable[[dict], None],
+        executor: str = EXECUTOR_THREAD,
+        workers: int = 4,
+        stop_event: threading.Event = None,
+        ordered: bool = False,
+        **worker_options,
+    ) -> None:
+        """
+        Process messages from the queue with a pool of threads or processes until stop_event is set
+
+        Messages are prefetched and dispatched to handler. Messages handled without errors are
+        deleted in batches, failed ones are left for redelivery.
+
+        Args:
+            queue_name (str): The name of the queue
+            handler (Callable): Called with every message dict
+            executor (str, optional): thread or process. Defaults to thread.
+            workers (int, optional): Number of threads or processes. Defaults to 4.
+            stop_event (threading.Event, optional): Event that stops the consumer when set. Runs
+                forever by default.
+            ordered (bool, optional): Process the messages of every message group one at a time
+                and in order, and different groups in parallel, using FifoQueueWorker. Use with
+                FIFO queues. Defaults to False.
+            worker_options: Additional QueueWorker options (prefetch, max_number_of_messages, idle_interval)
+
+        Returns:
+            None
+        """
+        worker_class = FifoQueueWorker if ordered else QueueWorker
+        worker_class(
+            self, queue_name, handler, executor, workers, stop_event=stop_event, **worker_options
+        ).run()
+
+    def mark_processed(self, queue_name: str, messages: list[dict]) -> None:
+        """
+        Remember messages as processed, so their redeliveries are dropped by fetch_messages
+
+        Does nothing when dedup_cache is not provided. Call it once messages are handled, before
+        deleting them, when consuming with fetch_messages or consume.
+
+        Args:
+            queue_name (str): The name of the queue the messages were fetched from
+            messages (list[dict]): The processed messages
+
+        Returns:
+            None
+        """
+        if self.dedup_cache is None:
+            return
+        keys = [self._get_dedup_key(queue_name, message) for message in messages]
+        self.dedup_cache.add_many([key for key in keys if key is not None])
+
+    def mark_failed(self, queue_name: str, messages: list[dict]) -> None:
+        """
+        Quarantine or back off messages whose handler failed
+
+        Does nothing when dead_letter_policy is not provided. Messages that used their last
+        receive are moved to the dead-letter queue in a batch, the others are hidden for their
+        backoff, with one ChangeMessageVisibilityBatch call per backoff. Call it with the failed
+        messages, once their handler raised, when consuming with fetch_messages or consume.
+
+        Args:
+            queue_name (str): The name of the queue the messages were fetched from
+            messages (list[dict]): The failed messages
+
+        Returns:
+            None
+        """
+        if self.dead_letter_policy is None:
+            return
+        exhausted, backoffs = [], {}
+        for message in messages:
+            if self.dead_letter_policy.is_exhausted(message):
+                exhausted.append(message)
+            else:
+                backoffs.setdefault(self.dead_letter_policy.get_backoff(message), []).append(
+                    message["message_receipt_handle"]
+                )
+        if exhausted:
+            self._quarantine(queue_name, exhausted)
+        for visibility_timeout, receipt_handles in backoffs.items():
+            try:
+                results = self.queue_adapter.change_messages_visibility(
+                    queue_name, receipt_handles, visibility_timeout
+                )
+            except Exception:
+                logger.exception("Failed to back off messages from %s", queue_name)
+                continue
+            self._log_failures("back off", queue_name, results)
+
+    def redrive(
+        self,
+        dead_letter_queue: str,
+        queue_name: str,
+        rate: float = None,
+        max_messages: int = None,
+        batch_size: int = 10,
+        stop_event: threading.Event = None,
+    ) -> dict:
+        """
+        Move the messages of a dead-letter queue back to their source queue
+
+        Messages are fetched in batches, sent to queue_name unchanged and deleted from the
+        dead-letter queue once sent, until the dead-letter queue is empty, max_messages were
+        handled or stop_event is set. Messages that fail to be sent stay in the dead-letter queue
+        and are not sent again by the same redrive, which stops once it only fetches them.
+
+        Args:
+            dead_letter_queue (str): The name of the queue messages are moved from
+            queue_name (str): The name of the queue messages are moved to
+            rate (float, optional): Highest number of messages moved per second, so consumers of
+                queue_name are not flooded. Defaults to None, no limit.
+            max_messages (int, optional): Highest number of messages to move. Defaults to None,
+                every message.
+            batch_size (int, optional): Highest number of messages fetched and sent at once.
+                Defaults to 10.
+            stop_event (threading.Event, optional): Event that stops the redrive when set.
+
+        Raises:
+            ValueError: If rate, max_messages or batch_size is not valid
+
+        Returns:
+            dict: A dict with the number of messages moved and failed
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
+        if max_messages is not None and max_messages < 0:
+            raise ValueError("max_messages must be a non-negative integer.")
+        # A full batch can be sent right away, the long-run rate is still bounded by rate
+        bucket = TokenBucket(rate, max(rate, batch_size)) if rate is not None else None
+        moved = failed = 0
+        attempted = set()
+        while stop_event is None or not stop_event.is_set():
+            count = batch_size
+            if max_messages is not None:
+                count = min(count, max_messages - moved - failed)
+                if count <= 0:
+                    break
+            messages = [
+                message
+                for message in self.queue_adapter.fetch_messages(dead_letter_queue, count)
+                if message["message_id"] not in attempted
+            ]
+            # Failed messages are fetched again once visible, nothing new is left to move
+            if not messages:
+                break
+            attempted.update(message["message_id"] for message in messages)
+            if bucket is not None:
+                bucket.acquire(len(messages))
+            try:
+                results = self.queue_adapter.send_messages(queue_name, messages)
+            except Exception:
+                logger.exception("Failed to redrive messages from %s", dead_letter_queue)
+                failed += len(messages)
+                continue
+            self._log_failures("redrive", dead_letter_queue, results)
+            sent = [result["receipt_handle"] for result in results if result["success"]]
+            moved += len(sent)
+            failed += len(messages) - len(sent)
+            if sent:
+                self._delete_moved(dead_letter_queue, sent)
+        return {"moved": moved, "failed": failed}
+
+    def _split_poison(self, messages) -> tuple[list, list]:
+        healthy, poison = [], []
+        for message in messages:
+            if self.dead_letter_policy.is_poison(message):
+                poison.append(message)
+            else:
+                healthy.append(message)
+        return healthy, poison
+
+    def _quarantine(self, queue_name: str, messages: list) -> None:
+        dead_letter_queue = self.dead_letter_policy.get_dead_letter_queue(queue_name)
+        logger.warning(
+            "Moving %s poison messages from %s to %s", len(messages), queue_name, dead_letter_queue
+        )
+        try:
+            results = self.queue_adapter.send_messages(dead_letter_queue, messages)
+        except Exception:
+            logger.exception(
+                "Failed to move messages from %s to %s", queue_name, dead_letter_queue
+            )
+            return
+        self._log_failures("quarantine", queue_name, results)
+        sent = [result["receipt_handle"] for result in results if result["success"]]
+        if sent:
+            self._delete_moved(queue_name, sent)
+
+    async def _async_quarantine(self, queue_name: str, messages: list) -> None:
+        dead_letter_queue = self.dead_letter_policy.get_dead_letter_queue(queue_name)
+        logger.warning(
+            "Moving %s poison messages from %s to %s", len(messages), queue_name, dead_letter_queue
+        )
+        try:
+            results = await self.queue_adapter.async_send_messages(dead_letter_queue, messages)
+        except Exception:
+            logger.exception(
+                "Failed to move messages from %s to %s", queue_name, dead_letter_queue
+            )
+            return
+        self._log_failures("quarantine", queue_name, results)
+        sent = [result["receipt_handle"] for result in results if result["success"]]
+        if not sent:
+            return
+        try:
+            results = await self.async_delete_messages(queue_name, sent)
+        except Exception:
+            logger.exception("Failed to delete moved messages from %s", queue_name)
+            return
+        self._log_failures("delete moved", queue_name, results)
+
+    def _delete_moved(self, queue_name: str, receipt_handles: list[str]) -> None:
+        # Messages that are sent but not deleted are delivered twice, from both queues
+        try:
+            results = self.delete_messages(queue_name, receipt_handles)
+        except Exception:
+            logger.exception("Failed to delete moved messages from %s", queue_name)
+            return
+        self._log_failures("delete moved", queue_name, results)
+
+    def _log_failures(self, action: str, queue_name: str, results: list[dict]) -> None:
+        for result in results:
+            if not result["success"]:
+                logger.error(
+                    "Failed to %s message from %s: %s %s",
+                    action,
+                    queue_name,
+                    result["error_code"],
+                    result["error_message"],
+                )
+
+    def _get_dedup_key(self, queue_name: str, message: dict) -> str:
+        if self.dedup_key is None:
+            key = message["message_id"]
+        elif callable(self.dedup_key):
+            key = self.dedup_key(message)
+        else:
+            message_data = message["message_data"]
+            key = message_data.get(self.dedup_key) if isinstance(message_data, dict) else None
+        if key is None:
+            return None
+        # Keys are scoped by queue, so a message fanned out to many queues is processed by each
+        return f"{queue_name}:{key}"
+
+    def _split_duplicates(self, queue_name: str, messages) -> tuple[list, list]:
+        unique, duplicates, keys = [], [], set()
+        for message in messages:
+            key = self._get_dedup_key(queue_name, message)
+            if key is not None and (key in keys or self.dedup_cache.contains(key)):
+                duplicates.append(message)
+                continue
+            keys.add(key)
+            unique.append(message)
+        return unique, duplicates
+
+    def _delete_duplicates(self, queue_name: str, duplicates: list) -> None:
+        logger.info("Dropping %s duplicate messages from %s", len(duplicates), queue_name)
+        try:
+            self.delete_messages(
+                queue_name, [message["message_receipt_handle"] for message in duplicates]
+            )
+        except Exception:
+            logger.exception("Failed to delete duplicate messages from %s", queue_name)
+
+    async def _async_delete_duplicates(self, queue_name: str, duplicates: list) -> None:
+        logger.info("Dropping %s duplicate messages from %s", len(duplicates), queue_name)
+        try:
+            await self.async_delete_messages(
+                queue_name, [message["message_receipt_handle"] for message in duplicates]
+            )
+        except Exception:
+            logger.exception("Failed to delete duplicate messages from %s", queue_name)
+
+    def _get_fetch_metrics(self, messages: list) -> dict:
+        return {"messages": len(messages)}
+
+    def _get_response_metrics(self, response) -> dict:
+        if not isinstance(response, dict):
+            return {}
+        return {"retries": response.get("ResponseMetadata", {}).get("RetryAttempts", 0)}
+
+    def _get_batch_results_metrics(self, results: list[dict]) -> dict:
+        return {"failed": sum(1 for result in results if not result["success"])}
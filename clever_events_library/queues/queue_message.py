@@ -0,0 +1,189 @@
+from collections.abc import Callable, Iterator, Mapping
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .adapters.queue_base_adapter import QueueBaseAdapter
+
+MESSAGE_KEYS = ("message_id", "message_receipt_handle", "message_data", "message_attributes")
+
+
+class QueueMessage(Mapping):
+    """
+    A message fetched from a queue
+
+    Messages are slotted objects rather than dicts, so fetching many messages allocates little,
+    and their body is decoded on first access of message_data, so handlers that only look at
+    message_attributes never pay for parsing it. They are read-only mappings of message_id,
+    message_receipt_handle, message_data and message_attributes, so message["message_data"]
+    and message.get("message_data") keep working, and they are pickled as plain dicts.
+
+    Messages used to be plain dicts: isinstance(message, dict), item assignment and
+    json.dumps(message) no longer work on them. Use to_dict to get a plain dict.
+    """
+
+    __slots__ = (
+        "message_id",
+        "message_receipt_handle",
+        "message_attributes",
+        "raw_message_attributes",
+        "queue_name",
+        "message_group_id",
+        "receive_count",
+        "body",
+        "_message_data",
+        "_decoder",
+        "_adapter",
+    )
+
+    def __init__(
+        self,
+        message_id: str,
+        message_receipt_handle: str,
+        body,
+        message_attributes: dict,
+        decoder: Callable[[object], object] = None,
+        adapter: "QueueBaseAdapter" = None,
+        queue_name: str = None,
+        message_group_id: str = None,
+        receive_count: int = None,
+        raw_message_attributes: dict = None,
+    ) -> None:
+        """
+        Initialize QueueMessage
+
+        Args:
+            message_id (str): The id of the message
+            message_receipt_handle (str): The receipt handle of the message
+            body: The raw body of the message, or its message_data if decoder is not provided
+            message_attributes (dict): The attributes of the message
+            decoder (Callable, optional): Decodes body into message_data on first access.
+                Defaults to None.
+            adapter (QueueBaseAdapter, optional): The adapter the message was fetched with, used
+                by ack, nack and extend. Defaults to None.
+            queue_name (str, optional): The queue the message was fetched from. Defaults to None.
+            message_group_id (str, optional): The message group of messages fetched from FIFO
+                queues. Defaults to None.
+            receive_count (int, optional): The number of times the message was received,
+                including this one. Defaults to None, not reported by the adapter.
+            raw_message_attributes (dict, optional): The attributes as received, before they
+                were decoded. Defaults to None, the same as message_attributes.
+
+        Returns:
+            None
+        """
+        self.message_id = message_id
+        self.message_receipt_handle = message_receipt_handle
+        self.message_attributes = message_attributes
+        # The attributes as received, kept with body to send the message to other queues unchanged
+        self.raw_message_attributes = (
+            message_attributes if raw_message_attributes is None else raw_message_attributes
+        )
+        self.queue_name = queue_name
+        self.message_group_id = message_group_id
+        self.receive_count = receive_count
+        # The body as received, kept to send the message to other queues unchanged
+        self.body = body
+        self._message_data = body
+        self._decoder = decoder
+        self._adapter = adapter
+
+    @property
+    def message_data(self):
+        """
+        The decoded body of the message, decoded on first access
+        """
+        if self._decoder is not None:
+            self._message_data = self._decoder(self._message_data)
+            self._decoder = None
+        return self._message_data
+
+    def ack(self) -> dict:
+        """
+        Delete the message from its queue
+
+        Raises:
+            ValueError: If the message is not bound to an adapter
+
+        Returns:
+            dict: The response of the adapter delete_message
+        """
+        return self._get_adapter().delete_message(self.queue_name, self.message_receipt_handle)
+
+    async def async_ack(self) -> dict:
+        """
+        Asynchronously delete the message from its queue
+
+        Raises:
+            ValueError: If the message is not bound to an adapter
+
+        Returns:
+            dict: The response of the adapter async_delete_message
+        """
+        return await self._get_adapter().async_delete_message(
+            self.queue_name, self.message_receipt_handle
+        )
+
+    def nack(self) -> dict:
+        """
+        Make the message visible again, so it is redelivered right away
+
+        Raises:
+            ValueError: If the message is not bound to an adapter
+
+        Returns:
+            dict: The result of the visibility change, see change_messages_visibility
+        """
+        return self.extend(0)
+
+    def extend(self, visibility_timeout: int) -> dict:
+        """
+        Hide the message from other consumers for visibility_timeout more seconds
+
+        Args:
+            visibility_timeout (int): The amount of seconds, counted from now, the message is
+                hidden from other consumers
+
+        Raises:
+            ValueError: If the message is not bound to an adapter or visibility_timeout is negative
+
+        Returns:
+            dict: The result of the visibility change, see change_messages_visibility
+        """
+        return self._get_adapter().change_messages_visibility(
+            self.queue_name, [self.message_receipt_handle], visibility_timeout
+        )[0]
+
+    def to_dict(self) -> dict:
+        """
+        Get the message as a plain dict, as fetch_messages used to return it
+
+        Returns:
+            dict: A new dict with message_id, message_receipt_handle, message_data (decoded) and
+                message_attributes
+        """
+        return dict(self)
+
+    def _get_adapter(self) -> "QueueBaseAdapter":
+        if self._adapter is None or self.queue_name is None:
+            raise ValueError("message is not bound to a queue adapter.")
+        return self._adapter
+
+    def __getitem__(self, key: str):
+        if key in MESSAGE_KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(MESSAGE_KEYS)
+
+    def __len__(self) -> int:
+        return len(MESSAGE_KEYS)
+
+    def __repr__(self) -> str:
+        return (
+            f"QueueMessage(message_id={self.message_id!r}, queue_name={self.queue_name!r}, "
+            f"message_attributes={self.message_attributes!r})"
+        )
+
+    def __reduce__(self):
+        return dict, (dict(self),)
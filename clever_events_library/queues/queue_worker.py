@@ -0,0 +1,209 @@
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING
+
+from .lease_manager import LeaseManager
+
+if TYPE_CHECKING:
+    from .queue_manager import QueueManager
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+EXECUTORS = (EXECUTOR_THREAD, EXECUTOR_PROCESS)
+
+
+class QueueWorker:
+    def __init__(
+        self,
+        queue_manager: "QueueManager",
+        queue_name: str,
+        handler: Callable[[dict], None],
+        executor: str = EXECUTOR_THREAD,
+        workers: int = 4,
+        prefetch: int = None,
+        max_number_of_messages: int = 10,
+        idle_interval: float = 1.0,
+        stop_event: threading.Event = None,
+        lease_manager: LeaseManager = None,
+    ) -> None:
+        """
+        Initialize QueueWorker with queue_manager
+
+        The worker prefetches messages from the queue and dispatches them to a pool of threads or
+        processes. Messages whose handler returns without raising are deleted in batches, messages
+        whose handler raises are left in the queue to be redelivered after their visibility
+        timeout, or backed off and quarantined by the dead_letter_policy of queue_manager.
+
+        Args:
+            queue_manager (QueueManager): An instance of QueueManager
+            queue_name (str): The name of the queue
+            handler (Callable): Called with every message dict. It must be picklable (e.g. a module
+                level function) when executor is process.
+            executor (str, optional): thread for IO-bound handlers or process for CPU-bound
+                handlers. Defaults to thread.
+            workers (int, optional): Number of threads or processes. Defaults to 4.
+            prefetch (int, optional): Highest number of messages fetched but not processed yet.
+                Defaults to workers * 2.
+            max_number_of_messages (int, optional): Highest number of messages fetched by each
+                receive call. Defaults to 10.
+            idle_interval (float, optional): Seconds to wait before polling again when the queue
+                is empty or a receive failed. Defaults to 1.0.
+            stop_event (threading.Event, optional): Event that stops the worker when set. A new one
+                is created by default, set it by calling stop().
+            lease_manager (LeaseManager, optional): When provided, the visibility timeout of every
+                message is extended while its handler runs.
+
+        Raises:
+            ValueError: If any of the arguments is not valid
+
+        Returns:
+            None
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {', '.join(EXECUTORS)}.")
+        if workers < 1:
+            raise ValueError("workers must be a positive integer.")
+        if prefetch is None:
+            prefetch = workers * 2
+        if prefetch < 1:
+            raise ValueError("prefetch must be a positive integer.")
+        if idle_interval < 0:
+            raise ValueError("idle_interval must be a non-negative number.")
+
+        self.queue_manager = queue_manager
+        self.queue_name = queue_name
+        self.handler = handler
+        self._executor = executor
+        self._workers = workers
+        self._prefetch = prefetch
+        self._max_number_of_messages = max_number_of_messages
+        self._idle_interval = idle_interval
+        self._stop_event = stop_event or threading.Event()
+        self._lease_manager = lease_manager
+
+    def run(self) -> None:
+        """
+        Process messages until stop is called
+
+        Messages already dispatched when stop is called are processed and acknowledged before
+        returning.
+
+        Returns:
+            None
+        """
+        with self._create_executor() as executor:
+            in_flight = {}
+            while not self._stop_event.is_set():
+                fetched = 0
+                if len(in_flight) < self._prefetch:
+                    for message in self._fetch_messages(self._prefetch - len(in_flight)):
+                        if self._lease_manager is not None:
+                            self._lease_manager.track(
+                                self.queue_name, message["message_receipt_handle"]
+                            )
+                        in_flight[executor.submit(self.handler, message)] = message
+                        fetched += 1
+                    if fetched:
+                        self._record_in_flight(len(in_flight))
+                if not in_flight:
+                    if not fetched:
+                        self._stop_event.wait(self._idle_interval)
+                    continue
+                timeout = None
+                if len(in_flight) < self._prefetch:
+                    timeout = 0 if fetched else self._idle_interval
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                self._complete(done, in_flight)
+                if done:
+                    self._record_in_flight(len(in_flight))
+
+            done, _ = wait(in_flight)
+            self._complete(done, in_flight)
+            self._record_in_flight(0)
+
+    def stop(self) -> None:
+        """
+        Ask the worker to stop after the messages already dispatched are processed
+
+        Returns:
+            None
+        """
+        self._stop_event.set()
+
+    def _create_executor(self):
+        if self._executor == EXECUTOR_PROCESS:
+            return ProcessPoolExecutor(max_workers=self._workers)
+        return ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="QueueWorker")
+
+    def _record_in_flight(self, count: int) -> None:
+        instrumentation = getattr(self.queue_manager, "instrumentation", None)
+        if instrumentation is None:
+            return
+        try:
+            instrumentation.record_in_flight("process_message", self.queue_name, count)
+        except Exception:
+            logger.exception("Instrumentation failed to record in flight messages")
+
+    def _fetch_messages(self, capacity: int) -> list:
+        try:
+            return list(
+                self.queue_manager.fetch_messages(
+                    self.queue_name, min(capacity, self._max_number_of_messages)
+                )
+            )
+        except Exception:
+            logger.exception("Failed to fetch messages from %s", self.queue_name)
+            self._stop_event.wait(self._idle_interval)
+            return []
+
+    def _complete(self, done: set, in_flight: dict) -> None:
+        processed, failed = [], []
+        for future in done:
+            message = in_flight.pop(future)
+            if self._lease_manager is not None:
+                self._lease_manager.release(self.queue_name, message["message_receipt_handle"])
+            error = future.exception()
+            if error is None:
+                processed.append(message)
+            else:
+                logger.error(
+                    "Handler failed for message %s from %s",
+                    message["message_id"],
+                    self.queue_name,
+                    exc_info=error,
+                )
+                failed.append(message)
+        if processed:
+            self._delete_messages(processed)
+        if failed:
+            self._fail_messages(failed)
+
+    def _delete_messages(self, messages: list[dict]) -> None:
+        try:
+            self.queue_manager.mark_processed(self.queue_name, messages)
+        except Exception:
+            logger.exception("Failed to mark messages from %s as processed", self.queue_name)
+        receipt_handles = [message["message_receipt_handle"] for message in messages]
+        try:
+            results = self.queue_manager.delete_messages(self.queue_name, receipt_handles)
+        except Exception:
+            logger.exception("Failed to delete messages from %s", self.queue_name)
+            return
+        for result in results:
+            if not result["success"]:
+                logger.error(
+                    "Failed to delete message from %s: %s %s",
+                    self.queue_name,
+                    result["error_code"],
+                    result["error_message"],
+                )
+
+    def _fail_messages(self, messages: list[dict]) -> None:
+        try:
+            self.queue_manager.mark_failed(self.queue_name, messages)
+        except Exception:
+            logger.exception("Failed to mark messages from %s as failed", self.queue_name)
@@ -0,0 +1,138 @@
+import math
+import threading
+
+SQS_MAX_WAIT_TIME = 20
+SQS_MAX_NUMBER_OF_MESSAGES = 10
+
+
+class AdaptiveReceiveStrategy:
+    def __init__(
+        self,
+        idle_wait_time: int = SQS_MAX_WAIT_TIME,
+        busy_wait_time: int = 0,
+        backlog_max_number_of_messages: int = SQS_MAX_NUMBER_OF_MESSAGES,
+        idle_after: int = 1,
+    ) -> None:
+        """
+        Initialize AdaptiveReceiveStrategy
+
+        Adapts every receive to what the previous receives of the same queue returned. Idle
+        queues are long polled, so consumers wait for messages in a single request instead of
+        burning empty receives, and queues with backlog are drained without waiting. Receives
+        never request more messages than the caller asked for, so prefetch bounds hold.
+
+        Args:
+            idle_wait_time (int, optional): Seconds receives wait for messages once the queue is
+                idle. Defaults to 20, the SQS long polling limit.
+            busy_wait_time (int, optional): Seconds receives wait for messages while the queue
+                has messages. Defaults to 0.
+            backlog_max_number_of_messages (int, optional): Highest number of messages requested
+                while the queue has backlog, never more than the number requested by the caller.
+                Defaults to 10, the SQS limit.
+            idle_after (int, optional): Number of consecutive empty receives after which the
+                queue is considered idle. Defaults to 1.
+
+        Raises:
+            ValueError: If any of the arguments is not valid
+
+        Returns:
+            None
+        """
+        if not 0 <= busy_wait_time <= idle_wait_time <= SQS_MAX_WAIT_TIME:
+            raise ValueError(
+                f"wait times must satisfy 0 <= busy_wait_time <= idle_wait_time <= {SQS_MAX_WAIT_TIME}."
+            )
+        if not 1 <= backlog_max_number_of_messages <= SQS_MAX_NUMBER_OF_MESSAGES:
+            raise ValueError(
+                f"backlog_max_number_of_messages must be between 1 and {SQS_MAX_NUMBER_OF_MESSAGES}."
+            )
+        if idle_after < 1:
+            raise ValueError("idle_after must be a positive integer.")
+        self.idle_wait_time = idle_wait_time
+        self.busy_wait_time = busy_wait_time
+        self.backlog_max_number_of_messages = backlog_max_number_of_messages
+        self.idle_after = idle_after
+        self._empty_receives = {}
+        self._backlog = {}
+        self._lock = threading.Lock()
+
+    def get_receive_params(
+        self, queue_name: str, max_number_of_messages: int, max_wait_time: int = None
+    ) -> dict:
+        """
+        Get the wait time and number of messages of the next receive
+
+        Queues are considered idle until a receive returns messages.
+
+        Args:
+            queue_name (str): The name of the queue
+            max_number_of_messages (int): The highest number of messages requested by the caller
+            max_wait_time (int, optional): Highest number of seconds the receive may wait, e.g.
+                so a consumer blocked in a long poll still deletes its messages before their
+                visibility timeout. Defaults to None, no limit.
+
+        Returns:
+            dict: A dict with the WaitTimeSeconds and MaxNumberOfMessages receive parameters
+        """
+        with self._lock:
+            idle = self._empty_receives.get(queue_name, self.idle_after) >= self.idle_after
+            backlog = self._backlog.get(queue_name, False)
+        wait_time = self.idle_wait_time if idle else self.busy_wait_time
+        if max_wait_time is not None:
+            wait_time = min(wait_time, max_wait_time)
+        if backlog and not idle:
+            max_number_of_messages = min(
+                max_number_of_messages, self.backlog_max_number_of_messages
+            )
+        return {"WaitTimeSeconds": wait_time, "MaxNumberOfMessages": max_number_of_messages}
+
+    def record_receive(self, queue_name: str, requested: int, received: int) -> None:
+        """
+        Record the outcome of a receive
+
+        Args:
+            queue_name (str): The name of the queue
+            requested (int): The number of messages requested
+            received (int): The number of messages received
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if received:
+                self._empty_receives[queue_name] = 0
+            else:
+                self._empty_receives[queue_name] = self._empty_receives.get(queue_name, 0) + 1
+            # A full batch means more messages are likely waiting
+            self._backlog[queue_name] = received >= requested
+
+    def is_idle(self, queue_name: str) -> bool:
+        """
+        Check whether the queue is considered idle
+
+        Args:
+            queue_name (str): The name of the queue
+
+        Returns:
+            bool: True if the last idle_after receives were empty, or no receive was recorded
+        """
+        with self._lock:
+            return self._empty_receives.get(queue_name, self.idle_after) >= self.idle_after
+
+
+def get_pollers_for_backlog(
+    queue_depth: int, min_pollers: int, max_pollers: int, messages_per_poller: int
+) -> int:
+    """
+    Get the number of concurrent pollers needed to drain a queue
+
+    Args:
+        queue_depth (int): The approximate number of visible messages in the queue
+        min_pollers (int): Lowest number of pollers
+        max_pollers (int): Highest number of pollers
+        messages_per_poller (int): Number of messages of backlog each poller handles
+
+    Returns:
+        int: One poller per messages_per_poller messages, between min_pollers and max_pollers
+    """
+    return max(min_pollers, min(max_pollers, math.ceil(queue_depth / messages_per_poller)))
@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float = None) -> None:
+        """
+        Initialize TokenBucket with rate
+
+        The bucket holds up to burst tokens and is refilled at rate tokens per second. Callers
+        reserve tokens and wait until they are available, so waiting callers are served in order
+        and the long-run rate never exceeds rate.
+
+        Args:
+            rate (float): Tokens added per second
+            burst (float, optional): Highest number of tokens held. Defaults to rate.
+
+        Raises:
+            ValueError: If rate or burst is not positive
+
+        Returns:
+            None
+        """
+        if burst is None:
+            burst = rate
+        if rate <= 0 or burst <= 0:
+            raise ValueError("rate and burst must be positive numbers.")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Take tokens from the bucket, going into debt if there aren't enough
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            float: Seconds the caller must wait before using the tokens
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1) -> None:
+        """
+        Wait until tokens are available
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            None
+        """
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    async def async_acquire(self, tokens: float = 1) -> None:
+        """
+        Wait until tokens are available without blocking the event loop
+
+        Args:
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            None
+        """
+        delay = self.reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: float = None) -> None:
+        """
+        Initialize RateLimiter with rate
+
+        Keeps one TokenBucket per key, e.g. per topic, created on first use.
+
+        Args:
+            rate (float): Tokens added per second to every bucket
+            burst (float, optional): Highest number of tokens held by every bucket. Defaults to rate.
+
+        Raises:
+            ValueError: If rate or burst is not positive
+
+        Returns:
+            None
+        """
+        # Validates the arguments before any bucket is created
+        TokenBucket(rate, burst)
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def get_bucket(self, key: str) -> TokenBucket:
+        """
+        Get the bucket of a key
+
+        Args:
+            key (str): The key, e.g. a topic name
+
+        Returns:
+            TokenBucket: The bucket of the key
+        """
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    def acquire(self, key: str, tokens: float = 1) -> None:
+        """
+        Wait until tokens of the key bucket are available
+
+        Args:
+            key (str): The key, e.g. a topic name
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            None
+        """
+        self.get_bucket(key).acquire(tokens)
+
+    async def async_acquire(self, key: str, tokens: float = 1) -> None:
+        """
+        Wait until tokens of the key bucket are available without blocking the event loop
+
+        Args:
+            key (str): The key, e.g. a topic name
+            tokens (float, optional): Number of tokens to take. Defaults to 1.
+
+        Returns:
+            None
+        """
+        await self.get_bucket(key).async_acquire(tokens)
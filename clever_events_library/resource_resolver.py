@@ -0,0 +1,129 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+class ResourceResolver:
+    def __init__(
+        self, aws_region: str, aws_account_id: str, max_size: int = DEFAULT_CACHE_SIZE
+    ) -> None:
+        """
+        Initialize ResourceResolver with aws_region and aws_account_id
+
+        Topic ARNs and queue URLs are built (or resolved) once per name and kept in a LRU cache,
+        so publishing or fetching doesn't rebuild them on every call.
+
+        Args:
+            aws_region (str): AWS region name
+            aws_account_id (str): AWS account id
+            max_size (int, optional): Highest number of names kept in the cache. Defaults to 1024.
+
+        Raises:
+            ValueError: If max_size is not positive
+
+        Returns:
+            None
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer.")
+        self.aws_region = aws_region
+        self.aws_account_id = aws_account_id
+        self._max_size = max_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_topic_arn(self, service: str, topic_name: str) -> str:
+        """
+        Get the ARN of a resource
+
+        Args:
+            service (str): The AWS service, e.g. sns
+            topic_name (str): The name of the resource. ARNs are returned as is.
+
+        Returns:
+            str: The ARN of the resource
+        """
+        return self._get_or_resolve(("arn", service, topic_name), self._build_topic_arn)
+
+    def get_queue_url(self, queue_name: str, resolver: Callable[[str], str] = None) -> str:
+        """
+        Get the URL of a SQS queue
+
+        Args:
+            queue_name (str): The name of the queue. URLs are returned as is.
+            resolver (Callable, optional): Called with queue_name to resolve the URL, e.g. using
+                GetQueueUrl, the first time the queue is seen. By default the URL is built from
+                the region and account id.
+
+        Returns:
+            str: The URL of the queue
+        """
+        if queue_name.startswith("https://"):
+            return queue_name
+        return self._get_or_resolve(
+            ("queue_url", queue_name), lambda _: (resolver or self._build_queue_url)(queue_name)
+        )
+
+    async def async_get_queue_url(
+        self, queue_name: str, resolver: Callable[[str], Awaitable[str]]
+    ) -> str:
+        """
+        Get the URL of a SQS queue, awaiting resolver the first time the queue is seen
+
+        Args:
+            queue_name (str): The name of the queue. URLs are returned as is.
+            resolver (Callable): Called with queue_name to resolve the URL, e.g. using the
+                GetQueueUrl call of an async client, returns the awaitable URL
+
+        Returns:
+            str: The URL of the queue
+        """
+        if queue_name.startswith("https://"):
+            return queue_name
+        key = ("queue_url", queue_name)
+        value = self._get_cached(key)
+        if value is None:
+            value = await resolver(queue_name)
+            self._store(key, value)
+        return value
+
+    def clear(self) -> None:
+        """
+        Remove every cached ARN and URL
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._cache.clear()
+
+    def _get_or_resolve(self, key: tuple, resolve: Callable[[tuple], str]) -> str:
+        value = self._get_cached(key)
+        if value is None:
+            value = resolve(key)
+            self._store(key, value)
+        return value
+
+    def _get_cached(self, key: tuple) -> str | None:
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+            return value
+
+    def _store(self, key: tuple, value: str) -> None:
+        with self._lock:
+            self._cache[key] = value
+            if len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+
+    def _build_topic_arn(self, key: tuple) -> str:
+        _, service, topic_name = key
+        if topic_name.startswith("arn:"):
+            return topic_name
+        return f"arn:aws:{service}:{self.aws_region}:{self.aws_account_id}:{topic_name}"
+
+    def _build_queue_url(self, queue_name: str) -> str:
+        return f"https://sqs.{self.aws_region}.amazonaws.com/{self.aws_account_id}/{queue_name}"
@@ -0,0 +1,182 @@
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+
+from botocore.exceptions import ClientError, ConnectionError, HTTPClientError
+
+from .instrumentation import Instrumentation
+
+# Error codes returned by AWS, e.g. SNS reports throttling as Throttled and KMSThrottling
+RETRYABLE_ERROR_CODES = frozenset(
+    (
+        "Throttling",
+        "Throttled",
+        "KMSThrottling",
+        "ThrottlingException",
+        "ThrottledException",
+        "RequestThrottledException",
+        "TooManyRequestsException",
+        "RequestLimitExceeded",
+        "KMSThrottlingException",
+        "ServiceUnavailable",
+        "InternalError",
+        "InternalFailure",
+        "RequestTimeout",
+        "RequestTimeoutException",
+    )
+)
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 5.0,
+        retryable_error_codes: frozenset = RETRYABLE_ERROR_CODES,
+        instrumentation: Instrumentation = None,
+    ) -> None:
+        """
+        Initialize RetryPolicy
+
+        Failed calls are retried with exponential backoff and full jitter: the delay before
+        retry n is a random number of seconds between 0 and min(max_delay, base_delay * 2 ** n),
+        so clients throttled at the same time don't retry at the same time. Only throttling,
+        transient server errors and connection errors are retried.
+
+        Args:
+            max_attempts (int, optional): Highest number of attempts, the first one included.
+                Defaults to 3.
+            base_delay (float, optional): Seconds of the first backoff. Defaults to 0.1.
+            max_delay (float, optional): Highest number of seconds between attempts. Defaults to 5.
+            retryable_error_codes (frozenset, optional): AWS error codes that are retried.
+                Defaults to throttling and transient server error codes.
+            instrumentation (Instrumentation, optional): Its record_retry hook is called before
+                every retry. Defaults to None.
+
+        Raises:
+            ValueError: If any of the arguments is not valid
+
+        Returns:
+            None
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be a positive integer.")
+        if base_delay < 0 or max_delay < base_delay:
+            raise ValueError("delays must satisfy 0 <= base_delay <= max_delay.")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retryable_error_codes = retryable_error_codes
+        self.instrumentation = instrumentation
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        Get the backoff before a retry
+
+        Args:
+            attempt (int): The number of the retry, starting at 1
+
+        Returns:
+            float: Seconds to wait
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def is_retryable(self, error: Exception) -> bool:
+        """
+        Check whether a failed call should be retried
+
+        Args:
+            error (Exception): The error raised by the call
+
+        Returns:
+            bool: True for retryable AWS error codes and connection errors
+        """
+        if isinstance(error, ClientError):
+            return self.is_retryable_code(error.response.get("Error", {}).get("Code"))
+        return isinstance(error, (ConnectionError, HTTPClientError))
+
+    def is_retryable_code(self, error_code: str) -> bool:
+        """
+        Check whether an AWS error code, e.g. of a failed batch entry, should be retried
+
+        Args:
+            error_code (str): The AWS error code
+
+        Returns:
+            bool: True if the code is in retryable_error_codes
+        """
+        return error_code in self.retryable_error_codes
+
+    def call(self, operation: str, destination: str, func: Callable[[], object]):
+        """
+        Call func, retrying it while it raises retryable errors
+
+        Args:
+            operation (str): The operation, reported to instrumentation, e.g. publish
+            destination (str): The topic or queue, reported to instrumentation
+            func (Callable): The call to be made
+
+        Raises:
+            Exception: The last error raised by func, once attempts are exhausted or if the error
+                is not retryable
+
+        Returns:
+            The value returned by func
+        """
+        attempt = 0
+        while True:
+            try:
+                return func()
+            except Exception as error:
+                attempt += 1
+                if attempt >= self.max_attempts or not self.is_retryable(error):
+                    raise
+                self.record_retry(operation, destination, attempt, error)
+                time.sleep(self.get_delay(attempt))
+
+    async def async_call(self, operation: str, destination: str, func: Callable[[], Awaitable]):
+        """
+        Call and await func, retrying it while it raises retryable errors
+
+        Args:
+            operation (str): The operation, reported to instrumentation, e.g. publish
+            destination (str): The topic or queue, reported to instrumentation
+            func (Callable): Returns the awaitable to be awaited on every attempt
+
+        Raises:
+            Exception: The last error raised by func, once attempts are exhausted or if the error
+                is not retryable
+
+        Returns:
+            The value returned by func
+        """
+        attempt = 0
+        while True:
+            try:
+                return await func()
+            except Exception as error:
+                attempt += 1
+                if attempt >= self.max_attempts or not self.is_retryable(error):
+                    raise
+                self.record_retry(operation, destination, attempt, error)
+                await asyncio.sleep(self.get_delay(attempt))
+
+    def record_retry(
+        self, operation: str, destination: str, attempt: int, error: Exception = None
+    ) -> None:
+        """
+        Report a retry to instrumentation, when provided
+
+        Args:
+            operation (str): The operation, e.g. publish
+            destination (str): The topic or queue
+            attempt (int): The number of the retry, starting at 1
+            error (Exception, optional): The error that caused the retry. Defaults to None.
+
+        Returns:
+            None
+        """
+        if self.instrumentation is not None:
+            self.instrumentation.record_retry(operation, destination, attempt, error)
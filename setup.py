@@ -28,13 +28,21 @@ setup(
         "Programming Language :: Python :: 3.10",
     ],
     description=("Clever Real Estate Events Library"),
+    entry_points={"console_scripts": ["clever-events=clever_events_library.cli:main"]},
     download_url=f"{__user__}/{__library__}.git",
     install_requires=required,
+    extras_require={
+        "orjson": ["orjson"],
+        "msgpack": ["msgpack"],
+        "zstd": ["zstandard"],
+        "prometheus": ["prometheus-client"],
+        "opentelemetry": ["opentelemetry-api"],
+    },
     license="LICENSE",
     long_description=LONG_DESCRIPTION,
     long_description_content_type="text/markdown",
     name="clever_events_python_library",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
     url=f"{__user__}/{__library__}.git",
     version=__version__,
     zip_safe=False,
@@ -0,0 +1,40 @@
+import asyncio
+from unittest import TestCase
+
+from clever_events_library.events.adapters import InMemoryEventAdapter
+from clever_events_library.local_broker import InMemoryBroker
+
+
+class TestInMemoryEventAdapter(TestCase):
+    def setUp(self):
+        self.broker = InMemoryBroker()
+        self.broker.subscribe("my_topic", "my_queue")
+        self.adapter = InMemoryEventAdapter(self.broker)
+
+    def test_sync_publish(self):
+        self.adapter.sync_publish(
+            "my_topic",
+            {"message": {"key": "value"}, "message_attributes": {"attr1": 1}},
+            {"MessageGroupId": "group"},
+        )
+
+        message = self.broker.receive("my_queue", 10, 30)[0]
+        self.assertEqual(message["body"], {"key": "value"})
+        self.assertEqual(
+            message["attributes"], {"attr1": {"DataType": "String", "StringValue": "1"}}
+        )
+        self.assertEqual(message["group_id"], "group")
+
+    def test_async_publish_batch(self):
+        results = asyncio.run(
+            self.adapter.async_publish_batch("my_topic", [{"message": 1}, {"message": 2}])
+        )
+
+        self.assertEqual([result["success"] for result in results], [True, True])
+        self.assertEqual(
+            [message["body"] for message in self.broker.receive("my_queue", 10, 30)], [1, 2]
+        )
+
+    def test_sync_publish_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            self.adapter.sync_publish("my_topic", {})
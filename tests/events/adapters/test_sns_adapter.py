@@ -1,8 +1,14 @@
 import asyncio
+import threading
 from unittest import TestCase
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+
+from botocore.exceptions import ClientError
 
 from clever_events_library.events.adapters.sns_adapter import SNSAdapter
+from clever_events_library.events.fifo_partitioner import FifoPartitioner
+from clever_events_library.rate_limiter import RateLimiter
+from clever_events_library.retry import RetryPolicy
 
 
 class TestSNSAdapter(TestCase):
@@ -25,9 +31,29 @@ class TestSNSAdapter(TestCase):
             region_name="us-east-1",
             aws_access_key_id="fake_key",
             aws_secret_access_key="fake_secret",
+            config=ANY,
         )
+        self.assertEqual(mock_boto_client.call_args.kwargs["config"].max_pool_connections, 10)
         self.assertIsNotNone(self.sns_adapter._sns_client)
 
+    @patch("boto3.client")
+    def test_sns_client_is_created_once_across_threads(self, mock_boto_client):
+        barrier = threading.Barrier(8)
+        clients = []
+
+        def get_client():
+            barrier.wait()
+            clients.append(self.sns_adapter.sns_client)
+
+        threads = [threading.Thread(target=get_client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mock_boto_client.assert_called_once()
+        self.assertEqual(len({id(client) for client in clients}), 1)
+
     @patch.object(
         SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
     )
@@ -37,8 +63,7 @@ class TestSNSAdapter(TestCase):
         self.sns_adapter.sync_publish("my_topic", message_data)
         self.sns_adapter.sns_client.publish.assert_called_once_with(
             TargetArn="arn:aws:sns:us-east-1:123456789012:my_topic",
-            Message='{"default": "{\\"key\\": \\"value\\"}"}',
-            MessageStructure="json",
+            Message='{"key": "value"}',
             MessageAttributes={"attr1": {"DataType": "String", "StringValue": "value1"}},
         )
 
@@ -55,8 +80,7 @@ class TestSNSAdapter(TestCase):
             await self.sns_adapter.async_publish("my_topic", message_data)
             mock_client.publish.assert_called_once_with(
                 TargetArn="arn:aws:sns:us-east-1:123456789012:my_topic",
-                Message='{"default": "{\\"key\\": \\"value\\"}"}',
-                MessageStructure="json",
+                Message='{"key": "value"}',
                 MessageAttributes={"attr1": {"DataType": "String", "StringValue": "value1"}},
             )
 
@@ -83,8 +107,437 @@ class TestSNSAdapter(TestCase):
         self.sns_adapter.sync_publish("my_topic", message_data, additional_params)
         self.sns_adapter.sns_client.publish.assert_called_once_with(
             TargetArn="arn:aws:sns:us-east-1:123456789012:my_topic",
-            Message='{"default": "{\\"key\\": \\"value\\"}"}',
-            MessageStructure="json",
+            Message='{"key": "value"}',
             MessageAttributes={"attr1": {"DataType": "String", "StringValue": "value1"}},
             **additional_params
         )
+
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    def test_sync_publish_batch(self, mock_get_topic_arn):
+        messages_data = [{"message": {"key": index}} for index in range(12)]
+        self.sns_adapter.sns_client.publish_batch = MagicMock(
+            side_effect=[
+                {
+                    "Successful": [
+                        {"Id": str(index), "MessageId": f"id-{index}"} for index in range(10)
+                    ]
+                },
+                {
+                    "Successful": [{"Id": "10", "MessageId": "id-10"}],
+                    "Failed": [
+                        {
+                            "Id": "11",
+                            "Code": "InternalError",
+                            "Message": "boom",
+                            "SenderFault": False,
+                        }
+                    ],
+                },
+            ]
+        )
+
+        results = self.sns_adapter.sync_publish_batch("my_topic", messages_data)
+
+        self.assertEqual(self.sns_adapter.sns_client.publish_batch.call_count, 2)
+        first_call = self.sns_adapter.sns_client.publish_batch.call_args_list[0].kwargs
+        self.assertEqual(first_call["TopicArn"], "arn:aws:sns:us-east-1:123456789012:my_topic")
+        self.assertEqual(len(first_call["PublishBatchRequestEntries"]), 10)
+        self.assertEqual(
+            first_call["PublishBatchRequestEntries"][0],
+            {
+                "Id": "0",
+                "Message": '{"key": 0}',
+                "MessageAttributes": {},
+            },
+        )
+        self.assertEqual(len(results), 12)
+        self.assertTrue(all(result["success"] for result in results[:11]))
+        self.assertEqual(results[10]["message_id"], "id-10")
+        self.assertFalse(results[11]["success"])
+        self.assertEqual(results[11]["index"], 11)
+        self.assertEqual(results[11]["error_code"], "InternalError")
+
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    def test_sync_publish_batch_respects_payload_limit(self, mock_get_topic_arn):
+        messages_data = [
+            {"message": "a" * 100000},
+            {"message": "b" * 100000},
+            {"message": "c" * 100000},
+            {"message": "d" * 300000},
+        ]
+        self.sns_adapter.sns_client.publish_batch = MagicMock(
+            side_effect=lambda TopicArn, PublishBatchRequestEntries: {
+                "Successful": [
+                    {"Id": entry["Id"], "MessageId": entry["Id"]}
+                    for entry in PublishBatchRequestEntries
+                ]
+            }
+        )
+
+        results = self.sns_adapter.sync_publish_batch("my_topic", messages_data)
+
+        chunk_sizes = [
+            len(call.kwargs["PublishBatchRequestEntries"])
+            for call in self.sns_adapter.sns_client.publish_batch.call_args_list
+        ]
+        self.assertEqual(chunk_sizes, [2, 1])
+        self.assertEqual([result["success"] for result in results], [True, True, True, False])
+        self.assertEqual(results[3]["error_code"], "PayloadTooLarge")
+        self.assertTrue(results[3]["sender_fault"])
+
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    def test_sync_publish_batch_client_error_fails_chunk(self, mock_get_topic_arn):
+        from botocore.exceptions import ClientError
+
+        self.sns_adapter.sns_client.publish_batch = MagicMock(
+            side_effect=ClientError({"Error": {"Code": "Throttling"}}, "PublishBatch")
+        )
+
+        results = self.sns_adapter.sync_publish_batch("my_topic", [{"message": "test"}])
+
+        self.assertFalse(results[0]["success"])
+        self.assertEqual(results[0]["error_code"], "Throttling")
+
+    def test_sync_publish_batch_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            self.sns_adapter.sync_publish_batch("my_topic", [{"message": "test"}, {}])
+
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    @patch("clever_events_library.events.adapters.sns_adapter.Session")
+    def test_async_publish_batch(self, mock_session, mock_get_topic_arn):
+        mock_client = AsyncMock()
+        mock_client.publish_batch.return_value = {
+            "Successful": [{"Id": "0", "MessageId": "id-0"}],
+            "Failed": [{"Id": "1", "Code": "InvalidParameter", "SenderFault": True}],
+        }
+        mock_session.return_value.client.return_value.__aenter__.return_value = mock_client
+
+        async def run_test():
+            return await self.sns_adapter.async_publish_batch(
+                "my_topic", [{"message": "first"}, {"message": "second"}], {"Subject": "test"}
+            )
+
+        results = asyncio.run(run_test())
+
+        entries = mock_client.publish_batch.call_args.kwargs["PublishBatchRequestEntries"]
+        self.assertEqual([entry["Subject"] for entry in entries], ["test", "test"])
+        self.assertTrue(results[0]["success"])
+        self.assertFalse(results[1]["success"])
+        self.assertTrue(results[1]["sender_fault"])
+
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    @patch("clever_events_library.events.adapters.sns_adapter.Session")
+    def test_async_publish_reuses_client(self, mock_session, mock_get_topic_arn):
+        message_data = {"message": {"key": "value"}}
+        mock_client = AsyncMock()
+        client_context = mock_session.return_value.client.return_value
+        client_context.__aenter__.return_value = mock_client
+
+        async def run_test():
+            async with SNSAdapter(self.client_config, max_pool_connections=50) as adapter:
+                await asyncio.gather(
+                    *[adapter.async_publish("my_topic", message_data) for _ in range(5)]
+                )
+
+        asyncio.run(run_test())
+
+        mock_session.return_value.client.assert_called_once()
+        config = mock_session.return_value.client.call_args.kwargs["config"]
+        self.assertEqual(config.max_pool_connections, 50)
+        self.assertEqual(config.connector_args, {"keepalive_timeout": 15})
+        self.assertEqual(mock_client.publish.call_count, 5)
+        client_context.__aexit__.assert_called_once()
+
+    @patch("clever_events_library.events.adapters.sns_adapter.Session")
+    def test_aclose_releases_client(self, mock_session):
+        mock_session.return_value.client.return_value.__aenter__.return_value = AsyncMock()
+
+        async def run_test():
+            await self.sns_adapter.async_publish("my_topic", {"message": "test"})
+            self.assertIsNotNone(self.sns_adapter._async_client)
+            await self.sns_adapter.aclose()
+            self.assertIsNone(self.sns_adapter._async_client)
+
+        asyncio.run(run_test())
+
+        mock_session.return_value.client.return_value.__aexit__.assert_called_once()
+
+    def test_invalid_max_pool_connections(self):
+        with self.assertRaises(ValueError):
+            SNSAdapter(self.client_config, max_pool_connections=0)
+
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    def test_sync_publish_with_codec(self, mock_get_topic_arn):
+        sns_adapter = SNSAdapter(client_config=self.client_config, codec="json+zlib")
+        sns_adapter.sns_client.publish = MagicMock()
+
+        sns_adapter.sync_publish("my_topic", {"message": {"key": "value"}})
+
+        params = sns_adapter.sns_client.publish.call_args.kwargs
+        self.assertNotIn("MessageStructure", params)
+        self.assertEqual(sns_adapter.codec.decode(params["Message"]), {"key": "value"})
+        self.assertEqual(
+            params["MessageAttributes"],
+            {"clever_events_codec": {"DataType": "String", "StringValue": "json+zlib"}},
+        )
+
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    def test_sync_publish_with_typed_attributes(self, mock_get_topic_arn):
+        sns_adapter = SNSAdapter(client_config=self.client_config, typed_attributes=True)
+        sns_adapter.sns_client.publish = MagicMock()
+
+        sns_adapter.sync_publish(
+            "my_topic", {"message": {}, "message_attributes": {"count": 3, "tags": ["a"]}}
+        )
+
+        self.assertEqual(
+            sns_adapter.sns_client.publish.call_args.kwargs["MessageAttributes"],
+            {
+                "count": {"DataType": "Number", "StringValue": "3"},
+                "tags": {"DataType": "String.Array", "StringValue": '["a"]'},
+            },
+        )
+
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    def test_sync_publish_batch_with_attribute_schema(self, mock_get_topic_arn):
+        sns_adapter = SNSAdapter(
+            client_config=self.client_config,
+            attribute_schemas={"my_topic": {"user_id": "Number", "signature": "Binary"}},
+        )
+        sns_adapter.sns_client.publish_batch = MagicMock(
+            return_value={"Successful": [{"Id": "0", "MessageId": "id-0"}]}
+        )
+
+        sns_adapter.sync_publish_batch(
+            "my_topic",
+            [{"message": {}, "message_attributes": {"user_id": "42", "signature": b"\x00"}}],
+        )
+
+        entry = sns_adapter.sns_client.publish_batch.call_args.kwargs[
+            "PublishBatchRequestEntries"
+        ][0]
+        self.assertEqual(
+            entry["MessageAttributes"],
+            {
+                "user_id": {"DataType": "Number", "StringValue": "42"},
+                "signature": {"DataType": "Binary", "BinaryValue": b"\x00"},
+            },
+        )
+
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    def test_sync_publish_batch_with_fifo_partitioner(self, mock_get_topic_arn):
+        sns_adapter = SNSAdapter(
+            client_config=self.client_config,
+            fifo_partitioners={
+                "my_topic.fifo": FifoPartitioner(
+                    lambda message_data: message_data["message"]["user_id"],
+                    deduplication_key=lambda message_data: message_data["message"]["event_id"],
+                )
+            },
+        )
+        sns_adapter.sns_client.publish_batch = MagicMock(
+            return_value={"Successful": [{"Id": "0", "MessageId": "id-0"}]}
+        )
+
+        sns_adapter.sync_publish_batch(
+            "my_topic.fifo", [{"message": {"user_id": 1, "event_id": "e1"}}]
+        )
+
+        entry = sns_adapter.sns_client.publish_batch.call_args.kwargs[
+            "PublishBatchRequestEntries"
+        ][0]
+        self.assertEqual(entry["MessageGroupId"], "1")
+        self.assertEqual(entry["MessageDeduplicationId"], "e1")
+
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    def test_sync_publish_with_claim_check(self, mock_get_topic_arn):
+        store = MagicMock()
+        store.put.return_value = "s3://bucket/key"
+        sns_adapter = SNSAdapter(
+            client_config=self.client_config, claim_check_store=store, claim_check_threshold=100
+        )
+        sns_adapter.sns_client.publish = MagicMock()
+
+        sns_adapter.sync_publish("my_topic", {"message": {"key": "small"}})
+        sns_adapter.sync_publish("my_topic", {"message": {"key": "x" * 200}})
+
+        small, large = [call.kwargs for call in sns_adapter.sns_client.publish.call_args_list]
+        self.assertEqual(small["Message"], '{"key": "small"}')
+        self.assertEqual(small["MessageAttributes"], {})
+        store.put.assert_called_once_with(('{"key": "' + "x" * 200 + '"}').encode("utf-8"))
+        self.assertEqual(large["Message"], '{"clever_events_claim_check": "s3://bucket/key"}')
+        self.assertEqual(
+            large["MessageAttributes"],
+            {
+                "clever_events_claim_check": {
+                    "DataType": "String",
+                    "StringValue": "s3://bucket/key",
+                }
+            },
+        )
+
+    @patch("clever_events_library.retry.time.sleep")
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    def test_sync_publish_retries_throttling(self, mock_get_topic_arn, mock_sleep):
+        instrumentation = MagicMock()
+        sns_adapter = SNSAdapter(
+            client_config=self.client_config,
+            retry_policy=RetryPolicy(max_attempts=3, instrumentation=instrumentation),
+            rate_limiter=RateLimiter(rate=1000),
+        )
+        throttled = ClientError({"Error": {"Code": "Throttling"}}, "Publish")
+        sns_adapter._sns_client = MagicMock()
+        sns_adapter._sns_client.publish.side_effect = [throttled, throttled, {"MessageId": "1"}]
+
+        sns_adapter.sync_publish("my_topic", {"message": "hello"})
+
+        self.assertEqual(sns_adapter._sns_client.publish.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(
+            [call.args[:3] for call in instrumentation.record_retry.call_args_list],
+            [("publish", "my_topic", 1), ("publish", "my_topic", 2)],
+        )
+
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    def test_sync_publish_does_not_retry_client_errors(self, mock_get_topic_arn):
+        sns_adapter = SNSAdapter(client_config=self.client_config, retry_policy=RetryPolicy())
+        sns_adapter._sns_client = MagicMock()
+        sns_adapter._sns_client.publish.side_effect = ClientError(
+            {"Error": {"Code": "InvalidParameter"}}, "Publish"
+        )
+
+        with self.assertRaises(ClientError):
+            sns_adapter.sync_publish("my_topic", {"message": "hello"})
+
+        sns_adapter._sns_client.publish.assert_called_once()
+
+    @patch("clever_events_library.events.adapters.sns_adapter.time.sleep")
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    def test_sync_publish_batch_retries_throttled_entries(self, mock_get_topic_arn, mock_sleep):
+        rate_limiter = MagicMock()
+        sns_adapter = SNSAdapter(
+            client_config=self.client_config,
+            retry_policy=RetryPolicy(max_attempts=2),
+            rate_limiter=rate_limiter,
+        )
+        sns_adapter._sns_client = MagicMock()
+        sns_adapter._sns_client.publish_batch.side_effect = [
+            {
+                "Successful": [{"Id": "0", "MessageId": "m0"}],
+                "Failed": [
+                    {"Id": "1", "Code": "Throttling", "SenderFault": False},
+                    {"Id": "2", "Code": "InvalidParameter", "SenderFault": True},
+                ],
+            },
+            {"Successful": [{"Id": "1", "MessageId": "m1"}]},
+        ]
+
+        results = sns_adapter.sync_publish_batch(
+            "my_topic", [{"message": "a"}, {"message": "b"}, {"message": "c"}]
+        )
+
+        self.assertEqual([result["success"] for result in results], [True, True, False])
+        retried_entries = sns_adapter._sns_client.publish_batch.call_args_list[1].kwargs[
+            "PublishBatchRequestEntries"
+        ]
+        self.assertEqual([entry["Id"] for entry in retried_entries], ["1"])
+        self.assertEqual(
+            [call.args for call in rate_limiter.acquire.call_args_list],
+            [("my_topic", 3), ("my_topic", 1)],
+        )
+        mock_sleep.assert_called_once()
+
+    @patch("clever_events_library.events.adapters.sns_adapter.asyncio.sleep")
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    @patch("clever_events_library.events.adapters.sns_adapter.Session")
+    def test_async_publish_batch_retries_throttled_entries(
+        self, mock_session, mock_get_topic_arn, mock_sleep
+    ):
+        sns_adapter = SNSAdapter(
+            client_config=self.client_config, retry_policy=RetryPolicy(max_attempts=2)
+        )
+        mock_client = AsyncMock()
+        mock_client.publish_batch.side_effect = [
+            {
+                "Successful": [{"Id": "0", "MessageId": "m0"}],
+                # SNS reports throttled entries as sender faults
+                "Failed": [{"Id": "1", "Code": "Throttled", "SenderFault": True}],
+            },
+            {"Successful": [{"Id": "1", "MessageId": "m1"}]},
+        ]
+        mock_session.return_value.client.return_value.__aenter__.return_value = mock_client
+
+        async def run_test():
+            return await sns_adapter.async_publish_batch(
+                "my_topic", [{"message": "a"}, {"message": "b"}]
+            )
+
+        results = asyncio.run(run_test())
+
+        self.assertEqual([result["message_id"] for result in results], ["m0", "m1"])
+        mock_sleep.assert_awaited_once()
+
+    @patch.object(
+        SNSAdapter, "_get_topic_arn", return_value="arn:aws:sns:us-east-1:123456789012:my_topic"
+    )
+    def test_prepared_messages_are_encoded_once(self, mock_get_topic_arn):
+        self.sns_adapter.sns_client.publish = MagicMock()
+        self.sns_adapter.sns_client.publish_batch = MagicMock(
+            return_value={"Successful": [{"Id": "0"}, {"Id": "1"}]}
+        )
+
+        with patch.object(
+            self.sns_adapter.codec, "encode", wraps=self.sns_adapter.codec.encode
+        ) as encode:
+            prepared = self.sns_adapter.prepare(
+                "my_topic", {"message": {"key": "value"}, "message_attributes": {"a": 1}}
+            )
+            self.sns_adapter.publish_prepared(prepared)
+            self.sns_adapter.publish_prepared(prepared)
+            results = self.sns_adapter.publish_prepared_batch([prepared, prepared])
+
+        encode.assert_called_once()
+        self.assertEqual(prepared.size, len('{"key": "value"}') + len("a") + len("String") + 1)
+        self.assertEqual(self.sns_adapter.sns_client.publish.call_count, 2)
+        entries = self.sns_adapter.sns_client.publish_batch.call_args.kwargs[
+            "PublishBatchRequestEntries"
+        ]
+        self.assertEqual([entry["Id"] for entry in entries], ["0", "1"])
+        self.assertEqual(entries[0]["Message"], '{"key": "value"}')
+        self.assertTrue(all(result["success"] for result in results))
+
+    def test_publish_prepared_batch_requires_a_single_topic(self):
+        first = self.sns_adapter.prepare("first_topic", {"message": 1})
+        second = self.sns_adapter.prepare("second_topic", {"message": 2})
+
+        with self.assertRaises(ValueError):
+            self.sns_adapter.publish_prepared_batch([first, second])
+        self.assertEqual(self.sns_adapter.publish_prepared_batch([]), [])
@@ -0,0 +1,160 @@
+import queue
+import threading
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from clever_events_library.events.adapters import EventBaseAdapter
+from clever_events_library.events.buffered_event_publisher import BufferedEventPublisher
+
+
+def successful_batch(event_name, messages_data, additional_params):
+    return [{"index": index, "success": True} for index in range(len(messages_data))]
+
+
+class TestBufferedEventPublisher(TestCase):
+    def setUp(self):
+        self.mock_adapter = MagicMock(spec=EventBaseAdapter)
+        self.mock_adapter.sync_publish_batch.side_effect = successful_batch
+
+    def test_flushes_when_batch_size_is_reached(self):
+        with BufferedEventPublisher(
+            self.mock_adapter, batch_size=3, flush_interval=60
+        ) as publisher:
+            for index in range(3):
+                publisher.sync_publish("test_event", {"message": index})
+            self.assertTrue(publisher.flush(timeout=5))
+
+        self.mock_adapter.sync_publish_batch.assert_called_once_with(
+            "test_event", [{"message": 0}, {"message": 1}, {"message": 2}], {}
+        )
+
+    def test_flushes_after_flush_interval(self):
+        published = threading.Event()
+        self.mock_adapter.sync_publish_batch.side_effect = lambda *args: (
+            published.set() or successful_batch(*args)
+        )
+        publisher = BufferedEventPublisher(self.mock_adapter, batch_size=100, flush_interval=0.01)
+
+        publisher.sync_publish("test_event", {"message": "test"})
+
+        self.assertTrue(published.wait(timeout=5))
+        publisher.close()
+
+    def test_groups_events_by_name_and_params(self):
+        publisher = BufferedEventPublisher(self.mock_adapter, batch_size=100, flush_interval=60)
+        publisher.sync_publish("first_event", {"message": 1})
+        publisher.sync_publish("second_event", {"message": 2})
+        publisher.sync_publish("first_event", {"message": 3})
+        publisher.sync_publish("first_event", {"message": 4}, {"MessageGroupId": "group"})
+        publisher.close()
+
+        calls = [call.args for call in self.mock_adapter.sync_publish_batch.call_args_list]
+        self.assertEqual(
+            calls,
+            [
+                ("first_event", [{"message": 1}, {"message": 3}], {}),
+                ("second_event", [{"message": 2}], {}),
+                ("first_event", [{"message": 4}], {"MessageGroupId": "group"}),
+            ],
+        )
+
+    def test_reports_failed_entries(self):
+        on_failure = MagicMock()
+        self.mock_adapter.sync_publish_batch.side_effect = lambda *args: [
+            {"index": 0, "success": False, "error_code": "InternalError", "error_message": ""}
+        ]
+        publisher = BufferedEventPublisher(self.mock_adapter, on_failure=on_failure)
+        publisher.sync_publish("test_event", {"message": "test"})
+        publisher.close()
+
+        on_failure.assert_called_once()
+        event, result = on_failure.call_args.args
+        self.assertEqual(
+            event,
+            {
+                "event_name": "test_event",
+                "message_data": {"message": "test"},
+                "additional_params": {},
+            },
+        )
+        self.assertEqual(result["error_code"], "InternalError")
+
+    def test_reports_adapter_exceptions(self):
+        on_failure = MagicMock()
+        self.mock_adapter.sync_publish_batch.side_effect = ValueError("boom")
+        publisher = BufferedEventPublisher(self.mock_adapter, on_failure=on_failure)
+        publisher.sync_publish("test_event", {"message": "test"})
+        publisher.close()
+
+        self.assertEqual(on_failure.call_args.args[1]["error_code"], "ValueError")
+
+    def test_backpressure_raise(self):
+        started, release = threading.Event(), threading.Event()
+        self.mock_adapter.sync_publish_batch.side_effect = lambda *args: (
+            started.set() or release.wait() and successful_batch(*args)
+        )
+        publisher = BufferedEventPublisher(
+            self.mock_adapter, max_queue_size=1, batch_size=1, backpressure="raise"
+        )
+        publisher.sync_publish("test_event", {"message": 1})
+        started.wait(timeout=5)
+        publisher.sync_publish("test_event", {"message": 2})
+
+        with self.assertRaises(queue.Full):
+            publisher.sync_publish("test_event", {"message": 3})
+        release.set()
+        publisher.close()
+
+    def test_backpressure_drop_oldest(self):
+        publisher = BufferedEventPublisher(
+            self.mock_adapter,
+            max_queue_size=2,
+            batch_size=100,
+            flush_interval=60,
+            backpressure="drop_oldest",
+        )
+        for index in range(4):
+            publisher.sync_publish("test_event", {"message": index})
+        publisher.close()
+
+        self.mock_adapter.sync_publish_batch.assert_called_once_with(
+            "test_event", [{"message": 2}, {"message": 3}], {}
+        )
+
+    def test_backpressure_block_timeout(self):
+        started, release = threading.Event(), threading.Event()
+        self.mock_adapter.sync_publish_batch.side_effect = lambda *args: (
+            started.set() or release.wait() and successful_batch(*args)
+        )
+        publisher = BufferedEventPublisher(self.mock_adapter, max_queue_size=1, batch_size=1)
+        publisher.sync_publish("test_event", {"message": 1})
+        started.wait(timeout=5)
+        publisher.sync_publish("test_event", {"message": 2})
+
+        with self.assertRaises(queue.Full):
+            publisher.sync_publish("test_event", {"message": 3}, timeout=0.01)
+        release.set()
+        publisher.close()
+
+    def test_publish_after_close_raises(self):
+        publisher = BufferedEventPublisher(self.mock_adapter)
+        publisher.close()
+
+        with self.assertRaises(RuntimeError):
+            publisher.sync_publish("test_event", {"message": "test"})
+
+    def test_events_without_message_are_not_queued(self):
+        with BufferedEventPublisher(self.mock_adapter) as publisher:
+            publisher.sync_publish("test_event", {"message": 1})
+            with self.assertRaises(ValueError):
+                publisher.sync_publish("test_event", {"msg": 2})
+            publisher.sync_publish("test_event", {"message": 3})
+            self.assertTrue(publisher.flush(timeout=5))
+
+        self.mock_adapter.sync_publish_batch.assert_called_once_with(
+            "test_event", [{"message": 1}, {"message": 3}], {}
+        )
+
+    def test_invalid_backpressure(self):
+        with self.assertRaises(ValueError):
+            BufferedEventPublisher(self.mock_adapter, backpressure="ignore")
@@ -1,8 +1,32 @@
+import asyncio
 from unittest import TestCase
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
-from clever_events_library.events.adapters import EventBaseAdapter, SNSAdapter
+from clever_events_library.events.adapters import (
+    EventBaseAdapter,
+    InMemoryEventAdapter,
+    PreparedMessage,
+    SNSAdapter,
+)
 from clever_events_library.events.event_publisher import EventPublisher
+from clever_events_library.instrumentation import Instrumentation
+
+
+class StubEventAdapter(EventBaseAdapter):
+    def __init__(self):
+        self.calls = MagicMock()
+
+    def sync_publish(self, event_name, message_data, additional_params={}):
+        self.calls.sync_publish(event_name, message_data, additional_params)
+
+    async def async_publish(self, event_name, message_data, additional_params={}):
+        self.calls.async_publish(event_name, message_data, additional_params)
+
+    def sync_publish_batch(self, event_name, messages_data, additional_params={}):
+        return self.calls.sync_publish_batch(event_name, messages_data, additional_params)
+
+    async def async_publish_batch(self, event_name, messages_data, additional_params={}):
+        return self.calls.async_publish_batch(event_name, messages_data, additional_params)
 
 
 class TestEventPublisher(TestCase):
@@ -12,6 +36,13 @@ class TestEventPublisher(TestCase):
         self.mock_sns_adapter = MagicMock(spec=SNSAdapter)
         self.sns_publisher = EventPublisher(self.mock_sns_adapter)
 
+    def prepare_with_size(self, size):
+        self.mock_adapter.prepare.side_effect = (
+            lambda event_name, message_data, additional_params: PreparedMessage(
+                event_name, event_name, message_data, size
+            )
+        )
+
     def test_publish_calls_adapter_publish(self):
         event_name = "test_event"
         message_data = {"key": "value"}
@@ -27,3 +58,144 @@ class TestEventPublisher(TestCase):
         self.sns_publisher.sync_publish(event_name, message_data)
 
         self.mock_sns_adapter.sync_publish.assert_called_once_with(event_name, message_data, {})
+
+    def test_publish_batch_calls_adapter_publish_batch(self):
+        event_name = "test_event"
+        messages_data = [{"message": "first"}, {"message": "second"}]
+        self.mock_adapter.sync_publish_batch.return_value = [{"success": True}, {"success": True}]
+
+        results = self.publisher.sync_publish_batch(event_name, messages_data)
+
+        self.mock_adapter.sync_publish_batch.assert_called_once_with(event_name, messages_data, {})
+        self.assertEqual(results, [{"success": True}, {"success": True}])
+
+    def test_publish_with_instrumentation(self):
+        instrumentation = MagicMock(spec=Instrumentation)
+        instrumentation.start_call.return_value = "context"
+        self.prepare_with_size(12)
+        publisher = EventPublisher(self.mock_adapter, instrumentation=instrumentation)
+
+        publisher.sync_publish("test_event", {"message": "first"})
+
+        self.mock_adapter.prepare.assert_called_once_with("test_event", {"message": "first"}, {})
+        self.mock_adapter.publish_prepared.assert_called_once()
+        self.mock_adapter.get_payload_size.assert_not_called()
+        instrumentation.start_call.assert_called_once_with("publish", "test_event")
+        (
+            context,
+            operation,
+            destination,
+            duration,
+            metrics,
+            error,
+        ) = instrumentation.end_call.call_args.args
+        self.assertEqual((context, operation, destination), ("context", "publish", "test_event"))
+        self.assertGreaterEqual(duration, 0)
+        self.assertEqual(metrics, {"batch_size": 1, "payload_bytes": 12})
+        self.assertIsNone(error)
+        self.assertEqual(
+            [call.args for call in instrumentation.record_in_flight.call_args_list],
+            [("publish", "test_event", 1), ("publish", "test_event", 0)],
+        )
+
+    def test_publish_batch_with_instrumentation_records_failures(self):
+        instrumentation = MagicMock(spec=Instrumentation)
+        self.prepare_with_size(5)
+        self.mock_adapter.async_publish_prepared_batch = AsyncMock(
+            return_value=[{"success": True}, {"success": False}]
+        )
+        publisher = EventPublisher(self.mock_adapter, instrumentation=instrumentation)
+
+        asyncio.run(
+            publisher.async_publish_batch("test_event", [{"message": "a"}, {"message": "b"}])
+        )
+
+        metrics = instrumentation.end_call.call_args.args[4]
+        self.assertEqual(metrics, {"batch_size": 2, "payload_bytes": 10, "failed": 1})
+
+    def test_publish_with_instrumentation_reraises_errors(self):
+        instrumentation = MagicMock(spec=Instrumentation)
+        self.mock_adapter.prepare.side_effect = ValueError("message is required")
+        publisher = EventPublisher(self.mock_adapter, instrumentation=instrumentation)
+
+        with self.assertRaises(ValueError):
+            publisher.sync_publish("test_event", {"key": "value"})
+
+        self.assertIsInstance(instrumentation.end_call.call_args.args[5], ValueError)
+
+    def test_failing_instrumentation_does_not_break_publish(self):
+        instrumentation = MagicMock(spec=Instrumentation)
+        instrumentation.end_call.side_effect = RuntimeError("exporter down")
+        self.prepare_with_size(5)
+        publisher = EventPublisher(self.mock_adapter, instrumentation=instrumentation)
+
+        with self.assertLogs("clever_events_library.mixins", level="ERROR"):
+            publisher.sync_publish("test_event", {"message": "first"})
+
+        self.mock_adapter.publish_prepared.assert_called_once()
+
+    def test_prepare_caches_events_by_cache_key(self):
+        self.prepare_with_size(5)
+        publisher = EventPublisher(self.mock_adapter, prepared_cache_size=1)
+
+        first = publisher.prepare("test_event", {"message": 1}, cache_key="heartbeat")
+        second = publisher.prepare("test_event", {"message": 2}, cache_key="heartbeat")
+        other = publisher.prepare("other_event", {"message": 1}, cache_key="heartbeat")
+        uncached = publisher.prepare("test_event", {"message": 1})
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, uncached)
+        self.assertEqual(other.event_name, "other_event")
+        # The cache holds a single event, so the first one was evicted
+        self.assertIsNot(
+            publisher.prepare("test_event", {"message": 1}, cache_key="heartbeat"), first
+        )
+        self.assertEqual(self.mock_adapter.prepare.call_count, 4)
+        with self.assertRaises(ValueError):
+            EventPublisher(self.mock_adapter, prepared_cache_size=0)
+
+    def test_publish_prepared_with_instrumentation(self):
+        instrumentation = MagicMock(spec=Instrumentation)
+        adapter = InMemoryEventAdapter()
+        adapter.broker.subscribe("test_event", "test_queue")
+        publisher = EventPublisher(adapter, instrumentation=instrumentation)
+        prepared = publisher.prepare("test_event", {"message": {"key": "value"}})
+
+        publisher.publish_prepared(prepared)
+        asyncio.run(publisher.async_publish_prepared(prepared))
+        results = publisher.publish_prepared_batch([prepared, prepared])
+
+        self.assertTrue(all(result["success"] for result in results))
+        self.assertEqual(adapter.broker.count_messages("test_queue")["visible"], 4)
+        self.assertEqual(
+            [call.args[4] for call in instrumentation.end_call.call_args_list],
+            [
+                {"batch_size": 1, "payload_bytes": prepared.size},
+                {"batch_size": 1, "payload_bytes": prepared.size},
+                {"batch_size": 2, "payload_bytes": 2 * prepared.size, "failed": 0},
+            ],
+        )
+
+    def test_default_prepared_publishing_uses_adapter_publish_methods(self):
+        adapter = StubEventAdapter()
+        publisher = EventPublisher(adapter)
+        prepared = publisher.prepare("test_event", {"message": 1}, {"Subject": "test"})
+
+        publisher.publish_prepared(prepared)
+        asyncio.run(publisher.async_publish_prepared(prepared))
+        publisher.publish_prepared_batch([prepared, prepared])
+
+        adapter.calls.sync_publish.assert_called_once_with(
+            "test_event", {"message": 1}, {"Subject": "test"}
+        )
+        adapter.calls.async_publish.assert_called_once_with(
+            "test_event", {"message": 1}, {"Subject": "test"}
+        )
+        adapter.calls.sync_publish_batch.assert_called_once_with(
+            "test_event", [{"message": 1}, {"message": 1}], {"Subject": "test"}
+        )
+        other = publisher.prepare("test_event", {"message": 1})
+        with self.assertRaises(ValueError):
+            publisher.publish_prepared_batch([prepared, other])
+        with self.assertRaises(ValueError):
+            publisher.prepare("test_event", {"key": "value"})
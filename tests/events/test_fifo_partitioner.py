@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+from clever_events_library.events.adapters import InMemoryEventAdapter
+from clever_events_library.events.fifo_partitioner import FifoPartitioner
+from clever_events_library.queues.adapters import InMemoryQueueAdapter
+
+
+class TestFifoPartitioner(TestCase):
+    def test_partition(self):
+        partitioner = FifoPartitioner(lambda message_data: message_data["message"]["user_id"])
+
+        message_data = partitioner.partition({"message": {"user_id": 42, "name": "test"}})
+        duplicate = partitioner.partition({"message": {"name": "test", "user_id": 42}})
+
+        self.assertEqual(message_data["message_group_id"], "42")
+        self.assertEqual(len(message_data["message_deduplication_id"]), 64)
+        self.assertEqual(
+            message_data["message_deduplication_id"], duplicate["message_deduplication_id"]
+        )
+
+    def test_partition_keeps_explicit_ids(self):
+        partitioner = FifoPartitioner(
+            lambda message_data: "group", deduplication_key=lambda message_data: "dedup"
+        )
+
+        message_data = partitioner.partition({"message": 1, "message_group_id": "explicit"})
+
+        self.assertEqual(message_data["message_group_id"], "explicit")
+        self.assertEqual(message_data["message_deduplication_id"], "dedup")
+
+    def test_partitions_bound_groups(self):
+        partitioner = FifoPartitioner(lambda message_data: message_data["message"], partitions=4)
+
+        group_ids = {partitioner.get_group_id({"message": index}) for index in range(100)}
+
+        self.assertEqual(group_ids, {"0", "1", "2", "3"})
+        self.assertEqual(
+            partitioner.get_group_id({"message": 7}), partitioner.get_group_id({"message": 7})
+        )
+
+    def test_invalid_partitions(self):
+        with self.assertRaises(ValueError):
+            FifoPartitioner(lambda message_data: "group", partitions=0)
+
+    def test_local_adapters_keep_message_group(self):
+        event_adapter = InMemoryEventAdapter()
+        event_adapter.broker.subscribe("test.fifo", "test_queue.fifo")
+        queue_adapter = InMemoryQueueAdapter(event_adapter.broker)
+        partitioner = FifoPartitioner(lambda message_data: message_data["message"]["user_id"])
+
+        event_adapter.sync_publish_batch(
+            "test.fifo", [partitioner.partition({"message": {"user_id": 1}})]
+        )
+
+        message = next(queue_adapter.fetch_messages("test_queue.fifo"))
+        self.assertEqual(message.message_group_id, "1")
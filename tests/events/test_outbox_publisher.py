@@ -0,0 +1,268 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from clever_events_library.events.adapters import EventBaseAdapter, InMemoryEventAdapter
+from clever_events_library.events.outbox_publisher import DEDUP_ID_ATTRIBUTE, OutboxPublisher
+from clever_events_library.queues.adapters import InMemoryQueueAdapter
+
+
+def successful_batch(event_name, messages_data, additional_params):
+    return [{"index": index, "success": True} for index in range(len(messages_data))]
+
+
+def failed_result(index, sender_fault):
+    return {
+        "index": index,
+        "success": False,
+        "message_id": None,
+        "error_code": "PayloadTooLarge" if sender_fault else "Throttling",
+        "error_message": "failed",
+        "sender_fault": sender_fault,
+    }
+
+
+class StubEventAdapter(EventBaseAdapter):
+    def __init__(self):
+        self.sync_publish_batch = MagicMock(side_effect=successful_batch)
+
+    def sync_publish(self, event_name, message_data, additional_params={}):
+        raise NotImplementedError
+
+    async def async_publish(self, event_name, message_data, additional_params={}):
+        raise NotImplementedError
+
+    def sync_publish_batch(self, event_name, messages_data, additional_params={}):
+        raise NotImplementedError
+
+    async def async_publish_batch(self, event_name, messages_data, additional_params={}):
+        raise NotImplementedError
+
+
+class TestOutboxPublisher(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "outbox.db")
+        self.mock_adapter = StubEventAdapter()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_relays_events_with_dedup_ids(self):
+        with OutboxPublisher(self.mock_adapter, self.path) as publisher:
+            dedup_id = publisher.sync_publish(
+                "test_event", {"message": 1, "message_attributes": {"attr": "value"}}
+            )
+            self.assertTrue(publisher.flush(timeout=5))
+            self.assertEqual(publisher.get_backlog(), 0)
+
+        self.mock_adapter.sync_publish_batch.assert_called_once_with(
+            "test_event",
+            [
+                {
+                    "message": 1,
+                    "message_attributes": {"attr": "value", DEDUP_ID_ATTRIBUTE: dedup_id},
+                }
+            ],
+            {},
+        )
+
+    def test_batches_events_by_event_name_and_params(self):
+        with OutboxPublisher(self.mock_adapter, self.path, batch_size=10) as publisher:
+            publisher.sync_publish_batch("first", [{"message": 0}, {"message": 1}])
+            publisher.sync_publish("second", {"message": 2}, {"Subject": "test"})
+            publisher.sync_publish("first", {"message": 3})
+            self.assertTrue(publisher.flush(timeout=5))
+
+        published = {}
+        for call in self.mock_adapter.sync_publish_batch.call_args_list:
+            event_name, messages_data, additional_params = call.args
+            published.setdefault((event_name, str(additional_params)), []).extend(
+                message_data["message"] for message_data in messages_data
+            )
+        self.assertEqual(
+            published, {("first", "{}"): [0, 1, 3], ("second", "{'Subject': 'test'}"): [2]}
+        )
+
+    def test_fifo_events_get_deduplication_id(self):
+        with OutboxPublisher(self.mock_adapter, self.path) as publisher:
+            dedup_ids = [
+                publisher.sync_publish("test.fifo", {"message": 1}, {"MessageGroupId": "g"}),
+                publisher.sync_publish("test.fifo", {"message": 2, "message_group_id": "h"}),
+            ]
+            self.assertTrue(publisher.flush(timeout=5))
+
+        messages_data = [
+            message_data
+            for call in self.mock_adapter.sync_publish_batch.call_args_list
+            for message_data in call.args[1]
+        ]
+        self.assertEqual(
+            [message_data["message_deduplication_id"] for message_data in messages_data],
+            dedup_ids,
+        )
+
+    def test_retries_failed_events(self):
+        self.mock_adapter.sync_publish_batch.side_effect = [
+            ConnectionError("unavailable"),
+            [failed_result(0, sender_fault=False)],
+            [{"index": 0, "success": True}],
+        ]
+
+        with patch.object(
+            self.mock_adapter, "prepare", wraps=self.mock_adapter.prepare
+        ) as prepare, OutboxPublisher(self.mock_adapter, self.path, retry_delay=0.01) as publisher:
+            dedup_id = publisher.sync_publish("test_event", {"message": 1})
+            self.assertTrue(publisher.flush(timeout=5))
+
+        self.assertEqual(self.mock_adapter.sync_publish_batch.call_count, 3)
+        # The event is prepared once, retries reuse the prepared message
+        prepare.assert_called_once()
+        dedup_ids = {
+            call.args[1][0]["message_attributes"][DEDUP_ID_ATTRIBUTE]
+            for call in self.mock_adapter.sync_publish_batch.call_args_list
+        }
+        self.assertEqual(dedup_ids, {dedup_id})
+
+    def test_fifo_events_wait_behind_retried_events_of_their_group(self):
+        results = iter([[failed_result(0, sender_fault=False)]])
+
+        def publish_batch(event_name, messages_data, additional_params):
+            return next(results, None) or successful_batch(
+                event_name, messages_data, additional_params
+            )
+
+        self.mock_adapter.sync_publish_batch.side_effect = publish_batch
+        with OutboxPublisher(
+            self.mock_adapter, self.path, batch_size=1, retry_delay=0.05
+        ) as publisher:
+            publisher.sync_publish_batch(
+                "test.fifo",
+                [
+                    {"message": "first", "message_group_id": "g"},
+                    {"message": "second", "message_group_id": "g"},
+                    {"message": "other", "message_group_id": "h"},
+                ],
+            )
+            self.assertTrue(publisher.flush(timeout=5))
+
+        published = [
+            call.args[1][0]["message"]
+            for call in self.mock_adapter.sync_publish_batch.call_args_list
+        ]
+        self.assertEqual(published, ["first", "other", "first", "second"])
+
+    def test_rejected_events_are_reported(self):
+        self.mock_adapter.sync_publish_batch.side_effect = [[failed_result(0, sender_fault=True)]]
+        on_failure = MagicMock()
+
+        with OutboxPublisher(self.mock_adapter, self.path, on_failure=on_failure) as publisher:
+            dedup_id = publisher.sync_publish("test_event", {"message": 1})
+            self.assertTrue(publisher.flush(timeout=5))
+
+        event, result = on_failure.call_args.args
+        self.assertEqual(event["dedup_id"], dedup_id)
+        self.assertEqual(event["event_name"], "test_event")
+        self.assertEqual(result["error_code"], "PayloadTooLarge")
+
+    def test_throttled_sender_faults_are_retried(self):
+        throttled = {**failed_result(0, sender_fault=True), "error_code": "Throttled"}
+        self.mock_adapter.sync_publish_batch.side_effect = [
+            [throttled],
+            [{"index": 0, "success": True}],
+        ]
+        on_failure = MagicMock()
+
+        with OutboxPublisher(
+            self.mock_adapter, self.path, retry_delay=0.01, on_failure=on_failure
+        ) as publisher:
+            publisher.sync_publish("test_event", {"message": 1})
+            self.assertTrue(publisher.flush(timeout=5))
+
+        self.assertEqual(self.mock_adapter.sync_publish_batch.call_count, 2)
+        on_failure.assert_not_called()
+
+    def test_events_without_message_are_not_appended(self):
+        with OutboxPublisher(self.mock_adapter, self.path) as publisher:
+            with self.assertRaises(ValueError):
+                publisher.sync_publish_batch("test_event", [{"message": 1}, {"attributes": {}}])
+            self.assertEqual(publisher.get_backlog(), 0)
+
+    def test_events_failing_to_be_prepared_are_rejected_alone(self):
+        on_failure = MagicMock()
+        prepare = self.mock_adapter.prepare
+
+        def fail_odd_messages(event_name, message_data, additional_params):
+            if message_data["message"] % 2:
+                raise TypeError("not serializable")
+            return prepare(event_name, message_data, additional_params)
+
+        with patch.object(
+            self.mock_adapter, "prepare", side_effect=fail_odd_messages
+        ), OutboxPublisher(self.mock_adapter, self.path, on_failure=on_failure) as publisher:
+            publisher.sync_publish_batch("test_event", [{"message": 0}, {"message": 1}])
+            self.assertTrue(publisher.flush(timeout=5))
+
+        messages_data = self.mock_adapter.sync_publish_batch.call_args.args[1]
+        self.assertEqual([message_data["message"] for message_data in messages_data], [0])
+        event, result = on_failure.call_args.args
+        self.assertEqual(event["message_data"]["message"], 1)
+        self.assertEqual(result["error_code"], "TypeError")
+
+    def test_spool_survives_restarts(self):
+        self.mock_adapter.sync_publish_batch.side_effect = ConnectionError("unavailable")
+        publisher = OutboxPublisher(self.mock_adapter, self.path, retry_delay=60)
+        publisher.sync_publish("test_event", {"message": 1})
+        self.assertFalse(publisher.flush(timeout=0.2))
+        publisher.close()
+
+        adapter = InMemoryEventAdapter()
+        queue_adapter = InMemoryQueueAdapter(adapter.broker)
+        adapter.broker.subscribe("test_event", "test_queue")
+        with OutboxPublisher(adapter, self.path) as publisher:
+            self.assertTrue(publisher.flush(timeout=5))
+
+        message = next(queue_adapter.fetch_messages("test_queue"))
+        self.assertEqual(message["message_data"], 1)
+        self.assertIn(DEDUP_ID_ATTRIBUTE, message["message_attributes"])
+
+    def test_closed_publisher_raises(self):
+        publisher = OutboxPublisher(self.mock_adapter, self.path)
+        publisher.close()
+
+        with self.assertRaises(RuntimeError):
+            publisher.sync_publish("test_event", {"message": 1})
+
+    def test_retry_delay_is_capped_after_many_attempts(self):
+        with OutboxPublisher(
+            self.mock_adapter, self.path, retry_delay=1, max_retry_delay=60
+        ) as publisher:
+            self.assertEqual(publisher._get_retry_delay(2), 4)
+            self.assertEqual(publisher._get_retry_delay(5000), 60)
+
+    def test_relay_survives_unexpected_errors(self):
+        with OutboxPublisher(self.mock_adapter, self.path, retry_delay=0.01) as publisher:
+            relay = publisher._relay
+            calls = []
+
+            def fail_once(events):
+                calls.append(events)
+                if len(calls) == 1:
+                    raise RuntimeError("bug")
+                relay(events)
+
+            with patch.object(publisher, "_relay", side_effect=fail_once), self.assertLogs(
+                "clever_events_library.events.outbox_publisher", level="ERROR"
+            ):
+                publisher.sync_publish("test_event", {"message": 1})
+                self.assertTrue(publisher.flush(timeout=5))
+
+            self.assertEqual(len(calls), 2)
+            self.assertTrue(publisher._worker.is_alive())
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            OutboxPublisher(self.mock_adapter, self.path, batch_size=0)
+        with self.assertRaises(ValueError):
+            OutboxPublisher(self.mock_adapter, self.path, retry_delay=0)
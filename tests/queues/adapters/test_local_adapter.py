@@ -0,0 +1,64 @@
+import asyncio
+from unittest import TestCase
+
+from clever_events_library.local_broker import InMemoryBroker
+from clever_events_library.queues.adapters import InMemoryQueueAdapter
+
+
+class TestInMemoryQueueAdapter(TestCase):
+    def setUp(self):
+        self.broker = InMemoryBroker()
+        self.broker.send("my_queue", [({"key": index}, {}, None) for index in range(3)])
+        self.adapter = InMemoryQueueAdapter(self.broker)
+
+    def test_fetch_messages(self):
+        messages = list(self.adapter.fetch_messages("my_queue", 2))
+
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages[0]["message_data"], {"key": 0})
+        self.assertEqual(messages[0]["message_attributes"], {})
+        self.assertIn("message_receipt_handle", messages[0])
+
+    def test_delete_message(self):
+        message = list(self.adapter.fetch_messages("my_queue"))[0]
+
+        response = self.adapter.delete_message("my_queue", message["message_receipt_handle"])
+
+        self.assertEqual(response["ResponseMetadata"]["HTTPStatusCode"], 200)
+        with self.assertRaises(ValueError):
+            self.adapter.delete_message("my_queue", message["message_receipt_handle"])
+
+    def test_send_messages(self):
+        messages = list(self.adapter.fetch_messages("my_queue", 2))
+
+        results = self.adapter.send_messages("other_queue", messages)
+
+        self.assertEqual([result["success"] for result in results], [True, True])
+        sent = list(self.adapter.fetch_messages("other_queue", 10))
+        self.assertEqual([message["message_data"] for message in sent], [{"key": 0}, {"key": 1}])
+        self.assertEqual(messages[0].receive_count, 1)
+        self.assertEqual(sent[0].receive_count, 1)
+
+    def test_async_fetch_and_delete_messages(self):
+        async def run_test():
+            messages = await self.adapter.async_fetch_messages("my_queue", 10)
+            return await self.adapter.async_delete_messages(
+                "my_queue", [message["message_receipt_handle"] for message in messages] + ["bad"]
+            )
+
+        results = asyncio.run(run_test())
+
+        self.assertEqual([result["success"] for result in results], [True, True, True, False])
+        self.assertEqual(results[3]["error_code"], "ReceiptHandleIsInvalid")
+        self.assertEqual(self.broker.count_messages("my_queue"), {"visible": 0, "in_flight": 0})
+
+    def test_change_messages_visibility(self):
+        self.adapter.set_visibility_timeout(30)
+        message = list(self.adapter.fetch_messages("my_queue"))[0]
+
+        results = self.adapter.change_messages_visibility(
+            "my_queue", [message["message_receipt_handle"]], 0
+        )
+
+        self.assertTrue(results[0]["success"])
+        self.assertEqual(len(list(self.adapter.fetch_messages("my_queue", 10))), 3)
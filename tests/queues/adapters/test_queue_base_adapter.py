@@ -0,0 +1,50 @@
+import asyncio
+from unittest import TestCase
+
+from clever_events_library.queues.adapters import QueueBaseAdapter
+
+
+class MinimalQueueAdapter(QueueBaseAdapter):
+    def __init__(self):
+        self.deleted = []
+
+    def fetch_messages(self, queue_name, max_number_of_messages=1):
+        return iter([])
+
+    def delete_message(self, queue_name, message_id):
+        if message_id == "missing":
+            raise KeyError(message_id)
+        self.deleted.append(message_id)
+        return {}
+
+    async def async_fetch_messages(self, queue_name, max_number_of_messages=1):
+        return []
+
+    async def async_delete_message(self, queue_name, message_id):
+        return self.delete_message(queue_name, message_id)
+
+
+class TestQueueBaseAdapter(TestCase):
+    def setUp(self):
+        self.adapter = MinimalQueueAdapter()
+
+    def test_delete_messages_falls_back_to_delete_message(self):
+        results = self.adapter.delete_messages("test_queue", ["handle1", "missing"])
+
+        self.assertEqual(self.adapter.deleted, ["handle1"])
+        self.assertEqual([result["success"] for result in results], [True, False])
+        self.assertEqual(results[1]["receipt_handle"], "missing")
+        self.assertEqual(results[1]["error_code"], "KeyError")
+
+    def test_async_delete_messages_falls_back_to_async_delete_message(self):
+        results = asyncio.run(
+            self.adapter.async_delete_messages("test_queue", ["handle1", "missing"])
+        )
+
+        self.assertEqual(self.adapter.deleted, ["handle1"])
+        self.assertEqual([result["index"] for result in results], [0, 1])
+        self.assertEqual([result["success"] for result in results], [True, False])
+
+    def test_change_messages_visibility_is_optional(self):
+        with self.assertRaises(NotImplementedError):
+            self.adapter.change_messages_visibility("test_queue", ["handle1"], 30)
@@ -1,8 +1,11 @@
+import asyncio
 import json
+import threading
 from unittest import TestCase
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from clever_events_library.queues.adapters.sqs_adapter import SQSAdapter
+from clever_events_library.queues.receive_strategy import AdaptiveReceiveStrategy
 
 
 class TestSQSAdapter(TestCase):
@@ -25,6 +28,24 @@ class TestSQSAdapter(TestCase):
             aws_secret_access_key=self.client_config["aws_secret"],
         )
 
+    @patch("boto3.client")
+    def test_sqs_client_is_created_once_across_threads(self, mock_boto_client):
+        barrier = threading.Barrier(8)
+        clients = []
+
+        def get_client():
+            barrier.wait()
+            clients.append(self.sqs_adapter.sqs_client)
+
+        threads = [threading.Thread(target=get_client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mock_boto_client.assert_called_once()
+        self.assertEqual(len({id(client) for client in clients}), 1)
+
     @patch("boto3.client")
     def test_fetch_messages(self, mock_boto_client):
         mock_sqs_client = MagicMock()
@@ -44,6 +65,61 @@ class TestSQSAdapter(TestCase):
         self.assertEqual(len(messages), 1)
         self.assertEqual(messages[0]["message_id"], "1")
         self.assertEqual(messages[0]["message_data"], {"key": "value"})
+        self.assertEqual(messages[0].queue_name, "test_queue")
+
+    @patch("boto3.client")
+    def test_fetch_messages_with_receive_strategy(self, mock_boto_client):
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        adapter = SQSAdapter(
+            client_config=self.client_config, receive_strategy=AdaptiveReceiveStrategy()
+        )
+        message = {"MessageId": "1", "ReceiptHandle": "handle1", "Body": "{}"}
+        mock_sqs_client.receive_message.side_effect = [
+            {"Messages": []},
+            {"Messages": [message]},
+            {"Messages": [message] * 10},
+            {"Messages": []},
+        ]
+
+        list(adapter.fetch_messages("test_queue", 1))
+        list(adapter.fetch_messages("test_queue", 1))
+        list(adapter.fetch_messages("test_queue", 1))
+        list(adapter.fetch_messages("test_queue", 1))
+
+        params = [
+            (call.kwargs["WaitTimeSeconds"], call.kwargs["MaxNumberOfMessages"])
+            for call in mock_sqs_client.receive_message.call_args_list
+        ]
+        self.assertEqual(params, [(20, 1), (20, 1), (0, 1), (0, 1)])
+
+    @patch("boto3.client")
+    def test_fetch_messages_long_polls_below_visibility_timeout(self, mock_boto_client):
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        adapter = SQSAdapter(
+            client_config=self.client_config, receive_strategy=AdaptiveReceiveStrategy()
+        )
+        adapter.set_visibility_timeout(10)
+        mock_sqs_client.receive_message.return_value = {"Messages": []}
+
+        list(adapter.fetch_messages("test_queue", 1))
+
+        self.assertEqual(mock_sqs_client.receive_message.call_args.kwargs["WaitTimeSeconds"], 5)
+
+    @patch("boto3.client")
+    def test_get_queue_depth(self, mock_boto_client):
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        mock_sqs_client.get_queue_attributes.return_value = {
+            "Attributes": {"ApproximateNumberOfMessages": "42"}
+        }
+
+        self.assertEqual(self.sqs_adapter.get_queue_depth("test_queue"), 42)
+        mock_sqs_client.get_queue_attributes.assert_called_once_with(
+            QueueUrl="https://sqs.us-east-1.amazonaws.com/123456789012/test_queue",
+            AttributeNames=["ApproximateNumberOfMessages"],
+        )
 
     @patch("boto3.client")
     def test_delete_message(self, mock_boto_client):
@@ -95,3 +171,405 @@ class TestSQSAdapter(TestCase):
         with self.assertRaises(ValueError) as context:
             self.sqs_adapter.set_await_time(-10)
         self.assertEqual(str(context.exception), "await_time must be a non-negative integer.")
+
+    @patch("clever_events_library.queues.adapters.sqs_adapter.Session")
+    def test_async_fetch_messages(self, mock_session):
+        mock_client = AsyncMock()
+        mock_client.receive_message.return_value = {
+            "Messages": [
+                {
+                    "MessageId": "1",
+                    "ReceiptHandle": "handle1",
+                    "Body": json.dumps({"key": "value"}),
+                }
+            ]
+        }
+        mock_session.return_value.client.return_value.__aenter__.return_value = mock_client
+
+        async def run_test():
+            async with self.sqs_adapter as adapter:
+                first = await adapter.async_fetch_messages("test_queue", 10)
+                second = await adapter.async_fetch_messages("test_queue", 10)
+            return first + second
+
+        messages = asyncio.run(run_test())
+
+        mock_session.return_value.client.assert_called_once()
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages[0]["message_receipt_handle"], "handle1")
+        self.assertEqual(messages[0]["message_data"], {"key": "value"})
+        self.assertEqual(messages[0]["message_attributes"], {})
+        mock_client.receive_message.assert_called_with(
+            QueueUrl="https://sqs.us-east-1.amazonaws.com/123456789012/test_queue",
+            AttributeNames=["All"],
+            MaxNumberOfMessages=10,
+            MessageAttributeNames=["All"],
+            VisibilityTimeout=0,
+            WaitTimeSeconds=0,
+        )
+
+    @patch("clever_events_library.queues.adapters.sqs_adapter.Session")
+    def test_async_delete_message(self, mock_session):
+        mock_client = AsyncMock()
+        mock_client.delete_message.return_value = {"ResponseMetadata": {"HTTPStatusCode": 200}}
+        mock_session.return_value.client.return_value.__aenter__.return_value = mock_client
+
+        response = asyncio.run(self.sqs_adapter.async_delete_message("test_queue", "handle1"))
+
+        self.assertEqual(response["ResponseMetadata"]["HTTPStatusCode"], 200)
+        mock_client.delete_message.assert_called_once_with(
+            QueueUrl="https://sqs.us-east-1.amazonaws.com/123456789012/test_queue",
+            ReceiptHandle="handle1",
+        )
+
+    @patch("boto3.client")
+    def test_delete_messages(self, mock_boto_client):
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        mock_sqs_client.delete_message_batch.side_effect = [
+            {"Successful": [{"Id": str(index)} for index in range(10)]},
+            {
+                "Successful": [{"Id": "10"}],
+                "Failed": [{"Id": "11", "Code": "ReceiptHandleIsInvalid", "SenderFault": True}],
+            },
+        ]
+        receipt_handles = [f"handle{index}" for index in range(12)]
+
+        results = self.sqs_adapter.delete_messages("test_queue", receipt_handles)
+
+        self.assertEqual(mock_sqs_client.delete_message_batch.call_count, 2)
+        first_call = mock_sqs_client.delete_message_batch.call_args_list[0].kwargs
+        self.assertEqual(
+            first_call["QueueUrl"], "https://sqs.us-east-1.amazonaws.com/123456789012/test_queue"
+        )
+        self.assertEqual(first_call["Entries"][0], {"Id": "0", "ReceiptHandle": "handle0"})
+        self.assertEqual(len(results), 12)
+        self.assertTrue(all(result["success"] for result in results[:11]))
+        self.assertFalse(results[11]["success"])
+        self.assertEqual(results[11]["receipt_handle"], "handle11")
+        self.assertEqual(results[11]["error_code"], "ReceiptHandleIsInvalid")
+        self.assertTrue(results[11]["sender_fault"])
+
+    @patch("boto3.client")
+    def test_delete_messages_client_error_fails_chunk(self, mock_boto_client):
+        from botocore.exceptions import ClientError
+
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        mock_sqs_client.delete_message_batch.side_effect = ClientError(
+            {"Error": {"Code": "AWS.SimpleQueueService.NonExistentQueue"}}, "DeleteMessageBatch"
+        )
+
+        results = self.sqs_adapter.delete_messages("test_queue", ["handle1", "handle2"])
+
+        self.assertEqual([result["success"] for result in results], [False, False])
+        self.assertEqual(results[0]["error_code"], "AWS.SimpleQueueService.NonExistentQueue")
+
+    @patch("clever_events_library.queues.adapters.sqs_adapter.Session")
+    def test_async_delete_messages(self, mock_session):
+        mock_client = AsyncMock()
+        mock_client.delete_message_batch.return_value = {"Successful": [{"Id": "0"}]}
+        mock_session.return_value.client.return_value.__aenter__.return_value = mock_client
+
+        results = asyncio.run(self.sqs_adapter.async_delete_messages("test_queue", ["handle1"]))
+
+        self.assertTrue(results[0]["success"])
+        mock_client.delete_message_batch.assert_called_once_with(
+            QueueUrl="https://sqs.us-east-1.amazonaws.com/123456789012/test_queue",
+            Entries=[{"Id": "0", "ReceiptHandle": "handle1"}],
+        )
+
+    @patch("boto3.client")
+    def test_change_messages_visibility(self, mock_boto_client):
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        mock_sqs_client.change_message_visibility_batch.return_value = {
+            "Successful": [{"Id": "0"}],
+            "Failed": [{"Id": "1", "Code": "ReceiptHandleIsInvalid", "SenderFault": True}],
+        }
+
+        results = self.sqs_adapter.change_messages_visibility(
+            "test_queue", ["handle1", "handle2"], 60
+        )
+
+        mock_sqs_client.change_message_visibility_batch.assert_called_once_with(
+            QueueUrl="https://sqs.us-east-1.amazonaws.com/123456789012/test_queue",
+            Entries=[
+                {"Id": "0", "ReceiptHandle": "handle1", "VisibilityTimeout": 60},
+                {"Id": "1", "ReceiptHandle": "handle2", "VisibilityTimeout": 60},
+            ],
+        )
+        self.assertTrue(results[0]["success"])
+        self.assertFalse(results[1]["success"])
+        self.assertEqual(results[1]["receipt_handle"], "handle2")
+
+    def test_change_messages_visibility_negative_value(self):
+        with self.assertRaises(ValueError):
+            self.sqs_adapter.change_messages_visibility("test_queue", ["handle1"], -1)
+
+    @patch("boto3.client")
+    def test_fetch_messages_decodes_codec(self, mock_boto_client):
+        from clever_events_library.message_codec import get_codec
+
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        mock_sqs_client.receive_message.return_value = {
+            "Messages": [
+                {
+                    "MessageId": "1",
+                    "ReceiptHandle": "handle1",
+                    "Body": get_codec("json+zlib").encode({"key": "value"}),
+                    "MessageAttributes": {
+                        "clever_events_codec": {"DataType": "String", "StringValue": "json+zlib"}
+                    },
+                }
+            ]
+        }
+
+        messages = list(self.sqs_adapter.fetch_messages("test_queue"))
+
+        self.assertEqual(messages[0]["message_data"], {"key": "value"})
+
+    @patch("boto3.client")
+    def test_fetch_messages_with_unknown_codec_keeps_the_batch(self, mock_boto_client):
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        mock_sqs_client.receive_message.return_value = {
+            "Messages": [
+                {
+                    "MessageId": "1",
+                    "ReceiptHandle": "handle1",
+                    "Body": "payload",
+                    "MessageAttributes": {
+                        "clever_events_codec": {"DataType": "String", "StringValue": "unknown"}
+                    },
+                },
+                {"MessageId": "2", "ReceiptHandle": "handle2", "Body": "{}"},
+            ]
+        }
+
+        messages = list(self.sqs_adapter.fetch_messages("test_queue", 2))
+
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages[1]["message_data"], {})
+        with self.assertRaises(ValueError):
+            messages[0]["message_data"]
+
+    @patch("boto3.client")
+    def test_fetch_messages_decodes_attributes(self, mock_boto_client):
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        mock_sqs_client.receive_message.return_value = {
+            "Messages": [
+                {
+                    "MessageId": "1",
+                    "ReceiptHandle": "handle1",
+                    "Body": json.dumps({"key": "value"}),
+                    "MessageAttributes": {
+                        "count": {"DataType": "Number", "StringValue": "3"},
+                        "active": {"DataType": "String.Boolean", "StringValue": "true"},
+                        "tags": {"DataType": "String.Array", "StringValue": '["a"]'},
+                        "signature": {"DataType": "Binary", "BinaryValue": b"\x00"},
+                    },
+                }
+            ]
+        }
+        sqs_adapter = SQSAdapter(client_config=self.client_config, decode_attributes=True)
+
+        messages = list(sqs_adapter.fetch_messages("test_queue"))
+
+        self.assertEqual(
+            messages[0]["message_attributes"],
+            {"count": 3, "active": True, "tags": ["a"], "signature": b"\x00"},
+        )
+
+    @patch("boto3.client")
+    def test_fetch_messages_from_fifo_queue(self, mock_boto_client):
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        mock_sqs_client.receive_message.return_value = {
+            "Messages": [
+                {
+                    "MessageId": "1",
+                    "ReceiptHandle": "handle1",
+                    "Body": json.dumps({"key": "value"}),
+                    "Attributes": {"MessageGroupId": "user-1", "ApproximateReceiveCount": "3"},
+                }
+            ]
+        }
+
+        messages = list(self.sqs_adapter.fetch_messages("test_queue.fifo"))
+
+        self.assertEqual(messages[0].message_group_id, "user-1")
+        self.assertEqual(messages[0].receive_count, 3)
+
+    @patch("boto3.client")
+    def test_send_messages(self, mock_boto_client):
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        attributes = {"event_name": {"DataType": "String", "StringValue": "user_created"}}
+        mock_sqs_client.receive_message.return_value = {
+            "Messages": [
+                {
+                    "MessageId": str(index),
+                    "ReceiptHandle": f"handle{index}",
+                    "Body": json.dumps({"index": index}),
+                    "MessageAttributes": attributes,
+                    "Attributes": {"MessageGroupId": "user-1"} if index == 11 else {},
+                }
+                for index in range(12)
+            ]
+        }
+        mock_sqs_client.send_message_batch.side_effect = [
+            {"Successful": [{"Id": str(index)} for index in range(10)]},
+            {
+                "Successful": [{"Id": "10"}],
+                "Failed": [{"Id": "11", "Code": "InvalidParameterValue"}],
+            },
+        ]
+        messages = list(self.sqs_adapter.fetch_messages("test_queue", 12))
+        messages[0]["message_data"]
+
+        results = self.sqs_adapter.send_messages("test_queue_dlq", messages)
+
+        self.assertEqual(mock_sqs_client.send_message_batch.call_count, 2)
+        first_call = mock_sqs_client.send_message_batch.call_args_list[0].kwargs
+        self.assertEqual(
+            first_call["QueueUrl"],
+            "https://sqs.us-east-1.amazonaws.com/123456789012/test_queue_dlq",
+        )
+        self.assertEqual(
+            first_call["Entries"][0],
+            {"Id": "0", "MessageBody": '{"index": 0}', "MessageAttributes": attributes},
+        )
+        last_entry = mock_sqs_client.send_message_batch.call_args_list[1].kwargs["Entries"][1]
+        self.assertEqual(last_entry["MessageGroupId"], "user-1")
+        self.assertEqual(last_entry["MessageDeduplicationId"], "11")
+        self.assertTrue(all(result["success"] for result in results[:11]))
+        self.assertEqual(results[11]["receipt_handle"], "handle11")
+        self.assertEqual(results[11]["error_code"], "InvalidParameterValue")
+
+    @patch("boto3.client")
+    def test_send_messages_forwards_raw_attributes(self, mock_boto_client):
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        attributes = {
+            "price": {"DataType": "Number", "StringValue": "1.50"},
+            "ratio": {"DataType": "Number.float", "StringValue": "0.1000000000000000055"},
+        }
+        mock_sqs_client.receive_message.return_value = {
+            "Messages": [
+                {
+                    "MessageId": "1",
+                    "ReceiptHandle": "handle1",
+                    "Body": "{}",
+                    "MessageAttributes": attributes,
+                }
+            ]
+        }
+        mock_sqs_client.send_message_batch.return_value = {"Successful": [{"Id": "0"}]}
+        sqs_adapter = SQSAdapter(client_config=self.client_config, decode_attributes=True)
+        messages = list(sqs_adapter.fetch_messages("test_queue"))
+
+        sqs_adapter.send_messages("test_queue_dlq", messages)
+
+        entry = mock_sqs_client.send_message_batch.call_args.kwargs["Entries"][0]
+        self.assertEqual(entry["MessageAttributes"], attributes)
+        self.assertEqual(messages[0]["message_attributes"]["price"], 1.5)
+
+    @patch("boto3.client")
+    def test_send_messages_chunks_by_size(self, mock_boto_client):
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        mock_sqs_client.receive_message.return_value = {
+            "Messages": [
+                {"MessageId": str(index), "ReceiptHandle": f"handle{index}", "Body": "x" * 100000}
+                for index in range(3)
+            ]
+        }
+        mock_sqs_client.send_message_batch.side_effect = lambda QueueUrl, Entries: {
+            "Successful": [{"Id": entry["Id"]} for entry in Entries]
+        }
+        messages = list(self.sqs_adapter.fetch_messages("test_queue", 3))
+
+        results = self.sqs_adapter.send_messages("test_queue_dlq", messages)
+
+        self.assertEqual(mock_sqs_client.send_message_batch.call_count, 2)
+        self.assertTrue(all(result["success"] for result in results))
+
+    @patch("boto3.client")
+    def test_fetch_messages_reads_claim_check_lazily(self, mock_boto_client):
+        store = MagicMock()
+        store.get.return_value = b'{"key": "value"}'
+        sqs_adapter = SQSAdapter(client_config=self.client_config, claim_check_store=store)
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        mock_sqs_client.receive_message.return_value = {
+            "Messages": [
+                {
+                    "MessageId": "1",
+                    "ReceiptHandle": "handle1",
+                    "Body": json.dumps({"clever_events_claim_check": "s3://bucket/key"}),
+                    "MessageAttributes": {
+                        "clever_events_claim_check": {
+                            "DataType": "String",
+                            "StringValue": "s3://bucket/key",
+                        }
+                    },
+                }
+            ]
+        }
+
+        messages = list(sqs_adapter.fetch_messages("test_queue"))
+
+        store.get.assert_not_called()
+        self.assertEqual(messages[0]["message_id"], "1")
+        self.assertEqual(messages[0]["message_data"], {"key": "value"})
+        store.get.assert_called_once_with("s3://bucket/key")
+
+    @patch("boto3.client")
+    def test_get_queue_url_resolves_with_get_queue_url(self, mock_boto_client):
+        mock_sqs_client = MagicMock()
+        mock_boto_client.return_value = mock_sqs_client
+        mock_sqs_client.get_queue_url.return_value = {
+            "QueueUrl": "https://sqs.us-east-1.amazonaws.com/210987654321/other_queue.fifo"
+        }
+        sqs_adapter = SQSAdapter(client_config=self.client_config, resolve_queue_urls=True)
+
+        for _ in range(2):
+            queue_url = sqs_adapter._get_queue_url("210987654321/other_queue.fifo")
+
+        self.assertEqual(
+            queue_url, "https://sqs.us-east-1.amazonaws.com/210987654321/other_queue.fifo"
+        )
+        mock_sqs_client.get_queue_url.assert_called_once_with(
+            QueueName="other_queue.fifo", QueueOwnerAWSAccountId="210987654321"
+        )
+
+    @patch("boto3.client")
+    @patch("clever_events_library.queues.adapters.sqs_adapter.Session")
+    def test_async_calls_resolve_queue_urls_with_the_async_client(
+        self, mock_session, mock_boto_client
+    ):
+        queue_url = "https://sqs.us-east-1.amazonaws.com/210987654321/other_queue"
+        mock_client = AsyncMock()
+        mock_client.get_queue_url.return_value = {"QueueUrl": queue_url}
+        mock_client.receive_message.return_value = {}
+        mock_session.return_value.client.return_value.__aenter__.return_value = mock_client
+        sqs_adapter = SQSAdapter(client_config=self.client_config, resolve_queue_urls=True)
+
+        async def run_test():
+            async with sqs_adapter as adapter:
+                await adapter.async_fetch_messages("210987654321/other_queue")
+                await adapter.async_delete_message("210987654321/other_queue", "handle1")
+
+        asyncio.run(run_test())
+
+        mock_boto_client.assert_not_called()
+        mock_client.get_queue_url.assert_awaited_once_with(
+            QueueName="other_queue", QueueOwnerAWSAccountId="210987654321"
+        )
+        self.assertEqual(mock_client.receive_message.call_args.kwargs["QueueUrl"], queue_url)
+        mock_client.delete_message.assert_awaited_once_with(
+            QueueUrl=queue_url, ReceiptHandle="handle1"
+        )
@@ -0,0 +1,83 @@
+import threading
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from clever_events_library.queues.ack_accumulator import AckAccumulator
+from clever_events_library.queues.adapters import QueueBaseAdapter
+
+
+def successful_delete(queue_name, receipt_handles):
+    return [
+        {"index": index, "receipt_handle": receipt_handle, "success": True}
+        for index, receipt_handle in enumerate(receipt_handles)
+    ]
+
+
+class TestAckAccumulator(TestCase):
+    def setUp(self):
+        self.mock_adapter = MagicMock(spec=QueueBaseAdapter)
+        self.mock_adapter.delete_messages.side_effect = successful_delete
+
+    def test_flushes_when_batch_size_is_reached(self):
+        deleted = threading.Event()
+        self.mock_adapter.delete_messages.side_effect = lambda *args: (
+            deleted.set() or successful_delete(*args)
+        )
+        accumulator = AckAccumulator(self.mock_adapter, flush_interval=60)
+        for index in range(10):
+            accumulator.add("test_queue", f"handle{index}")
+
+        self.assertTrue(deleted.wait(timeout=5))
+        accumulator.close()
+        self.mock_adapter.delete_messages.assert_called_once_with(
+            "test_queue", [f"handle{index}" for index in range(10)]
+        )
+
+    def test_flushes_after_flush_interval(self):
+        deleted = threading.Event()
+        self.mock_adapter.delete_messages.side_effect = lambda *args: (
+            deleted.set() or successful_delete(*args)
+        )
+        accumulator = AckAccumulator(self.mock_adapter, flush_interval=0.01)
+        accumulator.add("test_queue", "handle1")
+
+        self.assertTrue(deleted.wait(timeout=5))
+        accumulator.close()
+
+    def test_flush_groups_handles_by_queue(self):
+        with AckAccumulator(self.mock_adapter, flush_interval=60) as accumulator:
+            accumulator.add("first_queue", "handle1")
+            accumulator.add("second_queue", "handle2")
+            accumulator.add("first_queue", "handle3")
+            self.assertTrue(accumulator.flush(timeout=5))
+
+        calls = sorted(call.args for call in self.mock_adapter.delete_messages.call_args_list)
+        self.assertEqual(
+            calls, [("first_queue", ["handle1", "handle3"]), ("second_queue", ["handle2"])]
+        )
+
+    def test_reports_failed_deletions(self):
+        on_failure = MagicMock()
+        self.mock_adapter.delete_messages.side_effect = lambda *args: [
+            {
+                "index": 0,
+                "receipt_handle": "handle1",
+                "success": False,
+                "error_code": "ReceiptHandleIsInvalid",
+                "error_message": "",
+            }
+        ]
+        accumulator = AckAccumulator(self.mock_adapter, on_failure=on_failure)
+        accumulator.add("test_queue", "handle1")
+        accumulator.close()
+
+        on_failure.assert_called_once()
+        self.assertEqual(on_failure.call_args.args[0], "test_queue")
+        self.assertEqual(on_failure.call_args.args[1]["receipt_handle"], "handle1")
+
+    def test_add_after_close_raises(self):
+        accumulator = AckAccumulator(self.mock_adapter)
+        accumulator.close()
+
+        with self.assertRaises(RuntimeError):
+            accumulator.add("test_queue", "handle1")
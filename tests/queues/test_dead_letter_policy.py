@@ -0,0 +1,192 @@
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from clever_events_library.local_broker import InMemoryBroker
+from clever_events_library.queues import DeadLetterPolicy, QueueManager
+from clever_events_library.queues.adapters import InMemoryQueueAdapter
+from clever_events_library.queues.queue_message import QueueMessage
+
+
+def build_message(receive_count):
+    return QueueMessage("1", "handle1", {}, {}, receive_count=receive_count)
+
+
+class TestDeadLetterPolicy(TestCase):
+    def test_get_dead_letter_queue(self):
+        self.assertEqual(DeadLetterPolicy().get_dead_letter_queue("orders"), "orders_dlq")
+        self.assertEqual(
+            DeadLetterPolicy().get_dead_letter_queue("orders.fifo"), "orders_dlq.fifo"
+        )
+        self.assertEqual(DeadLetterPolicy("dlq").get_dead_letter_queue("orders"), "dlq")
+        self.assertEqual(
+            DeadLetterPolicy(lambda queue_name: f"{queue_name}-dead").get_dead_letter_queue("a"),
+            "a-dead",
+        )
+
+    def test_poison_detection(self):
+        policy = DeadLetterPolicy(max_receive_count=3)
+
+        self.assertFalse(policy.is_poison(build_message(3)))
+        self.assertTrue(policy.is_poison(build_message(4)))
+        self.assertTrue(policy.is_exhausted(build_message(3)))
+        self.assertFalse(policy.is_exhausted(build_message(2)))
+        self.assertFalse(policy.is_poison(build_message(None)))
+        self.assertFalse(policy.is_exhausted({"message_id": "1"}))
+
+    def test_get_backoff(self):
+        policy = DeadLetterPolicy(backoff=2, max_backoff=10)
+
+        self.assertEqual(
+            [policy.get_backoff(build_message(count)) for count in (None, 1, 2, 3, 4, 10**6)],
+            [2, 2, 4, 8, 10, 10],
+        )
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            DeadLetterPolicy(max_receive_count=0)
+        with self.assertRaises(ValueError):
+            DeadLetterPolicy(backoff=10, max_backoff=5)
+        with self.assertRaises(ValueError):
+            DeadLetterPolicy(max_backoff=50000)
+
+
+class TestQueueManagerDeadLetters(TestCase):
+    def setUp(self):
+        self.broker = InMemoryBroker()
+        self.broker.send("orders", [({"key": index}, {}, None) for index in range(3)])
+        self.adapter = InMemoryQueueAdapter(self.broker, visibility_timeout=0)
+        self.queue_manager = QueueManager(
+            self.adapter, dead_letter_policy=DeadLetterPolicy(max_receive_count=2)
+        )
+
+    def get_data(self, queue_name):
+        return [message["message_data"] for message in self.adapter.fetch_messages(queue_name, 10)]
+
+    def test_fetch_messages_quarantines_poison_messages(self):
+        for _ in range(2):
+            self.assertEqual(len(list(self.queue_manager.fetch_messages("orders", 10))), 3)
+
+        self.assertEqual(list(self.queue_manager.fetch_messages("orders", 10)), [])
+
+        self.assertEqual(self.get_data("orders_dlq"), [{"key": 0}, {"key": 1}, {"key": 2}])
+        self.assertEqual(self.broker.count_messages("orders"), {"visible": 0, "in_flight": 0})
+
+    def test_async_fetch_messages_quarantines_poison_messages(self):
+        import asyncio
+
+        async def fetch():
+            return await self.queue_manager.async_fetch_messages("orders", 10)
+
+        for _ in range(2):
+            asyncio.run(fetch())
+
+        self.assertEqual(asyncio.run(fetch()), [])
+        self.assertEqual(len(self.get_data("orders_dlq")), 3)
+
+    def test_mark_failed_backs_off_and_quarantines_exhausted_messages(self):
+        self.adapter.set_visibility_timeout(30)
+        (first,) = self.queue_manager.fetch_messages("orders", 1)
+        with patch.object(
+            self.adapter,
+            "change_messages_visibility",
+            wraps=self.adapter.change_messages_visibility,
+        ) as change_messages_visibility:
+            self.queue_manager.mark_failed("orders", [first])
+        change_messages_visibility.assert_called_once_with(
+            "orders", [first["message_receipt_handle"]], 2
+        )
+
+        self.broker.change_visibility("orders", [first["message_receipt_handle"]], 0)
+        (second,) = self.queue_manager.fetch_messages("orders", 1)
+        self.assertEqual(second.receive_count, 2)
+        self.queue_manager.mark_failed("orders", [second])
+
+        self.assertEqual(self.get_data("orders_dlq"), [{"key": 0}])
+
+    def test_mark_failed_without_policy(self):
+        adapter = MagicMock()
+
+        QueueManager(adapter).mark_failed("orders", [build_message(5)])
+
+        adapter.change_messages_visibility.assert_not_called()
+        adapter.send_messages.assert_not_called()
+
+    def test_redrive(self):
+        self.broker.send("orders_dlq", [({"key": index}, {}, None) for index in range(5)])
+
+        result = self.queue_manager.redrive("orders_dlq", "orders", max_messages=4, batch_size=3)
+
+        self.assertEqual(result, {"moved": 4, "failed": 0})
+        self.assertEqual(self.broker.count_messages("orders_dlq")["visible"], 1)
+        self.assertEqual(len(self.get_data("orders")), 7)
+
+    def test_redrive_is_rate_limited(self):
+        self.broker.send("orders_dlq", [({"key": index}, {}, None) for index in range(12)])
+
+        started_at = time.monotonic()
+        result = self.queue_manager.redrive("orders_dlq", "orders", rate=10, batch_size=2)
+
+        self.assertEqual(result, {"moved": 12, "failed": 0})
+        # The first 10 messages are a burst, the last 2 wait for 2 tokens
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.15)
+
+    def test_redrive_keeps_messages_that_fail_to_be_sent(self):
+        self.broker.send("orders_dlq", [({"key": 0}, {}, None)])
+        self.adapter.set_visibility_timeout(30)
+
+        with patch.object(self.adapter, "send_messages", side_effect=RuntimeError("down")):
+            result = self.queue_manager.redrive("orders_dlq", "orders")
+
+        self.assertEqual(result, {"moved": 0, "failed": 1})
+        self.assertEqual(self.broker.count_messages("orders_dlq")["in_flight"], 1)
+
+    def test_redrive_stops_when_only_failed_messages_are_left(self):
+        self.broker.send("orders_dlq", [({"key": index}, {}, None) for index in range(3)])
+        send_messages = self.adapter.send_messages
+
+        def fail_first(queue_name, messages):
+            results = send_messages(queue_name, messages)
+            for result in results:
+                if result["index"] == 0 and messages[0]["message_data"] == {"key": 0}:
+                    result["success"] = False
+            return results
+
+        # Visibility timeout 0, failed messages are fetched again right away
+        with patch.object(self.adapter, "send_messages", side_effect=fail_first):
+            result = self.queue_manager.redrive("orders_dlq", "orders", batch_size=2)
+
+        self.assertEqual(result, {"moved": 2, "failed": 1})
+        self.assertEqual(self.broker.count_messages("orders_dlq")["visible"], 1)
+
+    def test_redrive_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.queue_manager.redrive("orders_dlq", "orders", rate=0)
+        with self.assertRaises(ValueError):
+            self.queue_manager.redrive("orders_dlq", "orders", batch_size=0)
+
+    def test_run_consumer_quarantines_failing_messages(self):
+        self.broker.send("payments", [({"fail": index == 1}, {}, None) for index in range(3)])
+        self.adapter.set_visibility_timeout(30)
+        queue_manager = QueueManager(
+            self.adapter,
+            dead_letter_policy=DeadLetterPolicy(max_receive_count=1, backoff=0, max_backoff=0),
+        )
+        stop_event = threading.Event()
+
+        def handle(message):
+            if message["message_data"]["fail"]:
+                raise ValueError("poison")
+
+        def stop_when_done():
+            while self.broker.count_messages("payments") != {"visible": 0, "in_flight": 0}:
+                time.sleep(0.01)
+            stop_event.set()
+
+        threading.Thread(target=stop_when_done, daemon=True).start()
+        queue_manager.run_consumer(
+            "payments", handle, workers=2, stop_event=stop_event, idle_interval=0.01
+        )
+
+        self.assertEqual(self.get_data("payments_dlq"), [{"fail": True}])
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from clever_events_library.queues.dedup_cache import (
+    InMemoryDedupCache,
+    RedisDedupCache,
+    SQLiteDedupCache,
+)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    def set(self, key, value, px=None):
+        self.values[key] = (value, time.monotonic() + px / 1000)
+        return True
+
+    def exists(self, key):
+        value = self.values.get(key)
+        return int(value is not None and value[1] > time.monotonic())
+
+
+class TestInMemoryDedupCache(TestCase):
+    def test_add_and_contains(self):
+        cache = InMemoryDedupCache()
+
+        cache.add("a")
+
+        self.assertTrue(cache.contains("a"))
+        self.assertFalse(cache.contains("b"))
+
+    def test_evicts_oldest_keys(self):
+        cache = InMemoryDedupCache(max_size=2)
+
+        cache.add_many(["a", "b"])
+        cache.add("a")
+        cache.add("c")
+
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.contains("a"))
+        self.assertFalse(cache.contains("b"))
+        self.assertTrue(cache.contains("c"))
+
+    def test_keys_expire(self):
+        cache = InMemoryDedupCache(ttl=10)
+        with patch("time.monotonic", return_value=100):
+            cache.add("a")
+        with patch("time.monotonic", return_value=111):
+            self.assertFalse(cache.contains("a"))
+            cache.add("b")
+
+        self.assertEqual(len(cache), 1)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            InMemoryDedupCache(max_size=0)
+        with self.assertRaises(ValueError):
+            InMemoryDedupCache(ttl=0)
+
+
+class TestSQLiteDedupCache(TestCase):
+    def test_keys_are_shared_and_expire(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dedup.db")
+            cache = SQLiteDedupCache(path, ttl=10)
+            other = SQLiteDedupCache(path, ttl=10)
+
+            cache.add_many(["a", "b"])
+
+            self.assertTrue(other.contains("a"))
+            self.assertFalse(other.contains("c"))
+            with patch("time.time", return_value=time.time() + 11):
+                self.assertFalse(other.contains("a"))
+            cache.close()
+            other.close()
+
+
+class TestRedisDedupCache(TestCase):
+    def test_add_and_contains(self):
+        client = FakeRedis()
+        cache = RedisDedupCache(client, ttl=10, prefix="test:")
+
+        cache.add("a")
+
+        self.assertTrue(cache.contains("a"))
+        self.assertFalse(cache.contains("b"))
+        self.assertIn("test:a", client.values)
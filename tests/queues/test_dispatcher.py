@@ -0,0 +1,173 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from clever_events_library.events.adapters import DispatcherEventAdapter
+from clever_events_library.events.event_publisher import EventPublisher
+from clever_events_library.queues.dispatcher import Dispatcher, compile_filter_policy
+
+
+def build_message(index, **attributes):
+    return {
+        "message_id": str(index),
+        "message_receipt_handle": f"handle{index}",
+        "message_data": index,
+        "message_attributes": {
+            name: {"DataType": "String", "StringValue": str(value)}
+            for name, value in attributes.items()
+        },
+    }
+
+
+class TestCompileFilterPolicy(TestCase):
+    def assert_matches(self, filter_policy, attributes, expected=True):
+        _, matches = compile_filter_policy(filter_policy)
+        self.assertEqual(matches(attributes), expected, attributes)
+
+    def test_exact_values(self):
+        exact_values, _ = compile_filter_policy({"country": ["ES", "PT"], "price": [10]})
+
+        self.assertEqual(exact_values, {"country": {"ES", "PT"}})
+        self.assert_matches({"country": ["ES", "PT"]}, {"country": "PT"})
+        self.assert_matches({"country": ["ES", "PT"]}, {"country": "FR"}, False)
+        self.assert_matches({"country": ["ES"]}, {}, False)
+        self.assert_matches({"price": [10]}, {"price": "10"})
+        self.assert_matches({"tags": ["a"]}, {"tags": ["b", "a"]})
+
+    def test_operators(self):
+        self.assert_matches({"name": [{"prefix": "user_"}]}, {"name": "user_created"})
+        self.assert_matches({"name": [{"suffix": "_created"}]}, {"name": "user_deleted"}, False)
+        self.assert_matches({"name": [{"equals-ignore-case": "ES"}]}, {"name": "es"})
+        self.assert_matches({"name": [{"anything-but": ["a", "b"]}]}, {"name": "c"})
+        self.assert_matches({"name": [{"anything-but": ["a", "b"]}]}, {"name": "a"}, False)
+        self.assert_matches({"name": [{"anything-but": {"prefix": "x"}}]}, {"name": "xy"}, False)
+        self.assert_matches({"price": [{"numeric": [">", 0, "<=", 5]}]}, {"price": "5"})
+        self.assert_matches({"price": [{"numeric": [">", 0, "<=", 5]}]}, {"price": 6}, False)
+        self.assert_matches({"price": [{"numeric": [">", 0]}]}, {"price": "abc"}, False)
+        self.assert_matches({"name": [{"exists": True}]}, {"name": "a"})
+        self.assert_matches({"name": [{"exists": False}]}, {})
+        self.assert_matches({"name": [{"exists": False}]}, {"name": "a"}, False)
+
+    def test_unsupported_operator(self):
+        with self.assertRaises(ValueError):
+            compile_filter_policy({"name": [{"regex": ".*"}]})
+
+
+class TestDispatcher(TestCase):
+    def setUp(self):
+        self.dispatcher = Dispatcher()
+
+    def test_routes_by_event_name_filter_policy_and_predicate(self):
+        created, spanish, large, anything = MagicMock(), MagicMock(), MagicMock(), MagicMock()
+        self.dispatcher.register(created, event_name="user_created")
+        self.dispatcher.register(
+            spanish, event_name=["user_created", "user_updated"], filter_policy={"country": ["ES"]}
+        )
+        self.dispatcher.register(large, predicate=lambda message: message["message_data"] > 1)
+        self.dispatcher.register(anything)
+
+        results = self.dispatcher.dispatch_batch(
+            [
+                build_message(0, event_name="user_created", country="FR"),
+                build_message(1, event_name="user_updated", country="ES"),
+                build_message(2, event_name="user_deleted"),
+            ]
+        )
+
+        self.assertEqual([result["handlers"] for result in results], [2, 2, 2])
+        self.assertEqual(created.call_args.args[0]["message_id"], "0")
+        self.assertEqual(spanish.call_args.args[0]["message_id"], "1")
+        self.assertEqual(large.call_args.args[0]["message_id"], "2")
+        self.assertEqual(anything.call_count, 3)
+
+    def test_batch_handlers_receive_all_their_messages(self):
+        handler = MagicMock()
+        self.dispatcher.register(handler, event_name="user_created", batch=True)
+
+        self.dispatcher.dispatch_batch(
+            [build_message(index, event_name="user_created") for index in range(3)]
+        )
+
+        handler.assert_called_once()
+        self.assertEqual(
+            [message["message_id"] for message in handler.call_args.args[0]], ["0", "1", "2"]
+        )
+
+    def test_handler_errors_fail_their_messages(self):
+        self.dispatcher.register(MagicMock(side_effect=ValueError("boom")), event_name="failing")
+        other = MagicMock()
+        self.dispatcher.register(other)
+
+        results = self.dispatcher.dispatch_batch(
+            [build_message(0, event_name="failing"), build_message(1, event_name="other")]
+        )
+
+        self.assertFalse(results[0]["success"])
+        self.assertIsInstance(results[0]["error"], ValueError)
+        self.assertTrue(results[1]["success"])
+        self.assertEqual(other.call_count, 2)
+        with self.assertRaises(ValueError):
+            self.dispatcher.dispatch(build_message(2, event_name="failing"))
+
+    def test_default_handler(self):
+        default_handler = MagicMock()
+        dispatcher = Dispatcher(default_handler=default_handler)
+        dispatcher.register(MagicMock(), event_name="known")
+
+        dispatcher.dispatch(build_message(0, event_name="unknown"))
+
+        self.assertEqual(default_handler.call_args.args[0]["message_id"], "0")
+
+    def test_decorator_registration_after_dispatch(self):
+        self.dispatcher.dispatch(build_message(0, event_name="user_created"))
+        handled = []
+
+        @self.dispatcher.on(event_name="user_created")
+        def handle(message):
+            handled.append(message["message_id"])
+
+        self.dispatcher.dispatch(build_message(1, event_name="user_created"))
+
+        self.assertEqual(handled, ["1"])
+
+    def test_native_attributes(self):
+        handler = MagicMock()
+        self.dispatcher.register(handler, filter_policy={"count": [{"numeric": [">=", 2]}]})
+
+        self.assertEqual(
+            self.dispatcher.dispatch({"message_id": "0", "message_attributes": {"count": 3}}), 1
+        )
+
+
+class TestDispatcherEventAdapter(TestCase):
+    def test_publish_short_circuits_to_handlers(self):
+        dispatcher = Dispatcher()
+        handled = []
+        dispatcher.register(
+            lambda message: handled.append(
+                (message["message_data"], message["message_attributes"]["tier"]["StringValue"])
+            ),
+            event_name="user_created",
+            filter_policy={"tier": ["gold"]},
+        )
+        publisher = EventPublisher(DispatcherEventAdapter(dispatcher))
+
+        publisher.sync_publish(
+            "user_created", {"message": {"id": 1}, "message_attributes": {"tier": "gold"}}
+        )
+        results = publisher.sync_publish_batch(
+            "user_created",
+            [
+                {"message": {"id": 2}, "message_attributes": {"tier": "gold"}},
+                {"message": {"id": 3}, "message_attributes": {"tier": "silver"}},
+            ],
+        )
+
+        self.assertEqual(handled, [({"id": 1}, "gold"), ({"id": 2}, "gold")])
+        self.assertTrue(all(result["success"] for result in results))
+
+    def test_handler_errors_are_raised(self):
+        dispatcher = Dispatcher()
+        dispatcher.register(MagicMock(side_effect=ValueError("boom")))
+
+        with self.assertRaises(ValueError):
+            DispatcherEventAdapter(dispatcher).sync_publish("user_created", {"message": 1})
@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import defaultdict
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from clever_events_library.queues.fifo_queue_worker import FifoQueueWorker
+from clever_events_library.queues.queue_manager import QueueManager
+from clever_events_library.queues.queue_message import QueueMessage
+
+
+def build_message(index, group, value=None):
+    return QueueMessage(
+        str(index),
+        f"handle{index}",
+        index if value is None else value,
+        {},
+        queue_name="test_queue.fifo",
+        message_group_id=group,
+    )
+
+
+class TestFifoQueueWorker(TestCase):
+    def setUp(self):
+        self.mock_manager = MagicMock(spec=QueueManager)
+        self.deleted = []
+        self.mock_manager.delete_messages.side_effect = self.delete_messages
+
+    def delete_messages(self, queue_name, receipt_handles):
+        self.deleted.extend(receipt_handles)
+        return [
+            {"index": index, "receipt_handle": receipt_handle, "success": True}
+            for index, receipt_handle in enumerate(receipt_handles)
+        ]
+
+    def set_batches(self, batches, stop_event):
+        def fetch_messages(queue_name, max_number_of_messages):
+            if batches:
+                return batches.pop(0)
+            stop_event.set()
+            return []
+
+        self.mock_manager.fetch_messages.side_effect = fetch_messages
+
+    def test_keeps_groups_in_order_and_runs_groups_in_parallel(self):
+        stop_event = threading.Event()
+        messages = [build_message(index, "abc"[index % 3]) for index in range(12)]
+        self.set_batches([messages[:6], messages[6:]], stop_event)
+        handled = defaultdict(list)
+        lock = threading.Lock()
+        active, peak = defaultdict(int), []
+
+        def handler(message):
+            group = message.message_group_id
+            with lock:
+                active[group] += 1
+                peak.append((active[group], sum(active.values())))
+            time.sleep(0.01)
+            with lock:
+                active[group] -= 1
+                handled[group].append(message["message_data"])
+
+        worker = FifoQueueWorker(
+            self.mock_manager,
+            "test_queue.fifo",
+            handler,
+            workers=3,
+            prefetch=12,
+            stop_event=stop_event,
+        )
+        worker.run()
+
+        self.assertEqual(handled, {"a": [0, 3, 6, 9], "b": [1, 4, 7, 10], "c": [2, 5, 8, 11]})
+        self.assertEqual(max(group_active for group_active, _ in peak), 1)
+        self.assertGreater(max(total_active for _, total_active in peak), 1)
+        self.assertEqual(len(self.deleted), 12)
+
+    def test_failed_message_skips_rest_of_its_group(self):
+        stop_event = threading.Event()
+        self.set_batches(
+            [[build_message(0, "a", -1), build_message(1, "a"), build_message(2, "b")]],
+            stop_event,
+        )
+        handled = []
+
+        def handler(message):
+            handled.append(message["message_id"])
+            if message["message_data"] < 0:
+                raise ValueError("negative")
+
+        worker = FifoQueueWorker(
+            self.mock_manager, "test_queue.fifo", handler, workers=2, stop_event=stop_event
+        )
+        worker.run()
+
+        self.assertEqual(sorted(handled), ["0", "2"])
+        self.assertEqual(self.deleted, ["handle2"])
+
+    def test_messages_without_group_run_in_parallel(self):
+        stop_event = threading.Event()
+        self.set_batches([[build_message(index, None) for index in range(4)]], stop_event)
+        barrier = threading.Barrier(4, timeout=5)
+
+        worker = FifoQueueWorker(
+            self.mock_manager,
+            "test_queue",
+            lambda message: barrier.wait(),
+            workers=4,
+            stop_event=stop_event,
+        )
+        worker.run()
+
+        self.assertEqual(len(self.deleted), 4)
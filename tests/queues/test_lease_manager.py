@@ -0,0 +1,79 @@
+import threading
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from clever_events_library.queues.adapters import QueueBaseAdapter
+from clever_events_library.queues.lease_manager import LeaseManager
+
+
+def successful_change(queue_name, receipt_handles, visibility_timeout):
+    return [
+        {"index": index, "receipt_handle": receipt_handle, "success": True}
+        for index, receipt_handle in enumerate(receipt_handles)
+    ]
+
+
+class TestLeaseManager(TestCase):
+    def setUp(self):
+        self.mock_adapter = MagicMock(spec=QueueBaseAdapter)
+        self.extended = threading.Event()
+        self.mock_adapter.change_messages_visibility.side_effect = lambda *args: (
+            self.extended.set() or successful_change(*args)
+        )
+
+    def test_extends_tracked_messages_in_batches(self):
+        with LeaseManager(self.mock_adapter, visibility_timeout=2, extend_interval=0.05) as leases:
+            leases.track("test_queue", "handle1")
+            leases.track("test_queue", "handle2")
+            self.assertTrue(self.extended.wait(timeout=5))
+
+        (
+            queue_name,
+            receipt_handles,
+            visibility_timeout,
+        ) = self.mock_adapter.change_messages_visibility.call_args_list[0].args
+        self.assertEqual(queue_name, "test_queue")
+        self.assertEqual(sorted(receipt_handles), ["handle1", "handle2"])
+        self.assertEqual(visibility_timeout, 2)
+
+    def test_released_messages_are_not_extended(self):
+        leases = LeaseManager(self.mock_adapter, visibility_timeout=2, extend_interval=0.05)
+        leases.track("test_queue", "handle1")
+        leases.release("test_queue", "handle1")
+
+        self.assertFalse(self.extended.wait(timeout=0.2))
+        self.assertFalse(leases.is_tracked("test_queue", "handle1"))
+        leases.close()
+
+    def test_failed_extensions_release_the_lease(self):
+        self.mock_adapter.change_messages_visibility.side_effect = lambda *args: (
+            self.extended.set()
+            or [
+                {
+                    "index": 0,
+                    "receipt_handle": "handle1",
+                    "success": False,
+                    "error_code": "ReceiptHandleIsInvalid",
+                    "error_message": "",
+                }
+            ]
+        )
+        leases = LeaseManager(self.mock_adapter, visibility_timeout=2, extend_interval=0.01)
+        leases.track("test_queue", "handle1")
+
+        self.assertTrue(self.extended.wait(timeout=5))
+        leases.close()
+        self.assertFalse(leases.is_tracked("test_queue", "handle1"))
+
+    def test_max_lease_time(self):
+        leases = LeaseManager(
+            self.mock_adapter, visibility_timeout=2, extend_interval=0.5, max_lease_time=0.01
+        )
+        leases.track("test_queue", "handle1")
+
+        self.assertFalse(self.extended.wait(timeout=0.6))
+        leases.close()
+
+    def test_invalid_extend_interval(self):
+        with self.assertRaises(ValueError):
+            LeaseManager(self.mock_adapter, visibility_timeout=10, extend_interval=10)
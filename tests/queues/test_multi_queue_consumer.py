@@ -0,0 +1,98 @@
+import asyncio
+from collections import Counter
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from clever_events_library.queues.adapters import InMemoryQueueAdapter, QueueBaseAdapter
+from clever_events_library.queues.multi_queue_consumer import MultiQueueConsumer
+from clever_events_library.queues.queue_manager import QueueManager
+
+
+class TestMultiQueueConsumer(TestCase):
+    def setUp(self):
+        self.mock_adapter = MagicMock(spec=QueueBaseAdapter)
+        self.queue_manager = QueueManager(self.mock_adapter)
+
+        async def fetch_messages(queue_name, max_number_of_messages):
+            await asyncio.sleep(0)
+            return [{"queue": queue_name}] * max_number_of_messages
+
+        self.mock_adapter.async_fetch_messages.side_effect = fetch_messages
+
+    def consume(self, consumer, count):
+        async def run_test():
+            queue_names = []
+            async for queue_name, message in consumer.consume():
+                # Handling messages gives the pollers the chance to refill the buffers
+                await asyncio.sleep(0)
+                queue_names.append(queue_name)
+                if len(queue_names) == count:
+                    return queue_names
+
+        return asyncio.run(run_test())
+
+    def test_consume_merges_queues_by_weight(self):
+        consumer = MultiQueueConsumer(
+            self.queue_manager, {"busy": {"weight": 3}, "other": {"weight": 1}}
+        )
+
+        queue_names = self.consume(consumer, 40)
+
+        self.assertEqual(Counter(queue_names), {"busy": 30, "other": 10})
+        self.assertEqual(queue_names[:4].count("other"), 1)
+
+    def test_consume_serves_higher_priority_first(self):
+        consumer = MultiQueueConsumer(
+            self.queue_manager, {"urgent": {"priority": 1}, "batch": {"weight": 10}}
+        )
+
+        queue_names = self.consume(consumer, 20)
+
+        self.assertEqual(set(queue_names), {"urgent"})
+
+    def test_consume_with_local_queues(self):
+        adapter = InMemoryQueueAdapter()
+        for queue_name, count in (("first", 3), ("second", 2)):
+            adapter.broker.send(queue_name, [({"n": n}, {}, None) for n in range(count)])
+        consumer = MultiQueueConsumer(QueueManager(adapter), ["first", "second", "empty"])
+
+        queue_names = self.consume(consumer, 5)
+
+        self.assertEqual(Counter(queue_names), {"first": 3, "second": 2})
+
+    def test_consume_limits_concurrency_per_queue(self):
+        active, peak = Counter(), Counter()
+
+        async def fetch_messages(queue_name, max_number_of_messages):
+            active[queue_name] += 1
+            peak[queue_name] = max(peak[queue_name], active[queue_name])
+            await asyncio.sleep(0.01)
+            active[queue_name] -= 1
+            return [{"queue": queue_name}]
+
+        self.mock_adapter.async_fetch_messages.side_effect = fetch_messages
+        consumer = MultiQueueConsumer(
+            self.queue_manager,
+            {"first": {"concurrency": 3, "buffer_size": 100}, "second": {}},
+        )
+
+        self.consume(consumer, 20)
+
+        self.assertEqual(peak, {"first": 3, "second": 1})
+
+    def test_consume_raises_fetch_errors(self):
+        self.mock_adapter.async_fetch_messages.side_effect = RuntimeError("boom")
+        consumer = MultiQueueConsumer(self.queue_manager, ["queue"])
+
+        with self.assertRaises(RuntimeError):
+            self.consume(consumer, 1)
+
+    def test_invalid_options(self):
+        with self.assertRaises(ValueError):
+            MultiQueueConsumer(self.queue_manager, [])
+        with self.assertRaises(ValueError):
+            MultiQueueConsumer(self.queue_manager, {"queue": {"weight": 0}})
+        with self.assertRaises(ValueError):
+            MultiQueueConsumer(self.queue_manager, {"queue": {"concurrency": 0}})
+        with self.assertRaises(ValueError):
+            MultiQueueConsumer(self.queue_manager, {"queue": {"unknown": 1}})
@@ -1,7 +1,11 @@
+import asyncio
+import threading
 from unittest import TestCase
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
-from clever_events_library.queues.adapters import QueueBaseAdapter
+from clever_events_library.instrumentation import Instrumentation
+from clever_events_library.queues.adapters import InMemoryQueueAdapter, QueueBaseAdapter
+from clever_events_library.queues.dedup_cache import InMemoryDedupCache
 from clever_events_library.queues.queue_manager import QueueManager
 
 
@@ -35,3 +39,201 @@ class TestQueueManager(TestCase):
 
         self.mock_adapter.delete_message.assert_called_once_with(queue_name, message_id)
         self.assertEqual(result, expected_result)
+
+    def test_consume_yields_messages_from_concurrent_pollers(self):
+        batches = [[{"message_id": "1"}, {"message_id": "2"}], [{"message_id": "3"}]]
+
+        async def fetch_messages(queue_name, max_number_of_messages):
+            if batches:
+                return batches.pop(0)
+            await asyncio.sleep(0.01)
+            return []
+
+        self.mock_adapter.async_fetch_messages.side_effect = fetch_messages
+
+        async def run_test():
+            messages = []
+            async for message in self.queue_manager.consume("test_queue", concurrency=2):
+                messages.append(message)
+                if len(messages) == 3:
+                    break
+            return messages
+
+        messages = asyncio.run(run_test())
+
+        self.assertEqual(sorted(message["message_id"] for message in messages), ["1", "2", "3"])
+        self.mock_adapter.async_fetch_messages.assert_any_call("test_queue", 10)
+
+    def test_consume_raises_fetch_errors(self):
+        self.mock_adapter.async_fetch_messages.side_effect = RuntimeError("boom")
+
+        async def run_test():
+            async for _ in self.queue_manager.consume("test_queue"):
+                pass
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(run_test())
+
+    def test_consume_invalid_concurrency(self):
+        async def run_test():
+            async for _ in self.queue_manager.consume("test_queue", concurrency=0):
+                pass
+
+        with self.assertRaises(ValueError):
+            asyncio.run(run_test())
+
+    def test_async_delete_message(self):
+        self.mock_adapter.async_delete_message.return_value = True
+
+        result = asyncio.run(self.queue_manager.async_delete_message("test_queue", "message1"))
+
+        self.mock_adapter.async_delete_message.assert_called_once_with("test_queue", "message1")
+        self.assertTrue(result)
+
+    def test_delete_messages(self):
+        expected_result = [{"index": 0, "receipt_handle": "handle1", "success": True}]
+        self.mock_adapter.delete_messages.return_value = expected_result
+
+        result = self.queue_manager.delete_messages("test_queue", ["handle1"])
+
+        self.mock_adapter.delete_messages.assert_called_once_with("test_queue", ["handle1"])
+        self.assertEqual(result, expected_result)
+
+    def test_fetch_messages_with_instrumentation(self):
+        instrumentation = MagicMock(spec=Instrumentation)
+        queue_manager = QueueManager(self.mock_adapter, instrumentation=instrumentation)
+        self.mock_adapter.fetch_messages.return_value = iter([{"message_id": "1"}])
+
+        messages = list(queue_manager.fetch_messages("test_queue", 10))
+
+        self.assertEqual(messages, [{"message_id": "1"}])
+        instrumentation.start_call.assert_called_once_with("fetch_messages", "test_queue")
+        self.assertEqual(
+            instrumentation.end_call.call_args.args[4],
+            {"max_number_of_messages": 10, "messages": 1},
+        )
+
+    def test_async_fetch_messages_with_instrumentation_records_empty_receives(self):
+        instrumentation = MagicMock(spec=Instrumentation)
+        queue_manager = QueueManager(self.mock_adapter, instrumentation=instrumentation)
+        self.mock_adapter.async_fetch_messages = AsyncMock(return_value=[])
+
+        messages = asyncio.run(queue_manager.async_fetch_messages("test_queue", 10))
+
+        self.assertEqual(messages, [])
+        self.assertEqual(instrumentation.end_call.call_args.args[4]["messages"], 0)
+
+    def test_delete_with_instrumentation(self):
+        instrumentation = MagicMock(spec=Instrumentation)
+        queue_manager = QueueManager(self.mock_adapter, instrumentation=instrumentation)
+        self.mock_adapter.delete_message.return_value = {"ResponseMetadata": {"RetryAttempts": 2}}
+        self.mock_adapter.delete_messages.return_value = [
+            {"success": True},
+            {"success": False},
+        ]
+
+        queue_manager.delete_message("test_queue", "handle")
+        queue_manager.delete_messages("test_queue", ["handle1", "handle2"])
+
+        first_metrics, second_metrics = [
+            call.args[4] for call in instrumentation.end_call.call_args_list
+        ]
+        self.assertEqual(first_metrics, {"batch_size": 1, "retries": 2})
+        self.assertEqual(second_metrics, {"batch_size": 2, "failed": 1})
+
+    def test_consume_scales_pollers_with_queue_depth(self):
+        active, peak = [0], [0]
+
+        async def fetch_messages(queue_name, max_number_of_messages):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.02)
+            active[0] -= 1
+            return [{"message_id": "1"}]
+
+        self.mock_adapter.async_fetch_messages.side_effect = fetch_messages
+        self.mock_adapter.async_get_queue_depth = AsyncMock(return_value=1000)
+
+        async def run_test():
+            consumed = 0
+            async for _ in self.queue_manager.consume(
+                "test_queue",
+                concurrency=1,
+                max_number_of_messages=10,
+                max_concurrency=4,
+                scale_interval=0.01,
+            ):
+                consumed += 1
+                if consumed == 20:
+                    break
+
+        asyncio.run(run_test())
+
+        self.assertEqual(peak[0], 4)
+        self.mock_adapter.async_get_queue_depth.assert_called_with("test_queue")
+
+
+class TestQueueManagerDeduplication(TestCase):
+    def setUp(self):
+        self.adapter = InMemoryQueueAdapter()
+        self.queue_manager = QueueManager(self.adapter, dedup_cache=InMemoryDedupCache())
+
+    def test_drops_and_deletes_processed_messages(self):
+        self.adapter.broker.send("test_queue", [({"n": 1}, {}, None)])
+        messages = list(self.queue_manager.fetch_messages("test_queue", 10))
+        self.queue_manager.mark_processed("test_queue", messages)
+        messages[0].nack()
+
+        self.assertEqual(list(self.queue_manager.fetch_messages("test_queue", 10)), [])
+        self.assertEqual(
+            self.adapter.broker.count_messages("test_queue"), {"visible": 0, "in_flight": 0}
+        )
+
+    def test_unprocessed_messages_are_redelivered(self):
+        self.adapter.broker.send("test_queue", [({"n": 1}, {}, None)])
+        messages = list(self.queue_manager.fetch_messages("test_queue", 10))
+        messages[0].nack()
+
+        self.assertEqual(len(list(self.queue_manager.fetch_messages("test_queue", 10))), 1)
+
+    def test_dedup_on_body_key(self):
+        queue_manager = QueueManager(
+            self.adapter, dedup_cache=InMemoryDedupCache(), dedup_key="event_id"
+        )
+        self.adapter.broker.send(
+            "test_queue",
+            [({"event_id": "e1"}, {}, None), ({"event_id": "e1"}, {}, None), ({}, {}, None)],
+        )
+
+        messages = asyncio.run(queue_manager.async_fetch_messages("test_queue", 10))
+
+        self.assertEqual(
+            [message["message_data"] for message in messages], [{"event_id": "e1"}, {}]
+        )
+        self.assertEqual(self.adapter.broker.count_messages("test_queue")["in_flight"], 2)
+
+    def test_dedup_keys_are_scoped_by_queue(self):
+        self.adapter.broker.send("first", [({"event_id": "e1"}, {}, None)])
+        self.adapter.broker.send("second", [({"event_id": "e1"}, {}, None)])
+        self.queue_manager.dedup_key = "event_id"
+
+        self.queue_manager.mark_processed(
+            "first", list(self.queue_manager.fetch_messages("first", 10))
+        )
+
+        self.assertEqual(len(list(self.queue_manager.fetch_messages("second", 10))), 1)
+
+    def test_run_consumer_marks_handled_messages(self):
+        self.adapter.broker.send("test_queue", [({"n": 1}, {}, None)])
+        stop_event = threading.Event()
+        handled = []
+
+        def handler(message):
+            handled.append(message["message_id"])
+            stop_event.set()
+
+        self.queue_manager.run_consumer(
+            "test_queue", handler, stop_event=stop_event, idle_interval=0.01
+        )
+
+        self.assertTrue(self.queue_manager.dedup_cache.contains(f"test_queue:{handled[0]}"))
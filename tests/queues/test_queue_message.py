@@ -0,0 +1,106 @@
+import asyncio
+import json
+import pickle
+from unittest import TestCase
+from unittest.mock import AsyncMock, MagicMock
+
+from clever_events_library.queues.adapters import InMemoryQueueAdapter
+from clever_events_library.queues.queue_message import QueueMessage
+
+
+class TestQueueMessage(TestCase):
+    def setUp(self):
+        self.adapter = MagicMock()
+        self.decoder = MagicMock(side_effect=json.loads)
+        self.message = QueueMessage(
+            "1",
+            "handle1",
+            '{"key": "value"}',
+            {"attr": "value"},
+            self.decoder,
+            self.adapter,
+            "test_queue",
+        )
+
+    def test_message_data_is_decoded_once_on_first_access(self):
+        self.assertEqual(self.message["message_attributes"], {"attr": "value"})
+        self.decoder.assert_not_called()
+
+        self.assertEqual(self.message.message_data, {"key": "value"})
+        self.assertEqual(self.message["message_data"], {"key": "value"})
+        self.decoder.assert_called_once_with('{"key": "value"}')
+
+    def test_dict_access(self):
+        expected = {
+            "message_id": "1",
+            "message_receipt_handle": "handle1",
+            "message_data": {"key": "value"},
+            "message_attributes": {"attr": "value"},
+        }
+
+        self.assertEqual(self.message, expected)
+        self.assertEqual(dict(self.message), expected)
+        self.assertEqual(self.message.get("message_id"), "1")
+        self.assertIsNone(self.message.get("missing"))
+        self.assertIn("message_data", self.message)
+        with self.assertRaises(KeyError):
+            self.message["queue_name"]
+        with self.assertRaises(AttributeError):
+            self.message.other = 1
+
+    def test_to_dict(self):
+        message = self.message.to_dict()
+
+        self.assertEqual(type(message), dict)
+        self.assertEqual(
+            json.loads(json.dumps(message)),
+            {
+                "message_id": "1",
+                "message_receipt_handle": "handle1",
+                "message_data": {"key": "value"},
+                "message_attributes": {"attr": "value"},
+            },
+        )
+
+    def test_pickles_as_dict(self):
+        message = pickle.loads(pickle.dumps(self.message))
+
+        self.assertEqual(type(message), dict)
+        self.assertEqual(message["message_data"], {"key": "value"})
+
+    def test_ack_nack_and_extend(self):
+        self.adapter.change_messages_visibility.return_value = [{"success": True}]
+
+        self.message.ack()
+        self.assertEqual(self.message.nack(), {"success": True})
+        self.message.extend(60)
+
+        self.adapter.delete_message.assert_called_once_with("test_queue", "handle1")
+        self.adapter.change_messages_visibility.assert_any_call("test_queue", ["handle1"], 0)
+        self.adapter.change_messages_visibility.assert_any_call("test_queue", ["handle1"], 60)
+
+    def test_async_ack(self):
+        self.adapter.async_delete_message = AsyncMock()
+
+        asyncio.run(self.message.async_ack())
+
+        self.adapter.async_delete_message.assert_awaited_once_with("test_queue", "handle1")
+
+    def test_unbound_message_raises_value_error(self):
+        message = QueueMessage("1", "handle1", {}, {})
+
+        with self.assertRaises(ValueError):
+            message.ack()
+
+    def test_local_adapter_messages(self):
+        adapter = InMemoryQueueAdapter()
+        adapter.broker.send("test_queue", [({"key": "value"}, {}, None)])
+
+        message = next(adapter.fetch_messages("test_queue"))
+        message.nack()
+        message = next(adapter.fetch_messages("test_queue"))
+        message.ack()
+
+        self.assertEqual(message["message_data"], {"key": "value"})
+        self.assertEqual(adapter.get_queue_depth("test_queue"), 0)
+        self.assertEqual(list(adapter.fetch_messages("test_queue")), [])
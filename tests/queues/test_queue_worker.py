@@ -0,0 +1,150 @@
+import threading
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from clever_events_library.queues.queue_manager import QueueManager
+from clever_events_library.queues.queue_worker import QueueWorker
+
+
+def square_handler(message):
+    if message["message_data"] < 0:
+        raise ValueError("negative")
+    return message["message_data"] ** 2
+
+
+def build_message(index, value):
+    return {
+        "message_id": str(index),
+        "message_receipt_handle": f"handle{index}",
+        "message_data": value,
+        "message_attributes": {},
+    }
+
+
+class TestQueueWorker(TestCase):
+    def setUp(self):
+        self.mock_manager = MagicMock(spec=QueueManager)
+        self.deleted = []
+        self.mock_manager.delete_messages.side_effect = self.delete_messages
+
+    def delete_messages(self, queue_name, receipt_handles):
+        self.deleted.extend(receipt_handles)
+        return [
+            {"index": index, "receipt_handle": receipt_handle, "success": True}
+            for index, receipt_handle in enumerate(receipt_handles)
+        ]
+
+    def set_batches(self, batches, stop_event):
+        def fetch_messages(queue_name, max_number_of_messages):
+            if batches:
+                return batches.pop(0)
+            stop_event.set()
+            return []
+
+        self.mock_manager.fetch_messages.side_effect = fetch_messages
+
+    def test_deletes_successful_messages_and_leaves_failed_ones(self):
+        stop_event = threading.Event()
+        self.set_batches(
+            [[build_message(0, 1), build_message(1, -1)], [build_message(2, 3)]], stop_event
+        )
+        handled = []
+
+        def handler(message):
+            handled.append(message["message_id"])
+            square_handler(message)
+
+        worker = QueueWorker(
+            self.mock_manager, "test_queue", handler, workers=2, stop_event=stop_event
+        )
+        worker.run()
+
+        self.assertEqual(sorted(handled), ["0", "1", "2"])
+        self.assertEqual(sorted(self.deleted), ["handle0", "handle2"])
+        for call in self.mock_manager.fetch_messages.call_args_list:
+            self.assertEqual(call.args[0], "test_queue")
+            self.assertLessEqual(call.args[1], 4)
+
+    def test_process_executor(self):
+        stop_event = threading.Event()
+        self.set_batches([[build_message(index, index) for index in range(5)]], stop_event)
+
+        worker = QueueWorker(
+            self.mock_manager,
+            "test_queue",
+            square_handler,
+            executor="process",
+            workers=2,
+            prefetch=10,
+            stop_event=stop_event,
+        )
+        worker.run()
+
+        self.assertEqual(sorted(self.deleted), [f"handle{index}" for index in range(5)])
+
+    def test_fetch_errors_do_not_stop_the_worker(self):
+        stop_event = threading.Event()
+        calls = []
+
+        def fetch_messages(queue_name, max_number_of_messages):
+            calls.append(queue_name)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            if len(calls) == 2:
+                return [build_message(0, 2)]
+            stop_event.set()
+            return []
+
+        self.mock_manager.fetch_messages.side_effect = fetch_messages
+        QueueWorker(
+            self.mock_manager, "test_queue", square_handler, idle_interval=0, stop_event=stop_event
+        ).run()
+
+        self.assertEqual(self.deleted, ["handle0"])
+
+    def test_run_consumer(self):
+        stop_event = threading.Event()
+        adapter = MagicMock()
+        adapter.fetch_messages.side_effect = [[build_message(0, 2)], []]
+        adapter.delete_messages.side_effect = lambda queue_name, receipt_handles: (
+            stop_event.set() or self.delete_messages(queue_name, receipt_handles)
+        )
+
+        QueueManager(adapter).run_consumer(
+            "test_queue", square_handler, workers=1, stop_event=stop_event, idle_interval=0
+        )
+
+        self.assertEqual(self.deleted, ["handle0"])
+
+    def test_invalid_executor(self):
+        with self.assertRaises(ValueError):
+            QueueWorker(self.mock_manager, "test_queue", square_handler, executor="fiber")
+
+    def test_lease_manager_tracks_in_flight_messages(self):
+        stop_event = threading.Event()
+        self.set_batches([[build_message(0, 2), build_message(1, -2)]], stop_event)
+        lease_manager = MagicMock()
+        tracked = []
+
+        def handler(message):
+            tracked.append(lease_manager.track.call_count)
+            square_handler(message)
+
+        QueueWorker(
+            self.mock_manager,
+            "test_queue",
+            handler,
+            workers=1,
+            stop_event=stop_event,
+            lease_manager=lease_manager,
+        ).run()
+
+        self.assertEqual(
+            sorted(call.args for call in lease_manager.track.call_args_list),
+            [("test_queue", "handle0"), ("test_queue", "handle1")],
+        )
+        self.assertEqual(
+            sorted(call.args for call in lease_manager.release.call_args_list),
+            [("test_queue", "handle0"), ("test_queue", "handle1")],
+        )
+        self.assertTrue(all(count >= 1 for count in tracked))
@@ -0,0 +1,74 @@
+from unittest import TestCase
+
+from clever_events_library.queues.receive_strategy import (
+    AdaptiveReceiveStrategy,
+    get_pollers_for_backlog,
+)
+
+
+class TestAdaptiveReceiveStrategy(TestCase):
+    def setUp(self):
+        self.strategy = AdaptiveReceiveStrategy()
+
+    def test_unknown_queues_are_long_polled(self):
+        self.assertTrue(self.strategy.is_idle("queue"))
+        self.assertEqual(
+            self.strategy.get_receive_params("queue", 5),
+            {"WaitTimeSeconds": 20, "MaxNumberOfMessages": 5},
+        )
+
+    def test_full_batches_never_request_more_than_asked(self):
+        self.strategy.record_receive("queue", 5, 5)
+
+        self.assertFalse(self.strategy.is_idle("queue"))
+        self.assertEqual(
+            self.strategy.get_receive_params("queue", 5),
+            {"WaitTimeSeconds": 0, "MaxNumberOfMessages": 5},
+        )
+
+    def test_full_batches_are_capped_by_backlog_max_number_of_messages(self):
+        strategy = AdaptiveReceiveStrategy(backlog_max_number_of_messages=4)
+        strategy.record_receive("queue", 5, 5)
+
+        self.assertEqual(strategy.get_receive_params("queue", 5)["MaxNumberOfMessages"], 4)
+
+    def test_max_wait_time_caps_long_polls(self):
+        self.assertEqual(
+            self.strategy.get_receive_params("queue", 5, max_wait_time=15),
+            {"WaitTimeSeconds": 15, "MaxNumberOfMessages": 5},
+        )
+
+    def test_partial_batches_keep_requested_messages(self):
+        self.strategy.record_receive("queue", 10, 3)
+
+        self.assertEqual(
+            self.strategy.get_receive_params("queue", 5),
+            {"WaitTimeSeconds": 0, "MaxNumberOfMessages": 5},
+        )
+
+    def test_idle_after_consecutive_empty_receives(self):
+        strategy = AdaptiveReceiveStrategy(idle_wait_time=10, busy_wait_time=1, idle_after=2)
+        strategy.record_receive("queue", 10, 10)
+        strategy.record_receive("queue", 10, 0)
+
+        self.assertEqual(strategy.get_receive_params("queue", 10)["WaitTimeSeconds"], 1)
+
+        strategy.record_receive("queue", 10, 0)
+
+        self.assertEqual(strategy.get_receive_params("queue", 10)["WaitTimeSeconds"], 10)
+        self.assertTrue(strategy.is_idle("other_queue"))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            AdaptiveReceiveStrategy(idle_wait_time=21)
+        with self.assertRaises(ValueError):
+            AdaptiveReceiveStrategy(idle_wait_time=5, busy_wait_time=10)
+        with self.assertRaises(ValueError):
+            AdaptiveReceiveStrategy(backlog_max_number_of_messages=11)
+        with self.assertRaises(ValueError):
+            AdaptiveReceiveStrategy(idle_after=0)
+
+    def test_get_pollers_for_backlog(self):
+        self.assertEqual(get_pollers_for_backlog(0, 1, 8, 10), 1)
+        self.assertEqual(get_pollers_for_backlog(35, 1, 8, 10), 4)
+        self.assertEqual(get_pollers_for_backlog(1000, 1, 8, 10), 8)
@@ -0,0 +1,52 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from benchmarks.__main__ import main
+from benchmarks.runner import compare, measure
+
+
+class TestBenchmarks(TestCase):
+    def test_measure(self):
+        result = measure("noop", lambda: None, 20, concurrency=3, warmup=0, params={"a": 1})
+
+        self.assertEqual(result["name"], "noop")
+        self.assertEqual(result["iterations"], 20)
+        self.assertEqual(result["concurrency"], 3)
+        self.assertEqual(result["params"], {"a": 1})
+        self.assertGreater(result["ops_per_sec"], 0)
+        self.assertLessEqual(result["latency_us"]["p50"], result["latency_us"]["p99"])
+
+    def test_compare(self):
+        result = measure("noop", lambda: None, 10, warmup=0)
+        slower = {**result, "ops_per_sec": result["ops_per_sec"] / 2}
+
+        comparison = compare({"results": [result]}, {"results": [slower]})
+
+        self.assertEqual(len(comparison), 1)
+        self.assertEqual(comparison[0]["ratio"], 0.5)
+        self.assertTrue(comparison[0]["regression"])
+
+    def test_run_and_compare(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+
+            self.assertEqual(main(["run", "--iterations", "5", "--output", output]), 0)
+
+            with open(output) as output_file:
+                results = json.load(output_file)
+            self.assertIn("library_version", results["metadata"])
+            names = {result["name"] for result in results["results"]}
+            self.assertIn("publisher.sync_publish", names)
+            self.assertIn("publisher.async_publish", names)
+            self.assertIn("sns_adapter._prepare_message_attributes", names)
+            self.assertIn("sqs_adapter.fetch_messages", names)
+            self.assertEqual(
+                {
+                    result["concurrency"]
+                    for result in results["results"]
+                    if result["name"] == "sqs_adapter.fetch_messages"
+                },
+                {1, 10, 1000},
+            )
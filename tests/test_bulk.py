@@ -0,0 +1,213 @@
+import io
+import json
+import os
+import tempfile
+import time
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from clever_events_library import bulk
+from clever_events_library.bulk import drain_queue, export_queue, replay_file, to_record
+from clever_events_library.events import EventPublisher
+from clever_events_library.events.adapters import InMemoryEventAdapter
+from clever_events_library.local_broker import InMemoryBroker
+from clever_events_library.queues import QueueManager
+from clever_events_library.queues.adapters import InMemoryQueueAdapter
+
+
+def drop_odd(record):
+    return record["message_data"]["index"] % 2 == 0
+
+
+class TestBulk(TestCase):
+    def setUp(self):
+        self.broker = InMemoryBroker()
+        self.broker.subscribe("target_topic", "target_queue")
+        self.broker.send(
+            "source_queue",
+            [
+                ({"index": index}, {"kind": {"DataType": "String", "StringValue": "a"}}, None)
+                for index in range(25)
+            ],
+        )
+        self.queue_manager = QueueManager(InMemoryQueueAdapter(self.broker, visibility_timeout=60))
+        self.event_publisher = EventPublisher(InMemoryEventAdapter(self.broker))
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temporary_directory.cleanup)
+
+    def get_path(self, name):
+        return os.path.join(self.temporary_directory.name, name)
+
+    def get_data(self, queue_name):
+        messages = self.queue_manager.fetch_messages(queue_name, 100)
+        return sorted(message["message_data"]["index"] for message in messages)
+
+    def test_to_record(self):
+        (message,) = self.queue_manager.fetch_messages("source_queue", 1)
+        message.message_attributes["clever_events_codec"] = {
+            "DataType": "String",
+            "StringValue": "json",
+        }
+
+        self.assertEqual(
+            to_record(message),
+            {
+                "message_id": message["message_id"],
+                "message_data": {"index": 0},
+                "message_attributes": {"kind": "a"},
+            },
+        )
+
+    def test_drain_queue(self):
+        stats = drain_queue(
+            self.queue_manager,
+            self.event_publisher,
+            "source_queue",
+            "target_topic",
+            workers=4,
+            message_filter=drop_odd,
+            transform=lambda record: {
+                **record,
+                "message_data": {"index": record["message_data"]["index"] * 10},
+            },
+        )
+
+        self.assertEqual(stats, {"received": 25, "published": 13, "skipped": 12, "failed": 0})
+        self.assertEqual(self.get_data("target_queue"), list(range(0, 250, 20)))
+        self.assertEqual(
+            self.broker.count_messages("source_queue"), {"visible": 0, "in_flight": 12}
+        )
+
+    def test_drain_queue_keeps_failed_messages(self):
+        self.event_publisher.sync_publish_batch = MagicMock(side_effect=RuntimeError("down"))
+
+        stats = drain_queue(
+            self.queue_manager,
+            self.event_publisher,
+            "source_queue",
+            "target_topic",
+            max_messages=5,
+        )
+
+        self.assertEqual(stats, {"received": 5, "published": 0, "skipped": 0, "failed": 5})
+        self.assertEqual(
+            self.broker.count_messages("source_queue"), {"visible": 20, "in_flight": 5}
+        )
+
+    def test_export_and_replay(self):
+        output = io.StringIO()
+
+        stats = export_queue(self.queue_manager, "source_queue", output, workers=3, delete=True)
+
+        self.assertEqual(stats, {"received": 25, "written": 25, "skipped": 0})
+        self.assertEqual(
+            self.broker.count_messages("source_queue"), {"visible": 0, "in_flight": 0}
+        )
+        path = self.get_path("messages.ndjson")
+        with open(path, "w") as input_file:
+            input_file.write(output.getvalue())
+
+        stats = replay_file(self.event_publisher, path, "target_topic", batch_size=4)
+
+        self.assertEqual(stats, {"read": 25, "published": 25, "skipped": 0, "failed": 0})
+        self.assertEqual(self.get_data("target_queue"), list(range(25)))
+
+    def test_export_max_messages(self):
+        output = io.StringIO()
+
+        stats = export_queue(self.queue_manager, "source_queue", output, max_messages=12)
+
+        self.assertEqual(stats["received"], 12)
+        self.assertEqual(len(output.getvalue().splitlines()), 12)
+        self.assertEqual(
+            self.broker.count_messages("source_queue"), {"visible": 13, "in_flight": 12}
+        )
+
+    def test_replay_resumes_from_checkpoint(self):
+        path, checkpoint = self.get_path("messages.ndjson"), self.get_path("checkpoint")
+        with open(path, "w") as input_file:
+            for index in range(10):
+                input_file.write(
+                    json.dumps({"message_id": str(index), "message_data": {"index": index}}) + "\n"
+                )
+                if index == 4:
+                    input_file.write("\n")
+
+        with patch.object(bulk, "CHECKPOINT_INTERVAL", 0):
+            stats = replay_file(
+                self.event_publisher,
+                path,
+                "target_topic",
+                workers=1,
+                batch_size=3,
+                checkpoint=checkpoint,
+            )
+        self.assertEqual(stats["published"], 10)
+        with open(checkpoint) as checkpoint_file:
+            self.assertEqual(json.load(checkpoint_file)["offset"], os.path.getsize(path))
+
+        with open(path, "a") as input_file:
+            input_file.write(
+                json.dumps({"message_id": "10", "message_data": {"index": 10}}) + "\n"
+            )
+        stats = replay_file(self.event_publisher, path, "target_topic", checkpoint=checkpoint)
+
+        self.assertEqual(stats, {"read": 1, "published": 1, "skipped": 0, "failed": 0})
+        self.assertEqual(self.get_data("target_queue"), list(range(11)))
+        with self.assertRaises(ValueError):
+            replay_file(
+                self.event_publisher,
+                self.get_path("other.ndjson"),
+                "target_topic",
+                checkpoint=checkpoint,
+            )
+
+    def test_replay_bounds_batches_read_ahead_of_a_slow_batch(self):
+        path = self.get_path("messages.ndjson")
+        with open(path, "w") as input_file:
+            for index in range(20):
+                input_file.write(
+                    json.dumps({"message_id": str(index), "message_data": {"index": index}}) + "\n"
+                )
+        handled, handled_before_first = [], []
+
+        def transform(record):
+            if record["message_id"] == "0":
+                time.sleep(0.2)
+                handled_before_first.append(len(handled))
+            handled.append(record["message_id"])
+            return record
+
+        stats = replay_file(
+            self.event_publisher,
+            path,
+            "target_topic",
+            workers=2,
+            batch_size=1,
+            transform=transform,
+        )
+
+        self.assertEqual(stats["published"], 20)
+        self.assertLessEqual(handled_before_first[0], 3)
+
+    def test_replay_writes_failed_records(self):
+        path = self.get_path("messages.ndjson")
+        with open(path, "w") as input_file:
+            input_file.write(json.dumps({"message_id": "1", "message_data": {"index": 1}}) + "\n")
+        self.event_publisher.sync_publish_batch = MagicMock(
+            return_value=[{"success": False, "error_code": "Throttled", "error_message": None}]
+        )
+        failed_output = io.StringIO()
+
+        stats = replay_file(
+            self.event_publisher, path, "target_topic", failed_output=failed_output
+        )
+
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(json.loads(failed_output.getvalue())["message_id"], "1")
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            export_queue(self.queue_manager, "source_queue", io.StringIO(), workers=0)
+        with self.assertRaises(ValueError):
+            replay_file(self.event_publisher, "missing.ndjson", "target_topic", batch_size=0)
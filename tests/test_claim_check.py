@@ -0,0 +1,73 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from clever_events_library.claim_check import LocalFileBlobStore, S3BlobStore
+
+
+class TestLocalFileBlobStore(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = LocalFileBlobStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_put_get_delete(self):
+        location = self.store.put(b"payload")
+
+        self.assertEqual(self.store.get(location), b"payload")
+        self.store.delete(location)
+        with self.assertRaises(FileNotFoundError):
+            self.store.get(location)
+
+    def test_locations_outside_of_directory_are_rejected(self):
+        with tempfile.NamedTemporaryFile() as outside:
+            with self.assertRaises(ValueError):
+                self.store.get(outside.name)
+            with self.assertRaises(ValueError):
+                self.store.delete(f"{self.directory.name}/../{os.path.basename(outside.name)}")
+
+
+class TestS3BlobStore(TestCase):
+    def setUp(self):
+        self.store = S3BlobStore(
+            "test_bucket",
+            prefix="events/",
+            client_config={
+                "aws_region": "us-east-1",
+                "aws_key": "fake_key",
+                "aws_secret": "fake_secret",
+                "aws_account_id": "123456789012",
+            },
+        )
+
+    @patch("boto3.client")
+    def test_put_get_delete(self, mock_boto_client):
+        mock_s3_client = MagicMock()
+        mock_boto_client.return_value = mock_s3_client
+        mock_s3_client.get_object.return_value = {"Body": MagicMock(read=lambda: b"payload")}
+
+        location = self.store.put(b"payload")
+        key = mock_s3_client.put_object.call_args.kwargs["Key"]
+
+        self.assertTrue(key.startswith("events/"))
+        self.assertEqual(location, f"s3://test_bucket/{key}")
+        self.assertEqual(self.store.get(location), b"payload")
+        mock_s3_client.get_object.assert_called_once_with(Bucket="test_bucket", Key=key)
+        self.store.delete(location)
+        mock_s3_client.delete_object.assert_called_once_with(Bucket="test_bucket", Key=key)
+
+    def test_invalid_location(self):
+        with self.assertRaises(ValueError):
+            self.store.get("/tmp/payload")
+
+    def test_locations_outside_of_bucket_and_prefix_are_rejected(self):
+        for location in (
+            "s3://other_bucket/events/key",
+            "s3://test_bucket/private/key",
+            "s3://test_bucket/events/",
+        ):
+            with self.subTest(location=location), self.assertRaises(ValueError):
+                self.store.get(location)
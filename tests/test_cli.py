@@ -0,0 +1,68 @@
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+from unittest import TestCase
+
+from clever_events_library.cli import main
+from clever_events_library.local_broker import SQLiteBroker
+
+
+def is_even(record):
+    return record["message_data"]["index"] % 2 == 0
+
+
+class TestCli(TestCase):
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temporary_directory.cleanup)
+        self.database = self.get_path("broker.db")
+        self.broker = SQLiteBroker(self.database)
+        self.addCleanup(self.broker.close)
+        self.broker.subscribe("target_topic", "target_queue")
+        self.broker.send("source_queue", [({"index": index}, {}, None) for index in range(6)])
+
+    def get_path(self, name):
+        return os.path.join(self.temporary_directory.name, name)
+
+    def run_main(self, *argv):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            exit_code = main(["--sqlite", self.database, "--log-level", "ERROR", *argv])
+        return exit_code, json.loads(stdout.getvalue())
+
+    def test_drain(self):
+        exit_code, stats = self.run_main(
+            "drain",
+            "source_queue",
+            "target_topic",
+            "--workers",
+            "2",
+            "--filter",
+            f"{__name__}:is_even",
+        )
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(stats, {"received": 6, "published": 3, "skipped": 3, "failed": 0})
+        self.assertEqual(self.broker.count_messages("target_queue")["visible"], 3)
+
+    def test_export_and_replay(self):
+        path, checkpoint = self.get_path("messages.ndjson"), self.get_path("checkpoint")
+
+        exit_code, stats = self.run_main("export", "source_queue", path, "--delete")
+
+        self.assertEqual((exit_code, stats["written"]), (0, 6))
+        self.assertEqual(self.broker.count_messages("source_queue")["visible"], 0)
+
+        exit_code, stats = self.run_main(
+            "replay", path, "target_topic", "--checkpoint", checkpoint
+        )
+
+        self.assertEqual((exit_code, stats["published"]), (0, 6))
+        self.assertEqual(self.broker.count_messages("target_queue")["visible"], 6)
+        self.assertTrue(os.path.exists(checkpoint))
+
+    def test_invalid_callable(self):
+        with self.assertRaises(ValueError):
+            self.run_main("drain", "source_queue", "target_topic", "--filter", "json.loads")
@@ -0,0 +1,156 @@
+import socket
+from unittest import TestCase, skipUnless
+from unittest.mock import MagicMock, patch
+
+from clever_events_library import instrumentation
+from clever_events_library.instrumentation import (
+    CompositeInstrumentation,
+    Instrumentation,
+    OpenTelemetryInstrumentation,
+    PrometheusInstrumentation,
+    SentryInstrumentation,
+    StatsDInstrumentation,
+)
+
+try:
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+except ImportError:  # pragma: no cover
+    TracerProvider = None
+
+
+class TestInstrumentation(TestCase):
+    def test_composite_instrumentation_forwards_hooks(self):
+        first, second = MagicMock(spec=Instrumentation), MagicMock(spec=Instrumentation)
+        first.start_call.return_value = "first"
+        second.start_call.return_value = "second"
+        composite = CompositeInstrumentation([first, second])
+
+        context = composite.start_call("publish", "topic")
+        composite.end_call(context, "publish", "topic", 0.1, {})
+        composite.record_retry("publish", "topic", 1)
+        composite.record_in_flight("publish", "topic", 3)
+
+        first.end_call.assert_called_once_with("first", "publish", "topic", 0.1, {}, None)
+        second.end_call.assert_called_once_with("second", "publish", "topic", 0.1, {}, None)
+        second.record_retry.assert_called_once_with("publish", "topic", 1, None)
+        first.record_in_flight.assert_called_once_with("publish", "topic", 3)
+
+    @patch("clever_events_library.instrumentation.sentry_sdk")
+    def test_sentry_instrumentation(self, mock_sentry_sdk):
+        span = mock_sentry_sdk.start_span.return_value
+        sentry = SentryInstrumentation()
+
+        context = sentry.start_call("publish", "topic")
+        sentry.end_call(context, "publish", "topic", 0.1, {"payload_bytes": 10, "batch_size": 1})
+
+        mock_sentry_sdk.start_span.assert_called_once_with(
+            op="queue.publish", name="publish topic"
+        )
+        span.__enter__.assert_called_once()
+        span.set_data.assert_any_call("messaging.destination.name", "topic")
+        span.set_data.assert_any_call("messaging.message.body.size", 10)
+        span.set_data.assert_any_call("clever_events.batch_size", 1)
+        span.__exit__.assert_called_once_with(None, None, None)
+
+    @patch("clever_events_library.instrumentation.sentry_sdk")
+    def test_sentry_instrumentation_marks_errors(self, mock_sentry_sdk):
+        span = mock_sentry_sdk.start_span.return_value
+        sentry = SentryInstrumentation()
+        error = ValueError("boom")
+
+        context = sentry.start_call("fetch_messages", "queue")
+        sentry.end_call(context, "fetch_messages", "queue", 0.1, {}, error)
+
+        self.assertEqual(mock_sentry_sdk.start_span.call_args.kwargs["op"], "queue.receive")
+        span.__exit__.assert_called_once_with(ValueError, error, None)
+
+    def test_statsd_instrumentation(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(("127.0.0.1", 0))
+        server.settimeout(1)
+        self.addCleanup(server.close)
+        statsd = StatsDInstrumentation("127.0.0.1", server.getsockname()[1])
+        self.addCleanup(statsd.close)
+
+        statsd.end_call(None, "fetch_messages", "queue", 0.0125, {"messages": 0})
+        lines = server.recv(4096).decode("utf-8").split("\n")
+
+        self.assertEqual(
+            lines,
+            [
+                "clever_events.fetch_messages.duration:12.500|ms|#destination:queue",
+                "clever_events.fetch_messages.calls:1|c|#destination:queue,status:ok",
+                "clever_events.fetch_messages.messages:0|h|#destination:queue",
+                "clever_events.fetch_messages.empty_receives:1|c|#destination:queue",
+            ],
+        )
+
+        statsd.use_tags = False
+        statsd.record_in_flight("publish", "topic", 4)
+        self.assertEqual(server.recv(4096), b"clever_events.topic.publish.in_flight:4|g")
+
+    @skipUnless(instrumentation.prometheus_client, "prometheus_client is not installed")
+    def test_prometheus_instrumentation(self):
+        registry = instrumentation.prometheus_client.CollectorRegistry()
+        prometheus = PrometheusInstrumentation(registry=registry)
+        labels = {"operation": "publish_batch", "destination": "topic"}
+
+        prometheus.end_call(
+            None,
+            "publish_batch",
+            "topic",
+            0.2,
+            {"batch_size": 10, "payload_bytes": 2048, "failed": 2},
+            ValueError("boom"),
+        )
+        prometheus.record_retry("publish_batch", "topic", 1)
+        prometheus.record_in_flight("publish_batch", "topic", 3)
+
+        self.assertEqual(
+            registry.get_sample_value(
+                "clever_events_call_duration_seconds_count", {**labels, "status": "error"}
+            ),
+            1,
+        )
+        self.assertEqual(registry.get_sample_value("clever_events_batch_size_sum", labels), 10)
+        self.assertEqual(
+            registry.get_sample_value("clever_events_payload_bytes_sum", labels), 2048
+        )
+        self.assertEqual(
+            registry.get_sample_value("clever_events_failed_entries_total", labels), 2
+        )
+        self.assertEqual(registry.get_sample_value("clever_events_retries_total", labels), 1)
+        self.assertEqual(registry.get_sample_value("clever_events_in_flight", labels), 3)
+
+    @skipUnless(TracerProvider, "opentelemetry-sdk is not installed")
+    def test_opentelemetry_instrumentation(self):
+        span_exporter = InMemorySpanExporter()
+        tracer_provider = TracerProvider()
+        tracer_provider.add_span_processor(SimpleSpanProcessor(span_exporter))
+        metric_reader = InMemoryMetricReader()
+        opentelemetry = OpenTelemetryInstrumentation(
+            tracer_provider=tracer_provider,
+            meter_provider=MeterProvider(metric_readers=[metric_reader]),
+        )
+
+        context = opentelemetry.start_call("fetch_messages", "queue")
+        opentelemetry.end_call(context, "fetch_messages", "queue", 0.1, {"messages": 0})
+        opentelemetry.record_in_flight("fetch_messages", "queue", 2)
+        opentelemetry.record_in_flight("fetch_messages", "queue", 1)
+
+        (span,) = span_exporter.get_finished_spans()
+        self.assertEqual(span.name, "fetch_messages queue")
+        self.assertEqual(span.attributes["messaging.destination.name"], "queue")
+        metrics = {
+            metric.name: metric.data.data_points[0]
+            for resource_metrics in metric_reader.get_metrics_data().resource_metrics
+            for scope_metrics in resource_metrics.scope_metrics
+            for metric in scope_metrics.metrics
+        }
+        self.assertEqual(metrics["clever_events.receive.empty"].value, 1)
+        self.assertEqual(metrics["clever_events.in_flight"].value, 1)
+        self.assertEqual(metrics["clever_events.call.duration"].count, 1)
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import time
+from unittest import TestCase
+
+from clever_events_library.local_broker import InMemoryBroker, SQLiteBroker
+
+
+class LocalBrokerTestMixin:
+    def create_broker(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.broker = self.create_broker()
+        self.broker.subscribe("test_topic", "first_queue")
+        self.broker.subscribe("test_topic", "second_queue")
+
+    def test_publish_fans_out_to_subscribed_queues(self):
+        message_ids = self.broker.publish("test_topic", [({"key": "value"}, {}, None)])
+
+        for queue_name in ("first_queue", "second_queue"):
+            messages = self.broker.receive(queue_name, 10, 30)
+            self.assertEqual(len(messages), 1)
+            self.assertEqual(messages[0]["message_id"], message_ids[0])
+            self.assertEqual(messages[0]["body"], {"key": "value"})
+            self.assertEqual(messages[0]["receive_count"], 1)
+
+    def test_publish_without_subscriptions_is_dropped(self):
+        self.broker.publish("other_topic", [("message", {}, None)])
+
+        self.assertEqual(self.broker.receive("first_queue", 10, 30), [])
+
+    def test_received_messages_are_hidden_until_visibility_timeout(self):
+        self.broker.send("first_queue", [("first", {}, None), ("second", {}, "group")])
+
+        first = self.broker.receive("first_queue", 1, 0.05)
+        second = self.broker.receive("first_queue", 10, 30)
+        self.assertEqual([message["body"] for message in first], ["first"])
+        self.assertEqual([message["body"] for message in second], ["second"])
+        self.assertEqual(second[0]["group_id"], "group")
+        self.assertEqual(self.broker.count_messages("first_queue"), {"visible": 0, "in_flight": 2})
+
+        time.sleep(0.1)
+        redelivered = self.broker.receive("first_queue", 10, 30)
+        self.assertEqual([message["body"] for message in redelivered], ["first"])
+        self.assertEqual(redelivered[0]["receive_count"], 2)
+        self.assertNotEqual(redelivered[0]["receipt_handle"], first[0]["receipt_handle"])
+
+    def test_delete(self):
+        self.broker.send("first_queue", [("first", {}, None)])
+        message = self.broker.receive("first_queue", 1, 0)[0]
+
+        self.assertEqual(
+            self.broker.delete("first_queue", [message["receipt_handle"], "invalid"]),
+            [True, False],
+        )
+        self.assertEqual(self.broker.receive("first_queue", 10, 30), [])
+
+    def test_change_visibility(self):
+        self.broker.send("first_queue", [("first", {}, None)])
+        message = self.broker.receive("first_queue", 1, 30)[0]
+
+        self.assertEqual(
+            self.broker.change_visibility("first_queue", [message["receipt_handle"]], 0), [True]
+        )
+        self.assertEqual(len(self.broker.receive("first_queue", 10, 30)), 1)
+
+
+class TestInMemoryBroker(LocalBrokerTestMixin, TestCase):
+    def create_broker(self):
+        return InMemoryBroker()
+
+
+class TestSQLiteBroker(LocalBrokerTestMixin, TestCase):
+    def create_broker(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "broker.db")
+        return SQLiteBroker(self.path)
+
+    def tearDown(self):
+        self.broker.close()
+        self.directory.cleanup()
+
+    def test_messages_survive_reopening_the_database(self):
+        self.broker.publish("test_topic", [({"key": "value"}, {"attr": "value"}, None)])
+        self.broker.close()
+        self.broker = SQLiteBroker(self.path)
+
+        messages = self.broker.receive("first_queue", 10, 30)
+
+        self.assertEqual(messages[0]["body"], {"key": "value"})
+        self.assertEqual(messages[0]["attributes"], {"attr": "value"})
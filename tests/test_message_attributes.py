@@ -0,0 +1,76 @@
+from decimal import Decimal
+from unittest import TestCase
+
+from clever_events_library.message_attributes import AttributeEncoder, decode_attributes
+
+
+class TestAttributeEncoder(TestCase):
+    def test_encode_infers_types(self):
+        encoder = AttributeEncoder()
+
+        message_attributes = encoder.encode(
+            {
+                "name": "user",
+                "count": 3,
+                "price": Decimal("9.99"),
+                "active": True,
+                "tags": ["a", "b"],
+                "signature": b"\x00\x01",
+                "other": None,
+            }
+        )
+
+        self.assertEqual(
+            message_attributes,
+            {
+                "name": {"DataType": "String", "StringValue": "user"},
+                "count": {"DataType": "Number", "StringValue": "3"},
+                "price": {"DataType": "Number", "StringValue": "9.99"},
+                "active": {"DataType": "String.Boolean", "StringValue": "true"},
+                "tags": {"DataType": "String.Array", "StringValue": '["a", "b"]'},
+                "signature": {"DataType": "Binary", "BinaryValue": b"\x00\x01"},
+                "other": {"DataType": "String", "StringValue": "None"},
+            },
+        )
+
+    def test_encode_with_schema(self):
+        encoder = AttributeEncoder({"user_id": "String", "version": "Number"})
+
+        message_attributes = encoder.encode({"user_id": 42, "version": "2", "count": 1})
+
+        self.assertEqual(
+            message_attributes,
+            {
+                "user_id": {"DataType": "String", "StringValue": "42"},
+                "version": {"DataType": "Number", "StringValue": "2"},
+                "count": {"DataType": "Number", "StringValue": "1"},
+            },
+        )
+
+    def test_invalid_schema(self):
+        with self.assertRaises(ValueError):
+            AttributeEncoder({"user_id": "Integer"})
+
+
+class TestDecodeAttributes(TestCase):
+    def test_decode_round_trip(self):
+        attributes = {
+            "name": "user",
+            "count": 3,
+            "ratio": 0.5,
+            "active": False,
+            "tags": ["a", "b"],
+            "signature": b"\x00\x01",
+        }
+
+        self.assertEqual(decode_attributes(AttributeEncoder().encode(attributes)), attributes)
+
+    def test_decode_custom_types(self):
+        attributes = decode_attributes(
+            {
+                "price": {"DataType": "Number.float", "StringValue": "1.5"},
+                "kind": {"DataType": "String.custom", "StringValue": "value"},
+            }
+        )
+
+        self.assertEqual(attributes, {"price": 1.5, "kind": "value"})
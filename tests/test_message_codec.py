@@ -0,0 +1,67 @@
+from unittest import TestCase, skipUnless
+
+from clever_events_library import message_codec
+from clever_events_library.message_codec import MessageCodec, get_codec
+
+MESSAGE = {"key": "value", "items": [1, 2, 3], "nested": {"text": "ñandú"}}
+
+
+class TestMessageCodec(TestCase):
+    def test_json_codec(self):
+        codec = MessageCodec()
+
+        body = codec.encode(MESSAGE)
+
+        self.assertEqual(codec.name, "json")
+        self.assertEqual(
+            body, '{"key": "value", "items": [1, 2, 3], "nested": {"text": "\\u00f1and\\u00fa"}}'
+        )
+        self.assertEqual(codec.decode(body), MESSAGE)
+
+    def test_json_zlib_codec(self):
+        codec = MessageCodec("json", "zlib")
+
+        body = codec.encode(MESSAGE)
+
+        self.assertEqual(codec.name, "json+zlib")
+        self.assertIsInstance(body, str)
+        self.assertEqual(codec.decode(body), MESSAGE)
+
+    @skipUnless(message_codec.orjson, "orjson is not installed")
+    def test_orjson_codec(self):
+        codec = MessageCodec("orjson")
+
+        self.assertEqual(codec.decode(codec.encode(MESSAGE)), MESSAGE)
+
+    @skipUnless(message_codec.msgpack, "msgpack is not installed")
+    def test_msgpack_codec(self):
+        codec = MessageCodec("msgpack")
+
+        self.assertEqual(codec.decode(codec.encode(MESSAGE)), MESSAGE)
+
+    @skipUnless(message_codec.zstandard, "zstandard is not installed")
+    def test_zstd_compression(self):
+        codec = MessageCodec("json", "zstd")
+
+        self.assertEqual(codec.decode(codec.encode(MESSAGE)), MESSAGE)
+
+    def test_compression_reduces_large_payloads(self):
+        message = {"items": ["repeated value"] * 1000}
+
+        self.assertLess(
+            len(MessageCodec("json", "zlib").encode(message)),
+            len(MessageCodec().encode(message)) / 10,
+        )
+
+    def test_get_codec_caches_codecs(self):
+        codec = get_codec("json+zlib")
+
+        self.assertIs(get_codec("json+zlib"), codec)
+        self.assertIs(get_codec(codec), codec)
+        self.assertEqual(codec.compression, "zlib")
+
+    def test_unsupported_codec(self):
+        with self.assertRaises(ValueError):
+            get_codec("yaml")
+        with self.assertRaises(ValueError):
+            get_codec("json+gzip")
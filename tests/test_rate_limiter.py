@@ -0,0 +1,52 @@
+import asyncio
+from unittest import TestCase
+from unittest.mock import patch
+
+from clever_events_library.rate_limiter import RateLimiter, TokenBucket
+
+
+class TestTokenBucket(TestCase):
+    @patch("clever_events_library.rate_limiter.time.monotonic", return_value=100.0)
+    def test_reserve(self, mock_monotonic):
+        bucket = TokenBucket(rate=10, burst=5)
+
+        self.assertEqual([bucket.reserve() for _ in range(5)], [0] * 5)
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+        self.assertAlmostEqual(bucket.reserve(2), 0.3)
+
+        mock_monotonic.return_value = 101.0
+
+        self.assertEqual(bucket.reserve(), 0)
+
+    @patch("clever_events_library.rate_limiter.time.sleep")
+    def test_acquire_waits_when_empty(self, mock_sleep):
+        bucket = TokenBucket(rate=1000, burst=1)
+
+        bucket.acquire()
+        bucket.acquire()
+
+        mock_sleep.assert_called_once()
+
+    def test_async_acquire(self):
+        bucket = TokenBucket(rate=1000, burst=1)
+
+        async def acquire():
+            await bucket.async_acquire()
+            await bucket.async_acquire()
+
+        asyncio.run(acquire())
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=1, burst=-1)
+
+
+class TestRateLimiter(TestCase):
+    def test_buckets_per_key(self):
+        limiter = RateLimiter(rate=10, burst=2)
+
+        self.assertIs(limiter.get_bucket("topic"), limiter.get_bucket("topic"))
+        self.assertIsNot(limiter.get_bucket("topic"), limiter.get_bucket("other_topic"))
+        self.assertEqual(limiter.get_bucket("topic").burst, 2)
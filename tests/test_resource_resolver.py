@@ -0,0 +1,85 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from clever_events_library import mixins
+from clever_events_library.resource_resolver import ResourceResolver
+
+
+class TestResourceResolver(TestCase):
+    def setUp(self):
+        self.resolver = ResourceResolver("us-east-1", "123456789012", max_size=2)
+
+    def test_get_topic_arn(self):
+        self.assertEqual(
+            self.resolver.get_topic_arn("sns", "my_topic"),
+            "arn:aws:sns:us-east-1:123456789012:my_topic",
+        )
+        self.assertEqual(
+            self.resolver.get_topic_arn("sns", "arn:aws:sns:us-west-2:210987654321:other_topic"),
+            "arn:aws:sns:us-west-2:210987654321:other_topic",
+        )
+
+    def test_get_queue_url(self):
+        self.assertEqual(
+            self.resolver.get_queue_url("my_queue"),
+            "https://sqs.us-east-1.amazonaws.com/123456789012/my_queue",
+        )
+        self.assertEqual(
+            self.resolver.get_queue_url("https://sqs.us-west-2.amazonaws.com/2109/other_queue"),
+            "https://sqs.us-west-2.amazonaws.com/2109/other_queue",
+        )
+
+    def test_resolver_is_called_once_per_queue(self):
+        resolver = MagicMock(return_value="https://resolved/my_queue.fifo")
+
+        for _ in range(3):
+            url = self.resolver.get_queue_url("my_queue.fifo", resolver)
+
+        self.assertEqual(url, "https://resolved/my_queue.fifo")
+        resolver.assert_called_once_with("my_queue.fifo")
+
+    def test_cache_evicts_least_recently_used(self):
+        resolver = MagicMock(side_effect=lambda queue_name: queue_name)
+
+        self.resolver.get_queue_url("first", resolver)
+        self.resolver.get_queue_url("second", resolver)
+        self.resolver.get_queue_url("first", resolver)
+        self.resolver.get_queue_url("third", resolver)
+        self.resolver.get_queue_url("first", resolver)
+        self.resolver.get_queue_url("second", resolver)
+
+        self.assertEqual(
+            [call.args[0] for call in resolver.call_args_list],
+            ["first", "second", "third", "second"],
+        )
+
+
+class TestAwsHelperMixin(TestCase):
+    @patch.object(mixins, "load_dotenv")
+    def test_dotenv_is_not_loaded_with_full_config(self, mock_load_dotenv):
+        with patch.object(mixins, "_dotenv_loaded", False):
+            mixins.AwsHelperMixin()._get_aws_client_params(
+                {
+                    "aws_region": "us-east-1",
+                    "aws_key": "fake_key",
+                    "aws_secret": "fake_secret",
+                    "aws_account_id": "123456789012",
+                }
+            )
+
+        mock_load_dotenv.assert_not_called()
+
+    @patch.object(mixins, "load_dotenv")
+    def test_dotenv_is_loaded_once_when_config_is_missing(self, mock_load_dotenv):
+        env = {
+            "AWS_REGION": "us-east-1",
+            "AWS_ACCESS_KEY_ID": "fake_key",
+            "AWS_SECRET_ACCESS_KEY": "fake_secret",
+            "AWS_ACCOUNT_ID": "123456789012",
+        }
+        with patch.object(mixins, "_dotenv_loaded", False), patch.dict("os.environ", env):
+            mixins.AwsHelperMixin()._get_aws_client_params()
+            params = mixins.AwsHelperMixin()._get_aws_client_params()
+
+        mock_load_dotenv.assert_called_once()
+        self.assertEqual(params["aws_region"], "us-east-1")
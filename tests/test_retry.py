@@ -0,0 +1,60 @@
+import asyncio
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+from clever_events_library.retry import RetryPolicy
+
+
+class TestRetryPolicy(TestCase):
+    def test_get_delay_uses_full_jitter(self):
+        policy = RetryPolicy(base_delay=0.1, max_delay=1.0)
+
+        with patch("clever_events_library.retry.random.uniform", return_value=0.5) as uniform:
+            self.assertEqual(policy.get_delay(1), 0.5)
+            policy.get_delay(10)
+
+        self.assertEqual([call.args for call in uniform.call_args_list], [(0, 0.2), (0, 1.0)])
+
+    def test_is_retryable(self):
+        policy = RetryPolicy()
+
+        self.assertTrue(policy.is_retryable(ClientError({"Error": {"Code": "Throttling"}}, "Op")))
+        self.assertTrue(policy.is_retryable(ClientError({"Error": {"Code": "Throttled"}}, "Op")))
+        self.assertTrue(policy.is_retryable_code("KMSThrottling"))
+        self.assertTrue(policy.is_retryable(EndpointConnectionError(endpoint_url="url")))
+        self.assertFalse(policy.is_retryable(ClientError({"Error": {"Code": "NotFound"}}, "Op")))
+        self.assertFalse(policy.is_retryable(ValueError("message is required")))
+
+    @patch("clever_events_library.retry.time.sleep")
+    def test_call_gives_up_after_max_attempts(self, mock_sleep):
+        policy = RetryPolicy(max_attempts=3)
+        func = MagicMock(side_effect=ClientError({"Error": {"Code": "Throttling"}}, "Op"))
+
+        with self.assertRaises(ClientError):
+            policy.call("publish", "topic", func)
+
+        self.assertEqual(func.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_async_call_retries(self):
+        instrumentation = MagicMock()
+        policy = RetryPolicy(base_delay=0, max_delay=0, instrumentation=instrumentation)
+        calls = []
+
+        async def func():
+            calls.append(1)
+            if len(calls) == 1:
+                raise ClientError({"Error": {"Code": "ServiceUnavailable"}}, "Op")
+            return "result"
+
+        self.assertEqual(asyncio.run(policy.async_call("publish", "topic", func)), "result")
+        self.assertEqual(len(calls), 2)
+        instrumentation.record_retry.assert_called_once()
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_attempts=0)
+        with self.assertRaises(ValueError):
+            RetryPolicy(base_delay=2, max_delay=1)